@@ -1,7 +1,8 @@
 """EC2 operations for OpenShift cluster cleanup."""
 
-from .instances import execute_cleanup_action
+from .instances import execute_cleanup_action, iter_candidate_instances
 
 __all__ = [
     "execute_cleanup_action",
+    "iter_candidate_instances",
 ]
@@ -1,20 +1,145 @@
 """EC2 instance operations for OpenShift cluster cleanup."""
 
 from __future__ import annotations
-import boto3
+
+from collections.abc import Iterator
+from typing import Any
+
 from botocore.exceptions import ClientError
-from ..models import CleanupAction
+
+from ..models import CleanupAction, ClusterProgress
 from ..models.config import DRY_RUN, OPENSHIFT_CLEANUP_ENABLED
-from ..utils import get_logger
-from ..openshift.orchestrator import destroy_openshift_cluster
 from ..openshift.detection import detect_openshift_infra_id
+from ..openshift.inventory import RegionInventory
+from ..openshift.planner import plan_cluster_teardown
+from ..state import StateStore
+from ..utils import get_client, get_logger
 
 logger = get_logger()
 
+# Server-side filters for instance discovery. Filters with different names are
+# ANDed and values within one filter are ORed, so only running/stopped
+# instances carrying at least one OpenShift-related tag key are returned.
+INSTANCE_DISCOVERY_FILTERS = [
+    {"Name": "instance-state-name", "Values": ["running", "stopped"]},
+    {
+        "Name": "tag-key",
+        "Values": [
+            "kubernetes.io/cluster/*",
+            "sigs.k8s.io/cluster-api-provider-aws/cluster/*",
+            "red-hat-clustertype",
+            "red-hat-managed",
+        ],
+    },
+]
+
+# Second query for clusters only recognisable by their instance names (see
+# cluster_name_from_instance_name). Tag filters are case-sensitive, so the
+# common spellings of "openshift" are listed explicitly.
+INSTANCE_NAME_FILTERS = [
+    {"Name": "instance-state-name", "Values": ["running", "stopped"]},
+    {
+        "Name": "tag:Name",
+        "Values": [
+            "*-master-*",
+            "*openshift*",
+            "*OpenShift*",
+            "*Openshift*",
+            "*OPENSHIFT*",
+        ],
+    },
+]
+
+# describe_instances accepts at most 1000 results per page
+INSTANCE_PAGE_SIZE = 1000
+
+
+def destroy_openshift_cluster(
+    cluster_name: str,
+    infra_id: str,
+    region: str,
+    inventory: RegionInventory | None = None,
+    progress: ClusterProgress | None = None,
+) -> bool:
+    """Run the cluster teardown, loading the teardown graph on first use.
+
+    Dry runs and scans never tear anything down, so the orchestrator and the
+    resource deleters stay out of the cold start.
+    """
+    from ..openshift.orchestrator import destroy_openshift_cluster as destroy
+
+    return destroy(cluster_name, infra_id, region, inventory, progress)
+
+
+def iter_candidate_instances(ec2: Any) -> Iterator[dict[str, Any]]:
+    """Yield candidate OpenShift instances one at a time.
+
+    Walks every describe_instances page via the EC2 paginator (following
+    NextToken), so clusters beyond the first page are not missed and only one
+    page is held in memory at a time. Instances matched by the tag query are
+    not yielded again by the name query.
+
+    Args:
+        ec2: EC2 client for the region being scanned
+
+    Yields:
+        EC2 instance dictionaries matching INSTANCE_DISCOVERY_FILTERS or
+        INSTANCE_NAME_FILTERS
+    """
+    paginator = ec2.get_paginator("describe_instances")
+    seen: set[str] = set()
+    for filters in (INSTANCE_DISCOVERY_FILTERS, INSTANCE_NAME_FILTERS):
+        pages = paginator.paginate(
+            Filters=filters,
+            PaginationConfig={"PageSize": INSTANCE_PAGE_SIZE},
+        )
+        for page in pages:
+            for reservation in page.get("Reservations", []):
+                for instance in reservation.get("Instances", []):
+                    if instance["InstanceId"] not in seen:
+                        seen.add(instance["InstanceId"])
+                        yield instance
 
-def execute_cleanup_action(action: CleanupAction, region: str) -> bool:
-    """Execute OpenShift cluster cleanup action."""
-    ec2 = boto3.client("ec2", region_name=region)
+
+def terminate_cluster_instances(ec2: Any, action: CleanupAction) -> None:
+    """Terminate every scanned instance of the action's cluster.
+
+    Instances already gone (e.g. of a resumed cluster) are not an error.
+    """
+    instance_ids = action.instance_ids or [action.instance_id]
+    logger.info(
+        "TERMINATE instance for cluster",
+        extra={"instance_ids": instance_ids, "cluster_name": action.cluster_name},
+    )
+    try:
+        ec2.terminate_instances(InstanceIds=instance_ids)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "InvalidInstanceID.NotFound":
+            raise
+        logger.info(
+            "Cluster instances already gone",
+            extra={"instance_ids": instance_ids, "cluster_name": action.cluster_name},
+        )
+
+
+def execute_cleanup_action(
+    action: CleanupAction,
+    region: str,
+    inventory: RegionInventory | None = None,
+    state_store: StateStore | None = None,
+) -> bool:
+    """Execute OpenShift cluster cleanup action.
+
+    Args:
+        action: Cleanup action to execute
+        region: AWS region of the cluster
+        inventory: Optional region snapshot shared by all clusters in the region
+        state_store: Optional cross-run progress store; clusters it records as
+            finished only have their remaining instances terminated, others
+            resume from their remaining teardown nodes. A cluster is recorded
+            only after its instances were terminated.
+    """
+    ec2 = get_client("ec2", region_name=region)
 
     try:
         if action.action == "TERMINATE_OPENSHIFT_CLUSTER":
@@ -27,48 +152,83 @@ def execute_cleanup_action(action: CleanupAction, region: str) -> bool:
 
             if OPENSHIFT_CLEANUP_ENABLED:
                 cluster_name = action.cluster_name
-                infra_id = detect_openshift_infra_id(cluster_name, region)
-                if infra_id:
-                    if DRY_RUN:
-                        logger.info(
-                            "Would TERMINATE_OPENSHIFT_CLUSTER",
-                            extra={
-                                "dry_run": True,
-                                "cluster_name": cluster_name,
-                                "infra_id": infra_id,
-                                "cluster_type": "openshift",
-                                "region": region,
-                            },
-                        )
-                    else:
+                progress = None
+                if state_store is not None and not DRY_RUN:
+                    progress = state_store.get(
+                        region, action.infra_id or cluster_name
+                    ) or ClusterProgress.from_action(action)
+                    if progress.is_complete:
+                        # Instances still showing up in the scan were left by
+                        # an earlier, interrupted run
                         logger.info(
-                            "TERMINATE_OPENSHIFT_CLUSTER",
+                            "OpenShift cluster already cleaned up, skipping teardown",
                             extra={
                                 "cluster_name": cluster_name,
-                                "infra_id": infra_id,
-                                "cluster_type": "openshift",
+                                "infra_id": progress.infra_id,
                                 "region": region,
+                                "attempts": progress.attempts,
                             },
                         )
-                        destroy_openshift_cluster(cluster_name, infra_id, region)
+                        terminate_cluster_instances(ec2, action)
+                        return True
+
+                # Terminate the instances first: their network interfaces
+                # block the subnets, security groups and VPC of the graph.
+                # Progress is only recorded once this has succeeded.
                 if DRY_RUN:
                     logger.info(
                         "Would TERMINATE instance for cluster",
                         extra={
                             "dry_run": True,
-                            "instance_id": action.instance_id,
+                            "instance_ids": action.instance_ids or [action.instance_id],
                             "cluster_name": cluster_name,
                         },
                     )
                 else:
-                    logger.info(
-                        "TERMINATE instance for cluster",
-                        extra={
-                            "instance_id": action.instance_id,
+                    terminate_cluster_instances(ec2, action)
+
+                infra_id = detect_openshift_infra_id(
+                    cluster_name, region, inventory=inventory
+                )
+                if not infra_id and progress is not None and progress.attempts:
+                    # VPC already gone: finish DNS/S3 cleanup of a resumed cluster
+                    infra_id = progress.infra_id
+                if infra_id:
+                    if DRY_RUN:
+                        extra: dict[str, Any] = {
+                            "dry_run": True,
                             "cluster_name": cluster_name,
-                        },
-                    )
-                    ec2.terminate_instances(InstanceIds=[action.instance_id])
+                            "infra_id": infra_id,
+                            "cluster_type": "openshift",
+                            "region": region,
+                        }
+                        if inventory is not None:
+                            # Plan from the region snapshot instead of walking
+                            # every delete step
+                            extra["plan"] = plan_cluster_teardown(
+                                cluster_name, infra_id, region, inventory
+                            ).to_dict()
+                        logger.info("Would TERMINATE_OPENSHIFT_CLUSTER", extra=extra)
+                    else:
+                        logger.info(
+                            "TERMINATE_OPENSHIFT_CLUSTER",
+                            extra={
+                                "cluster_name": cluster_name,
+                                "infra_id": infra_id,
+                                "cluster_type": "openshift",
+                                "region": region,
+                            },
+                        )
+                        cluster_done = destroy_openshift_cluster(
+                            cluster_name,
+                            infra_id,
+                            region,
+                            inventory=inventory,
+                            progress=progress,
+                        )
+                        if progress is not None and state_store is not None:
+                            progress.record_attempt(cluster_done)
+                            state_store.put(progress)
             else:
                 logger.info(
                     "OpenShift cleanup disabled",
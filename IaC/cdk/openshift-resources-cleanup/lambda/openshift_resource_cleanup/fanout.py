@@ -0,0 +1,163 @@
+"""Fan-out of cleanup work to worker invocations.
+
+In fan-out mode the scheduled invocation only coordinates: it lists regions,
+dispatches one worker event per region (or per cluster for teardown) and
+aggregates the workers' results into the usual single report. Workers are the
+same Lambda function invoked with a ``worker`` event, so each gets its own
+timeout and memory instead of sharing one container.
+
+A dispatcher decides how a worker event is run. ``LambdaDispatcher`` invokes
+the function synchronously; ``InProcessDispatcher`` calls the worker entry
+point on local threads, for tests and local runs.
+
+Because the coordinator waits for its workers, it hands each worker its own
+deadline (``deadline``, a Unix timestamp) so the worker's time budget ends
+before the coordinator's does, and it stops dispatching once its budget is
+spent. At most ``FAN_OUT_MAX_CONCURRENCY`` workers run at once, the number of
+invokes the Lambda client sends without waiting for admission. Events that were never dispatched come back as ``{"deferred": True}``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from .models import CleanupAction
+from .models.config import FAN_OUT_CONCURRENCY, FAN_OUT_MAX_CONCURRENCY
+from .utils import TimeBudget, get_client, get_logger
+
+logger = get_logger()
+
+WORKER_REGION = "region"
+WORKER_CLUSTER = "cluster"
+
+
+def region_event(
+    region: str, execution_id: str | None = None, execute: bool = True
+) -> dict[str, Any]:
+    """Worker event that scans (and by default cleans up) one region."""
+    return {
+        "worker": WORKER_REGION,
+        "region": region,
+        "execute": execute,
+        "execution_id": execution_id,
+    }
+
+
+def cluster_event(
+    action: CleanupAction, execution_id: str | None = None
+) -> dict[str, Any]:
+    """Worker event that tears down the cluster targeted by one action."""
+    return {
+        "worker": WORKER_CLUSTER,
+        "region": action.region,
+        "action": action.to_dict(),
+        "execution_id": execution_id,
+    }
+
+
+class Dispatcher(ABC):
+    """Runs worker events with bounded concurrency."""
+
+    def __init__(self, max_workers: int = FAN_OUT_CONCURRENCY):
+        self.max_workers = max(1, min(max_workers, FAN_OUT_MAX_CONCURRENCY))
+
+    @abstractmethod
+    def invoke(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Run one worker event and return its result."""
+
+    def dispatch(
+        self,
+        events: list[dict[str, Any]],
+        budget: TimeBudget | None = None,
+        min_seconds: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """Run every event and return results in input order.
+
+        A worker that fails yields ``{"error": ...}`` instead of raising, so
+        one failed region or cluster cannot abort the others. With a budget,
+        each event carries the coordinator's deadline, and events whose turn
+        comes when less than ``min_seconds`` are left yield
+        ``{"deferred": True}`` without being invoked.
+        """
+        if not events:
+            return []
+
+        def run(event: dict[str, Any]) -> dict[str, Any]:
+            if budget is not None:
+                remaining = budget.remaining_seconds()
+                if remaining <= min_seconds:
+                    logger.warning(
+                        "Worker not dispatched, coordinator time budget spent",
+                        extra={
+                            "worker": event.get("worker"),
+                            "region": event.get("region"),
+                            "remaining_seconds": round(remaining, 1),
+                        },
+                    )
+                    return {"deferred": True}
+                # Stamped right before the invoke: the Lambda client admits
+                # FAN_OUT_MAX_CONCURRENCY invokes without waiting (see
+                # limiter.py) and does not retry throttled ones, so the worker
+                # starts with about the time checked above
+                event = {**event, "deadline": time.time() + remaining}
+            try:
+                return self.invoke(event)
+            except Exception as e:  # noqa: BLE001
+                logger.error(
+                    "Worker invocation failed",
+                    extra={
+                        "worker": event.get("worker"),
+                        "region": event.get("region"),
+                        "error": str(e),
+                    },
+                )
+                return {"error": str(e)}
+
+        workers = min(self.max_workers, len(events))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="fan-out"
+        ) as pool:
+            return list(pool.map(run, events))
+
+
+class LambdaDispatcher(Dispatcher):
+    """Invokes a Lambda function (normally this one) per worker event."""
+
+    def __init__(self, function_name: str, max_workers: int = FAN_OUT_CONCURRENCY):
+        super().__init__(max_workers)
+        self.function_name = function_name
+
+    def invoke(self, event: dict[str, Any]) -> dict[str, Any]:
+        response = get_client("lambda").invoke(
+            FunctionName=self.function_name,
+            InvocationType="RequestResponse",
+            Payload=json.dumps(event).encode(),
+        )
+        payload: dict[str, Any] = json.loads(response["Payload"].read() or b"{}")
+        if response.get("FunctionError"):
+            raise RuntimeError(payload.get("errorMessage", response["FunctionError"]))
+        return payload
+
+
+class InProcessDispatcher(Dispatcher):
+    """Runs worker events on local threads (tests and local runs)."""
+
+    def __init__(
+        self,
+        worker: Callable[[dict[str, Any]], dict[str, Any]],
+        max_workers: int = FAN_OUT_CONCURRENCY,
+    ):
+        super().__init__(max_workers)
+        self.worker = worker
+
+    def invoke(self, event: dict[str, Any]) -> dict[str, Any]:
+        # Round-trip through JSON like a real invocation would
+        result: dict[str, Any] = json.loads(
+            json.dumps(self.worker(json.loads(json.dumps(event))))
+        )
+        return result
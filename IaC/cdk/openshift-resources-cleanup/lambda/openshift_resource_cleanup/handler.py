@@ -1,31 +1,141 @@
 """Main Lambda handler for OpenShift cluster cleanup."""
 
 from __future__ import annotations
+
+import datetime
 import json
+import tempfile
 import time
-import datetime
-import boto3
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from aws_lambda_powertools import Tracer, Metrics
-from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit, single_metric
 from aws_lambda_powertools.utilities.typing import LambdaContext
-
-from .models import CleanupAction
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .ec2 import execute_cleanup_action, iter_candidate_instances
+from .fanout import (
+    WORKER_CLUSTER,
+    WORKER_REGION,
+    Dispatcher,
+    LambdaDispatcher,
+    cluster_event,
+    region_event,
+)
+from .models import ActionLedger, CleanupAction, ClusterProgress, InstanceFacts
 from .models.config import (
+    ACTIONS_BUCKET,
+    CLUSTER_TIME_ESTIMATE_SECONDS,
     DRY_RUN,
+    FAN_OUT_CONCURRENCY,
+    FAN_OUT_MODE,
+    LOG_LEVEL,
+    NOTIFICATION_DEDUP_HOURS,
+    NOTIFICATION_MODE,
+    OPENSHIFT_BASE_DOMAIN,
+    OPENSHIFT_CLEANUP_ENABLED,
+    REGION_CONCURRENCY,
+    RESPONSE_MAX_ACTIONS,
     SNS_TOPIC_ARN,
     TARGET_REGIONS,
-    OPENSHIFT_CLEANUP_ENABLED,
-    OPENSHIFT_BASE_DOMAIN,
-    LOG_LEVEL,
+    TEARDOWN_CONCURRENCY,
+    TIME_BUDGET_RESERVE_SECONDS,
+)
+from .models.instance_facts import DETECTED_NAME_PATTERN
+from .notifications import MODE_DIGEST, MODE_REGION, DigestNotifier, action_lines
+from .openshift.inventory import RegionInventory
+from .state import StateStore, get_state_store
+from .utils import (
+    DeadlineScheduler,
+    LazyTracer,
+    TimeBudget,
+    clear_time_budget,
+    current_time_budget,
+    get_api_limiter,
+    get_api_stats,
+    get_client,
+    get_logger,
+    reset_api_stats,
+    start_time_budget,
 )
-from .utils import convert_tags_to_dict, get_logger
-from .ec2 import execute_cleanup_action
+
+METRICS_NAMESPACE = "Percona/OpenShiftCleanup"
+SERVICE_NAME = "openshift-cleanup"
 
 logger = get_logger()
-tracer = Tracer(service="openshift-cleanup")
-metrics = Metrics(namespace="Percona/OpenShiftCleanup", service="openshift-cleanup")
+tracer = LazyTracer(service=SERVICE_NAME)
+metrics = Metrics(namespace=METRICS_NAMESPACE, service=SERVICE_NAME)
+
+
+def emit_region_metrics(region: str, values: dict[str, int]) -> None:
+    """Emit per-region count metrics with their own Region dimension.
+
+    The shared ``metrics`` object holds a single dimension set for the whole
+    invocation, so regions processed concurrently would overwrite each other's
+    Region dimension. Each value is flushed as a standalone EMF record instead.
+    """
+    for name, value in values.items():
+        with single_metric(
+            name=name,
+            unit=MetricUnit.Count,
+            value=value,
+            namespace=METRICS_NAMESPACE,
+            default_dimensions={"service": SERVICE_NAME},
+        ) as metric:
+            metric.add_dimension(name="Region", value=region)
+
+
+def publish_api_stats() -> dict[str, Any]:
+    """Emit this invocation's AWS API accounting and return it for logging.
+
+    Per region, ApiCalls/ApiThrottles/ApiRetries carry a Region dimension; per
+    operation across regions, ApiLatencyP50/ApiLatencyP99 carry an Operation
+    dimension. The full per-region, per-operation breakdown is attached to the
+    trace as metadata, together with the adaptive limiter's counters
+    (ApiLimiterWaitSeconds and ApiLimiterDecreases are emitted as totals).
+    """
+    stats = get_api_stats()
+    snapshot = stats.snapshot()
+
+    for region, totals in snapshot["regions"].items():
+        emit_region_metrics(
+            region,
+            {
+                "ApiCalls": totals["calls"],
+                "ApiThrottles": totals["throttles"],
+                "ApiRetries": totals["retries"],
+            },
+        )
+    for operation, latency in stats.latency_by_operation().items():
+        for name, percentile in (("ApiLatencyP50", "p50"), ("ApiLatencyP99", "p99")):
+            with single_metric(
+                name=name,
+                unit=MetricUnit.Milliseconds,
+                value=latency[percentile],
+                namespace=METRICS_NAMESPACE,
+                default_dimensions={"service": SERVICE_NAME},
+            ) as metric:
+                metric.add_dimension(name="Operation", value=operation)
+
+    limiter = get_api_limiter().snapshot()
+    snapshot["limiter"] = limiter
+    metrics.add_metric(
+        name="ApiLimiterWaitSeconds",
+        unit=MetricUnit.Seconds,
+        value=sum(entry["wait_seconds"] for entry in limiter.values()),
+    )
+    metrics.add_metric(
+        name="ApiLimiterDecreases",
+        unit=MetricUnit.Count,
+        value=sum(entry["decreases"] for entry in limiter.values()),
+    )
+
+    tracer.put_annotation(key="ApiCalls", value=snapshot["calls"])
+    tracer.put_annotation(key="ApiThrottles", value=snapshot["throttles"])
+    tracer.put_metadata(key="api_calls", value=snapshot)
+    return snapshot
 
 
 def send_notification(actions: list[CleanupAction], region: str) -> None:
@@ -34,7 +144,7 @@ def send_notification(actions: list[CleanupAction], region: str) -> None:
         return
 
     try:
-        sns = boto3.client("sns")
+        sns = get_client("sns")
 
         message_lines = [
             f"OpenShift Cluster Cleanup Report - {region}",
@@ -42,19 +152,16 @@ def send_notification(actions: list[CleanupAction], region: str) -> None:
             f"Timestamp: {datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}",
             "",
             f"Total Clusters: {len(actions)}",
-            "",
         ]
+        deferred_count = sum(1 for action in actions if action.deferred)
+        if deferred_count:
+            message_lines.append(
+                f"Deferred to next run (time budget exhausted): {deferred_count}"
+            )
+        message_lines.append("")
 
         for action in actions:
-            message_lines.append(f"Cluster: {action.cluster_name or 'Unknown'}")
-            message_lines.append(f"  Instance: {action.instance_id}")
-            message_lines.append(f"  Name: {action.name}")
-            message_lines.append(f"  Action: {action.action}")
-            message_lines.append(f"  Reason: {action.reason}")
-            message_lines.append(f"  Billing Tag: {action.billing_tag}")
-            if action.owner:
-                message_lines.append(f"  Owner: {action.owner}")
-            message_lines.append("")
+            message_lines.extend(action_lines(action))
 
         message = "\n".join(message_lines)
         subject = f"[{'DRY-RUN' if DRY_RUN else 'LIVE'}] OpenShift Cleanup: {len(actions)} clusters in {region}"
@@ -74,90 +181,173 @@ def send_notification(actions: list[CleanupAction], region: str) -> None:
         logger.error(f"Failed to send SNS notification: {e}")
 
 
-def check_cluster_ttl(tags_dict: dict[str, str]) -> tuple[bool, float]:
-    """Check if cluster TTL has expired.
+def send_digest(actions: Iterable[CleanupAction]) -> dict[str, Any]:
+    """Send one deduplicated SNS report for the whole run (digest mode).
+
+    ``actions`` is normally the run's ActionLedger, whose rows are rebuilt
+    one at a time while the digest is assembled.
+    """
+    if not SNS_TOPIC_ARN or not actions:
+        return {"reported": 0, "suppressed": 0, "messages": 0}
+    try:
+        notifier = DigestNotifier(
+            SNS_TOPIC_ARN,
+            get_state_store(),
+            window_hours=NOTIFICATION_DEDUP_HOURS,
+            dry_run=DRY_RUN,
+        )
+        return notifier.notify(actions)
+    except (BotoCoreError, ClientError, RuntimeError) as e:
+        logger.error(f"Failed to send SNS digest: {e}")
+        return {"error": str(e)}
+
+
+# Spool NDJSON in memory up to this size before spilling to /tmp
+LEDGER_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def store_action_ledger(ledger: ActionLedger, execution_id: str) -> str | None:
+    """Upload every action of the run as NDJSON to ACTIONS_BUCKET.
+
+    Returns:
+        The s3:// URI of the listing, or None if not stored
+    """
+    if not ACTIONS_BUCKET or not ledger:
+        return None
+    date = datetime.datetime.now(datetime.timezone.utc).strftime("%Y/%m/%d")
+    key = f"actions/{date}/{execution_id}.ndjson"
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=LEDGER_SPOOL_BYTES) as spool:
+            size = ledger.write_ndjson(spool)
+            spool.seek(0)
+            get_client("s3").upload_fileobj(
+                spool,
+                ACTIONS_BUCKET,
+                key,
+                ExtraArgs={"ContentType": "application/x-ndjson"},
+            )
+    except Exception as e:  # noqa: BLE001
+        # upload_fileobj wraps S3 errors in boto3's own exception types;
+        # a listing that cannot be stored must not fail the run
+        logger.error(f"Failed to store action ledger: {e}")
+        return None
+    logger.info(
+        "Stored action ledger",
+        extra={
+            "bucket": ACTIONS_BUCKET,
+            "key": key,
+            "actions": len(ledger),
+            "bytes": size,
+        },
+    )
+    return f"s3://{ACTIONS_BUCKET}/{key}"
+
+
+def evaluate_ttl(facts: InstanceFacts, now: float | None = None) -> tuple[bool, float]:
+    """Check if a classified instance's cluster TTL has expired.
 
     Args:
-        tags_dict: Dictionary of instance tags
+        facts: Classified instance
+        now: Current Unix time (default: time.time())
 
     Returns:
         Tuple of (should_delete, days_overdue):
         - (True, days_overdue) if TTL expired or no TTL tags (unmanaged)
         - (False, 0.0) if TTL not expired or malformed (fail-safe)
     """
-    creation_time_str = tags_dict.get("creation-time")
-    ttl_hours_str = tags_dict.get("delete-cluster-after-hours")
-
     # No TTL tags = unmanaged infrastructure, should delete
-    if not creation_time_str or not ttl_hours_str:
+    if not facts.has_ttl:
         logger.info(
             "Cluster has no TTL tags, marking for deletion (unmanaged infrastructure)",
-            extra={"tags": tags_dict},
+            extra={"instance_id": facts.instance_id, "instance_name": facts.name},
         )
         return (True, 0.0)
 
-    try:
-        # Parse creation time - try Unix timestamp first (real clusters use this)
-        # Then fall back to ISO format (for compatibility)
-        try:
-            # Try parsing as Unix timestamp (e.g., "1761053127")
-            creation_timestamp = float(creation_time_str)
-            creation_time = datetime.datetime.fromtimestamp(
-                creation_timestamp, tz=datetime.timezone.utc
-            )
-        except (ValueError, OSError):
-            # Fall back to ISO format parsing (e.g., "2025-01-15T05:00:00Z")
-            creation_time = datetime.datetime.fromisoformat(
-                creation_time_str.replace("Z", "+00:00")
-            )
-
-        # Parse TTL hours
-        ttl_hours = float(ttl_hours_str)
-
-        # Calculate expiry time
-        expiry_time = creation_time + datetime.timedelta(hours=ttl_hours)
-        current_time = datetime.datetime.now(datetime.timezone.utc)
-
-        # Calculate time difference
-        time_diff = current_time - expiry_time
-        days_overdue = time_diff.total_seconds() / (24 * 3600)
-
-        if days_overdue >= 0:
-            # TTL expired
-            logger.info(
-                "Cluster TTL expired",
-                extra={
-                    "creation_time": creation_time_str,
-                    "ttl_hours": ttl_hours,
-                    "days_overdue": round(days_overdue, 2),
-                },
-            )
-            return (True, days_overdue)
-        else:
-            # TTL not expired yet
-            hours_remaining = -days_overdue * 24
-            logger.info(
-                "Cluster TTL not expired, skipping deletion",
-                extra={
-                    "creation_time": creation_time_str,
-                    "ttl_hours": ttl_hours,
-                    "hours_remaining": round(hours_remaining, 2),
-                },
-            )
-            return (False, 0.0)
-
-    except (ValueError, TypeError) as e:
+    if facts.expires_at is None:
         # Malformed TTL tags - fail-safe: don't delete
         logger.warning(
-            f"Failed to parse TTL tags, skipping deletion (fail-safe): {e}",
+            f"Failed to parse TTL tags, skipping deletion (fail-safe): {facts.ttl_error}",
             extra={
-                "creation_time": creation_time_str,
-                "ttl_hours": ttl_hours_str,
-                "error": str(e),
+                "creation_time": facts.creation_time,
+                "ttl_hours": facts.ttl_hours,
+                "error": facts.ttl_error,
             },
         )
         return (False, 0.0)
 
+    current_time = time.time() if now is None else now
+    days_overdue = (current_time - facts.expires_at) / (24 * 3600)
+
+    if days_overdue >= 0:
+        # TTL expired
+        logger.info(
+            "Cluster TTL expired",
+            extra={
+                "creation_time": facts.creation_time,
+                "ttl_hours": facts.ttl_hours,
+                "days_overdue": round(days_overdue, 2),
+            },
+        )
+        return (True, days_overdue)
+
+    # TTL not expired yet
+    logger.info(
+        "Cluster TTL not expired, skipping deletion",
+        extra={
+            "creation_time": facts.creation_time,
+            "ttl_hours": facts.ttl_hours,
+            "hours_remaining": round(-days_overdue * 24, 2),
+        },
+    )
+    return (False, 0.0)
+
+
+def check_cluster_ttl(tags_dict: dict[str, str]) -> tuple[bool, float]:
+    """Check if cluster TTL has expired.
+
+    Args:
+        tags_dict: Dictionary of instance tags
+
+    Returns:
+        Same as evaluate_ttl()
+    """
+    facts = InstanceFacts.from_instance(
+        {
+            "InstanceId": "",
+            "Tags": [{"Key": key, "Value": value} for key, value in tags_dict.items()],
+        }
+    )
+    return evaluate_ttl(facts)
+
+
+def resolve_infra_id(facts: InstanceFacts, region: str) -> str | None:
+    """Return the OpenShift infra ID of a classified instance, if it has one.
+
+    Tag-based detections are already resolved by the classifier; only the
+    instance name fallback needs an API lookup to confirm the cluster.
+    """
+    infra_id = facts.infra_id
+    extra: dict[str, Any] = {"instance_id": facts.instance_id}
+
+    if (
+        infra_id is None
+        and facts.detection == DETECTED_NAME_PATTERN
+        and facts.name_cluster
+    ):
+        # Verify it's actually OpenShift by checking for infra ID
+        from .openshift.detection import detect_openshift_infra_id
+
+        infra_id = detect_openshift_infra_id(facts.name_cluster, region)
+        extra["cluster_name"] = facts.name_cluster
+
+    if infra_id:
+        extra["infra_id"] = infra_id
+        logger.info(
+            f"Detected OpenShift cluster via {facts.detection}",
+            extra={**extra, "detection": facts.detection},
+        )
+    return infra_id
+
 
 def is_openshift_instance(instance: dict, region: str) -> tuple[bool, str | None]:
     """Check if instance belongs to an OpenShift cluster (not EKS or other K8s).
@@ -171,71 +361,8 @@ def is_openshift_instance(instance: dict, region: str) -> tuple[bool, str | None
         - (True, infra_id) if this is an OpenShift instance
         - (False, None) if not OpenShift
     """
-    tags_dict = convert_tags_to_dict(instance.get("Tags", []))
-
-    # Check 1: Red Hat ROSA specific tag (most reliable)
-    if tags_dict.get("red-hat-clustertype") == "rosa":
-        # Extract infra ID from kubernetes.io/cluster tag
-        for tag in instance.get("Tags", []):
-            if tag["Key"].startswith("kubernetes.io/cluster/"):
-                infra_id = tag["Key"].split("/")[-1]
-                logger.info(
-                    "Detected OpenShift ROSA cluster via red-hat-clustertype tag",
-                    extra={"infra_id": infra_id, "instance_id": instance["InstanceId"]},
-                )
-                return (True, infra_id)
-
-    # Check 2: Red Hat managed tag
-    if tags_dict.get("red-hat-managed") == "true":
-        for tag in instance.get("Tags", []):
-            if tag["Key"].startswith("kubernetes.io/cluster/"):
-                infra_id = tag["Key"].split("/")[-1]
-                logger.info(
-                    "Detected OpenShift cluster via red-hat-managed tag",
-                    extra={"infra_id": infra_id, "instance_id": instance["InstanceId"]},
-                )
-                return (True, infra_id)
-
-    # Check 3: OpenShift Cluster API tag (not used by EKS)
-    for tag in instance.get("Tags", []):
-        if tag["Key"].startswith("sigs.k8s.io/cluster-api-provider-aws/cluster/"):
-            infra_id = tag["Key"].split("/")[-1]
-            logger.info(
-                "Detected OpenShift cluster via cluster-api tag",
-                extra={"infra_id": infra_id, "instance_id": instance["InstanceId"]},
-            )
-            return (True, infra_id)
-
-    # Check 4: Instance name pattern (fallback for older detection)
-    instance_name = tags_dict.get("Name", "")
-    if "-master-" in instance_name or "openshift" in instance_name.lower():
-        # Try to extract cluster name from instance name
-        # Format: clustername-xxxxx-master-0
-        parts = instance_name.split("-")
-        if len(parts) >= 3:
-            cluster_name = None
-            for i, part in enumerate(parts):
-                if part == "master" and i > 0:
-                    cluster_name = "-".join(parts[: i - 1])
-                    break
-
-            if cluster_name:
-                # Verify it's actually OpenShift by checking for infra ID
-                from .openshift.detection import detect_openshift_infra_id
-
-                infra_id = detect_openshift_infra_id(cluster_name, region)
-                if infra_id:
-                    logger.info(
-                        "Detected OpenShift cluster via instance name pattern",
-                        extra={
-                            "infra_id": infra_id,
-                            "cluster_name": cluster_name,
-                            "instance_id": instance["InstanceId"],
-                        },
-                    )
-                    return (True, infra_id)
-
-    return (False, None)
+    infra_id = resolve_infra_id(InstanceFacts.from_instance(instance), region)
+    return (True, infra_id) if infra_id else (False, None)
 
 
 def extract_cluster_name_from_infra_id(infra_id: str) -> str:
@@ -251,9 +378,24 @@ def extract_cluster_name_from_infra_id(infra_id: str) -> str:
     return infra_id
 
 
+def checkpoint_deferred(state_store: StateStore, actions: list[CleanupAction]) -> None:
+    """Record deferred clusters so the next run resumes them even if their
+    instances are gone by then."""
+    for action in actions:
+        infra_id = action.infra_id or action.cluster_name or ""
+        if state_store.get(action.region, infra_id) is None:
+            state_store.put(ClusterProgress.from_action(action))
+
+
 @tracer.capture_method
-def cleanup_region(region: str, execution_id: str | None = None) -> list[CleanupAction]:
-    """Process OpenShift cluster cleanup for a single region."""
+def cleanup_region(
+    region: str, execution_id: str | None = None, execute: bool = True
+) -> list[CleanupAction]:
+    """Process OpenShift cluster cleanup for a single region.
+
+    With ``execute=False`` the region is only scanned (including clusters to
+    resume) and the actions are returned for another worker to carry out.
+    """
     start_time = time.time()
     logger.info(
         "Processing region for OpenShift cleanup",
@@ -264,7 +406,7 @@ def cleanup_region(region: str, execution_id: str | None = None) -> list[Cleanup
         },
     )
 
-    ec2 = boto3.client("ec2", region_name=region)
+    ec2 = get_client("ec2", region_name=region)
     actions = []
 
     # Track instance scan statistics
@@ -272,56 +414,66 @@ def cleanup_region(region: str, execution_id: str | None = None) -> list[Cleanup
     openshift_clusters_found = 0
 
     try:
-        # Scan for running instances to detect OpenShift clusters
-        response = ec2.describe_instances(
-            Filters=[{"Name": "instance-state-name", "Values": ["running", "stopped"]}]
-        )
+        # Track clusters we've already processed (by infra_id), and the action
+        # of each expired one so its other instances are terminated too
+        processed_clusters: set[str] = set()
+        cluster_actions: dict[str, CleanupAction] = {}
+        scan_started = time.time()
+
+        # Stream candidate instances page by page to detect OpenShift clusters
+        for instance in iter_candidate_instances(ec2):
+            instance_scan_count += 1
+            facts = InstanceFacts.from_instance(instance)
+
+            # Cheap duplicate check before any detection lookups or logging
+            if facts.infra_id and facts.infra_id in processed_clusters:
+                if facts.infra_id in cluster_actions:
+                    cluster_actions[facts.infra_id].instance_ids.append(
+                        facts.instance_id
+                    )
+                continue
+
+            # Check if this is an OpenShift instance (not EKS or other K8s)
+            infra_id = resolve_infra_id(facts, region)
+
+            if infra_id:
+                # Avoid processing the same cluster multiple times
+                if infra_id in processed_clusters:
+                    if infra_id in cluster_actions:
+                        cluster_actions[infra_id].instance_ids.append(facts.instance_id)
+                    continue
+
+                processed_clusters.add(infra_id)
+                openshift_clusters_found += 1
 
-        # Track clusters we've already processed (by infra_id)
-        processed_clusters = set()
-
-        for reservation in response["Reservations"]:
-            for instance in reservation["Instances"]:
-                instance_scan_count += 1
-                tags_dict = convert_tags_to_dict(instance.get("Tags", []))
-                instance_name = tags_dict.get("Name", "")
-
-                # Check if this is an OpenShift instance (not EKS or other K8s)
-                is_openshift, infra_id = is_openshift_instance(instance, region)
-
-                if is_openshift and infra_id:
-                    # Avoid processing the same cluster multiple times
-                    if infra_id in processed_clusters:
-                        continue
-
-                    processed_clusters.add(infra_id)
-                    openshift_clusters_found += 1
-
-                    # Extract cluster name from infra ID
-                    cluster_name = extract_cluster_name_from_infra_id(infra_id)
-
-                    # Check TTL before marking for deletion
-                    should_delete, days_overdue = check_cluster_ttl(tags_dict)
-
-                    if should_delete:
-                        # Create cleanup action for this cluster
-                        reason = (
-                            f"OpenShift cluster TTL expired ({days_overdue:.2f} days overdue)"
-                            if days_overdue > 0
-                            else "OpenShift cluster has no TTL tags (unmanaged infrastructure)"
-                        )
-                        action = CleanupAction(
-                            instance_id=instance["InstanceId"],
-                            region=region,
-                            name=instance_name,
-                            action="TERMINATE_OPENSHIFT_CLUSTER",
-                            reason=reason,
-                            days_overdue=days_overdue,
-                            billing_tag=tags_dict.get("iit-billing-tag", ""),
-                            cluster_name=cluster_name,
-                            owner=tags_dict.get("owner", None),
-                        )
-                        actions.append(action)
+                # Extract cluster name from infra ID
+                cluster_name = extract_cluster_name_from_infra_id(infra_id)
+
+                # Check TTL before marking for deletion
+                should_delete, days_overdue = evaluate_ttl(facts, scan_started)
+
+                if should_delete:
+                    # Create cleanup action for this cluster
+                    reason = (
+                        f"OpenShift cluster TTL expired ({days_overdue:.2f} days overdue)"
+                        if days_overdue > 0
+                        else "OpenShift cluster has no TTL tags (unmanaged infrastructure)"
+                    )
+                    action = CleanupAction(
+                        instance_id=facts.instance_id,
+                        region=region,
+                        name=facts.name,
+                        action="TERMINATE_OPENSHIFT_CLUSTER",
+                        reason=reason,
+                        days_overdue=days_overdue,
+                        billing_tag=facts.billing_tag,
+                        cluster_name=cluster_name,
+                        owner=facts.owner,
+                        infra_id=infra_id,
+                        instance_ids=[facts.instance_id],
+                    )
+                    actions.append(action)
+                    cluster_actions[infra_id] = action
 
         # Log scan summary
         logger.info(
@@ -339,26 +491,52 @@ def cleanup_region(region: str, execution_id: str | None = None) -> list[Cleanup
         )
 
         # Emit metrics with region dimension
-        metrics.add_dimension(name="Region", value=region)
-        metrics.add_metric(
-            name="InstancesScanned", unit=MetricUnit.Count, value=instance_scan_count
-        )
-        metrics.add_metric(
-            name="OpenShiftClustersFound",
-            unit=MetricUnit.Count,
-            value=openshift_clusters_found,
-        )
-        metrics.add_metric(
-            name="CleanupActions", unit=MetricUnit.Count, value=len(actions)
+        emit_region_metrics(
+            region,
+            {
+                "InstancesScanned": instance_scan_count,
+                "OpenShiftClustersFound": openshift_clusters_found,
+                "CleanupActions": len(actions),
+            },
         )
 
-        # Execute cleanup actions
-        for action in actions:
-            execute_cleanup_action(action, region)
+        # Resume clusters a previous run left mid-teardown; their instances
+        # may already be terminated and so missing from the scan above
+        state_store = None if DRY_RUN else get_state_store()
+        resumed_clusters = 0
+        if state_store is not None:
+            scanned = {action.infra_id for action in actions}
+            for progress in state_store.pending(region):
+                if progress.infra_id not in scanned and progress.action:
+                    actions.append(progress.to_action())
+                    resumed_clusters += 1
+
+        # Execute cleanup actions against one shared region snapshot, so each
+        # describe API is called once per region rather than once per cluster.
+        # Most overdue clusters go first; whatever does not fit in the
+        # invocation's remaining time is checkpointed for the next run.
+        inventory = RegionInventory(region)
+        deferred: list[CleanupAction] = []
+        if execute:
+            scheduler: DeadlineScheduler[CleanupAction] = DeadlineScheduler(
+                current_time_budget(), estimate_seconds=CLUSTER_TIME_ESTIMATE_SECONDS
+            )
+            schedule = scheduler.run(
+                actions,
+                priority=lambda action: action.days_overdue,
+                work=lambda action: execute_cleanup_action(
+                    action, region, inventory=inventory, state_store=state_store
+                ),
+            )
+            deferred = schedule.deferred
+            for action in deferred:
+                action.deferred = True
+            if state_store is not None and deferred:
+                checkpoint_deferred(state_store, deferred)
 
-        # Send notification
-        if actions:
-            send_notification(actions, region)
+            # Digest mode reports every region at once from lambda_handler
+            if actions and NOTIFICATION_MODE == MODE_REGION:
+                send_notification(actions, region)
 
         # Region completion with timing
         duration = time.time() - start_time
@@ -378,7 +556,10 @@ def cleanup_region(region: str, execution_id: str | None = None) -> list[Cleanup
                     "instances_scanned": instance_scan_count,
                     "openshift_clusters_found": openshift_clusters_found,
                     "total_actions": len(actions),
+                    "resumed_clusters": resumed_clusters,
+                    "deferred_clusters": len(deferred),
                 },
+                "inventory_api_calls": dict(inventory.api_calls),
             },
         )
 
@@ -388,6 +569,169 @@ def cleanup_region(region: str, execution_id: str | None = None) -> list[Cleanup
     return actions
 
 
+def run_worker(event: dict[str, Any]) -> dict[str, Any]:
+    """Handle one fan-out worker event (see fanout.py)."""
+    worker = event.get("worker")
+    region = event["region"]
+    execution_id = event.get("execution_id")
+
+    if worker == WORKER_REGION:
+        actions = cleanup_region(
+            region, execution_id, execute=event.get("execute", True)
+        )
+        return {"region": region, "actions": [action.to_dict() for action in actions]}
+
+    if worker == WORKER_CLUSTER:
+        action = CleanupAction.from_dict(event["action"])
+        success = execute_cleanup_action(
+            action,
+            region,
+            inventory=RegionInventory(region),
+            state_store=None if DRY_RUN else get_state_store(),
+        )
+        return {"region": region, "infra_id": action.infra_id, "success": success}
+
+    raise ValueError(f"Unknown worker type: {worker}")
+
+
+def make_dispatcher(context: LambdaContext) -> Dispatcher:
+    """Dispatch workers to the same function version that is coordinating."""
+    return LambdaDispatcher(context.invoked_function_arn, FAN_OUT_CONCURRENCY)
+
+
+def cleanup_regions_fan_out(
+    regions: list[str],
+    dispatcher: Dispatcher,
+    execution_id: str | None = None,
+    mode: str = FAN_OUT_MODE,
+    budget: TimeBudget | None = None,
+) -> list[tuple[str, list[CleanupAction]]]:
+    """Run cleanup through worker invocations and aggregate their results.
+
+    ``region`` mode gives each region its own worker. ``cluster`` mode scans
+    regions in workers, then gives each cluster teardown its own worker, most
+    overdue first, and sends the per-region notifications from here (in
+    ``region`` notification mode).
+
+    Workers are waited for, so with a budget each one is given the
+    coordinator's deadline and no worker is started once the budget is
+    spent. Clusters not dispatched are reported deferred and checkpointed.
+
+    Returns:
+        List of (region, actions) tuples in input order, like cleanup_regions()
+    """
+    logger.info(
+        "Dispatching cleanup workers",
+        extra={
+            "execution_id": execution_id,
+            "fan_out_mode": mode,
+            "regions_count": len(regions),
+            "max_workers": dispatcher.max_workers,
+        },
+    )
+    scans = dispatcher.dispatch(
+        [region_event(r, execution_id, execute=mode != "cluster") for r in regions],
+        budget=budget,
+    )
+
+    results = []
+    for region, scan in zip(regions, scans):
+        if "error" in scan:
+            logger.error(f"Error processing region {region}: {scan['error']}")
+        if scan.get("deferred"):
+            logger.warning(f"Region {region} not processed before the deadline")
+        region_actions = [CleanupAction.from_dict(a) for a in scan.get("actions", [])]
+        results.append((region, region_actions))
+
+    if mode == "cluster":
+        pending = sorted(
+            (action for _, region_actions in results for action in region_actions),
+            key=lambda action: action.days_overdue,
+            reverse=True,
+        )
+        outcomes = dispatcher.dispatch(
+            [cluster_event(action, execution_id) for action in pending],
+            budget=budget,
+            min_seconds=CLUSTER_TIME_ESTIMATE_SECONDS,
+        )
+        deferred = []
+        for action, outcome in zip(pending, outcomes):
+            if outcome.get("deferred"):
+                action.deferred = True
+                deferred.append(action)
+        if deferred and not DRY_RUN:
+            checkpoint_deferred(get_state_store(), deferred)
+        failed = [
+            action.infra_id or action.cluster_name
+            for action, outcome in zip(pending, outcomes)
+            if not outcome.get("success") and not outcome.get("deferred")
+        ]
+        logger.info(
+            "Cluster workers finished",
+            extra={
+                "execution_id": execution_id,
+                "clusters_dispatched": len(pending) - len(deferred),
+                "clusters_deferred": len(deferred),
+                "clusters_failed": failed,
+            },
+        )
+        if NOTIFICATION_MODE == MODE_REGION:
+            for region, region_actions in results:
+                if region_actions:
+                    send_notification(region_actions, region)
+
+    return results
+
+
+def cleanup_regions(
+    regions: list[str],
+    execution_id: str | None = None,
+    max_workers: int | None = None,
+) -> list[tuple[str, list[CleanupAction]]]:
+    """Run cleanup_region for every region with bounded concurrency.
+
+    Regions are independent, so they are fanned out over a thread pool of at
+    most ``max_workers`` threads (default: REGION_CONCURRENCY). Results are
+    returned in the same order as ``regions`` regardless of completion order,
+    so callers merge actions deterministically.
+
+    Returns:
+        List of (region, actions) tuples in input order
+    """
+    if not regions:
+        return []
+
+    workers = max(1, min(max_workers or REGION_CONCURRENCY, len(regions)))
+    logger.info(
+        "Starting concurrent region scan",
+        extra={
+            "execution_id": execution_id,
+            "regions_count": len(regions),
+            "max_workers": workers,
+        },
+    )
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="region"
+    ) as executor:
+        futures = [
+            executor.submit(cleanup_region, region, execution_id) for region in regions
+        ]
+
+    results = []
+    for region, future in zip(regions, futures):
+        try:
+            region_actions = future.result()
+        except Exception as e:  # noqa: BLE001
+            # cleanup_region handles its own errors; this guards against
+            # anything escaping it so one region cannot abort the others
+            logger.error(f"Error processing region {region}: {e}")
+            region_actions = []
+        results.append((region, region_actions))
+
+    return results
+
+
 @logger.inject_lambda_context
 @tracer.capture_lambda_handler
 @metrics.log_metrics(capture_cold_start_metric=True)
@@ -395,6 +739,28 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
     """Main Lambda handler for OpenShift cleanup."""
     start_time = time.time()
     execution_id = context.aws_request_id
+    budget = start_time_budget(
+        context,
+        reserve_seconds=TIME_BUDGET_RESERVE_SECONDS,
+        deadline=(event or {}).get("deadline"),
+    )
+    reset_api_stats()
+    get_api_limiter().reset_counters()
+
+    if event and event.get("worker"):
+        try:
+            return run_worker(event)
+        finally:
+            logger.info(
+                "Fan-out worker complete",
+                extra={
+                    "execution_id": event.get("execution_id"),
+                    "worker": event.get("worker"),
+                    "region": event.get("region"),
+                    "api_calls": publish_api_stats(),
+                },
+            )
+            clear_time_budget()
 
     # Log configuration at startup
     logger.info(
@@ -411,14 +777,29 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
                     "openshift_cleanup_enabled": OPENSHIFT_CLEANUP_ENABLED,
                     "openshift_base_domain": OPENSHIFT_BASE_DOMAIN,
                 },
-                "notifications": {
-                    "sns_enabled": bool(SNS_TOPIC_ARN),
-                    "sns_topic": SNS_TOPIC_ARN if SNS_TOPIC_ARN else "disabled",
-                },
                 "regions": {
                     "target_regions": (
                         TARGET_REGIONS if TARGET_REGIONS != "all" else "all"
                     ),
+                    "region_concurrency": REGION_CONCURRENCY,
+                },
+                "notifications": {
+                    "sns_enabled": bool(SNS_TOPIC_ARN),
+                    "sns_topic": SNS_TOPIC_ARN if SNS_TOPIC_ARN else "disabled",
+                    "mode": NOTIFICATION_MODE,
+                    "dedup_hours": NOTIFICATION_DEDUP_HOURS,
+                },
+                "actions": {
+                    "bucket": ACTIONS_BUCKET or "disabled",
+                    "response_max_actions": RESPONSE_MAX_ACTIONS,
+                },
+                "fan_out": {
+                    "mode": FAN_OUT_MODE,
+                    "concurrency": FAN_OUT_CONCURRENCY,
+                },
+                "teardown": {
+                    "teardown_concurrency": TEARDOWN_CONCURRENCY,
+                    "time_budget_seconds": round(budget.remaining_seconds(), 1),
                 },
             },
             "event": event if event else {},
@@ -426,7 +807,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
     )
 
     try:
-        ec2 = boto3.client("ec2")
+        ec2 = get_client("ec2")
         all_regions = [
             region["RegionName"] for region in ec2.describe_regions()["Regions"]
         ]
@@ -455,23 +836,35 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
                 },
             )
 
-        all_actions = []
+        ledger = ActionLedger()
         regions_processed = []
         regions_with_actions = []
 
-        for region in regions:
-            region_actions = cleanup_region(region, execution_id)
-            all_actions.extend(region_actions)
+        if FAN_OUT_MODE in (WORKER_REGION, WORKER_CLUSTER):
+            region_results = cleanup_regions_fan_out(
+                regions, make_dispatcher(context), execution_id, budget=budget
+            )
+        else:
+            region_results = cleanup_regions(regions, execution_id)
+
+        for region, region_actions in region_results:
+            ledger.extend(region_actions)
             regions_processed.append(region)
             if region_actions:
                 regions_with_actions.append(region)
+        del region_results
 
-        # Calculate summary statistics
+        # Calculate summary statistics from the ledger columns
         total_duration = time.time() - start_time
-        action_counts: dict[str, int] = {}
+        total_actions = len(ledger)
+        action_counts = ledger.count_by("action")
+        deferred = ledger.deferred_indexes()
 
-        for action in all_actions:
-            action_counts[action.action] = action_counts.get(action.action, 0) + 1
+        notification: dict[str, Any] = {"mode": NOTIFICATION_MODE}
+        if NOTIFICATION_MODE == MODE_DIGEST:
+            notification.update(send_digest(ledger))
+
+        actions_uri = store_action_ledger(ledger, execution_id)
 
         summary = {
             "execution_id": execution_id,
@@ -483,7 +876,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
                     round(len(regions) / total_duration, 2) if total_duration > 0 else 0
                 ),
                 "actions_per_second": (
-                    round(len(all_actions) / total_duration, 2)
+                    round(total_actions / total_duration, 2)
                     if total_duration > 0
                     else 0
                 ),
@@ -495,16 +888,24 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
                 "regions_list": regions_with_actions,
             },
             "openshift": {
-                "total_clusters_found": len(all_actions),
+                "total_clusters_found": total_actions,
                 "clusters_by_region": action_counts,
+                "deferred_clusters": len(deferred),
+                "days_overdue": ledger.days_overdue_summary(),
             },
+            "actions_uri": actions_uri,
+            "notifications": notification,
+            "api_calls": publish_api_stats(),
         }
 
         logger.info("OpenShift Cleanup execution complete", extra=summary)
 
         # Emit summary metrics
         metrics.add_metric(
-            name="TotalActions", unit=MetricUnit.Count, value=len(all_actions)
+            name="TotalActions", unit=MetricUnit.Count, value=total_actions
+        )
+        metrics.add_metric(
+            name="DeferredActions", unit=MetricUnit.Count, value=len(deferred)
         )
         metrics.add_metric(
             name="RegionsProcessed", unit=MetricUnit.Count, value=len(regions)
@@ -513,14 +914,28 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             name="ExecutionDuration", unit=MetricUnit.Seconds, value=total_duration
         )
 
+        # The response lists at most RESPONSE_MAX_ACTIONS actions; the full
+        # listing is in actions_uri when ACTIONS_BUCKET is set
+        deferred_rows = [ledger.row(index) for index in deferred[:RESPONSE_MAX_ACTIONS]]
         return {
             "statusCode": 200,
             "body": json.dumps(
                 {
                     "dry_run": DRY_RUN,
-                    "total_actions": len(all_actions),
+                    "total_actions": total_actions,
                     "by_action": action_counts,
-                    "actions": [action.to_dict() for action in all_actions],
+                    "deferred": [
+                        {
+                            "region": action.region,
+                            "cluster_name": action.cluster_name,
+                            "infra_id": action.infra_id,
+                            "days_overdue": round(action.days_overdue, 2),
+                        }
+                        for action in deferred_rows
+                    ],
+                    "actions": ledger.head(RESPONSE_MAX_ACTIONS),
+                    "actions_truncated": total_actions > RESPONSE_MAX_ACTIONS,
+                    "actions_uri": actions_uri,
                 }
             ),
         }
@@ -528,3 +943,5 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
     except Exception as e:
         logger.error(f"Lambda execution failed: {e}")
         raise
+    finally:
+        clear_time_budget()
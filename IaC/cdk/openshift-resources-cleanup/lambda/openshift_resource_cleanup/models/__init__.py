@@ -1,6 +1,17 @@
 """Data models for EC2 cleanup Lambda."""
 
+from .action_ledger import ActionLedger
 from .cleanup_action import CleanupAction
+from .cluster_progress import PHASE_COMPLETE, PHASE_TEARING_DOWN, ClusterProgress
 from .config import Config
+from .instance_facts import InstanceFacts
 
-__all__ = ["CleanupAction", "Config"]
+__all__ = [
+    "PHASE_COMPLETE",
+    "PHASE_TEARING_DOWN",
+    "ActionLedger",
+    "CleanupAction",
+    "ClusterProgress",
+    "Config",
+    "InstanceFacts",
+]
@@ -0,0 +1,155 @@
+"""Columnar ledger of the cleanup actions of one run.
+
+A run over many regions can produce thousands of actions. The ledger stores
+them column-wise instead of as one dataclass per action: string fields are
+interned into a shared table and kept as ``array('I')`` indexes (region,
+action, reason and billing tag repeat across most rows), ``days_overdue`` is
+an ``array('d')``, ``deferred`` an ``array('b')`` and the per-cluster
+``instance_ids`` lists one flat index array with row offsets. Summary aggregates are
+computed from the columns without materializing rows; rows are rebuilt one at
+a time only when iterated or serialized.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from .cleanup_action import CleanupAction
+
+# String fields in CleanupAction order; index 0 of the table stands for None
+STRING_FIELDS = (
+    "instance_id",
+    "region",
+    "name",
+    "action",
+    "reason",
+    "billing_tag",
+    "cluster_name",
+    "owner",
+    "infra_id",
+)
+_NONE = 0
+
+
+class ActionLedger:
+    """Append-only, column-oriented store of CleanupActions."""
+
+    __slots__ = (
+        "_columns",
+        "_days_overdue",
+        "_deferred",
+        "_ids",
+        "_instance_ids",
+        "_instance_offsets",
+        "_strings",
+    )
+
+    def __init__(self, actions: Iterable[CleanupAction] = ()):
+        self._strings: list[str | None] = [None]
+        self._ids: dict[str, int] = {}
+        self._columns: dict[str, array] = {name: array("I") for name in STRING_FIELDS}
+        self._days_overdue = array("d")
+        self._deferred = array("b")
+        # Row i's instance IDs are _instance_ids[offsets[i]:offsets[i + 1]]
+        self._instance_ids = array("I")
+        self._instance_offsets = array("I", [0])
+        self.extend(actions)
+
+    def _intern(self, value: str | None) -> int:
+        if value is None:
+            return _NONE
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def append(self, action: CleanupAction) -> None:
+        for name, column in self._columns.items():
+            column.append(self._intern(getattr(action, name)))
+        self._days_overdue.append(action.days_overdue)
+        self._deferred.append(1 if action.deferred else 0)
+        self._instance_ids.extend(self._intern(i) for i in action.instance_ids)
+        self._instance_offsets.append(len(self._instance_ids))
+
+    def extend(self, actions: Iterable[CleanupAction]) -> None:
+        for action in actions:
+            self.append(action)
+
+    def __len__(self) -> int:
+        return len(self._days_overdue)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def row(self, index: int) -> CleanupAction:
+        """Rebuild the action stored at ``index``."""
+        strings = self._strings
+        values = {name: strings[col[index]] for name, col in self._columns.items()}
+        start, end = self._instance_offsets[index], self._instance_offsets[index + 1]
+        return CleanupAction(
+            days_overdue=self._days_overdue[index],
+            deferred=bool(self._deferred[index]),
+            instance_ids=[str(strings[i]) for i in self._instance_ids[start:end]],
+            **values,
+        )
+
+    def __iter__(self) -> Iterator[CleanupAction]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    # Aggregates, computed from the columns
+
+    def count_by(self, name: str) -> dict[str, int]:
+        """Number of actions per value of a string field, in first-seen order."""
+        counts = Counter(self._columns[name])
+        return {
+            str(self._strings[index]): count
+            for index, count in counts.items()
+            if index != _NONE
+        }
+
+    def distinct(self, name: str) -> list[str]:
+        """Distinct values of a string field, in first-seen order."""
+        return list(self.count_by(name))
+
+    def deferred_count(self) -> int:
+        return sum(self._deferred)
+
+    def deferred_indexes(self) -> list[int]:
+        return [index for index, flag in enumerate(self._deferred) if flag]
+
+    def days_overdue_summary(self) -> dict[str, float]:
+        if not self._days_overdue:
+            return {"max": 0.0, "mean": 0.0}
+        return {
+            "max": round(max(self._days_overdue), 2),
+            "mean": round(sum(self._days_overdue) / len(self._days_overdue), 2),
+        }
+
+    # Serialization
+
+    def to_dict(self, index: int) -> dict[str, Any]:
+        """Serialized form of one row, identical to ``CleanupAction.to_dict``."""
+        return self.row(index).to_dict()
+
+    def head(self, limit: int) -> list[dict[str, Any]]:
+        """Serialized form of at most ``limit`` rows, in insertion order."""
+        return [self.to_dict(index) for index in range(min(limit, len(self)))]
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        """Yield one JSON line per action."""
+        for index in range(len(self)):
+            yield (json.dumps(self.to_dict(index)) + "\n").encode()
+
+    def write_ndjson(self, stream: IO[bytes]) -> int:
+        """Write every action as NDJSON; return the number of bytes written."""
+        written = 0
+        for line in self.iter_ndjson():
+            stream.write(line)
+            written += len(line)
+        return written
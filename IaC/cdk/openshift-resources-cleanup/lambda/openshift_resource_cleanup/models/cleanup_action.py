@@ -1,11 +1,12 @@
 """CleanupAction data class."""
 
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+
+from dataclasses import asdict, dataclass, field, fields
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class CleanupAction:
     """Represents an OpenShift cluster cleanup action."""
 
@@ -18,6 +19,16 @@ class CleanupAction:
     billing_tag: str = ""
     cluster_name: str | None = None
     owner: str | None = None
+    infra_id: str | None = None
+    deferred: bool = False  # Not started before the invocation deadline
+    # Every scanned instance of the cluster; instance_id is the first of them
+    instance_ids: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CleanupAction:
+        """Build from a serialized action, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
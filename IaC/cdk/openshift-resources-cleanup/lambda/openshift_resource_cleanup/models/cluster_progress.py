@@ -0,0 +1,70 @@
+"""ClusterProgress data class."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any
+
+from .cleanup_action import CleanupAction
+
+PHASE_TEARING_DOWN = "tearing_down"
+PHASE_COMPLETE = "complete"
+
+
+@dataclass
+class ClusterProgress:
+    """Teardown progress of one OpenShift cluster, kept across scheduled runs.
+
+    Once a cluster's instances are terminated it no longer shows up in the
+    instance scan, so the stored action is what lets the next run resume the
+    remaining teardown nodes.
+    """
+
+    region: str
+    infra_id: str
+    cluster_name: str
+    phase: str = PHASE_TEARING_DOWN
+    completed_nodes: list[str] = field(default_factory=list)
+    remaining_nodes: list[str] = field(default_factory=list)
+    attempts: int = 0
+    last_attempt_at: float | None = None  # Unix timestamp
+    action: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_action(cls, action: CleanupAction) -> ClusterProgress:
+        """Start tracking the cluster targeted by a cleanup action."""
+        return cls(
+            region=action.region,
+            infra_id=action.infra_id or action.cluster_name or "",
+            cluster_name=action.cluster_name or "",
+            action=action.to_dict(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ClusterProgress:
+        """Build from a stored record, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @property
+    def is_complete(self) -> bool:
+        return self.phase == PHASE_COMPLETE
+
+    def to_action(self) -> CleanupAction:
+        """Rebuild the cleanup action that started this teardown."""
+        action = CleanupAction.from_dict(self.action)
+        action.deferred = False
+        return action
+
+    def record_attempt(self, complete: bool) -> None:
+        """Record the outcome of one teardown attempt."""
+        self.attempts += 1
+        self.last_attempt_at = time.time()
+        if complete:
+            self.phase = PHASE_COMPLETE
+            self.remaining_nodes = []
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
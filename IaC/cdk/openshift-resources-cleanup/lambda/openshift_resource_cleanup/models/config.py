@@ -15,6 +15,60 @@ OPENSHIFT_BASE_DOMAIN = os.environ.get("OPENSHIFT_BASE_DOMAIN", "cd.percona.com"
 # Region filtering
 TARGET_REGIONS = os.environ.get("TARGET_REGIONS", "all")
 
+# Maximum number of regions processed concurrently
+REGION_CONCURRENCY = max(1, int(os.environ.get("REGION_CONCURRENCY", "8")))
+
+# Parallel workers used to tear down one OpenShift cluster's resource graph
+TEARDOWN_CONCURRENCY = max(1, int(os.environ.get("TEARDOWN_CONCURRENCY", "4")))
+
+# Longest time one cluster's teardown graph may spend retrying blocked nodes;
+# whatever is still blocked then is resumed by the next scheduled run
+TEARDOWN_RETRY_SECONDS = int(os.environ.get("TEARDOWN_RETRY_SECONDS", "120"))
+
+# Seconds of invocation time kept free for reporting after teardown retries
+TIME_BUDGET_RESERVE_SECONDS = int(os.environ.get("TIME_BUDGET_RESERVE_SECONDS", "60"))
+
+# Minimum time assumed for one cluster teardown when deciding whether to start it
+CLUSTER_TIME_ESTIMATE_SECONDS = int(
+    os.environ.get("CLUSTER_TIME_ESTIMATE_SECONDS", "90")
+)
+
+# Fan-out: "off" runs everything in one invocation; "region" invokes one worker
+# per region; "cluster" scans regions in workers, then tears down each cluster
+# in its own worker invocation
+FAN_OUT_MODE = os.environ.get("FAN_OUT_MODE", "off").lower()
+
+# Maximum worker invocations in flight at once. FAN_OUT_MAX_CONCURRENCY is
+# what the Lambda client can run without waiting (connection pool and rate
+# limiter are sized for it) and matches the FanOutConcurrency stack maximum
+FAN_OUT_MAX_CONCURRENCY = 64
+FAN_OUT_CONCURRENCY = min(
+    FAN_OUT_MAX_CONCURRENCY,
+    max(1, int(os.environ.get("FAN_OUT_CONCURRENCY", "8"))),
+)
+
+# SNS reporting: "digest" sends one message per run for all regions and skips
+# clusters already reported within NOTIFICATION_DEDUP_HOURS; "region" sends
+# one message per region per run
+NOTIFICATION_MODE = os.environ.get("NOTIFICATION_MODE", "region").lower()
+NOTIFICATION_DEDUP_HOURS = float(os.environ.get("NOTIFICATION_DEDUP_HOURS", "24"))
+
+# Upper bound on AWS API calls in flight per (service, region); the adaptive
+# limiter shrinks it while AWS throttles and grows it back on success
+API_MAX_CONCURRENCY = max(1, int(os.environ.get("API_MAX_CONCURRENCY", "16")))
+
+# Full per-run action listings are written as NDJSON to ACTIONS_BUCKET (when
+# set); the Lambda response lists at most RESPONSE_MAX_ACTIONS of them
+ACTIONS_BUCKET = os.environ.get("ACTIONS_BUCKET", "")
+RESPONSE_MAX_ACTIONS = max(0, int(os.environ.get("RESPONSE_MAX_ACTIONS", "100")))
+
+# Cross-run cleanup state: "dynamodb" (production), "sqlite" or "memory"
+STATE_BACKEND = os.environ.get("STATE_BACKEND", "memory").lower()
+STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME", "")
+STATE_SQLITE_PATH = os.environ.get(
+    "STATE_SQLITE_PATH", "/tmp/openshift-cleanup-state.db"
+)
+
 # Logging configuration
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 
@@ -28,4 +82,18 @@ class Config:
         self.openshift_cleanup_enabled = OPENSHIFT_CLEANUP_ENABLED
         self.openshift_base_domain = OPENSHIFT_BASE_DOMAIN
         self.target_regions = TARGET_REGIONS
+        self.region_concurrency = REGION_CONCURRENCY
+        self.teardown_concurrency = TEARDOWN_CONCURRENCY
+        self.teardown_retry_seconds = TEARDOWN_RETRY_SECONDS
+        self.time_budget_reserve_seconds = TIME_BUDGET_RESERVE_SECONDS
+        self.cluster_time_estimate_seconds = CLUSTER_TIME_ESTIMATE_SECONDS
+        self.fan_out_mode = FAN_OUT_MODE
+        self.fan_out_concurrency = FAN_OUT_CONCURRENCY
+        self.notification_mode = NOTIFICATION_MODE
+        self.notification_dedup_hours = NOTIFICATION_DEDUP_HOURS
+        self.api_max_concurrency = API_MAX_CONCURRENCY
+        self.actions_bucket = ACTIONS_BUCKET
+        self.response_max_actions = RESPONSE_MAX_ACTIONS
+        self.state_backend = STATE_BACKEND
+        self.state_table_name = STATE_TABLE_NAME
         self.log_level = LOG_LEVEL
@@ -0,0 +1,180 @@
+"""InstanceFacts record built from a single pass over an instance's tags."""
+
+from __future__ import annotations
+
+import datetime
+import functools
+from typing import Any
+
+# Detection methods, in order of precedence
+DETECTED_ROSA = "red-hat-clustertype"
+DETECTED_RED_HAT_MANAGED = "red-hat-managed"
+DETECTED_CLUSTER_API = "cluster-api"
+DETECTED_NAME_PATTERN = "name-pattern"
+
+KUBERNETES_CLUSTER_PREFIX = "kubernetes.io/cluster/"
+CLUSTER_API_PREFIX = "sigs.k8s.io/cluster-api-provider-aws/cluster/"
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_ttl_expiry(creation_time: str, ttl_hours: str) -> float:
+    """Return the Unix timestamp at which a cluster's TTL expires.
+
+    Every instance of a cluster carries the same tag values, so results are
+    cached and each cluster's tags are parsed once per process.
+
+    Raises:
+        ValueError: If either tag is malformed
+    """
+    try:
+        # Real clusters use a Unix timestamp (e.g. "1761053127")
+        created = float(creation_time)
+    except ValueError:
+        # ISO format for compatibility (e.g. "2025-01-15T05:00:00Z")
+        parsed = datetime.datetime.fromisoformat(creation_time.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            raise ValueError(f"creation-time has no timezone: {creation_time!r}")
+        created = parsed.timestamp()
+    return created + float(ttl_hours) * 3600
+
+
+def cluster_name_from_instance_name(instance_name: str) -> str | None:
+    """Guess the cluster name from an installer-style instance name.
+
+    Example: jvp-rosa1-qmdkk-master-0 -> jvp-rosa1
+    """
+    if "-master-" not in instance_name and "openshift" not in instance_name.lower():
+        return None
+    parts = instance_name.split("-")
+    if len(parts) < 3:
+        return None
+    for i, part in enumerate(parts):
+        if part == "master" and i > 0:
+            return "-".join(parts[: i - 1]) or None
+    return None
+
+
+class InstanceFacts:
+    """Cleanup-relevant facts about one EC2 instance.
+
+    Scans touch every instance in every region, so this is a plain
+    ``__slots__`` class rather than a dataclass and is filled by walking the
+    tag list exactly once.
+
+    ``detection`` is the tag that identified the cluster, or
+    ``DETECTED_NAME_PATTERN`` when only the instance name suggests OpenShift
+    and ``infra_id`` still has to be looked up. ``expires_at`` is None when
+    the TTL tags are missing or malformed; ``ttl_error`` tells the two apart.
+    """
+
+    __slots__ = (
+        "billing_tag",
+        "creation_time",
+        "detection",
+        "expires_at",
+        "infra_id",
+        "instance_id",
+        "name",
+        "name_cluster",
+        "owner",
+        "ttl_error",
+        "ttl_hours",
+    )
+
+    def __init__(
+        self,
+        instance_id: str,
+        name: str = "",
+        infra_id: str | None = None,
+        detection: str | None = None,
+        name_cluster: str | None = None,
+        creation_time: str | None = None,
+        ttl_hours: str | None = None,
+        expires_at: float | None = None,
+        ttl_error: str | None = None,
+        billing_tag: str = "",
+        owner: str | None = None,
+    ):
+        self.instance_id = instance_id
+        self.name = name
+        self.infra_id = infra_id
+        self.detection = detection
+        self.name_cluster = name_cluster
+        self.creation_time = creation_time
+        self.ttl_hours = ttl_hours
+        self.expires_at = expires_at
+        self.ttl_error = ttl_error
+        self.billing_tag = billing_tag
+        self.owner = owner
+
+    def __repr__(self) -> str:
+        return (
+            f"InstanceFacts(instance_id={self.instance_id!r}, "
+            f"infra_id={self.infra_id!r}, detection={self.detection!r})"
+        )
+
+    @property
+    def has_ttl(self) -> bool:
+        """Whether both TTL tags are present."""
+        return bool(self.creation_time and self.ttl_hours)
+
+    @classmethod
+    def from_instance(cls, instance: dict[str, Any]) -> InstanceFacts:
+        """Classify an EC2 instance with a single pass over its tags."""
+        name = ""
+        billing_tag = ""
+        owner = creation_time = ttl_hours = None
+        kubernetes_id = cluster_api_id = None
+        rosa = managed = False
+
+        for tag in instance.get("Tags", []):
+            key = tag["Key"]
+            value = tag["Value"]
+            if key == "Name":
+                name = value
+            elif key == "creation-time":
+                creation_time = value
+            elif key == "delete-cluster-after-hours":
+                ttl_hours = value
+            elif key == "iit-billing-tag":
+                billing_tag = value
+            elif key == "owner":
+                owner = value
+            elif key == "red-hat-clustertype":
+                rosa = value == "rosa"
+            elif key == "red-hat-managed":
+                managed = value == "true"
+            elif key.startswith(KUBERNETES_CLUSTER_PREFIX):
+                if kubernetes_id is None:
+                    kubernetes_id = key.split("/")[-1]
+            elif key.startswith(CLUSTER_API_PREFIX):
+                if cluster_api_id is None:
+                    cluster_api_id = key.split("/")[-1]
+
+        facts = cls(
+            instance_id=instance["InstanceId"],
+            name=name,
+            creation_time=creation_time,
+            ttl_hours=ttl_hours,
+            billing_tag=billing_tag,
+            owner=owner,
+        )
+
+        if kubernetes_id and rosa:
+            facts.infra_id, facts.detection = kubernetes_id, DETECTED_ROSA
+        elif kubernetes_id and managed:
+            facts.infra_id, facts.detection = kubernetes_id, DETECTED_RED_HAT_MANAGED
+        elif cluster_api_id:
+            facts.infra_id, facts.detection = cluster_api_id, DETECTED_CLUSTER_API
+        else:
+            facts.name_cluster = cluster_name_from_instance_name(name)
+            if facts.name_cluster:
+                facts.detection = DETECTED_NAME_PATTERN
+
+        if creation_time and ttl_hours:
+            try:
+                facts.expires_at = parse_ttl_expiry(creation_time, ttl_hours)
+            except (ValueError, TypeError, OverflowError) as e:
+                facts.ttl_error = str(e)
+
+        return facts
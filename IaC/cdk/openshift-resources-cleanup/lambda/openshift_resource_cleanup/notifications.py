@@ -0,0 +1,227 @@
+"""Digest reporting of cleanup actions over SNS.
+
+On a short schedule the same clusters show up run after run while their
+teardown is still in progress (or deferred), and per-region reports turn into
+a stream of near-identical messages. The digest notifier instead sends one
+report per run covering every region, and leaves out clusters already reported
+within the deduplication window. Sent reports are remembered as fingerprints
+in the cleanup state store, so the window holds across invocations.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from .models import CleanupAction
+from .models.config import DRY_RUN, NOTIFICATION_DEDUP_HOURS
+from .state import StateStore
+from .utils import get_client, get_logger
+
+logger = get_logger()
+
+MODE_DIGEST = "digest"
+MODE_REGION = "region"
+
+# SNS caps one message, and one whole PublishBatch request, at 256 KiB;
+# leave room for the subject and request overhead
+MAX_MESSAGE_BYTES = 240 * 1024
+
+# PublishBatch accepts at most 10 entries
+PUBLISH_BATCH_SIZE = 10
+
+
+def action_lines(action: CleanupAction) -> list[str]:
+    """Report lines describing one cleanup action."""
+    lines = [
+        f"Cluster: {action.cluster_name or 'Unknown'}",
+        f"  Instance: {action.instance_id}",
+        f"  Name: {action.name}",
+        f"  Action: {action.action}",
+        f"  Reason: {action.reason}",
+        f"  Billing Tag: {action.billing_tag}",
+    ]
+    if action.owner:
+        lines.append(f"  Owner: {action.owner}")
+    if action.deferred:
+        lines.append("  Status: DEFERRED")
+    lines.append("")
+    return lines
+
+
+def notification_fingerprint(action: CleanupAction, dry_run: bool) -> str:
+    """Identify a report about one cluster and action.
+
+    The mode is part of the fingerprint, so switching from dry run to live
+    reports every cluster again.
+    """
+    target = action.infra_id or action.cluster_name or action.instance_id
+    key = "|".join(
+        ["DRY-RUN" if dry_run else "LIVE", action.region, target, action.action]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+class DigestNotifier:
+    """Publishes one deduplicated report per run."""
+
+    def __init__(
+        self,
+        topic_arn: str,
+        store: StateStore | None,
+        window_hours: float = NOTIFICATION_DEDUP_HOURS,
+        dry_run: bool = DRY_RUN,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.topic_arn = topic_arn
+        self.store = store
+        self.window_seconds = max(0.0, window_hours * 3600)
+        self.dry_run = dry_run
+        self._clock = clock
+
+    @property
+    def mode(self) -> str:
+        return "DRY-RUN" if self.dry_run else "LIVE"
+
+    def notify(self, actions: Iterable[CleanupAction]) -> dict[str, int]:
+        """Report the actions not already reported within the window.
+
+        Fingerprints are only recorded once every message was accepted, so a
+        failed publish is retried by the next run.
+
+        Returns:
+            Counts of reported and suppressed clusters and messages sent
+        """
+        result = {"reported": 0, "suppressed": 0, "messages": 0}
+        if not self.topic_arn or not actions:
+            return result
+
+        now = self._clock()
+        recent: set[str] = set()
+        if self.store is not None and self.window_seconds:
+            recent = self.store.recent_notifications(now - self.window_seconds)
+
+        fresh: dict[str, CleanupAction] = {}
+        suppressed = 0
+        for action in actions:
+            fingerprint = notification_fingerprint(action, self.dry_run)
+            if fingerprint in recent:
+                suppressed += 1
+            elif fingerprint not in fresh:
+                fresh[fingerprint] = action
+        result["suppressed"] = suppressed
+
+        if not fresh:
+            logger.info(
+                "All clusters already reported, skipping SNS digest",
+                extra={"suppressed": suppressed},
+            )
+            return result
+
+        messages = self.build_messages(list(fresh.values()), suppressed, now)
+        self.publish(messages)
+        if self.store is not None and self.window_seconds:
+            self.store.record_notifications(list(fresh), now, self.window_seconds)
+
+        result["reported"] = len(fresh)
+        result["messages"] = len(messages)
+        logger.info("Sent SNS digest", extra=result)
+        return result
+
+    def build_messages(
+        self, actions: list[CleanupAction], suppressed: int, now: float
+    ) -> list[dict[str, str]]:
+        """Render the digest, split into parts that fit one SNS message each."""
+        by_region: dict[str, list[CleanupAction]] = {}
+        for action in actions:
+            by_region.setdefault(action.region, []).append(action)
+
+        timestamp = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+        header = [
+            "OpenShift Cluster Cleanup Digest",
+            f"Mode: {self.mode}",
+            f"Timestamp: {timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+            "",
+            f"Total Clusters: {len(actions)} in {len(by_region)} regions",
+        ]
+        deferred_count = sum(1 for action in actions if action.deferred)
+        if deferred_count:
+            header.append(
+                f"Deferred to next run (time budget exhausted): {deferred_count}"
+            )
+        if suppressed:
+            hours = self.window_seconds / 3600
+            header.append(
+                f"Already reported in the last {hours:g}h (omitted): {suppressed}"
+            )
+        header.append("")
+
+        # Pack region sections into parts; a section too large for one part
+        # is split between clusters
+        header_bytes = len("\n".join(header).encode()) + 64
+        parts: list[list[str]] = [[]]
+        size = 0
+        for region in sorted(by_region):
+            blocks = [[f"== {region} ({len(by_region[region])}) ==", ""]]
+            blocks += [action_lines(action) for action in by_region[region]]
+            for block in blocks:
+                block_bytes = len("\n".join(block).encode()) + 1
+                if parts[-1] and size + block_bytes + header_bytes > MAX_MESSAGE_BYTES:
+                    parts.append([])
+                    size = 0
+                parts[-1].extend(block)
+                size += block_bytes
+
+        subject = (
+            f"[{self.mode}] OpenShift Cleanup: {len(actions)} clusters "
+            f"in {len(by_region)} regions"
+        )
+        messages = []
+        for number, body in enumerate(parts, start=1):
+            part_header = list(header)
+            part_subject = subject
+            if len(parts) > 1:
+                part_header[0] += f" (part {number}/{len(parts)})"
+                part_subject += f" ({number}/{len(parts)})"
+            messages.append(
+                {
+                    "Subject": part_subject[:100],
+                    "Message": "\n".join(part_header + body),
+                }
+            )
+        return messages
+
+    def publish(self, messages: list[dict[str, str]]) -> None:
+        """Publish messages with as few PublishBatch calls as the limits allow."""
+        sns = get_client("sns")
+        batch: list[dict[str, str]] = []
+        batch_bytes = 0
+        for index, message in enumerate(messages):
+            entry = {"Id": str(index), **message}
+            entry_bytes = len(message["Message"].encode()) + len(
+                message["Subject"].encode()
+            )
+            if batch and (
+                len(batch) == PUBLISH_BATCH_SIZE
+                or batch_bytes + entry_bytes > MAX_MESSAGE_BYTES
+            ):
+                self._publish_batch(sns, batch)
+                batch, batch_bytes = [], 0
+            batch.append(entry)
+            batch_bytes += entry_bytes
+        if batch:
+            self._publish_batch(sns, batch)
+
+    def _publish_batch(self, sns: Any, entries: list[dict[str, str]]) -> None:
+        response = sns.publish_batch(
+            TopicArn=self.topic_arn, PublishBatchRequestEntries=entries
+        )
+        failed = response.get("Failed", [])
+        if failed:
+            raise RuntimeError(
+                f"SNS rejected {len(failed)} digest message(s): "
+                f"{failed[0].get('Code')}: {failed[0].get('Message')}"
+            )
@@ -1,35 +1,46 @@
-"""OpenShift cluster comprehensive cleanup."""
+"""OpenShift cluster comprehensive cleanup.
 
-from .detection import detect_openshift_infra_id
-from .compute import delete_load_balancers
-from .network import (
-    delete_nat_gateways,
-    release_elastic_ips,
-    cleanup_network_interfaces,
-    delete_vpc_endpoints,
-    delete_security_groups,
-    delete_subnets,
-    delete_route_tables,
-    delete_internet_gateway,
-    delete_vpc,
-)
-from .dns import cleanup_route53_records
-from .storage import cleanup_s3_state
-from .orchestrator import destroy_openshift_cluster
+Submodules are imported on first attribute access (PEP 562), so scanning a
+region loads only the inventory and detection code; the teardown graph and
+resource deleters load when a cluster is actually torn down.
+"""
 
-__all__ = [
-    "detect_openshift_infra_id",
-    "delete_load_balancers",
-    "delete_nat_gateways",
-    "release_elastic_ips",
-    "cleanup_network_interfaces",
-    "delete_vpc_endpoints",
-    "delete_security_groups",
-    "delete_subnets",
-    "delete_route_tables",
-    "delete_internet_gateway",
-    "delete_vpc",
-    "cleanup_route53_records",
-    "cleanup_s3_state",
-    "destroy_openshift_cluster",
-]
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "RegionInventory": "inventory",
+    "detect_openshift_infra_id": "detection",
+    "delete_load_balancers": "compute",
+    "delete_nat_gateways": "network",
+    "release_elastic_ips": "network",
+    "cleanup_network_interfaces": "network",
+    "delete_vpc_endpoints": "network",
+    "delete_security_groups": "network",
+    "delete_subnets": "network",
+    "delete_route_tables": "network",
+    "delete_internet_gateway": "network",
+    "delete_vpc": "network",
+    "cleanup_route53_records": "dns",
+    "cleanup_s3_state": "storage",
+    "TeardownExecutor": "teardown",
+    "TeardownNode": "teardown",
+    "TeardownReport": "teardown",
+    "TeardownPlan": "planner",
+    "plan_cluster_teardown": "planner",
+    "build_teardown_graph": "orchestrator",
+    "destroy_openshift_cluster": "orchestrator",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,29 +1,52 @@
 """OpenShift compute resources (EC2, Load Balancers)."""
 
-import boto3
+from __future__ import annotations
+
 from ..models.config import DRY_RUN
-from ..utils import get_logger
+from ..utils import get_client, get_logger
+from .inventory import RegionInventory
 
 logger = get_logger()
 
 
-def delete_load_balancers(infra_id: str, region: str):
-    """Delete Classic ELBs and ALB/NLBs for OpenShift cluster."""
+def delete_load_balancers(
+    infra_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
+    """Delete Classic ELBs and ALB/NLBs for OpenShift cluster.
+
+    With an inventory, the region's load balancer lists are read from the
+    snapshot instead of being listed again for every cluster.
+
+    Returns:
+        True if every matching load balancer was deleted
+    """
     try:
-        elb = boto3.client("elb", region_name=region)
-        elbv2 = boto3.client("elbv2", region_name=region)
-        ec2 = boto3.client("ec2", region_name=region)
+        elb = get_client("elb", region_name=region)
+        elbv2 = get_client("elbv2", region_name=region)
+        ec2 = get_client("ec2", region_name=region)
 
         # Get VPC ID for cluster
-        vpcs = ec2.describe_vpcs(
-            Filters=[
-                {"Name": "tag:kubernetes.io/cluster/" + infra_id, "Values": ["owned"]}
-            ]
-        )["Vpcs"]
-        vpc_id = vpcs[0]["VpcId"] if vpcs else None
+        if inventory is not None:
+            vpc_ids = inventory.cluster_vpc_ids(infra_id)
+            vpc_id = vpc_ids[0] if vpc_ids else None
+            classic_elbs = inventory.get("load_balancers")
+            alb_nlbs = inventory.get("load_balancers_v2")
+        else:
+            vpcs = ec2.describe_vpcs(
+                Filters=[
+                    {
+                        "Name": "tag:kubernetes.io/cluster/" + infra_id,
+                        "Values": ["owned"],
+                    }
+                ]
+            )["Vpcs"]
+            vpc_id = vpcs[0]["VpcId"] if vpcs else None
+            classic_elbs = elb.describe_load_balancers().get(
+                "LoadBalancerDescriptions", []
+            )
+            alb_nlbs = elbv2.describe_load_balancers().get("LoadBalancers", [])
 
         # Delete Classic ELBs
-        classic_elbs = elb.describe_load_balancers().get("LoadBalancerDescriptions", [])
         for lb in classic_elbs:
             if infra_id in lb["LoadBalancerName"] or (
                 vpc_id and lb.get("VPCId") == vpc_id
@@ -52,7 +75,6 @@ def delete_load_balancers(infra_id: str, region: str):
                     )
 
         # Delete ALB/NLBs
-        alb_nlbs = elbv2.describe_load_balancers().get("LoadBalancers", [])
         for lb in alb_nlbs:
             if infra_id in lb["LoadBalancerName"] or (
                 vpc_id and lb.get("VpcId") == vpc_id
@@ -85,3 +107,6 @@ def delete_load_balancers(infra_id: str, region: str):
 
     except Exception as e:
         logger.error(f"Error deleting load balancers: {e}")
+        return False
+
+    return True
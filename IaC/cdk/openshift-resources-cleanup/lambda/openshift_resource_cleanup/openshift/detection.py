@@ -1,16 +1,30 @@
 """OpenShift cluster detection."""
 
 from __future__ import annotations
-import boto3
-from ..utils import get_logger
+
+from ..utils import get_client, get_logger
+from .inventory import RegionInventory
 
 logger = get_logger()
 
 
-def detect_openshift_infra_id(cluster_name: str, region: str) -> str | None:
-    """Detect OpenShift infrastructure ID from cluster name."""
+def detect_openshift_infra_id(
+    cluster_name: str, region: str, inventory: RegionInventory | None = None
+) -> str | None:
+    """Detect OpenShift infrastructure ID from cluster name.
+
+    With an inventory, the lookup runs against the region's VPC snapshot.
+    """
     try:
-        ec2 = boto3.client("ec2", region_name=region)
+        if inventory is not None:
+            snapshot_infra_id = inventory.find_infra_id(cluster_name)
+            if snapshot_infra_id:
+                logger.info(
+                    f"Detected OpenShift infra ID: {snapshot_infra_id} from cluster: {cluster_name}"
+                )
+            return snapshot_infra_id
+
+        ec2 = get_client("ec2", region_name=region)
 
         # Try exact match first
         vpcs = ec2.describe_vpcs(
@@ -1,43 +1,133 @@
-"""OpenShift Route53 DNS cleanup."""
+"""OpenShift Route53 DNS cleanup.
+
+Route53 lists record sets in DNS-tree order (labels compared right to left),
+so every record under ``api.<cluster>.<domain>`` or ``apps.<cluster>.<domain>``
+is contiguous. Instead of listing the whole zone for each cluster, a listing
+starts at ``StartRecordName`` and stops at the first record outside that
+subtree.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from typing import Any
 
-import boto3
 from ..models.config import DRY_RUN, OPENSHIFT_BASE_DOMAIN
-from ..utils import get_logger
+from ..utils import get_client, get_logger
 
 logger = get_logger()
 
+# ChangeResourceRecordSets limits per request
+MAX_CHANGE_RECORDS = 1000
+MAX_CHANGE_VALUE_CHARS = 32000
+
+# list_resource_record_sets returns at most 300 records per page
+RECORD_PAGE_SIZE = "300"
+
+_zone_ids: dict[str, str] = {}
+_zone_lock = threading.Lock()
+
+
+def get_hosted_zone_id(route53: Any, domain: str) -> str | None:
+    """Return the hosted zone ID for a domain, cached for the process lifetime."""
+    zone_id = _zone_ids.get(domain)
+    if zone_id is not None:
+        return zone_id
+
+    with _zone_lock:
+        zone_id = _zone_ids.get(domain)
+        if zone_id is None:
+            # Zones are sorted by name, so the first page starting at the
+            # domain holds the match if there is one
+            zones = route53.list_hosted_zones_by_name(DNSName=domain)["HostedZones"]
+            for zone in zones:
+                if zone["Name"].rstrip(".") == domain:
+                    zone_id = zone["Id"].split("/")[-1]
+                    _zone_ids[domain] = zone_id
+                    break
+    return zone_id
+
+
+def clear_zone_cache() -> None:
+    """Forget cached hosted zone IDs (used by tests)."""
+    with _zone_lock:
+        _zone_ids.clear()
+
+
+def iter_record_sets_under(
+    route53: Any, zone_id: str, name: str
+) -> Iterator[dict[str, Any]]:
+    """Yield record sets named ``name`` or ``*.name``, reading only that range.
+
+    Args:
+        route53: Route53 client
+        zone_id: Hosted zone ID
+        name: Subtree root without trailing dot (e.g. api.cluster.domain)
+    """
+    suffix = "." + name
+    params: dict[str, Any] = {
+        "HostedZoneId": zone_id,
+        "StartRecordName": name,
+        "MaxItems": RECORD_PAGE_SIZE,
+    }
+    while True:
+        page = route53.list_resource_record_sets(**params)
+        for record in page["ResourceRecordSets"]:
+            record_name = record["Name"].rstrip(".")
+            if record_name != name and not record_name.endswith(suffix):
+                return  # Past the subtree
+            yield record
+
+        if not page.get("IsTruncated"):
+            return
+        params["StartRecordName"] = page["NextRecordName"]
+        params["StartRecordType"] = page["NextRecordType"]
+        if "NextRecordIdentifier" in page:
+            params["StartRecordIdentifier"] = page["NextRecordIdentifier"]
+        else:
+            params.pop("StartRecordIdentifier", None)
+
+
+def chunk_changes(changes: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    """Split changes into batches within the per-request Route53 limits."""
+    batch: list[dict[str, Any]] = []
+    records = chars = 0
+    for change in changes:
+        values = [
+            rr["Value"] for rr in change["ResourceRecordSet"].get("ResourceRecords", [])
+        ]
+        change_records = max(1, len(values))
+        change_chars = sum(len(value) for value in values)
+        if batch and (
+            records + change_records > MAX_CHANGE_RECORDS
+            or chars + change_chars > MAX_CHANGE_VALUE_CHARS
+        ):
+            yield batch
+            batch, records, chars = [], 0, 0
+        batch.append(change)
+        records += change_records
+        chars += change_chars
+    if batch:
+        yield batch
+
 
 def cleanup_route53_records(cluster_name: str, region: str):
     """Clean up Route53 DNS records for OpenShift cluster."""
     try:
-        route53 = boto3.client("route53")
+        route53 = get_client("route53")
 
         # Find the hosted zone for the base domain
-        zones = route53.list_hosted_zones()["HostedZones"]
-        zone_id = None
-        for zone in zones:
-            if zone["Name"].rstrip(".") == OPENSHIFT_BASE_DOMAIN:
-                zone_id = zone["Id"].split("/")[-1]
-                break
-
+        zone_id = get_hosted_zone_id(route53, OPENSHIFT_BASE_DOMAIN)
         if not zone_id:
             logger.warning(f"Hosted zone for {OPENSHIFT_BASE_DOMAIN} not found")
             return
 
-        # Get all DNS records for this zone
-        records = route53.list_resource_record_sets(HostedZoneId=zone_id)[
-            "ResourceRecordSets"
-        ]
-
-        # Find records for this cluster
-        changes = []
-        for record in records:
-            name = record["Name"].rstrip(".")
-            # Match api.cluster.domain or *.apps.cluster.domain
-            if (
-                f"api.{cluster_name}.{OPENSHIFT_BASE_DOMAIN}" in name
-                or f"apps.{cluster_name}.{OPENSHIFT_BASE_DOMAIN}" in name
-            ):
+        # Find records for this cluster: api.cluster.domain and *.apps.cluster.domain
+        changes: list[dict[str, Any]] = []
+        for prefix in ("api", "apps"):
+            subtree = f"{prefix}.{cluster_name}.{OPENSHIFT_BASE_DOMAIN}"
+            for record in iter_record_sets_under(route53, zone_id, subtree):
                 changes.append({"Action": "DELETE", "ResourceRecordSet": record})
 
         # Log each DNS record being deleted
@@ -66,14 +156,18 @@ def cleanup_route53_records(cluster_name: str, region: str):
                 )
 
         if changes and not DRY_RUN:
-            route53.change_resource_record_sets(
-                HostedZoneId=zone_id, ChangeBatch={"Changes": changes}
-            )
+            batches = 0
+            for batch in chunk_changes(changes):
+                route53.change_resource_record_sets(
+                    HostedZoneId=zone_id, ChangeBatch={"Changes": batch}
+                )
+                batches += 1
             logger.info(
                 f"Deleted {len(changes)} Route53 records for {cluster_name}",
                 extra={
                     "hosted_zone_id": zone_id,
                     "records_deleted": len(changes),
+                    "change_batches": batches,
                     "cluster_name": cluster_name,
                 },
             )
@@ -0,0 +1,212 @@
+"""Region-wide resource snapshot shared by OpenShift cleanup steps.
+
+Every cluster teardown used to re-run describe_vpcs for its infra tag and list
+every load balancer in the region. RegionInventory describes each resource
+type at most once per region and indexes the results by VPC ID and by
+``kubernetes.io/cluster/<infra_id>`` tag, so cleanup steps query memory
+instead of the API. Resource types are loaded lazily on first access.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from ..utils import get_client, get_logger
+
+logger = get_logger()
+
+CLUSTER_TAG_PREFIX = "kubernetes.io/cluster/"
+
+
+def _vpc_id(item: dict[str, Any]) -> list[str]:
+    vpc_id = item.get("VpcId") or item.get("VPCId")
+    return [vpc_id] if vpc_id else []
+
+
+def _attached_vpc_ids(item: dict[str, Any]) -> list[str]:
+    return [a["VpcId"] for a in item.get("Attachments", []) if a.get("VpcId")]
+
+
+def _no_vpc(item: dict[str, Any]) -> list[str]:
+    return []
+
+
+# kind -> (service, operation, result key, paginated, VPC ID extractor)
+RESOURCE_SPECS: dict[
+    str, tuple[str, str, str, bool, Callable[[dict[str, Any]], list[str]]]
+] = {
+    "vpcs": ("ec2", "describe_vpcs", "Vpcs", True, _vpc_id),
+    "load_balancers": (
+        "elb",
+        "describe_load_balancers",
+        "LoadBalancerDescriptions",
+        True,
+        _vpc_id,
+    ),
+    "load_balancers_v2": (
+        "elbv2",
+        "describe_load_balancers",
+        "LoadBalancers",
+        True,
+        _vpc_id,
+    ),
+    "nat_gateways": ("ec2", "describe_nat_gateways", "NatGateways", True, _vpc_id),
+    "addresses": ("ec2", "describe_addresses", "Addresses", False, _no_vpc),
+    "network_interfaces": (
+        "ec2",
+        "describe_network_interfaces",
+        "NetworkInterfaces",
+        True,
+        _vpc_id,
+    ),
+    "vpc_endpoints": ("ec2", "describe_vpc_endpoints", "VpcEndpoints", True, _vpc_id),
+    "security_groups": (
+        "ec2",
+        "describe_security_groups",
+        "SecurityGroups",
+        True,
+        _vpc_id,
+    ),
+    "subnets": ("ec2", "describe_subnets", "Subnets", True, _vpc_id),
+    "route_tables": ("ec2", "describe_route_tables", "RouteTables", True, _vpc_id),
+    "internet_gateways": (
+        "ec2",
+        "describe_internet_gateways",
+        "InternetGateways",
+        True,
+        _attached_vpc_ids,
+    ),
+}
+
+
+class _KindIndex:
+    """Loaded resources of one kind plus their VPC and cluster-tag indexes."""
+
+    __slots__ = ("by_cluster", "by_vpc", "items")
+
+    def __init__(self) -> None:
+        self.items: list[dict[str, Any]] = []
+        self.by_vpc: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        # infra_id -> [(tag value, item)]
+        self.by_cluster: dict[str, list[tuple[str, dict[str, Any]]]] = defaultdict(list)
+
+
+class RegionInventory:
+    """Lazily loaded, indexed snapshot of a region's cluster resources.
+
+    Thread-safe: concurrent cleanup steps asking for the same kind trigger a
+    single describe call, while different kinds load in parallel.
+    """
+
+    def __init__(self, region: str):
+        self.region = region
+        self._kinds: dict[str, _KindIndex] = {}
+        self._kind_locks = {kind: threading.Lock() for kind in RESOURCE_SPECS}
+        self.api_calls: dict[str, int] = defaultdict(int)
+
+    def _fetch(self, kind: str) -> list[dict[str, Any]]:
+        service, operation, result_key, paginated, _ = RESOURCE_SPECS[kind]
+        client = get_client(service, region_name=self.region)
+        items: list[dict[str, Any]] = []
+        if paginated:
+            for page in client.get_paginator(operation).paginate():
+                self.api_calls[f"{service}:{operation}"] += 1
+                items.extend(page.get(result_key, []))
+        else:
+            self.api_calls[f"{service}:{operation}"] += 1
+            items.extend(getattr(client, operation)().get(result_key, []))
+        return items
+
+    def _index(self, kind: str) -> _KindIndex:
+        index = self._kinds.get(kind)
+        if index is not None:
+            return index
+
+        with self._kind_locks[kind]:
+            index = self._kinds.get(kind)
+            if index is not None:
+                return index
+
+            vpc_ids_of = RESOURCE_SPECS[kind][4]
+            index = _KindIndex()
+            index.items = self._fetch(kind)
+            for item in index.items:
+                for vpc_id in vpc_ids_of(item):
+                    index.by_vpc[vpc_id].append(item)
+                for tag in item.get("Tags") or []:
+                    if tag["Key"].startswith(CLUSTER_TAG_PREFIX):
+                        infra_id = tag["Key"][len(CLUSTER_TAG_PREFIX) :]
+                        index.by_cluster[infra_id].append((tag.get("Value", ""), item))
+
+            self._kinds[kind] = index
+            logger.debug(
+                "Loaded region inventory",
+                extra={
+                    "region": self.region,
+                    "resource_kind": kind,
+                    "resource_count": len(index.items),
+                },
+            )
+            return index
+
+    def get(self, kind: str) -> list[dict[str, Any]]:
+        """Return every resource of a kind in the region."""
+        return self._index(kind).items
+
+    def by_vpc(self, kind: str, vpc_id: str) -> list[dict[str, Any]]:
+        """Return resources of a kind that belong to a VPC."""
+        return list(self._index(kind).by_vpc.get(vpc_id, []))
+
+    def by_cluster(
+        self, kind: str, infra_id: str, value: str | None = "owned"
+    ) -> list[dict[str, Any]]:
+        """Return resources of a kind tagged ``kubernetes.io/cluster/<infra_id>``.
+
+        Args:
+            kind: Resource kind (key of RESOURCE_SPECS)
+            infra_id: OpenShift infrastructure ID
+            value: Required tag value, or None to accept any value
+        """
+        return [
+            item
+            for tag_value, item in self._index(kind).by_cluster.get(infra_id, [])
+            if value is None or tag_value == value
+        ]
+
+    def cluster_vpc_ids(self, infra_id: str) -> list[str]:
+        """Return IDs of VPCs owned by the cluster."""
+        return [vpc["VpcId"] for vpc in self.by_cluster("vpcs", infra_id)]
+
+    def find_infra_id(self, cluster_name: str) -> str | None:
+        """Find the infra ID of a cluster from its VPC tags.
+
+        Mirrors detect_openshift_infra_id: an exact
+        ``kubernetes.io/cluster/<cluster_name>`` tag wins, otherwise the first
+        ``kubernetes.io/cluster/<cluster_name>-*`` tag is used.
+        """
+        clusters = self._index("vpcs").by_cluster
+        matches = clusters.get(cluster_name)
+        if not matches:
+            prefix = f"{cluster_name}-"
+            for infra_id in sorted(clusters):
+                if infra_id.startswith(prefix):
+                    matches = clusters[infra_id]
+                    break
+        if not matches:
+            return None
+
+        _, vpc = matches[0]
+        for tag in vpc.get("Tags", []):
+            if tag["Key"].startswith(CLUSTER_TAG_PREFIX):
+                found: str = tag["Key"][len(CLUSTER_TAG_PREFIX) :]
+                return found
+        return None
+
+    def invalidate(self, *kinds: str) -> None:
+        """Drop loaded kinds (all when none given) so the next access re-describes."""
+        for kind in kinds or tuple(RESOURCE_SPECS):
+            with self._kind_locks[kind]:
+                self._kinds.pop(kind, None)
@@ -1,23 +1,58 @@
-"""OpenShift network resources cleanup."""
+"""OpenShift network resources cleanup.
+
+Every function accepts an optional RegionInventory; when given, resources are
+read from the region snapshot instead of issuing a describe call per cluster.
+
+Every delete function returns True when nothing it targeted is left behind,
+so the teardown graph knows whether dependent steps may run. Resources that
+are already gone count as deleted.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
 from botocore.exceptions import ClientError
+
 from ..models.config import DRY_RUN
-from ..utils import get_logger
+from ..utils import get_client, get_logger
+from .inventory import RegionInventory
 
 logger = get_logger()
 
+# Parallel delete calls used when tearing down one VPC's security groups
+SECURITY_GROUP_WORKERS = 8
+
+
+def _already_gone(error: ClientError) -> bool:
+    """Return True when a ClientError means the resource no longer exists."""
+    return "NotFound" in error.response.get("Error", {}).get("Code", "")
 
-def delete_nat_gateways(infra_id: str, region: str):
+
+def delete_nat_gateways(
+    infra_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Delete NAT gateways for OpenShift cluster."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        nat_gws = ec2.describe_nat_gateways(
-            Filters=[
-                {"Name": "tag:kubernetes.io/cluster/" + infra_id, "Values": ["owned"]},
-                {"Name": "state", "Values": ["available", "pending"]},
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            nat_gws = [
+                nat
+                for nat in inventory.by_cluster("nat_gateways", infra_id)
+                if nat.get("State") in ("available", "pending")
             ]
-        )["NatGateways"]
+        else:
+            nat_gws = ec2.describe_nat_gateways(
+                Filters=[
+                    {
+                        "Name": "tag:kubernetes.io/cluster/" + infra_id,
+                        "Values": ["owned"],
+                    },
+                    {"Name": "state", "Values": ["available", "pending"]},
+                ]
+            )["NatGateways"]
 
         for nat in nat_gws:
             if DRY_RUN:
@@ -38,17 +73,29 @@ def delete_nat_gateways(infra_id: str, region: str):
 
     except Exception as e:
         logger.error("Error deleting NAT gateways", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
-def release_elastic_ips(infra_id: str, region: str):
+def release_elastic_ips(
+    infra_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Release Elastic IPs for OpenShift cluster."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        eips = ec2.describe_addresses(
-            Filters=[
-                {"Name": "tag:kubernetes.io/cluster/" + infra_id, "Values": ["owned"]}
-            ]
-        )["Addresses"]
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            eips = inventory.by_cluster("addresses", infra_id)
+        else:
+            eips = ec2.describe_addresses(
+                Filters=[
+                    {
+                        "Name": "tag:kubernetes.io/cluster/" + infra_id,
+                        "Values": ["owned"],
+                    }
+                ]
+            )["Addresses"]
 
         for eip in eips:
             if "AllocationId" in eip:
@@ -71,23 +118,37 @@ def release_elastic_ips(infra_id: str, region: str):
                                 "infra_id": infra_id,
                             },
                         )
-                    except ClientError:
-                        pass  # May already be released
+                    except ClientError as e:
+                        if not _already_gone(e):
+                            complete = False
 
     except Exception as e:
         logger.error("Error releasing EIPs", extra={"error": str(e)})
+        return False
 
+    return complete
 
-def cleanup_network_interfaces(vpc_id: str, region: str):
+
+def cleanup_network_interfaces(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Clean up orphaned network interfaces."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        enis = ec2.describe_network_interfaces(
-            Filters=[
-                {"Name": "vpc-id", "Values": [vpc_id]},
-                {"Name": "status", "Values": ["available"]},
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            enis = [
+                eni
+                for eni in inventory.by_vpc("network_interfaces", vpc_id)
+                if eni.get("Status") == "available"
             ]
-        )["NetworkInterfaces"]
+        else:
+            enis = ec2.describe_network_interfaces(
+                Filters=[
+                    {"Name": "vpc-id", "Values": [vpc_id]},
+                    {"Name": "status", "Values": ["available"]},
+                ]
+            )["NetworkInterfaces"]
 
         for eni in enis:
             if DRY_RUN:
@@ -111,20 +172,30 @@ def cleanup_network_interfaces(vpc_id: str, region: str):
                             "vpc_id": vpc_id,
                         },
                     )
-                except ClientError:
-                    pass  # May already be deleted
+                except ClientError as e:
+                    if not _already_gone(e):
+                        complete = False
 
     except Exception as e:
         logger.error("Error cleaning up ENIs", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
-def delete_vpc_endpoints(vpc_id: str, region: str):
+def delete_vpc_endpoints(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Delete VPC endpoints."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        endpoints = ec2.describe_vpc_endpoints(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-        )["VpcEndpoints"]
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            endpoints = inventory.by_vpc("vpc_endpoints", vpc_id)
+        else:
+            endpoints = ec2.describe_vpc_endpoints(
+                Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+            )["VpcEndpoints"]
 
         for endpoint in endpoints:
             if DRY_RUN:
@@ -146,39 +217,78 @@ def delete_vpc_endpoints(vpc_id: str, region: str):
                             "vpc_id": vpc_id,
                         },
                     )
-                except ClientError:
-                    pass
+                except ClientError as e:
+                    if not _already_gone(e):
+                        complete = False
 
     except Exception as e:
         logger.error("Error deleting VPC endpoints", extra={"error": str(e)})
+        return False
+
+    return complete
+
 
+def _revoke_security_group_rules(ec2, sg: dict) -> bool:
+    """Revoke all of a group's rules with one call per direction.
 
-def delete_security_groups(vpc_id: str, region: str):
-    """Delete security groups with dependency handling."""
+    Returns:
+        True if no rule is left behind
+    """
+    complete = True
+    for permissions_key, revoke in (
+        ("IpPermissions", ec2.revoke_security_group_ingress),
+        ("IpPermissionsEgress", ec2.revoke_security_group_egress),
+    ):
+        permissions = sg.get(permissions_key)
+        if not permissions:
+            continue
+        try:
+            revoke(GroupId=sg["GroupId"], IpPermissions=permissions)
+        except ClientError as e:
+            if not _already_gone(e):
+                complete = False
+    return complete
+
+
+def _delete_security_group(ec2, sg: dict, vpc_id: str) -> bool:
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        sgs = ec2.describe_security_groups(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-        )["SecurityGroups"]
-
-        # First pass: remove all ingress rules to break circular dependencies
-        for sg in sgs:
-            if sg["GroupName"] == "default":
-                continue
-            try:
-                if sg.get("IpPermissions"):
-                    if not DRY_RUN:
-                        ec2.revoke_security_group_ingress(
-                            GroupId=sg["GroupId"], IpPermissions=sg["IpPermissions"]
-                        )
-            except ClientError:
-                pass
+        ec2.delete_security_group(GroupId=sg["GroupId"])
+        logger.info(
+            "DELETE security_group",
+            extra={"security_group_id": sg["GroupId"], "vpc_id": vpc_id},
+        )
+    except ClientError as e:
+        if not _already_gone(e):
+            return False
+    return True
+
+
+def delete_security_groups(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
+    """Delete security groups with dependency handling.
+
+    Groups of one cluster reference each other, so deleting them one by one
+    hits DependencyViolation until the last reference is gone. Teardown is
+    done in two timed phases instead: every ingress and egress rule of every
+    group is revoked first, then the now unreferenced groups are deleted
+    concurrently.
+    """
+    complete = True
+    try:
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            sgs = inventory.by_vpc("security_groups", vpc_id)
+        else:
+            sgs = ec2.describe_security_groups(
+                Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+            )["SecurityGroups"]
+        sgs = [sg for sg in sgs if sg["GroupName"] != "default"]
+        if not sgs:
+            return True
 
-        # Second pass: delete security groups
-        for sg in sgs:
-            if sg["GroupName"] == "default":
-                continue
-            if DRY_RUN:
+        if DRY_RUN:
+            for sg in sgs:
                 logger.info(
                     "Would DELETE security_group",
                     extra={
@@ -187,27 +297,59 @@ def delete_security_groups(vpc_id: str, region: str):
                         "vpc_id": vpc_id,
                     },
                 )
-            else:
-                try:
-                    ec2.delete_security_group(GroupId=sg["GroupId"])
-                    logger.info(
-                        "DELETE security_group",
-                        extra={"security_group_id": sg["GroupId"], "vpc_id": vpc_id},
-                    )
-                except ClientError:
-                    pass
+            return True
+
+        workers = min(SECURITY_GROUP_WORKERS, len(sgs))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="security-group"
+        ) as pool:
+            # Phase 1: drop all rules to break cross-group references
+            revoke_started = time.time()
+            revoked = list(
+                pool.map(lambda sg: _revoke_security_group_rules(ec2, sg), sgs)
+            )
+            revoke_seconds = time.time() - revoke_started
+
+            # Phase 2: delete the unreferenced groups
+            delete_started = time.time()
+            deleted = list(
+                pool.map(lambda sg: _delete_security_group(ec2, sg, vpc_id), sgs)
+            )
+            delete_seconds = time.time() - delete_started
+
+        complete = all(deleted)
+        logger.info(
+            "Security group teardown finished",
+            extra={
+                "vpc_id": vpc_id,
+                "security_groups": len(sgs),
+                "rules_revoked_groups": sum(revoked),
+                "deleted_groups": sum(deleted),
+                "revoke_seconds": round(revoke_seconds, 2),
+                "delete_seconds": round(delete_seconds, 2),
+            },
+        )
 
     except Exception as e:
         logger.error("Error deleting security groups", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
-def delete_subnets(vpc_id: str, region: str):
+def delete_subnets(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Delete subnets."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        subnets = ec2.describe_subnets(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-        )["Subnets"]
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            subnets = inventory.by_vpc("subnets", vpc_id)
+        else:
+            subnets = ec2.describe_subnets(
+                Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+            )["Subnets"]
 
         for subnet in subnets:
             if DRY_RUN:
@@ -226,20 +368,30 @@ def delete_subnets(vpc_id: str, region: str):
                         "DELETE subnet",
                         extra={"subnet_id": subnet["SubnetId"], "vpc_id": vpc_id},
                     )
-                except ClientError:
-                    pass
+                except ClientError as e:
+                    if not _already_gone(e):
+                        complete = False
 
     except Exception as e:
         logger.error("Error deleting subnets", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
-def delete_route_tables(vpc_id: str, region: str):
+def delete_route_tables(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Delete route tables."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        rts = ec2.describe_route_tables(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-        )["RouteTables"]
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            rts = inventory.by_vpc("route_tables", vpc_id)
+        else:
+            rts = ec2.describe_route_tables(
+                Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+            )["RouteTables"]
 
         for rt in rts:
             # Skip main route table
@@ -265,20 +417,30 @@ def delete_route_tables(vpc_id: str, region: str):
                         "DELETE route_table",
                         extra={"route_table_id": rt["RouteTableId"], "vpc_id": vpc_id},
                     )
-                except ClientError:
-                    pass
+                except ClientError as e:
+                    if not _already_gone(e):
+                        complete = False
 
     except Exception as e:
         logger.error("Error deleting route tables", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
-def delete_internet_gateway(vpc_id: str, region: str):
+def delete_internet_gateway(
+    vpc_id: str, region: str, inventory: RegionInventory | None = None
+) -> bool:
     """Detach and delete internet gateway."""
+    complete = True
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-        igws = ec2.describe_internet_gateways(
-            Filters=[{"Name": "attachment.vpc-id", "Values": [vpc_id]}]
-        )["InternetGateways"]
+        ec2 = get_client("ec2", region_name=region)
+        if inventory is not None:
+            igws = inventory.by_vpc("internet_gateways", vpc_id)
+        else:
+            igws = ec2.describe_internet_gateways(
+                Filters=[{"Name": "attachment.vpc-id", "Values": [vpc_id]}]
+            )["InternetGateways"]
 
         for igw in igws:
             if DRY_RUN:
@@ -305,11 +467,15 @@ def delete_internet_gateway(vpc_id: str, region: str):
                             "vpc_id": vpc_id,
                         },
                     )
-                except ClientError:
-                    pass
+                except ClientError as e:
+                    if not _already_gone(e):
+                        complete = False
 
     except Exception as e:
         logger.error("Error deleting IGW", extra={"error": str(e)})
+        return False
+
+    return complete
 
 
 def delete_vpc(vpc_id: str, region: str) -> bool:
@@ -321,7 +487,7 @@ def delete_vpc(vpc_id: str, region: str) -> bool:
         False if VPC still has dependencies
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region)
+        ec2 = get_client("ec2", region_name=region)
         if DRY_RUN:
             logger.info(
                 "Would DELETE vpc",
@@ -1,36 +1,136 @@
 """OpenShift cluster destruction orchestration.
 
-Single-pass cleanup with dependency order enforcement.
-EventBridge schedule (every 15 minutes) handles retries naturally.
+Resources are torn down as a dependency graph: independent resource types are
+deleted in parallel and blocked ones are retried while the invocation's time
+budget allows. Whatever is still blocked is left to the next EventBridge
+schedule (every 15 minutes).
 """
 
-import boto3
+from __future__ import annotations
+
 from botocore.exceptions import ClientError
-from ..utils import get_logger
+
+from ..models import ClusterProgress
+from ..models.config import TEARDOWN_CONCURRENCY, TEARDOWN_RETRY_SECONDS
+from ..utils import current_time_budget, get_client, get_logger
 from .compute import delete_load_balancers
+from .dns import cleanup_route53_records
+from .inventory import RegionInventory
 from .network import (
-    delete_nat_gateways,
-    release_elastic_ips,
     cleanup_network_interfaces,
-    delete_vpc_endpoints,
+    delete_internet_gateway,
+    delete_nat_gateways,
+    delete_route_tables,
     delete_security_groups,
     delete_subnets,
-    delete_route_tables,
-    delete_internet_gateway,
     delete_vpc,
+    delete_vpc_endpoints,
+    release_elastic_ips,
 )
-from .dns import cleanup_route53_records
 from .storage import cleanup_s3_state
+from .teardown import TeardownExecutor, TeardownNode
 
 logger = get_logger()
 
 
-def destroy_openshift_cluster(cluster_name: str, infra_id: str, region: str) -> bool:
+def build_teardown_graph(
+    infra_id: str,
+    vpc_id: str,
+    region: str,
+    inventory: RegionInventory | None = None,
+) -> list[TeardownNode]:
+    """Declare the cluster's resource types and what must be gone before each."""
+    return [
+        TeardownNode(
+            "load_balancers",
+            lambda: delete_load_balancers(infra_id, region, inventory=inventory),
+            refresh=("load_balancers", "load_balancers_v2"),
+        ),
+        TeardownNode(
+            "nat_gateways",
+            lambda: delete_nat_gateways(infra_id, region, inventory=inventory),
+            refresh=("nat_gateways",),
+        ),
+        TeardownNode(
+            "elastic_ips",
+            lambda: release_elastic_ips(infra_id, region, inventory=inventory),
+            depends_on=("nat_gateways",),
+            refresh=("addresses",),
+        ),
+        TeardownNode(
+            "network_interfaces",
+            lambda: cleanup_network_interfaces(vpc_id, region, inventory=inventory),
+            depends_on=("load_balancers", "nat_gateways"),
+            refresh=("network_interfaces",),
+        ),
+        TeardownNode(
+            "vpc_endpoints",
+            lambda: delete_vpc_endpoints(vpc_id, region, inventory=inventory),
+            refresh=("vpc_endpoints",),
+        ),
+        TeardownNode(
+            "security_groups",
+            lambda: delete_security_groups(vpc_id, region, inventory=inventory),
+            depends_on=("load_balancers", "network_interfaces", "vpc_endpoints"),
+            refresh=("security_groups",),
+        ),
+        TeardownNode(
+            "subnets",
+            lambda: delete_subnets(vpc_id, region, inventory=inventory),
+            depends_on=(
+                "load_balancers",
+                "nat_gateways",
+                "network_interfaces",
+                "vpc_endpoints",
+            ),
+            refresh=("subnets",),
+        ),
+        TeardownNode(
+            "route_tables",
+            lambda: delete_route_tables(vpc_id, region, inventory=inventory),
+            depends_on=("subnets",),
+            refresh=("route_tables",),
+        ),
+        TeardownNode(
+            "internet_gateway",
+            lambda: delete_internet_gateway(vpc_id, region, inventory=inventory),
+            depends_on=("load_balancers", "nat_gateways", "elastic_ips"),
+            refresh=("internet_gateways",),
+        ),
+        TeardownNode(
+            "vpc",
+            lambda: delete_vpc(vpc_id, region),
+            depends_on=(
+                "security_groups",
+                "subnets",
+                "route_tables",
+                "internet_gateway",
+            ),
+        ),
+    ]
+
+
+def destroy_openshift_cluster(
+    cluster_name: str,
+    infra_id: str,
+    region: str,
+    inventory: RegionInventory | None = None,
+    progress: ClusterProgress | None = None,
+) -> bool:
     """
-    Single-pass OpenShift cluster cleanup.
+    OpenShift cluster cleanup driven by the teardown graph.
+
+    Deletes independent resource types in parallel and retries blocked ones
+    for up to TEARDOWN_RETRY_SECONDS while the invocation time budget allows.
+    The cluster's instances must already be terminating, or their network
+    interfaces keep the subnets, security groups and VPC blocked. If resources still have
+    dependencies, exits gracefully and relies on next EventBridge schedule
+    (15min) to retry.
 
-    Deletes resources in dependency order. If resources still have dependencies,
-    exits gracefully and relies on next EventBridge schedule (15min) to retry.
+    When a RegionInventory is supplied, every step reads the region snapshot
+    instead of describing resources again for this cluster. When a
+    ClusterProgress from a previous run is supplied, graph nodes it recorded as
+    complete are skipped and the record is updated with this run's result.
 
     Returns:
         True if VPC successfully deleted (cleanup complete)
@@ -47,19 +147,22 @@ def destroy_openshift_cluster(cluster_name: str, infra_id: str, region: str) ->
     )
 
     try:
-        ec2 = boto3.client("ec2", region_name=region)
-
         # Check if VPC still exists
-        vpcs = ec2.describe_vpcs(
-            Filters=[
-                {
-                    "Name": "tag:kubernetes.io/cluster/" + infra_id,
-                    "Values": ["owned"],
-                }
-            ]
-        )["Vpcs"]
-
-        if not vpcs:
+        if inventory is not None:
+            vpc_ids = inventory.cluster_vpc_ids(infra_id)
+        else:
+            ec2 = get_client("ec2", region_name=region)
+            vpcs = ec2.describe_vpcs(
+                Filters=[
+                    {
+                        "Name": "tag:kubernetes.io/cluster/" + infra_id,
+                        "Values": ["owned"],
+                    }
+                ]
+            )["Vpcs"]
+            vpc_ids = [vpc["VpcId"] for vpc in vpcs]
+
+        if not vpc_ids:
             logger.info(
                 "VPC not found - cleanup complete",
                 extra={"cluster_name": cluster_name, "infra_id": infra_id},
@@ -69,26 +172,42 @@ def destroy_openshift_cluster(cluster_name: str, infra_id: str, region: str) ->
             cleanup_s3_state(cluster_name, region)
             return True
 
-        vpc_id = vpcs[0]["VpcId"]
+        vpc_id = vpc_ids[0]
         logger.info(
             "Found VPC, proceeding with cleanup",
             extra={"cluster_name": cluster_name, "vpc_id": vpc_id},
         )
 
-        # Delete resources in dependency order
-        # Each function handles its own DependencyViolation errors gracefully
-        delete_load_balancers(infra_id, region)
-        delete_nat_gateways(infra_id, region)
-        release_elastic_ips(infra_id, region)
-        cleanup_network_interfaces(vpc_id, region)
-        delete_vpc_endpoints(vpc_id, region)
-        delete_security_groups(vpc_id, region)
-        delete_subnets(vpc_id, region)
-        delete_route_tables(vpc_id, region)
-        delete_internet_gateway(vpc_id, region)
-
-        # Try to delete VPC - if it fails due to dependencies, we'll retry on next run
-        vpc_deleted = delete_vpc(vpc_id, region)
+        # Each node handles its own DependencyViolation errors gracefully.
+        # Retries are capped per cluster so one stuck cluster cannot use up
+        # the invocation; the next run resumes its remaining nodes.
+        budget = current_time_budget()
+        report = TeardownExecutor(
+            build_teardown_graph(infra_id, vpc_id, region, inventory),
+            max_workers=TEARDOWN_CONCURRENCY,
+            budget=(
+                budget.limited_to(TEARDOWN_RETRY_SECONDS)
+                if budget is not None
+                else None
+            ),
+            inventory=inventory,
+            completed=progress.completed_nodes if progress is not None else (),
+        ).run()
+        if progress is not None:
+            progress.completed_nodes = report.completed_nodes()
+            progress.remaining_nodes = report.remaining_nodes()
+        logger.info(
+            "Teardown graph finished",
+            extra={
+                "cluster_name": cluster_name,
+                "vpc_id": vpc_id,
+                "duration_seconds": round(report.duration_seconds, 2),
+                "node_timings": report.timings(),
+            },
+        )
+
+        # VPC deletion is the last node - if it is blocked, we'll retry on next run
+        vpc_deleted = report.is_complete("vpc")
 
         if vpc_deleted:
             logger.info(
@@ -0,0 +1,232 @@
+"""Dry-run teardown plans built from the region inventory.
+
+A plan lists, for every node of the teardown graph, the resource IDs the
+delete step would act on, the nodes it waits for, the stage it would run in
+(nodes of one stage run in parallel) and the number of mutating API calls it
+would make. Resources are selected from the RegionInventory snapshot with the
+same filters as the ``delete_*`` functions, so planning a cluster costs no API
+call beyond the region-wide describes the snapshot shares between clusters.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .inventory import RegionInventory
+
+# Steps run once the VPC is gone; their targets (hosted zone records, state
+# bucket objects) are only listed at execution time
+POST_STEPS = ("route53_records", "s3_state")
+
+
+def _load_balancers(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    classic = [
+        lb["LoadBalancerName"]
+        for lb in inv.get("load_balancers")
+        if infra_id in lb["LoadBalancerName"] or lb.get("VPCId") == vpc_id
+    ]
+    v2 = [
+        lb["LoadBalancerArn"]
+        for lb in inv.get("load_balancers_v2")
+        if infra_id in lb["LoadBalancerName"] or lb.get("VpcId") == vpc_id
+    ]
+    return classic + v2
+
+
+def _nat_gateways(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [
+        nat["NatGatewayId"]
+        for nat in inv.by_cluster("nat_gateways", infra_id)
+        if nat.get("State") in ("available", "pending")
+    ]
+
+
+def _elastic_ips(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [
+        eip["AllocationId"]
+        for eip in inv.by_cluster("addresses", infra_id)
+        if "AllocationId" in eip
+    ]
+
+
+def _network_interfaces(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [
+        eni["NetworkInterfaceId"]
+        for eni in inv.by_vpc("network_interfaces", vpc_id)
+        if eni.get("Status") == "available"
+    ]
+
+
+def _vpc_endpoints(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [ep["VpcEndpointId"] for ep in inv.by_vpc("vpc_endpoints", vpc_id)]
+
+
+def _security_groups(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [
+        sg["GroupId"]
+        for sg in inv.by_vpc("security_groups", vpc_id)
+        if sg["GroupName"] != "default"
+    ]
+
+
+def _security_group_calls(inv: RegionInventory, infra_id: str, vpc_id: str) -> int:
+    # One revoke per non-empty rule direction, then one delete per group
+    return sum(
+        bool(sg.get("IpPermissions")) + bool(sg.get("IpPermissionsEgress")) + 1
+        for sg in inv.by_vpc("security_groups", vpc_id)
+        if sg["GroupName"] != "default"
+    )
+
+
+def _subnets(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [subnet["SubnetId"] for subnet in inv.by_vpc("subnets", vpc_id)]
+
+
+def _route_tables(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [
+        rt["RouteTableId"]
+        for rt in inv.by_vpc("route_tables", vpc_id)
+        if not any(a.get("Main", False) for a in rt.get("Associations", []))
+    ]
+
+
+def _internet_gateways(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [igw["InternetGatewayId"] for igw in inv.by_vpc("internet_gateways", vpc_id)]
+
+
+def _vpc(inv: RegionInventory, infra_id: str, vpc_id: str) -> list[str]:
+    return [vpc_id]
+
+
+Selector = Callable[[RegionInventory, str, str], Any]
+
+# node -> (resource selector, mutating calls per resource, or a function
+# computing the node's total calls)
+NODE_SELECTORS: dict[str, tuple[Selector, int | Selector]] = {
+    "load_balancers": (_load_balancers, 1),
+    "nat_gateways": (_nat_gateways, 1),
+    "elastic_ips": (_elastic_ips, 1),
+    "network_interfaces": (_network_interfaces, 1),
+    "vpc_endpoints": (_vpc_endpoints, 1),
+    "security_groups": (_security_groups, _security_group_calls),
+    "subnets": (_subnets, 1),
+    "route_tables": (_route_tables, 1),
+    "internet_gateway": (_internet_gateways, 2),  # detach + delete
+    "vpc": (_vpc, 1),
+}
+
+
+@dataclass
+class PlanStep:
+    """Resources one teardown node would delete."""
+
+    node: str
+    stage: int
+    depends_on: list[str]
+    resources: list[str]
+    api_calls: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "node": self.node,
+            "stage": self.stage,
+            "depends_on": self.depends_on,
+            "resources": self.resources,
+            "api_calls": self.api_calls,
+        }
+
+
+@dataclass
+class TeardownPlan:
+    """What tearing down one cluster would do."""
+
+    cluster_name: str
+    infra_id: str
+    region: str
+    vpc_id: str | None
+    steps: list[PlanStep] = field(default_factory=list)
+
+    @property
+    def api_calls(self) -> int:
+        """Mutating calls of the graph plus the instance termination."""
+        return sum(step.api_calls for step in self.steps) + 1
+
+    @property
+    def resources(self) -> int:
+        return sum(len(step.resources) for step in self.steps)
+
+    @property
+    def stages(self) -> int:
+        return max((step.stage for step in self.steps), default=-1) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cluster_name": self.cluster_name,
+            "infra_id": self.infra_id,
+            "region": self.region,
+            "vpc_id": self.vpc_id,
+            "resources": self.resources,
+            "stages": self.stages,
+            "estimated_api_calls": self.api_calls,
+            "steps": [step.to_dict() for step in self.steps],
+            "post_steps": list(POST_STEPS),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def _stages(depends_on: dict[str, tuple[str, ...]]) -> dict[str, int]:
+    """Longest-path level of each node; nodes of one level can run together."""
+    stages: dict[str, int] = {}
+
+    def stage(name: str) -> int:
+        if name not in stages:
+            stages[name] = 1 + max((stage(dep) for dep in depends_on[name]), default=-1)
+        return stages[name]
+
+    for name in depends_on:
+        stage(name)
+    return stages
+
+
+def plan_cluster_teardown(
+    cluster_name: str, infra_id: str, region: str, inventory: RegionInventory
+) -> TeardownPlan:
+    """Plan the teardown of one cluster from the region snapshot.
+
+    Nodes with nothing to delete are left out of the steps, but still count
+    for the stages of the nodes that depend on them.
+    """
+    # The graph declares the dependencies; its actions are never called here
+    from .orchestrator import build_teardown_graph
+
+    vpc_ids = inventory.cluster_vpc_ids(infra_id)
+    plan = TeardownPlan(cluster_name, infra_id, region, vpc_ids[0] if vpc_ids else None)
+    if plan.vpc_id is None:
+        return plan
+
+    graph = build_teardown_graph(infra_id, plan.vpc_id, region, inventory)
+    stages = _stages({node.name: node.depends_on for node in graph})
+    for node in graph:
+        select, calls = NODE_SELECTORS[node.name]
+        resources = select(inventory, infra_id, plan.vpc_id)
+        if not resources:
+            continue
+        plan.steps.append(
+            PlanStep(
+                node=node.name,
+                stage=stages[node.name],
+                depends_on=list(node.depends_on),
+                resources=resources,
+                api_calls=(
+                    calls * len(resources)
+                    if isinstance(calls, int)
+                    else calls(inventory, infra_id, plan.vpc_id)
+                ),
+            )
+        )
+    return plan
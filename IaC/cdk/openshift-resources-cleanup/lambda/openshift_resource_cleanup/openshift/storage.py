@@ -1,41 +1,144 @@
-"""OpenShift S3 state storage cleanup."""
+"""OpenShift S3 state storage cleanup.
+
+Installer state prefixes can hold thousands of objects. Keys are streamed page
+by page from list_objects_v2 and removed with delete_objects in batches of up
+to 1000 keys, spread over a small worker pool.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
 
-import boto3
 from botocore.exceptions import ClientError
+
 from ..models.config import DRY_RUN
-from ..utils import get_logger
+from ..utils import get_account_id, get_client, get_logger
 
 logger = get_logger()
 
+# delete_objects accepts at most 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+# Concurrent delete_objects calls per prefix
+S3_DELETE_WORKERS = 4
+
+
+def iter_object_batches(
+    s3: Any, bucket_name: str, prefix: str
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield the objects under a prefix one list page (<= 1000 keys) at a time."""
+    paginator = s3.get_paginator("list_objects_v2")
+    pages = paginator.paginate(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        PaginationConfig={"PageSize": S3_DELETE_BATCH_SIZE},
+    )
+    for page in pages:
+        contents = page.get("Contents", [])
+        if contents:
+            yield contents
+
+
+def _delete_batch(
+    s3: Any, bucket_name: str, batch: list[dict[str, Any]]
+) -> tuple[int, int, int]:
+    """Delete one batch of objects.
+
+    Returns:
+        (objects deleted, bytes deleted, objects that failed)
+    """
+    response = s3.delete_objects(
+        Bucket=bucket_name,
+        Delete={"Objects": [{"Key": obj["Key"]} for obj in batch], "Quiet": True},
+    )
+    errors = response.get("Errors", [])
+    for error in errors:
+        logger.warning(
+            "Failed to delete s3_object",
+            extra={
+                "bucket_name": bucket_name,
+                "object_key": error.get("Key"),
+                "error_code": error.get("Code"),
+            },
+        )
+    failed_keys = {error.get("Key") for error in errors}
+    deleted = [obj for obj in batch if obj["Key"] not in failed_keys]
+    return len(deleted), sum(obj.get("Size", 0) for obj in deleted), len(errors)
+
+
+def delete_prefix(s3: Any, bucket_name: str, prefix: str) -> dict[str, Any]:
+    """Delete every object under a prefix.
+
+    Listing continues while earlier batches are being deleted; at most two
+    batches per worker are in flight so memory stays bounded.
+
+    Returns:
+        Deletion statistics: objects, bytes, failures, duration and rates
+    """
+    started = time.time()
+    objects = bytes_deleted = failed = 0
+    in_flight: set[Future[tuple[int, int, int]]] = set()
+
+    def collect(done: set[Future[tuple[int, int, int]]]) -> None:
+        nonlocal objects, bytes_deleted, failed
+        for future in done:
+            in_flight.discard(future)
+            count, size, errors = future.result()
+            objects += count
+            bytes_deleted += size
+            failed += errors
+
+    with ThreadPoolExecutor(
+        max_workers=S3_DELETE_WORKERS, thread_name_prefix="s3-delete"
+    ) as pool:
+        for batch in iter_object_batches(s3, bucket_name, prefix):
+            if len(in_flight) >= S3_DELETE_WORKERS * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(_delete_batch, s3, bucket_name, batch))
+            logger.info(
+                "DELETE s3_objects",
+                extra={
+                    "bucket_name": bucket_name,
+                    "prefix": prefix,
+                    "object_count": len(batch),
+                    "first_key": batch[0]["Key"],
+                    "last_key": batch[-1]["Key"],
+                },
+            )
+        collect(set(in_flight))
+
+    duration = time.time() - started
+    return {
+        "objects_deleted": objects,
+        "bytes_deleted": bytes_deleted,
+        "objects_failed": failed,
+        "duration_seconds": round(duration, 2),
+        "objects_per_second": round(objects / duration, 2) if duration > 0 else 0,
+        "bytes_per_second": round(bytes_deleted / duration, 2) if duration > 0 else 0,
+    }
+
 
 def cleanup_s3_state(cluster_name: str, region: str):
     """Clean up S3 state bucket for OpenShift cluster."""
     try:
-        s3 = boto3.client("s3", region_name=region)
-        sts = boto3.client("sts")
+        s3 = get_client("s3", region_name=region)
 
         # Determine S3 bucket name (standard naming convention)
-        account_id = sts.get_caller_identity()["Account"]
+        account_id = get_account_id()
         bucket_name = f"openshift-clusters-{account_id}-{region}"
+        prefix = f"{cluster_name}/"
 
         try:
-            # List objects with cluster name prefix
-            objects = s3.list_objects_v2(Bucket=bucket_name, Prefix=f"{cluster_name}/")
-
-            if "Contents" in objects:
-                object_count = len(objects["Contents"])
-                if DRY_RUN:
-                    logger.info(
-                        f"[DRY-RUN] Would delete {object_count} S3 objects for {cluster_name}",
-                        extra={
-                            "dry_run": True,
-                            "bucket_name": bucket_name,
-                            "prefix": f"{cluster_name}/",
-                            "object_count": object_count,
-                        },
-                    )
+            if DRY_RUN:
+                object_count = 0
+                for batch in iter_object_batches(s3, bucket_name, prefix):
+                    object_count += len(batch)
                     # Log each object that would be deleted
-                    for obj in objects["Contents"]:
+                    for obj in batch:
                         logger.info(
                             "Would DELETE s3_object",
                             extra={
@@ -45,24 +148,25 @@ def cleanup_s3_state(cluster_name: str, region: str):
                                 "cluster_name": cluster_name,
                             },
                         )
-                else:
-                    # Delete and log each object
-                    for obj in objects["Contents"]:
-                        s3.delete_object(Bucket=bucket_name, Key=obj["Key"])
-                        logger.info(
-                            "DELETE s3_object",
-                            extra={
-                                "bucket_name": bucket_name,
-                                "object_key": obj["Key"],
-                                "cluster_name": cluster_name,
-                            },
-                        )
+                if object_count:
+                    logger.info(
+                        f"[DRY-RUN] Would delete {object_count} S3 objects for {cluster_name}",
+                        extra={
+                            "dry_run": True,
+                            "bucket_name": bucket_name,
+                            "prefix": prefix,
+                            "object_count": object_count,
+                        },
+                    )
+            else:
+                stats = delete_prefix(s3, bucket_name, prefix)
+                if stats["objects_deleted"] or stats["objects_failed"]:
                     logger.info(
                         f"Deleted S3 state for {cluster_name}",
                         extra={
                             "bucket_name": bucket_name,
-                            "objects_deleted": object_count,
                             "cluster_name": cluster_name,
+                            **stats,
                         },
                     )
         except ClientError as e:
@@ -0,0 +1,244 @@
+"""Dependency-graph teardown engine for OpenShift cluster resources.
+
+A cluster's resource types form a DAG: subnets cannot go before the NAT
+gateways and load balancers inside them, the VPC goes last, while load
+balancers, NAT gateways and VPC endpoints do not depend on each other at all.
+TeardownExecutor deletes every node whose dependencies are complete in
+parallel, and re-checks blocked nodes with exponential backoff for as long as
+the invocation's TimeBudget allows, instead of leaving them to the next
+scheduled run.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from ..utils import TimeBudget, get_logger
+from .inventory import RegionInventory
+
+logger = get_logger()
+
+PENDING = "pending"
+COMPLETE = "complete"
+BLOCKED = "blocked"
+
+
+@dataclass(frozen=True)
+class TeardownNode:
+    """One resource type in the teardown graph.
+
+    Attributes:
+        name: Node name used in dependencies and timing reports
+        action: Deletes the node's resources; returns True once none remain
+        depends_on: Nodes that must be complete before this one runs
+        refresh: RegionInventory kinds to re-describe before a retry
+    """
+
+    name: str
+    action: Callable[[], bool]
+    depends_on: tuple[str, ...] = ()
+    refresh: tuple[str, ...] = ()
+
+
+@dataclass
+class NodeResult:
+    """Outcome and timing of one node."""
+
+    name: str
+    status: str = PENDING
+    attempts: int = 0
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "attempts": self.attempts,
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+@dataclass
+class TeardownReport:
+    """Per-node results of one teardown run."""
+
+    nodes: dict[str, NodeResult] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return all(node.status == COMPLETE for node in self.nodes.values())
+
+    def is_complete(self, name: str) -> bool:
+        return self.nodes[name].status == COMPLETE
+
+    def completed_nodes(self) -> list[str]:
+        return [name for name, node in self.nodes.items() if node.status == COMPLETE]
+
+    def remaining_nodes(self) -> list[str]:
+        return [name for name, node in self.nodes.items() if node.status != COMPLETE]
+
+    def timings(self) -> dict[str, dict[str, Any]]:
+        return {name: node.to_dict() for name, node in self.nodes.items()}
+
+
+def _check_graph(nodes: dict[str, TeardownNode]) -> None:
+    """Raise ValueError on unknown dependencies or cycles."""
+    for node in nodes.values():
+        unknown = set(node.depends_on) - set(nodes)
+        if unknown:
+            raise ValueError(f"Node {node.name} depends on unknown nodes {unknown}")
+
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Teardown graph has a cycle through {name}")
+        visiting.add(name)
+        for dep in nodes[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in nodes:
+        visit(name)
+
+
+class TeardownExecutor:
+    """Run a teardown graph with parallel nodes and budgeted retries.
+
+    Without a budget every node is attempted at most once (dependents of a
+    blocked node are left for the next scheduled run). With a budget, blocked
+    nodes are retried after ``initial_backoff`` seconds, doubling up to
+    ``max_backoff``, while the wait still fits in the remaining time; the
+    node's inventory kinds are re-described first so it sees current state.
+    """
+
+    def __init__(
+        self,
+        nodes: list[TeardownNode],
+        max_workers: int = 4,
+        budget: TimeBudget | None = None,
+        initial_backoff: float = 5.0,
+        max_backoff: float = 60.0,
+        max_attempts: int = 8,
+        inventory: RegionInventory | None = None,
+        completed: Iterable[str] = (),
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.nodes = {node.name: node for node in nodes}
+        _check_graph(self.nodes)
+        self.max_workers = max(1, max_workers)
+        self.budget = budget
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts if budget is not None else 1
+        self.inventory = inventory
+        # Nodes finished by a previous run are not attempted again
+        self.completed = {name for name in completed if name in self.nodes}
+        self._sleep = sleep
+        self._clock = clock
+
+    def _backoff(self, attempts: int) -> float:
+        return float(min(self.max_backoff, self.initial_backoff * 2 ** (attempts - 1)))
+
+    def _run_node(self, node: TeardownNode) -> bool:
+        try:
+            return bool(node.action())
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") == "DependencyViolation":
+                return False
+            raise
+
+    def run(self) -> TeardownReport:
+        """Tear down the graph and report per-node status and timings."""
+        report = TeardownReport(nodes={name: NodeResult(name) for name in self.nodes})
+        results = report.nodes
+        for name in self.completed:
+            results[name].status = COMPLETE
+        next_attempt_at = dict.fromkeys(self.nodes, 0.0)
+        running: dict[Future[bool], tuple[str, float]] = {}
+        started = self._clock()
+
+        def eligible(name: str) -> bool:
+            result = results[name]
+            return (
+                result.status != COMPLETE
+                and result.attempts < self.max_attempts
+                and all(
+                    results[dep].status == COMPLETE
+                    for dep in self.nodes[name].depends_on
+                )
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="teardown"
+        ) as pool:
+            while True:
+                now = self._clock()
+                in_flight = {name for name, _ in running.values()}
+                waiting = [
+                    name
+                    for name in self.nodes
+                    if name not in in_flight and eligible(name)
+                ]
+                ready = [name for name in waiting if next_attempt_at[name] <= now]
+
+                for name in ready:
+                    node = self.nodes[name]
+                    if results[name].attempts:
+                        if self.budget is not None and not self.budget.allows(0):
+                            continue
+                        if self.inventory is not None and node.refresh:
+                            self.inventory.invalidate(*node.refresh)
+                    running[pool.submit(self._run_node, node)] = (name, self._clock())
+
+                if running:
+                    pending_retries = [
+                        next_attempt_at[name] for name in waiting if name not in ready
+                    ]
+                    timeout = (
+                        max(0.0, min(pending_retries) - now)
+                        if pending_retries
+                        else None
+                    )
+                    finished, _ = wait(
+                        running, timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+                    for future in finished:
+                        name, node_started = running.pop(future)
+                        result = results[name]
+                        result.attempts += 1
+                        result.duration_seconds += self._clock() - node_started
+                        if future.result():
+                            result.status = COMPLETE
+                        else:
+                            result.status = BLOCKED
+                            next_attempt_at[name] = self._clock() + self._backoff(
+                                result.attempts
+                            )
+                    continue
+
+                if not waiting:
+                    break
+
+                delay = max(0.0, min(next_attempt_at[name] for name in waiting) - now)
+                if self.budget is None or not self.budget.allows(delay):
+                    break
+                logger.debug(
+                    "Waiting to retry blocked teardown nodes",
+                    extra={"nodes": waiting, "delay_seconds": round(delay, 2)},
+                )
+                self._sleep(delay)
+
+        report.duration_seconds = self._clock() - started
+        return report
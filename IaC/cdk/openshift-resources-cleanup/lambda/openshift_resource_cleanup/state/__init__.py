@@ -0,0 +1,37 @@
+"""Persistent cleanup state shared across scheduled runs.
+
+Backends are imported on first access (PEP 562); a run only loads the one
+selected by STATE_BACKEND.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from .base import StateStore
+from .factory import get_state_store, reset_state_store
+
+_BACKENDS = {
+    "MemoryStateStore": "memory",
+    "SQLiteStateStore": "sqlite",
+    "DynamoDBStateStore": "dynamodb",
+}
+
+__all__ = [
+    "DynamoDBStateStore",
+    "MemoryStateStore",
+    "SQLiteStateStore",
+    "StateStore",
+    "get_state_store",
+    "reset_state_store",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _BACKENDS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
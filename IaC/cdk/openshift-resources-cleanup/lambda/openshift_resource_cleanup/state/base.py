@@ -0,0 +1,39 @@
+"""State store interface."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from ..models import ClusterProgress
+
+
+class StateStore(ABC):
+    """Keeps ClusterProgress records keyed by (region, infra_id), plus the
+    fingerprints of recently sent notifications."""
+
+    @abstractmethod
+    def get(self, region: str, infra_id: str) -> ClusterProgress | None:
+        """Return the stored progress of a cluster, or None if unknown."""
+
+    @abstractmethod
+    def put(self, progress: ClusterProgress) -> None:
+        """Create or replace a cluster's progress record."""
+
+    @abstractmethod
+    def list_region(self, region: str) -> list[ClusterProgress]:
+        """Return every progress record of a region."""
+
+    def pending(self, region: str) -> list[ClusterProgress]:
+        """Return clusters of a region whose teardown has not finished."""
+        return [p for p in self.list_region(region) if not p.is_complete]
+
+    @abstractmethod
+    def recent_notifications(self, since: float) -> set[str]:
+        """Return fingerprints of notifications sent at or after ``since``."""
+
+    @abstractmethod
+    def record_notifications(
+        self, fingerprints: Iterable[str], sent_at: float, keep_seconds: float
+    ) -> None:
+        """Remember fingerprints as notified at ``sent_at`` for ``keep_seconds``."""
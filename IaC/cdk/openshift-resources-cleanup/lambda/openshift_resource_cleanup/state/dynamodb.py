@@ -0,0 +1,123 @@
+"""DynamoDB state store used in production.
+
+Table layout: partition key ``region`` (S), sort key ``infra_id`` (S), so a
+region's clusters are read with a single Query. The full record is kept as a
+JSON string in ``data``; ``expires_at`` drives DynamoDB TTL so finished
+clusters age out on their own.
+
+Notification fingerprints share the table under the ``#notifications``
+partition (no AWS region has that name), one item per fingerprint, expiring
+with the deduplication window.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterable
+
+from ..models import ClusterProgress
+from ..utils import get_client
+from .base import StateStore
+
+# Days a record is kept after its last teardown attempt
+STATE_TTL_DAYS = 30
+
+NOTIFICATIONS_PARTITION = "#notifications"
+
+# BatchWriteItem accepts at most 25 requests
+BATCH_WRITE_SIZE = 25
+
+
+class DynamoDBStateStore(StateStore):
+    """Store backed by a DynamoDB table."""
+
+    def __init__(self, table_name: str):
+        if not table_name:
+            raise ValueError("STATE_TABLE_NAME is required for the dynamodb backend")
+        self.table_name = table_name
+
+    @property
+    def _client(self):
+        return get_client("dynamodb")
+
+    def get(self, region: str, infra_id: str) -> ClusterProgress | None:
+        item = self._client.get_item(
+            TableName=self.table_name,
+            Key={"region": {"S": region}, "infra_id": {"S": infra_id}},
+            ConsistentRead=True,
+        ).get("Item")
+        return (
+            ClusterProgress.from_dict(json.loads(item["data"]["S"])) if item else None
+        )
+
+    def put(self, progress: ClusterProgress) -> None:
+        last_attempt = progress.last_attempt_at or time.time()
+        self._client.put_item(
+            TableName=self.table_name,
+            Item={
+                "region": {"S": progress.region},
+                "infra_id": {"S": progress.infra_id},
+                "phase": {"S": progress.phase},
+                "data": {"S": json.dumps(progress.to_dict())},
+                "expires_at": {"N": str(int(last_attempt + STATE_TTL_DAYS * 86400))},
+            },
+        )
+
+    def list_region(self, region: str) -> list[ClusterProgress]:
+        pages = self._client.get_paginator("query").paginate(
+            TableName=self.table_name,
+            KeyConditionExpression="#region = :region",
+            ExpressionAttributeNames={"#region": "region"},
+            ExpressionAttributeValues={":region": {"S": region}},
+            ConsistentRead=True,
+        )
+        return [
+            ClusterProgress.from_dict(json.loads(item["data"]["S"]))
+            for page in pages
+            for item in page.get("Items", [])
+        ]
+
+    def recent_notifications(self, since: float) -> set[str]:
+        pages = self._client.get_paginator("query").paginate(
+            TableName=self.table_name,
+            KeyConditionExpression="#region = :region",
+            FilterExpression="sent_at >= :since",
+            ExpressionAttributeNames={"#region": "region"},
+            ExpressionAttributeValues={
+                ":region": {"S": NOTIFICATIONS_PARTITION},
+                ":since": {"N": str(since)},
+            },
+            ProjectionExpression="infra_id",
+        )
+        return {
+            item["infra_id"]["S"] for page in pages for item in page.get("Items", [])
+        }
+
+    def record_notifications(
+        self, fingerprints: Iterable[str], sent_at: float, keep_seconds: float
+    ) -> None:
+        expires_at = str(int(sent_at + keep_seconds))
+        requests = [
+            {
+                "PutRequest": {
+                    "Item": {
+                        "region": {"S": NOTIFICATIONS_PARTITION},
+                        "infra_id": {"S": fingerprint},
+                        "sent_at": {"N": str(sent_at)},
+                        "expires_at": {"N": expires_at},
+                    }
+                }
+            }
+            for fingerprint in fingerprints
+        ]
+        for start in range(0, len(requests), BATCH_WRITE_SIZE):
+            batch = {self.table_name: requests[start : start + BATCH_WRITE_SIZE]}
+            # Retry throttled leftovers a few times; a lost fingerprint only
+            # means the cluster may be reported once more
+            for _ in range(3):
+                batch = self._client.batch_write_item(RequestItems=batch).get(
+                    "UnprocessedItems", {}
+                )
+                if not batch:
+                    break
@@ -0,0 +1,39 @@
+"""Process-wide state store selected by STATE_BACKEND."""
+
+from __future__ import annotations
+
+import threading
+
+from ..models.config import STATE_BACKEND, STATE_SQLITE_PATH, STATE_TABLE_NAME
+from .base import StateStore
+
+_store: StateStore | None = None
+_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Return the configured state store, creating it on first use."""
+    global _store
+    with _lock:
+        if _store is None:
+            # Import only the selected backend
+            if STATE_BACKEND == "dynamodb":
+                from .dynamodb import DynamoDBStateStore
+
+                _store = DynamoDBStateStore(STATE_TABLE_NAME)
+            elif STATE_BACKEND == "sqlite":
+                from .sqlite import SQLiteStateStore
+
+                _store = SQLiteStateStore(STATE_SQLITE_PATH)
+            else:
+                from .memory import MemoryStateStore
+
+                _store = MemoryStateStore()
+        return _store
+
+
+def reset_state_store() -> None:
+    """Drop the cached store (used by tests)."""
+    global _store
+    with _lock:
+        _store = None
@@ -0,0 +1,52 @@
+"""In-memory state store (tests and local runs; survives warm invocations only)."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+
+from ..models import ClusterProgress
+from .base import StateStore
+
+
+class MemoryStateStore(StateStore):
+    """Dictionary-backed store; records are copied in and out."""
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[str, str], dict] = {}
+        self._notified: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, region: str, infra_id: str) -> ClusterProgress | None:
+        with self._lock:
+            data = self._records.get((region, infra_id))
+        return ClusterProgress.from_dict(data) if data is not None else None
+
+    def put(self, progress: ClusterProgress) -> None:
+        with self._lock:
+            self._records[(progress.region, progress.infra_id)] = progress.to_dict()
+
+    def list_region(self, region: str) -> list[ClusterProgress]:
+        with self._lock:
+            records = [
+                data
+                for (rec_region, _), data in self._records.items()
+                if rec_region == region
+            ]
+        return [ClusterProgress.from_dict(data) for data in records]
+
+    def recent_notifications(self, since: float) -> set[str]:
+        with self._lock:
+            return {fp for fp, sent_at in self._notified.items() if sent_at >= since}
+
+    def record_notifications(
+        self, fingerprints: Iterable[str], sent_at: float, keep_seconds: float
+    ) -> None:
+        with self._lock:
+            for fingerprint in fingerprints:
+                self._notified[fingerprint] = sent_at
+            # Prune so a long-lived warm container does not grow without bound
+            cutoff = sent_at - keep_seconds
+            self._notified = {
+                fp: at for fp, at in self._notified.items() if at >= cutoff
+            }
@@ -0,0 +1,88 @@
+"""SQLite state store for local runs and tests."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+
+from ..models import ClusterProgress
+from .base import StateStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cluster_progress (
+    region TEXT NOT NULL,
+    infra_id TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (region, infra_id)
+);
+CREATE TABLE IF NOT EXISTS notifications (
+    fingerprint TEXT PRIMARY KEY,
+    sent_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteStateStore(StateStore):
+    """Single-file store; one connection shared by all threads under a lock."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def get(self, region: str, infra_id: str) -> ClusterProgress | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM cluster_progress WHERE region = ? AND infra_id = ?",
+                (region, infra_id),
+            ).fetchone()
+        return ClusterProgress.from_dict(json.loads(row[0])) if row else None
+
+    def put(self, progress: ClusterProgress) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cluster_progress (region, infra_id, phase, data)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    progress.region,
+                    progress.infra_id,
+                    progress.phase,
+                    json.dumps(progress.to_dict()),
+                ),
+            )
+
+    def list_region(self, region: str) -> list[ClusterProgress]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM cluster_progress WHERE region = ? ORDER BY infra_id",
+                (region,),
+            ).fetchall()
+        return [ClusterProgress.from_dict(json.loads(row[0])) for row in rows]
+
+    def recent_notifications(self, since: float) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint FROM notifications WHERE sent_at >= ?", (since,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record_notifications(
+        self, fingerprints: Iterable[str], sent_at: float, keep_seconds: float
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO notifications (fingerprint, sent_at) VALUES (?, ?)",
+                [(fingerprint, sent_at) for fingerprint in fingerprints],
+            )
+            self._conn.execute(
+                "DELETE FROM notifications WHERE sent_at < ?", (sent_at - keep_seconds,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
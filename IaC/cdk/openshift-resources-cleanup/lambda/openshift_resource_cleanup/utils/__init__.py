@@ -1,15 +1,42 @@
 """Utility functions for EC2 cleanup Lambda."""
 
+from .api_stats import ApiStats, get_api_stats, reset_api_stats
 from .aws_helpers import (
     convert_tags_to_dict,
-    has_valid_billing_tag,
     extract_cluster_name,
+    has_valid_billing_tag,
 )
+from .clients import clear_clients, get_account_id, get_client
+from .limiter import AimdLimiter, ApiLimiter, get_api_limiter
 from .logging_config import get_logger
+from .scheduler import DeadlineScheduler, ScheduleResult
+from .time_budget import (
+    TimeBudget,
+    clear_time_budget,
+    current_time_budget,
+    start_time_budget,
+)
+from .tracing import LazyTracer
 
 __all__ = [
+    "AimdLimiter",
+    "ApiLimiter",
+    "ApiStats",
+    "DeadlineScheduler",
+    "LazyTracer",
+    "ScheduleResult",
+    "TimeBudget",
+    "clear_clients",
+    "clear_time_budget",
     "convert_tags_to_dict",
-    "has_valid_billing_tag",
+    "current_time_budget",
     "extract_cluster_name",
+    "get_account_id",
+    "get_api_limiter",
+    "get_api_stats",
+    "get_client",
     "get_logger",
+    "has_valid_billing_tag",
+    "reset_api_stats",
+    "start_time_budget",
 ]
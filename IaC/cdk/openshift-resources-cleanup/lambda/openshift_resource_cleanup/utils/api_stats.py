@@ -0,0 +1,272 @@
+"""Per-operation AWS API accounting.
+
+Every client built by ``get_client`` is instrumented through botocore's event
+hooks, so calls are counted without touching the cleanup modules. For each
+(region, service, operation) the collector keeps the number of calls, failed
+calls, throttled attempts, retries and the latency of each call (retries and
+backoff included), which is what a slow invocation needs explained: whether
+``describe_load_balancers`` or ``delete_security_groups`` dominated, and
+whether AWS was pushing back.
+
+Stats are process-wide and reset at the start of each invocation.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+# Error codes AWS uses for request-rate throttling
+THROTTLE_ERROR_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "EC2ThrottledException",
+    }
+)
+
+PERCENTILES = (50, 90, 99)
+
+_CALL_KEY = "api_stats_call"
+
+
+def is_throttle(parsed: dict[str, Any] | None, status_code: int | None = None) -> bool:
+    """Return True if a parsed response is a throttling error."""
+    if status_code == 429:
+        return True
+    code = (parsed or {}).get("Error", {}).get("Code")
+    return code in THROTTLE_ERROR_CODES
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class OperationStats:
+    """Counters and latency samples for one (region, service, operation)."""
+
+    __slots__ = ("calls", "errors", "latencies", "retries", "throttles")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.throttles = 0
+        self.retries = 0
+        self.latencies: list[float] = []
+
+    def copy(self) -> OperationStats:
+        other = OperationStats()
+        other.calls, other.errors = self.calls, self.errors
+        other.throttles, other.retries = self.throttles, self.retries
+        other.latencies = list(self.latencies)
+        return other
+
+
+def _latency_summary(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    summary = {f"p{pct}": round(percentile(ordered, pct), 1) for pct in PERCENTILES}
+    summary["max"] = round(ordered[-1], 1) if ordered else 0.0
+    return summary
+
+
+def _totals(stats: list[OperationStats]) -> dict[str, int]:
+    return {
+        "calls": sum(s.calls for s in stats),
+        "errors": sum(s.errors for s in stats),
+        "throttles": sum(s.throttles for s in stats),
+        "retries": sum(s.retries for s in stats),
+    }
+
+
+class ApiStats:
+    """Thread-safe collector fed by botocore event hooks."""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._operations: dict[tuple[str, str, str], OperationStats] = {}
+
+    def _entry(self, region: str, service: str, operation: str) -> OperationStats:
+        key = (region, service, operation)
+        entry = self._operations.get(key)
+        if entry is None:
+            entry = self._operations[key] = OperationStats()
+        return entry
+
+    def record_call(
+        self,
+        region: str,
+        service: str,
+        operation: str,
+        latency_ms: float,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record one completed API call (all of its attempts)."""
+        with self._lock:
+            entry = self._entry(region, service, operation)
+            entry.calls += 1
+            entry.retries += retries
+            entry.errors += int(error)
+            entry.latencies.append(latency_ms)
+
+    def record_throttle(self, region: str, service: str, operation: str) -> None:
+        """Record one throttled attempt."""
+        with self._lock:
+            self._entry(region, service, operation).throttles += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    # botocore event handlers; all must return None so they never
+    # short-circuit a request or get read as a retry delay
+
+    def _before_call(self, model: Any, context: dict[str, Any], **kwargs: Any) -> None:
+        # after-call-error carries no operation model, so keep it with the start
+        context[_CALL_KEY] = (
+            model.service_model.service_name,
+            model.name,
+            self._clock(),
+        )
+
+    def _finish_call(
+        self, region: str, context: dict[str, Any], retries: int, error: bool
+    ) -> None:
+        call = context.pop(_CALL_KEY, None)
+        if call is None:
+            return
+        service, operation, started = call
+        latency_ms = (self._clock() - started) * 1000
+        self.record_call(region, service, operation, latency_ms, retries, error)
+
+    def _after_call(
+        self,
+        region: str,
+        context: dict[str, Any],
+        http_response: Any = None,
+        parsed: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = (parsed or {}).get("ResponseMetadata", {})
+        status = getattr(http_response, "status_code", None) or metadata.get(
+            "HTTPStatusCode", 200
+        )
+        self._finish_call(
+            region, context, metadata.get("RetryAttempts", 0), status >= 300
+        )
+
+    def _after_call_error(
+        self, region: str, context: dict[str, Any], **kwargs: Any
+    ) -> None:
+        self._finish_call(region, context, 0, True)
+
+    def _needs_retry(
+        self,
+        region: str,
+        operation: Any,
+        response: tuple[Any, dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if response is None:
+            return
+        http_response, parsed = response
+        if is_throttle(parsed, getattr(http_response, "status_code", None)):
+            self.record_throttle(
+                region, operation.service_model.service_name, operation.name
+            )
+
+    def instrument(self, client: Any) -> None:
+        """Register this collector's hooks on a boto3 client."""
+        events = getattr(getattr(client, "meta", None), "events", None)
+        if events is None:
+            return
+        region = getattr(client.meta, "region_name", None) or "global"
+
+        def after_call(**kwargs: Any) -> None:
+            self._after_call(region, **kwargs)
+
+        def after_call_error(**kwargs: Any) -> None:
+            self._after_call_error(region, **kwargs)
+
+        def needs_retry(**kwargs: Any) -> None:
+            self._needs_retry(region, **kwargs)
+
+        events.register("before-call", self._before_call, unique_id="api-stats-before")
+        events.register("after-call", after_call, unique_id="api-stats-after")
+        events.register(
+            "after-call-error", after_call_error, unique_id="api-stats-error"
+        )
+        events.register("needs-retry", needs_retry, unique_id="api-stats-retry")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Summarize the stats collected so far.
+
+        Returns:
+            Totals, plus per region the totals and per-operation counts with
+            latency percentiles in milliseconds. Operations are keyed
+            ``service:Operation`` and sorted by total latency, slowest first.
+        """
+        with self._lock:
+            items = [(key, entry.copy()) for key, entry in self._operations.items()]
+
+        regions: dict[str, list[tuple[str, OperationStats]]] = {}
+        for (region, service, operation), entry in items:
+            regions.setdefault(region, []).append((f"{service}:{operation}", entry))
+
+        by_region = {}
+        for region, entries in sorted(regions.items()):
+            entries.sort(key=lambda item: sum(item[1].latencies), reverse=True)
+            by_region[region] = {
+                **_totals([entry for _, entry in entries]),
+                "operations": {
+                    name: {
+                        "calls": entry.calls,
+                        "errors": entry.errors,
+                        "throttles": entry.throttles,
+                        "retries": entry.retries,
+                        "latency_ms": _latency_summary(entry.latencies),
+                    }
+                    for name, entry in entries
+                },
+            }
+        return {**_totals([entry for _, entry in items]), "regions": by_region}
+
+    def latency_by_operation(self) -> dict[str, dict[str, float]]:
+        """Latency percentiles per ``service:Operation`` across all regions."""
+        with self._lock:
+            merged: dict[str, list[float]] = {}
+            for (_, service, operation), entry in self._operations.items():
+                merged.setdefault(f"{service}:{operation}", []).extend(entry.latencies)
+        return {
+            name: _latency_summary(values) for name, values in sorted(merged.items())
+        }
+
+
+_stats = ApiStats()
+
+
+def get_api_stats() -> ApiStats:
+    """Return the process-wide collector used by ``get_client``."""
+    return _stats
+
+
+def reset_api_stats() -> None:
+    """Start accounting afresh (each invocation, tests)."""
+    _stats.reset()
@@ -1,8 +1,10 @@
 """AWS helper functions."""
 
 from __future__ import annotations
+
 import datetime
 from typing import Any
+
 from .logging_config import get_logger
 
 logger = get_logger()
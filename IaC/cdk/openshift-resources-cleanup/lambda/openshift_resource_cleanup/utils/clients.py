@@ -0,0 +1,123 @@
+"""Process-wide boto3 client registry.
+
+Creating a boto3 client loads and parses service models, which costs
+noticeable CPU per call. Clients are thread-safe once built, so one client per
+(service, region) is created lazily and reused by every cleanup module and
+across warm Lambda invocations. Each new client gets the shared throttle-aware
+admission control (see limiter.py) and per-operation API accounting (see
+api_stats.py).
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from typing import Any
+
+from ..models.config import FAN_OUT_MAX_CONCURRENCY
+from .api_stats import get_api_stats
+from .limiter import get_api_limiter
+
+
+@functools.cache
+def _client_configs() -> tuple[Any, dict[str, Any]]:
+    """Build the shared and per-service client configurations.
+
+    botocore (and boto3 with it) takes well over 100 ms to import, so it is
+    only loaded when the first client is built, not when the package is.
+    """
+    from botocore.config import Config
+
+    # Shared client configuration:
+    # - adaptive retries back off client-side when AWS starts throttling
+    # - the connection pool is sized for concurrent region and resource workers
+    client_config = Config(
+        retries={"max_attempts": 10, "mode": "adaptive"},
+        max_pool_connections=50,
+        connect_timeout=10,
+        read_timeout=60,
+    )
+
+    # Per-service overrides merged over the shared configuration:
+    # - lambda: fan-out workers are invoked synchronously and may run for the
+    #   full 15-minute Lambda maximum; retrying a timed-out invoke would run a
+    #   worker twice; every concurrent invoke holds its own connection
+    service_config = {
+        "lambda": Config(
+            read_timeout=900,
+            retries={"total_max_attempts": 1},
+            max_pool_connections=FAN_OUT_MAX_CONCURRENCY,
+        ),
+    }
+    return client_config, service_config
+
+
+def __getattr__(name: str) -> Any:
+    # Lazily resolved module attributes (PEP 562), kept so that callers and
+    # tests can keep using clients.boto3 and clients.CLIENT_CONFIG
+    if name == "boto3":
+        import boto3
+
+        return boto3
+    if name == "CLIENT_CONFIG":
+        return _client_configs()[0]
+    if name == "SERVICE_CONFIG":
+        return _client_configs()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_clients: dict[tuple[str, str | None], Any] = {}
+_account_id: str | None = None
+_lock = threading.Lock()
+
+
+def get_client(service_name: str, region_name: str | None = None) -> Any:
+    """Return the cached boto3 client for a service/region pair.
+
+    Args:
+        service_name: AWS service name (e.g. "ec2", "route53")
+        region_name: AWS region, or None for the default/global endpoint
+
+    Returns:
+        A boto3 client shared by all callers in this process
+    """
+    key = (service_name, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    # boto3's default session is not thread-safe during client creation
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+
+            config, service_config = _client_configs()
+            if service_name in service_config:
+                config = config.merge(service_config[service_name])
+            client = boto3.client(service_name, region_name=region_name, config=config)
+            # Limiter first, so accounted latency excludes admission waits
+            get_api_limiter().instrument(client)
+            get_api_stats().instrument(client)
+            _clients[key] = client
+    return client
+
+
+def get_account_id() -> str:
+    """Return the caller's AWS account ID, looked up once per container."""
+    global _account_id
+    if _account_id is None:
+        account_id = get_client("sts").get_caller_identity()["Account"]
+        with _lock:
+            _account_id = account_id
+    return _account_id
+
+
+def clear_clients() -> None:
+    """Drop cached clients, their limiters and the account ID (tests,
+    credential changes)."""
+    global _account_id
+    with _lock:
+        _clients.clear()
+        _account_id = None
+    get_api_limiter().clear()
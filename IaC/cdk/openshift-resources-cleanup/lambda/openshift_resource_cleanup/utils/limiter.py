@@ -0,0 +1,295 @@
+"""Throttle-aware admission control for AWS API calls.
+
+Region workers, teardown workers and fan-out threads all share one client per
+(service, region), and AWS rate-limits per account, region and API family.
+Every call made through ``get_client`` is admitted by the limiter for its
+(service, region) before it is sent:
+
+- A concurrency limit caps calls in flight. It follows AIMD: each throttled
+  attempt (``RequestLimitExceeded``, ``Throttling``, ...) halves it, at most
+  once per cooldown window, and every successful call grows it back by
+  ``1/limit``, i.e. by about one slot per round of successful calls.
+- A token bucket per (service, region) paces the request rate to roughly the
+  published AWS refill rates, so bursts drain the bucket instead of earning
+  throttling errors.
+
+Lambda invocations are paced by their token bucket only. Fan-out invokes
+are synchronous and hold their call for as long as the worker runs, so a
+concurrency limit would silently cap ``FAN_OUT_CONCURRENCY`` at
+``API_MAX_CONCURRENCY`` and delay the rest of the workers.
+
+botocore's adaptive retry mode still backs off individual attempts; the
+limiter reduces how many attempts get throttled in the first place. Waiting is
+bounded: a call that cannot be admitted within ``max_wait_seconds`` is sent
+anyway and counted as a timeout, so a leaked slot can never wedge a run.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..models.config import API_MAX_CONCURRENCY, FAN_OUT_MAX_CONCURRENCY
+from .api_stats import is_throttle
+
+# (refill requests/second, bucket capacity) per service, after the published
+# AWS limits (EC2 non-mutating actions, Route 53 5 req/s per account, ...)
+SERVICE_RATES: dict[str, tuple[float, float]] = {
+    "ec2": (20.0, 100.0),
+    "elb": (10.0, 40.0),
+    "elbv2": (10.0, 40.0),
+    "route53": (5.0, 5.0),
+    "s3": (100.0, 200.0),
+    "sns": (30.0, 30.0),
+    "sts": (10.0, 10.0),
+    "dynamodb": (100.0, 200.0),
+    # The capacity admits a full fan-out at once
+    "lambda": (50.0, float(FAN_OUT_MAX_CONCURRENCY)),
+}
+# Services admitted by their token bucket only, without a concurrency limit
+RATE_ONLY_SERVICES = frozenset({"lambda"})
+DEFAULT_RATE = (10.0, 20.0)
+
+_SLOT_KEY = "api_limiter_slot"
+
+
+class TokenBucket:
+    """Request-rate bucket; callers serialize access."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def take(self) -> float:
+        """Reserve one token; return how long the caller must wait for it."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class AimdLimiter:
+    """AIMD concurrency limit plus token bucket for one (service, region).
+
+    With ``max_concurrency=None`` only the token bucket applies.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None,
+        rate: float,
+        capacity: float,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 1.0,
+        max_wait_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.bounded = max_concurrency is not None
+        self.max_concurrency = max(1, max_concurrency or 1)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._bucket = TokenBucket(rate, capacity, clock)
+        self._cond = threading.Condition()
+        self._last_decrease: float | None = None
+
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        """Zero the tuning counters; the learned limit is kept."""
+        with self._cond:
+            self.calls = 0
+            self.waits = 0
+            self.wait_seconds = 0.0
+            self.throttles = 0
+            self.decreases = 0
+            self.timeouts = 0
+            self.peak_in_flight = self.in_flight
+            self.lowest_limit = self.limit
+
+    def acquire(self) -> None:
+        """Block until a call may be sent."""
+        started = self._clock()
+        blocked = False
+        with self._cond:
+            deadline = started + self.max_wait_seconds
+            while self.bounded and self.in_flight >= int(self.limit):
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    break
+                blocked = True
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            self.calls += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self._bucket.take()
+
+        if delay > 0:
+            blocked = True
+            self._sleep(delay)
+        if blocked:
+            with self._cond:
+                self.waits += 1
+                self.wait_seconds += self._clock() - started
+
+    def release(self, success: bool) -> None:
+        """Return a slot; a successful call grows the limit additively."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if self.bounded and success and self.limit < self.max_concurrency:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def throttled(self) -> None:
+        """Record a throttled attempt; cut the limit multiplicatively."""
+        with self._cond:
+            self.throttles += 1
+            if not self.bounded:
+                return
+            now = self._clock()
+            if (
+                self._last_decrease is not None
+                and now - self._last_decrease < self.cooldown_seconds
+            ):
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+            self.lowest_limit = min(self.lowest_limit, self.limit)
+            self.decreases += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2) if self.bounded else None,
+                "lowest_limit": round(self.lowest_limit, 2) if self.bounded else None,
+                "max_concurrency": self.max_concurrency if self.bounded else None,
+                "rate_per_second": self._bucket.rate,
+                "calls": self.calls,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "throttles": self.throttles,
+                "decreases": self.decreases,
+                "timeouts": self.timeouts,
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+
+class ApiLimiter:
+    """One ``AimdLimiter`` per (service, region), attached to clients via hooks."""
+
+    def __init__(
+        self,
+        max_concurrency: int = API_MAX_CONCURRENCY,
+        rates: dict[str, tuple[float, float]] | None = None,
+        **limiter_options: Any,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rates = SERVICE_RATES if rates is None else rates
+        self._limiter_options = limiter_options
+        self._limiters: dict[tuple[str, str], AimdLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service: str, region: str) -> AimdLimiter:
+        """Return the limiter for a service/region pair, creating it once."""
+        key = (service, region)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(key)
+                if limiter is None:
+                    rate, capacity = self.rates.get(service, DEFAULT_RATE)
+                    limiter = AimdLimiter(
+                        None if service in RATE_ONLY_SERVICES else self.max_concurrency,
+                        rate,
+                        capacity,
+                        **self._limiter_options,
+                    )
+                    self._limiters[key] = limiter
+        return limiter
+
+    def instrument(self, client: Any) -> None:
+        """Register admission hooks on a boto3 client.
+
+        Register before other timing hooks so their latency excludes the
+        time spent waiting here.
+        """
+        events = getattr(getattr(client, "meta", None), "events", None)
+        if events is None:
+            return
+        limiter = self.get(
+            client.meta.service_model.service_name,
+            getattr(client.meta, "region_name", None) or "global",
+        )
+
+        def before_call(context: dict[str, Any], **kwargs: Any) -> None:
+            limiter.acquire()
+            context[_SLOT_KEY] = True
+
+        def after_call(
+            context: dict[str, Any], http_response: Any = None, **kwargs: Any
+        ) -> None:
+            if context.pop(_SLOT_KEY, False):
+                status = getattr(http_response, "status_code", 200)
+                limiter.release(success=status < 300)
+
+        def after_call_error(context: dict[str, Any], **kwargs: Any) -> None:
+            if context.pop(_SLOT_KEY, False):
+                limiter.release(success=False)
+
+        def needs_retry(response: Any = None, **kwargs: Any) -> None:
+            if response is not None:
+                http_response, parsed = response
+                if is_throttle(parsed, getattr(http_response, "status_code", None)):
+                    limiter.throttled()
+
+        events.register("before-call", before_call, unique_id="api-limiter-before")
+        events.register("after-call", after_call, unique_id="api-limiter-after")
+        events.register(
+            "after-call-error", after_call_error, unique_id="api-limiter-error"
+        )
+        events.register("needs-retry", needs_retry, unique_id="api-limiter-retry")
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        for limiter in limiters:
+            limiter.reset_counters()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Counters per ``service:region`` for limiters used since the reset."""
+        with self._lock:
+            limiters = list(self._limiters.items())
+        used = {
+            f"{service}:{region}": limiter.snapshot()
+            for (service, region), limiter in limiters
+            if limiter.calls
+        }
+        return dict(sorted(used.items()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+
+
+_limiter = ApiLimiter()
+
+
+def get_api_limiter() -> ApiLimiter:
+    """Return the process-wide limiter used by ``get_client``."""
+    return _limiter
@@ -0,0 +1,106 @@
+"""Deadline-aware execution of prioritised work items.
+
+Items run one at a time, highest priority first. Before each item starts the
+scheduler checks that the invocation budget still fits the longest item seen
+so far (or a configured minimum), and defers everything left once it does
+not. Deferred items are returned to the caller so they can be checkpointed
+and reported instead of being cut off by the Lambda timeout.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from .logging_config import get_logger
+from .time_budget import TimeBudget
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+
+@dataclass
+class ScheduleResult(Generic[T]):
+    """Outcome of one scheduler run, in execution order."""
+
+    completed: list[T] = field(default_factory=list)
+    failed: list[T] = field(default_factory=list)
+    deferred: list[T] = field(default_factory=list)
+    durations: list[float] = field(default_factory=list)
+
+    @property
+    def stopped_early(self) -> bool:
+        return bool(self.deferred)
+
+
+class DeadlineScheduler(Generic[T]):
+    """Run work items by descending priority until the budget runs out."""
+
+    def __init__(
+        self,
+        budget: TimeBudget | None,
+        estimate_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            budget: Invocation budget; None runs every item (local runs)
+            estimate_seconds: Minimum time assumed for one item before any
+                has finished
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.budget = budget
+        self.estimate_seconds = estimate_seconds
+        self._clock = clock
+
+    def run(
+        self,
+        items: Iterable[T],
+        priority: Callable[[T], float],
+        work: Callable[[T], bool],
+    ) -> ScheduleResult[T]:
+        """Execute ``work`` for each item, most urgent first.
+
+        Args:
+            items: Work items
+            priority: Higher values run first
+            work: Returns True when the item completed; exceptions count as
+                failures and do not stop the run
+
+        Returns:
+            Completed, failed and deferred items
+        """
+        result: ScheduleResult[T] = ScheduleResult()
+        queue = sorted(items, key=priority, reverse=True)
+        needed = self.estimate_seconds
+
+        for index, item in enumerate(queue):
+            if self.budget is not None and not self.budget.allows(needed):
+                result.deferred = queue[index:]
+                logger.warning(
+                    "Time budget exhausted, deferring remaining work",
+                    extra={
+                        "deferred_count": len(result.deferred),
+                        "remaining_seconds": round(self.budget.remaining_seconds(), 1),
+                        "needed_seconds": round(needed, 1),
+                    },
+                )
+                break
+
+            started = self._clock()
+            try:
+                ok = work(item)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Scheduled work item failed: {e}")
+                ok = False
+            duration = self._clock() - started
+
+            result.durations.append(duration)
+            (result.completed if ok else result.failed).append(item)
+            # Plan for the slowest item so far: cluster teardowns vary widely
+            needed = max(needed, duration)
+
+        return result
@@ -0,0 +1,76 @@
+"""Invocation time budget shared by long-running cleanup steps.
+
+The Lambda handler starts a budget from ``context.get_remaining_time_in_millis``
+so that deep helpers (e.g. the teardown graph waiting on a NAT gateway) can
+decide whether another retry fits before the invocation times out, without
+threading the Lambda context through every call.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class TimeBudget:
+    """Remaining invocation time minus a safety reserve."""
+
+    def __init__(
+        self, remaining_time_ms: Callable[[], int], reserve_seconds: float = 0.0
+    ):
+        self._remaining_time_ms = remaining_time_ms
+        self.reserve_seconds = reserve_seconds
+
+    def remaining_seconds(self) -> float:
+        """Seconds left for work after keeping the reserve."""
+        remaining = self._remaining_time_ms() / 1000.0 - self.reserve_seconds
+        return max(0.0, remaining)
+
+    def allows(self, seconds: float) -> bool:
+        """Return True if ``seconds`` of work still fit in the budget."""
+        return self.remaining_seconds() > seconds
+
+    def limited_to(self, seconds: float) -> TimeBudget:
+        """Budget that also runs out ``seconds`` from now."""
+        deadline = time.monotonic() + seconds
+
+        def remaining_time_ms() -> int:
+            own_ms = (deadline - time.monotonic() + self.reserve_seconds) * 1000
+            return int(min(self._remaining_time_ms(), own_ms))
+
+        return TimeBudget(remaining_time_ms, self.reserve_seconds)
+
+
+_current: TimeBudget | None = None
+
+
+def start_time_budget(
+    context: Any, reserve_seconds: float = 0.0, deadline: float | None = None
+) -> TimeBudget:
+    """Start the budget for the current invocation from a Lambda context.
+
+    ``deadline`` (Unix timestamp) ends the budget earlier than the invocation,
+    e.g. for a fan-out worker whose coordinator is waiting for it.
+    """
+    global _current
+    remaining_time_ms: Callable[[], int] = context.get_remaining_time_in_millis
+    if deadline is not None:
+        invocation_ms = remaining_time_ms
+
+        def remaining_time_ms() -> int:
+            return int(min(invocation_ms(), (deadline - time.time()) * 1000))
+
+    _current = TimeBudget(remaining_time_ms, reserve_seconds)
+    return _current
+
+
+def current_time_budget() -> TimeBudget | None:
+    """Return the active invocation budget, or None outside a Lambda invocation."""
+    return _current
+
+
+def clear_time_budget() -> None:
+    """Drop the active budget at the end of an invocation."""
+    global _current
+    _current = None
@@ -0,0 +1,79 @@
+"""Powertools Tracer created on first use.
+
+Constructing a Powertools ``Tracer`` imports the X-Ray SDK and patches
+botocore, which together cost a few hundred milliseconds of cold start even
+when tracing is off. ``LazyTracer`` offers the subset of the Tracer API this
+package uses; decorators are applied at import time as usual, but the real
+Tracer is only built when a traced function first runs, and never when
+Powertools would have disabled tracing anyway (outside Lambda, under SAM
+local, or with ``POWERTOOLS_TRACE_DISABLED`` set).
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from aws_lambda_powertools.shared.functions import resolve_truthy_env_var_choice
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def tracing_enabled() -> bool:
+    """Return True if Powertools would record traces in this environment."""
+    if resolve_truthy_env_var_choice(
+        env=os.getenv("POWERTOOLS_TRACE_DISABLED", "false")
+    ):
+        return False
+    if os.getenv("AWS_SAM_LOCAL"):
+        return False
+    return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+
+
+class LazyTracer:
+    """Defers building a Powertools Tracer until something is traced."""
+
+    def __init__(self, service: str):
+        self.service = service
+        self._tracer: Any = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Any:
+        if self._tracer is None:
+            with self._lock:
+                if self._tracer is None:
+                    from aws_lambda_powertools import Tracer
+
+                    self._tracer = Tracer(service=self.service)
+        return self._tracer
+
+    def _lazy_decorator(self, method: str, func: F) -> F:
+        traced: Callable[..., Any] | None = None
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            nonlocal traced
+            if not tracing_enabled():
+                return func(*args, **kwargs)
+            if traced is None:
+                traced = getattr(self._get(), method)(func)
+            return traced(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    def capture_lambda_handler(self, handler: F) -> F:
+        return self._lazy_decorator("capture_lambda_handler", handler)
+
+    def capture_method(self, method: F) -> F:
+        return self._lazy_decorator("capture_method", method)
+
+    def put_annotation(self, key: str, value: Any) -> None:
+        if tracing_enabled():
+            self._get().put_annotation(key=key, value=value)
+
+    def put_metadata(self, key: str, value: Any) -> None:
+        if tracing_enabled():
+            self._get().put_metadata(key=key, value=value)
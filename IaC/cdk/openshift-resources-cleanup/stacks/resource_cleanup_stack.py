@@ -1,9 +1,13 @@
 """CDK Stack for OpenShift Cluster Cleanup Lambda."""
 
 from aws_cdk import (
+    Aws,
     Stack,
     Duration,
+    RemovalPolicy,
+    aws_dynamodb as dynamodb,
     aws_lambda as lambda_,
+    aws_s3 as s3,
     aws_iam as iam,
     aws_sns as sns,
     aws_sns_subscriptions as subscriptions,
@@ -13,7 +17,10 @@ from aws_cdk import (
     aws_cloudwatch as cloudwatch,
     aws_cloudwatch_actions as cw_actions,
     CfnParameter,
+    CfnCondition,
     CfnOutput,
+    Fn,
+    Token,
     Tags
 )
 from constructs import Construct
@@ -38,6 +45,7 @@ class ResourceCleanupStack(Stack):
         iam_role_name = "RoleOpenShiftCleanup"
         sns_topic_name = "OpenShiftCleanupNotifications"
         schedule_rule_name = "OpenShiftCleanupSchedule"
+        state_table_name = "OpenShiftCleanupState"
         alarm_prefix = "OpenShiftCleanup"
 
         # Parameters
@@ -56,6 +64,23 @@ class ResourceCleanupStack(Stack):
             description="[NOTIFICATIONS] Email address for cleanup action reports. Leave empty to disable SNS notifications. Subscribe to SNS topic manually after deployment."
         )
 
+        notification_mode_param = CfnParameter(
+            self, "NotificationMode",
+            type="String",
+            default="region",
+            allowed_values=["digest", "region"],
+            description="[NOTIFICATIONS] 'digest' = one report per run for all regions, leaving out clusters already reported within NotificationDedupHours. 'region' = one report per region per run."
+        )
+
+        notification_dedup_hours_param = CfnParameter(
+            self, "NotificationDedupHours",
+            type="Number",
+            default=24,
+            min_value=0,
+            max_value=168,
+            description="[NOTIFICATIONS] Digest mode: hours during which a cluster that was already reported is left out of later reports. 0 reports every cluster on every run."
+        )
+
         openshift_cleanup_param = CfnParameter(
             self, "OpenShiftCleanupEnabled",
             type="String",
@@ -87,6 +112,40 @@ class ResourceCleanupStack(Stack):
             description="Regions to scan for clusters. Use 'all' (default) or comma-separated list (e.g., 'us-east-1,eu-west-1')."
         )
 
+        region_concurrency_param = CfnParameter(
+            self, "RegionConcurrency",
+            type="Number",
+            default=8,
+            min_value=1,
+            max_value=32,
+            description="[PERFORMANCE] Maximum number of regions scanned and cleaned up concurrently within one invocation. Higher values shorten runs across many regions at the cost of more parallel AWS API calls."
+        )
+
+        # Fan-out
+        fan_out_mode_param = CfnParameter(
+            self, "FanOutMode",
+            type="String",
+            default="off",
+            allowed_values=["off", "region", "cluster"],
+            description="[PERFORMANCE] 'off' = one invocation handles every region. 'region' = the scheduled invocation dispatches one worker invocation per region. 'cluster' = regions are scanned by workers, then each cluster is torn down by its own worker."
+        )
+
+        fan_out_concurrency_param = CfnParameter(
+            self, "FanOutConcurrency",
+            type="Number",
+            default=8,
+            min_value=1,
+            max_value=64,
+            description="[PERFORMANCE] Maximum worker invocations running at once in fan-out mode. The maximum of 64 is the number of invokes the coordinator's Lambda client runs at once without waiting. Fan-out removes the function's reserved concurrency of 1 so workers can run alongside the coordinator."
+        )
+
+        fan_out_enabled = CfnCondition(
+            self, "FanOutEnabled",
+            expression=Fn.condition_not(
+                Fn.condition_equals(fan_out_mode_param.value_as_string, "off")
+            ),
+        )
+
         # Logging
         log_retention_param = CfnParameter(
             self, "LogRetentionDays",
@@ -138,6 +197,7 @@ class ResourceCleanupStack(Stack):
                 # EC2 - VPC and network cleanup
                 "ec2:DescribeSecurityGroups",
                 "ec2:RevokeSecurityGroupIngress",
+                "ec2:RevokeSecurityGroupEgress",
                 "ec2:DeleteSecurityGroup",
                 "ec2:DescribeVpcs",
                 "ec2:DeleteVpc",
@@ -167,6 +227,7 @@ class ResourceCleanupStack(Stack):
 
                 # Route53 - DNS cleanup
                 "route53:ListHostedZones",
+                "route53:ListHostedZonesByName",
                 "route53:ListResourceRecordSets",
                 "route53:ChangeResourceRecordSets",
                 "route53:GetChange",
@@ -190,6 +251,55 @@ class ResourceCleanupStack(Stack):
             resources=[sns_topic.topic_arn]
         ))
 
+        # Fan-out workers are invocations of this same function. The ARN is
+        # built from its name rather than referenced so the role policy does
+        # not depend on the function (which depends on the role).
+        lambda_role.add_to_policy(iam.PolicyStatement(
+            effect=iam.Effect.ALLOW,
+            actions=["lambda:InvokeFunction"],
+            resources=[
+                f"arn:{self.partition}:lambda:{self.region}:{self.account}:function:{lambda_function_name}",
+                f"arn:{self.partition}:lambda:{self.region}:{self.account}:function:{lambda_function_name}:*",
+            ]
+        ))
+
+        # Cross-run teardown progress (one item per cluster, expired via TTL)
+        state_table = dynamodb.Table(
+            self, "CleanupStateTable",
+            table_name=state_table_name,
+            partition_key=dynamodb.Attribute(
+                name="region", type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="infra_id", type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="expires_at",
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        Tags.of(state_table).add("iit-billing-tag", "openshift-cleanup")
+
+        state_table.grant_read_write_data(lambda_role)
+
+        # Full NDJSON action listing of each run; the invocation response only
+        # carries the first RESPONSE_MAX_ACTIONS actions
+        actions_bucket = s3.Bucket(
+            self, "CleanupActionsBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            lifecycle_rules=[
+                s3.LifecycleRule(prefix="actions/", expiration=Duration.days(30))
+            ],
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
+        )
+
+        Tags.of(actions_bucket).add("iit-billing-tag", "openshift-cleanup")
+
+        actions_bucket.grant_put(lambda_role, "actions/*")
+
         # Map log retention parameter to CDK enum
         log_retention_mapping = {
             1: logs.RetentionDays.ONE_DAY,
@@ -225,7 +335,11 @@ class ResourceCleanupStack(Stack):
             role=lambda_role,
             timeout=Duration.seconds(600),
             memory_size=1024,
-            reserved_concurrent_executions=1,
+            # One run at a time; fan-out workers need unreserved concurrency
+            # (the coordinator caps them at FanOutConcurrency)
+            reserved_concurrent_executions=Token.as_number(
+                Fn.condition_if(fan_out_enabled.logical_id, Aws.NO_VALUE, 1)
+            ),
             log_group=log_group,
             environment={
                 "DRY_RUN": dry_run_param.value_as_string,
@@ -233,7 +347,18 @@ class ResourceCleanupStack(Stack):
                 "OPENSHIFT_CLEANUP_ENABLED": openshift_cleanup_param.value_as_string,
                 "OPENSHIFT_BASE_DOMAIN": openshift_domain_param.value_as_string,
                 "TARGET_REGIONS": regions_param.value_as_string,
-                "LOG_LEVEL": log_level_param.value_as_string
+                "REGION_CONCURRENCY": region_concurrency_param.value_as_string,
+                "FAN_OUT_MODE": fan_out_mode_param.value_as_string,
+                "FAN_OUT_CONCURRENCY": fan_out_concurrency_param.value_as_string,
+                "NOTIFICATION_MODE": notification_mode_param.value_as_string,
+                "NOTIFICATION_DEDUP_HOURS": notification_dedup_hours_param.value_as_string,
+                "STATE_BACKEND": "dynamodb",
+                "STATE_TABLE_NAME": state_table.table_name,
+                "ACTIONS_BUCKET": actions_bucket.bucket_name,
+                "LOG_LEVEL": log_level_param.value_as_string,
+                # Active X-Ray tracing is not enabled on this function; keep
+                # the tracer (and the X-Ray SDK) out of the cold start
+                "POWERTOOLS_TRACE_DISABLED": "true"
             }
         )
 
@@ -301,6 +426,18 @@ class ResourceCleanupStack(Stack):
             export_name="OpenShiftCleanupLambdaArn"
         )
 
+        CfnOutput(
+            self, "StateTableName",
+            description="DynamoDB table holding cross-run cleanup progress",
+            value=state_table.table_name
+        )
+
+        CfnOutput(
+            self, "ActionsBucketName",
+            description="S3 bucket holding the NDJSON action listing of each run",
+            value=actions_bucket.bucket_name
+        )
+
         CfnOutput(
             self, "SNSTopicArn",
             description="ARN of the SNS topic for notifications",
@@ -178,6 +178,26 @@ def volume_builder():
     return VolumeBuilder()
 
 
+@pytest.fixture(autouse=True)
+def _reset_aws_clients():
+    """Ensure cached boto3 clients never leak between tests."""
+    from openshift_resource_cleanup.utils import clear_clients
+
+    clear_clients()
+    yield
+    clear_clients()
+
+
+@pytest.fixture(autouse=True)
+def _reset_state_store():
+    """Give every test a fresh in-memory cleanup state store."""
+    from openshift_resource_cleanup.state import reset_state_store
+
+    reset_state_store()
+    yield
+    reset_state_store()
+
+
 @pytest.fixture
 def current_time():
     """Fixture for current time as Unix timestamp."""
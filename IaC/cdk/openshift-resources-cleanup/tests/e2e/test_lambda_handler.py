@@ -9,12 +9,26 @@ Tests focus on:
 from __future__ import annotations
 import datetime
 import json
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from botocore.exceptions import ClientError
 
-from openshift_resource_cleanup.handler import lambda_handler, cleanup_region
+from openshift_resource_cleanup.fanout import (
+    InProcessDispatcher,
+    LambdaDispatcher,
+    region_event,
+)
+from openshift_resource_cleanup.handler import (
+    lambda_handler,
+    cleanup_region,
+    cleanup_regions,
+    cleanup_regions_fan_out,
+    run_worker,
+)
 from openshift_resource_cleanup.models import CleanupAction
+from openshift_resource_cleanup.state import MemoryStateStore
+from openshift_resource_cleanup.utils import TimeBudget, current_time_budget
 
 
 @pytest.fixture
@@ -38,7 +52,7 @@ class TestLambdaHandlerEntryPoint:
     """Test the main Lambda handler entry point."""
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_no_actions_across_all_regions(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
     ):
@@ -67,7 +81,7 @@ class TestLambdaHandlerEntryPoint:
         assert body["actions"] == []
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
     def test_lambda_handler_includes_dry_run_flag(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
@@ -88,7 +102,7 @@ class TestLambdaHandlerEntryPoint:
         assert body["dry_run"] is True
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_aggregates_actions_correctly(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
     ):
@@ -124,7 +138,7 @@ class TestLambdaHandlerEntryPoint:
         assert body["by_action"]["STOP"] == 1
         assert body["by_action"]["TERMINATE_CLUSTER"] == 1
 
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_handles_describe_regions_failure(self, mock_boto_client, mock_lambda_context):
         """
         GIVEN describe_regions API call fails
@@ -148,7 +162,7 @@ class TestPartialFailureScenarios:
     """Test error propagation and partial failure handling."""
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_continues_after_region_failure(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
     ):
@@ -184,13 +198,80 @@ class TestPartialFailureScenarios:
         assert body["total_actions"] == 2
 
 
+@pytest.mark.e2e
+class TestConcurrentRegionScan:
+    """Test bounded concurrent region fan-out."""
+
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    def test_actions_merged_in_region_order(
+        self, mock_boto_client, mock_cleanup_region, mock_lambda_context
+    ):
+        """
+        GIVEN regions that finish in reverse order
+        WHEN lambda_handler is invoked
+        THEN actions should be merged in describe_regions order
+        """
+        import time
+
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        regions = ["us-east-1", "us-west-2", "eu-west-1"]
+        mock_ec2.describe_regions.return_value = {
+            "Regions": [{"RegionName": r} for r in regions]
+        }
+
+        delays = {"us-east-1": 0.06, "us-west-2": 0.03, "eu-west-1": 0.0}
+
+        def slow_region(region, execution_id=None):
+            time.sleep(delays[region])
+            return [CleanupAction(f"i-{region}", region, "n", "TERMINATE", "r", 1.0)]
+
+        mock_cleanup_region.side_effect = slow_region
+
+        result = lambda_handler({}, mock_lambda_context)
+
+        body = json.loads(result["body"])
+        assert [a["region"] for a in body["actions"]] == regions
+
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    def test_respects_max_workers(self, mock_cleanup_region):
+        """
+        GIVEN more regions than the concurrency limit
+        WHEN cleanup_regions is called
+        THEN no more than max_workers regions should run at once
+        """
+        import threading
+        import time
+
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def tracked_region(region, execution_id=None):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+            return []
+
+        mock_cleanup_region.side_effect = tracked_region
+        regions = [f"region-{i}" for i in range(8)]
+
+        results = cleanup_regions(regions, "exec-1", max_workers=2)
+
+        assert [region for region, _ in results] == regions
+        assert running["peak"] <= 2
+        assert mock_cleanup_region.call_count == 8
+
 
 @pytest.mark.e2e
 class TestLambdaEventHandling:
     """Test Lambda event validation and edge cases."""
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_accepts_empty_event(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
     ):
@@ -209,7 +290,7 @@ class TestLambdaEventHandling:
         assert result["statusCode"] == 200
 
     @patch("openshift_resource_cleanup.handler.cleanup_region")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     def test_lambda_handler_accepts_none_context(
         self, mock_boto_client, mock_cleanup_region, mock_lambda_context
     ):
@@ -226,3 +307,301 @@ class TestLambdaEventHandling:
         result = lambda_handler({}, mock_lambda_context)
 
         assert result["statusCode"] == 200
+
+
+def make_cluster_action(region: str, infra_id: str, days_overdue: float) -> CleanupAction:
+    return CleanupAction(
+        instance_id=f"i-{infra_id}",
+        region=region,
+        name=f"{infra_id}-master-0",
+        action="TERMINATE_OPENSHIFT_CLUSTER",
+        reason="OpenShift cluster TTL expired",
+        days_overdue=days_overdue,
+        cluster_name=infra_id.rsplit("-", 1)[0],
+        infra_id=infra_id,
+    )
+
+
+@pytest.mark.e2e
+@pytest.mark.aws
+class TestFanOut:
+    """Test the coordinator/worker fan-out mode with an in-process dispatcher."""
+
+    @patch("openshift_resource_cleanup.handler.make_dispatcher")
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.FAN_OUT_MODE", "region")
+    def test_region_workers_aggregated_into_one_report(
+        self, mock_boto_client, mock_cleanup_region, mock_make_dispatcher,
+        mock_lambda_context,
+    ):
+        """
+        GIVEN fan-out by region and two regions with one expired cluster each
+        WHEN lambda_handler is invoked
+        THEN each region should run in its own worker
+        AND the coordinator should report both clusters
+        """
+        mock_boto_client.return_value.describe_regions.return_value = {
+            "Regions": [{"RegionName": "us-east-1"}, {"RegionName": "eu-west-1"}]
+        }
+        mock_cleanup_region.side_effect = lambda region, execution_id=None, execute=True: [
+            make_cluster_action(region, f"{region}-abc12", 1.0)
+        ]
+        mock_make_dispatcher.return_value = InProcessDispatcher(
+            lambda event: lambda_handler(event, mock_lambda_context)
+        )
+
+        result = lambda_handler({}, mock_lambda_context)
+
+        body = json.loads(result["body"])
+        assert body["total_actions"] == 2
+        assert [a["region"] for a in body["actions"]] == ["us-east-1", "eu-west-1"]
+        assert all(
+            c.kwargs["execute"] is True for c in mock_cleanup_region.call_args_list
+        )
+
+    @patch("openshift_resource_cleanup.handler.send_notification")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
+    @patch("openshift_resource_cleanup.handler.NOTIFICATION_MODE", "region")
+    def test_cluster_workers_run_most_overdue_first(
+        self, mock_cleanup_region, mock_execute, mock_notify
+    ):
+        """
+        GIVEN fan-out by cluster and three expired clusters in two regions
+        WHEN cleanup_regions_fan_out runs
+        THEN regions should only be scanned by their workers
+        AND one cluster worker per cluster should run, most overdue first
+        """
+        scanned = {
+            "us-east-1": [
+                make_cluster_action("us-east-1", "a-abc12", 1.0),
+                make_cluster_action("us-east-1", "b-abc12", 9.0),
+            ],
+            "eu-west-1": [make_cluster_action("eu-west-1", "c-abc12", 4.0)],
+        }
+        mock_cleanup_region.side_effect = (
+            lambda region, execution_id=None, execute=True: scanned[region]
+        )
+        mock_execute.return_value = True
+
+        results = cleanup_regions_fan_out(
+            ["us-east-1", "eu-west-1"],
+            InProcessDispatcher(run_worker, max_workers=1),
+            mode="cluster",
+        )
+
+        assert all(
+            c.kwargs["execute"] is False for c in mock_cleanup_region.call_args_list
+        )
+        executed = [c.args[0].infra_id for c in mock_execute.call_args_list]
+        assert executed == ["b-abc12", "c-abc12", "a-abc12"]
+        assert [region for region, _ in results] == ["us-east-1", "eu-west-1"]
+        assert mock_notify.call_count == 2
+
+    @patch("openshift_resource_cleanup.handler.get_state_store")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.DRY_RUN", False)
+    @patch("openshift_resource_cleanup.handler.NOTIFICATION_MODE", "digest")
+    def test_cluster_workers_not_dispatched_past_coordinator_budget(
+        self, mock_cleanup_region, mock_execute, mock_get_store
+    ):
+        """
+        GIVEN fan-out by cluster and time left for only one cluster worker
+        WHEN cleanup_regions_fan_out runs
+        THEN the dispatched worker should receive the coordinator's deadline
+        AND the other cluster should be reported deferred and checkpointed
+        """
+        store = MemoryStateStore()
+        mock_get_store.return_value = store
+        mock_cleanup_region.side_effect = lambda region, execution_id=None, execute=True: [
+            make_cluster_action(region, "a-abc12", 1.0),
+            make_cluster_action(region, "b-abc12", 9.0),
+        ]
+        mock_execute.return_value = True
+        events = []
+
+        def worker(event):
+            events.append(event)
+            return run_worker(event)
+
+        remaining_ms = iter([300000, 300000, 30000])
+        results = cleanup_regions_fan_out(
+            ["us-east-1"],
+            InProcessDispatcher(worker, max_workers=1),
+            mode="cluster",
+            budget=TimeBudget(lambda: next(remaining_ms, 30000)),
+        )
+
+        cluster_events = [e for e in events if e["worker"] == "cluster"]
+        assert [e["action"]["infra_id"] for e in cluster_events] == ["b-abc12"]
+        assert all(e["deadline"] > time.time() for e in events)
+        deferred = [a.infra_id for _, actions in results for a in actions if a.deferred]
+        assert deferred == ["a-abc12"]
+        assert [p.infra_id for p in store.pending("us-east-1")] == ["a-abc12"]
+
+    @patch("openshift_resource_cleanup.handler.run_worker")
+    def test_worker_budget_ends_at_coordinator_deadline(
+        self, mock_run_worker, mock_lambda_context
+    ):
+        """
+        GIVEN a worker event whose coordinator deadline is 100s away
+        WHEN lambda_handler runs it with 300s of invocation time left
+        THEN the worker's time budget should end at the deadline
+        """
+        seen = []
+        mock_run_worker.side_effect = lambda event: seen.append(
+            current_time_budget().remaining_seconds()
+        ) or {}
+
+        lambda_handler(
+            {**region_event("us-east-1"), "deadline": time.time() + 100},
+            mock_lambda_context,
+        )
+
+        assert seen and seen[0] <= 100
+
+    def test_failed_worker_reported_without_aborting_others(self):
+        """
+        GIVEN a Lambda worker invocation that returns a function error
+        WHEN events are dispatched
+        THEN the failing worker should yield an error result
+        AND the other worker's payload should be returned
+        """
+        mock_lambda = Mock()
+
+        def invoke(FunctionName, InvocationType, Payload):
+            region = json.loads(Payload)["region"]
+            if region == "eu-west-1":
+                body, error = {"errorMessage": "Task timed out"}, "Unhandled"
+            else:
+                body, error = {"region": region, "actions": []}, None
+            response = {"Payload": Mock(read=Mock(return_value=json.dumps(body).encode()))}
+            if error:
+                response["FunctionError"] = error
+            return response
+
+        mock_lambda.invoke.side_effect = invoke
+
+        with patch("openshift_resource_cleanup.fanout.get_client", return_value=mock_lambda):
+            results = LambdaDispatcher("cleanup-fn").dispatch(
+                [region_event("us-east-1"), region_event("eu-west-1")]
+            )
+
+        assert results == [
+            {"region": "us-east-1", "actions": []},
+            {"error": "Task timed out"},
+        ]
+        assert mock_lambda.invoke.call_args.kwargs["InvocationType"] == "RequestResponse"
+
+
+@pytest.mark.e2e
+@pytest.mark.aws
+class TestDigestNotifications:
+    """Test run-wide digest reporting from lambda_handler."""
+
+    @patch("openshift_resource_cleanup.notifications.get_client")
+    @patch("openshift_resource_cleanup.handler.send_notification")
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.SNS_TOPIC_ARN", "arn:aws:sns:us-east-2:123456789012:t")
+    @patch("openshift_resource_cleanup.handler.NOTIFICATION_MODE", "digest")
+    def test_one_digest_per_run_then_suppressed(
+        self, mock_boto_client, mock_cleanup_region, mock_notify, mock_sns_client,
+        mock_lambda_context,
+    ):
+        """
+        GIVEN digest mode and expired clusters in two regions
+        WHEN lambda_handler runs twice in a row
+        THEN the first run should publish one digest for both regions
+        AND the second run should publish nothing
+        AND no per-region notification should be sent
+        """
+        mock_boto_client.return_value.describe_regions.return_value = {
+            "Regions": [{"RegionName": "us-east-1"}, {"RegionName": "eu-west-1"}]
+        }
+        mock_cleanup_region.side_effect = lambda region, execution_id=None, execute=True: [
+            make_cluster_action(region, f"{region}-abc12", 1.0)
+        ]
+        sns = mock_sns_client.return_value
+        sns.publish_batch.return_value = {"Successful": [{"Id": "0"}], "Failed": []}
+
+        lambda_handler({}, mock_lambda_context)
+        lambda_handler({}, mock_lambda_context)
+
+        assert sns.publish_batch.call_count == 1
+        entries = sns.publish_batch.call_args.kwargs["PublishBatchRequestEntries"]
+        assert "Total Clusters: 2 in 2 regions" in entries[0]["Message"]
+        mock_notify.assert_not_called()
+
+
+@pytest.mark.e2e
+@pytest.mark.aws
+class TestActionListing:
+    """Test the capped response and the NDJSON action listing."""
+
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.ACTIONS_BUCKET", "cleanup-actions")
+    @patch("openshift_resource_cleanup.handler.RESPONSE_MAX_ACTIONS", 3)
+    def test_response_capped_and_full_listing_uploaded(
+        self, mock_boto_client, mock_cleanup_region, mock_lambda_context
+    ):
+        """
+        GIVEN 10 expired clusters and a response cap of 3 actions
+        WHEN lambda_handler is invoked
+        THEN the response should list 3 actions and count all 10
+        AND all 10 should be uploaded as NDJSON to the actions bucket
+        """
+        client = mock_boto_client.return_value
+        client.describe_regions.return_value = {
+            "Regions": [{"RegionName": "us-east-1"}, {"RegionName": "eu-west-1"}]
+        }
+        mock_cleanup_region.side_effect = lambda region, execution_id=None: [
+            make_cluster_action(region, f"c{n}-{region}", float(n)) for n in range(5)
+        ]
+        uploaded = {}
+
+        def upload_fileobj(stream, bucket, key, ExtraArgs=None):
+            uploaded.update(bucket=bucket, key=key, body=stream.read())
+
+        client.upload_fileobj.side_effect = upload_fileobj
+
+        result = lambda_handler({}, mock_lambda_context)
+
+        body = json.loads(result["body"])
+        assert body["total_actions"] == 10
+        assert len(body["actions"]) == 3
+        assert body["actions_truncated"] is True
+        assert body["actions_uri"] == f"s3://cleanup-actions/{uploaded['key']}"
+        assert uploaded["key"].startswith("actions/")
+        assert uploaded["key"].endswith(".ndjson")
+        lines = [json.loads(line) for line in uploaded["body"].splitlines()]
+        assert len(lines) == 10
+        assert lines[:3] == body["actions"]
+
+    @patch("openshift_resource_cleanup.handler.cleanup_region")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.ACTIONS_BUCKET", "")
+    def test_no_upload_without_bucket(
+        self, mock_boto_client, mock_cleanup_region, mock_lambda_context
+    ):
+        """
+        GIVEN no actions bucket configured
+        WHEN lambda_handler finds expired clusters
+        THEN nothing should be uploaded and the response should have no listing URI
+        """
+        client = mock_boto_client.return_value
+        client.describe_regions.return_value = {"Regions": [{"RegionName": "us-east-1"}]}
+        mock_cleanup_region.return_value = [
+            make_cluster_action("us-east-1", "alpha-aaaaa", 1.0)
+        ]
+
+        result = lambda_handler({}, mock_lambda_context)
+
+        body = json.loads(result["body"])
+        assert body["actions_uri"] is None
+        assert body["actions_truncated"] is False
+        client.upload_fileobj.assert_not_called()
@@ -21,7 +21,7 @@ class TestCleanupRegionTTLValidation:
     """Test TTL validation in cleanup_region function."""
 
     @freeze_time("2025-01-15 12:00:00")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.openshift.detection.detect_openshift_infra_id")
     @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
@@ -41,7 +41,7 @@ class TestCleanupRegionTTLValidation:
 
         mock_ec2 = Mock()
         mock_boto_client.return_value = mock_ec2
-        mock_ec2.describe_instances.return_value = {
+        describe_instances_page = {
             "Reservations": [
                 {
                     "Instances": [
@@ -65,6 +65,9 @@ class TestCleanupRegionTTLValidation:
                 }
             ]
         }
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            describe_instances_page
+        ]
 
         # Mock OpenShift detection
         mock_detect_infra.return_value = "jvp-rosa1-abc12"
@@ -80,7 +83,7 @@ class TestCleanupRegionTTLValidation:
         )
 
     @freeze_time("2025-01-15 12:00:00")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.openshift.detection.detect_openshift_infra_id")
     @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
@@ -100,7 +103,7 @@ class TestCleanupRegionTTLValidation:
 
         mock_ec2 = Mock()
         mock_boto_client.return_value = mock_ec2
-        mock_ec2.describe_instances.return_value = {
+        describe_instances_page = {
             "Reservations": [
                 {
                     "Instances": [
@@ -124,6 +127,9 @@ class TestCleanupRegionTTLValidation:
                 }
             ]
         }
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            describe_instances_page
+        ]
 
         mock_detect_infra.return_value = "expired-cluster-xyz45"
 
@@ -139,7 +145,7 @@ class TestCleanupRegionTTLValidation:
         )
 
     @freeze_time("2025-01-15 12:00:00")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.openshift.detection.detect_openshift_infra_id")
     @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
@@ -153,7 +159,7 @@ class TestCleanupRegionTTLValidation:
         """
         mock_ec2 = Mock()
         mock_boto_client.return_value = mock_ec2
-        mock_ec2.describe_instances.return_value = {
+        describe_instances_page = {
             "Reservations": [
                 {
                     "Instances": [
@@ -176,6 +182,9 @@ class TestCleanupRegionTTLValidation:
                 }
             ]
         }
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            describe_instances_page
+        ]
 
         mock_detect_infra.return_value = "no-ttl-cluster-def67"
 
@@ -191,7 +200,7 @@ class TestCleanupRegionTTLValidation:
         assert actions[0].cluster_name == "no-ttl-cluster"
 
     @freeze_time("2025-01-15 12:00:00")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.openshift.detection.detect_openshift_infra_id")
     @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
@@ -205,7 +214,7 @@ class TestCleanupRegionTTLValidation:
         """
         mock_ec2 = Mock()
         mock_boto_client.return_value = mock_ec2
-        mock_ec2.describe_instances.return_value = {
+        describe_instances_page = {
             "Reservations": [
                 {
                     "Instances": [
@@ -228,6 +237,9 @@ class TestCleanupRegionTTLValidation:
                 }
             ]
         }
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            describe_instances_page
+        ]
 
         mock_detect_infra.return_value = "malformed-ttl-ghi89"
 
@@ -241,7 +253,7 @@ class TestCleanupRegionTTLValidation:
         )
 
     @freeze_time("2025-01-15 12:00:00")
-    @patch("openshift_resource_cleanup.handler.boto3.client")
+    @patch("openshift_resource_cleanup.handler.get_client")
     @patch("openshift_resource_cleanup.openshift.detection.detect_openshift_infra_id")
     @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
     @patch("openshift_resource_cleanup.handler.DRY_RUN", True)
@@ -261,7 +273,7 @@ class TestCleanupRegionTTLValidation:
 
         mock_ec2 = Mock()
         mock_boto_client.return_value = mock_ec2
-        mock_ec2.describe_instances.return_value = {
+        describe_instances_page = {
             "Reservations": [
                 {
                     "Instances": [
@@ -284,6 +296,9 @@ class TestCleanupRegionTTLValidation:
                 }
             ]
         }
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            describe_instances_page
+        ]
 
         mock_detect_infra.return_value = "boundary-jkl01"
 
@@ -293,3 +308,114 @@ class TestCleanupRegionTTLValidation:
         assert len(actions) == 1
         assert actions[0].action == "TERMINATE_OPENSHIFT_CLUSTER"
         assert actions[0].days_overdue >= 0
+
+
+@pytest.mark.integration
+@pytest.mark.openshift
+class TestCleanupRegionPaginatedDiscovery:
+    """Test paginated instance discovery in cleanup_region."""
+
+    @freeze_time("2025-01-15 12:00:00")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    @patch("openshift_resource_cleanup.handler.send_notification")
+    def test_discovers_clusters_beyond_first_page(
+        self, mock_notify, mock_execute, mock_boto_client
+    ):
+        """
+        GIVEN expired clusters spread across two describe_instances pages
+        WHEN cleanup_region is called
+        THEN clusters from every page should produce actions
+        """
+        expired = "1736884800"  # 2025-01-14 20:00:00 UTC, 14h TTL -> expired
+
+        def rosa_instance(instance_id: str, infra_id: str) -> dict:
+            return {
+                "InstanceId": instance_id,
+                "Tags": [
+                    {"Key": "Name", "Value": f"{infra_id}-master-0"},
+                    {"Key": "creation-time", "Value": expired},
+                    {"Key": "delete-cluster-after-hours", "Value": "14"},
+                    {"Key": "red-hat-clustertype", "Value": "rosa"},
+                    {"Key": f"kubernetes.io/cluster/{infra_id}", "Value": "owned"},
+                ],
+            }
+
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            {"Reservations": [{"Instances": [rosa_instance("i-1", "first-aaaaa")]}]},
+            {"Reservations": [{"Instances": [rosa_instance("i-2", "second-bbbbb")]}]},
+        ]
+
+        actions = cleanup_region("us-east-1", "test-exec-123")
+
+        assert [a.cluster_name for a in actions] == ["first", "second"]
+        mock_ec2.get_paginator.assert_called_once_with("describe_instances")
+
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    def test_action_lists_every_scanned_instance_of_cluster(
+        self, mock_execute, mock_boto_client
+    ):
+        """
+        GIVEN three instances of one expired cluster
+        WHEN cleanup_region is called
+        THEN one action should be created listing all three instances
+        """
+        expired = "1736884800"  # 2025-01-14 20:00:00 UTC, 14h TTL -> expired
+        instances = [
+            {
+                "InstanceId": f"i-{n}",
+                "Tags": [
+                    {"Key": "Name", "Value": f"first-aaaaa-master-{n}"},
+                    {"Key": "creation-time", "Value": expired},
+                    {"Key": "delete-cluster-after-hours", "Value": "14"},
+                    {"Key": "red-hat-clustertype", "Value": "rosa"},
+                    {"Key": "kubernetes.io/cluster/first-aaaaa", "Value": "owned"},
+                ],
+            }
+            for n in range(3)
+        ]
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            {"Reservations": [{"Instances": instances}]}
+        ]
+
+        actions = cleanup_region("us-east-1", "test-exec-123")
+
+        assert len(actions) == 1
+        assert actions[0].instance_ids == ["i-0", "i-1", "i-2"]
+
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    def test_pushes_state_and_tag_filters_to_server(
+        self, mock_execute, mock_boto_client
+    ):
+        """
+        GIVEN a region to scan
+        WHEN cleanup_region is called
+        THEN the paginator should receive state and tag-key filters
+        AND a second query should match installer-style instance names
+        """
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        mock_ec2.get_paginator.return_value.paginate.return_value = []
+
+        cleanup_region("us-east-1", "test-exec-123")
+
+        tag_call, name_call = (
+            mock_ec2.get_paginator.return_value.paginate.call_args_list
+        )
+        by_name = {f["Name"]: f["Values"] for f in tag_call.kwargs["Filters"]}
+        assert by_name["instance-state-name"] == ["running", "stopped"]
+        assert "kubernetes.io/cluster/*" in by_name["tag-key"]
+        assert "sigs.k8s.io/cluster-api-provider-aws/cluster/*" in by_name["tag-key"]
+        assert "red-hat-clustertype" in by_name["tag-key"]
+        assert "red-hat-managed" in by_name["tag-key"]
+
+        by_name = {f["Name"]: f["Values"] for f in name_call.kwargs["Filters"]}
+        assert by_name["instance-state-name"] == ["running", "stopped"]
+        assert "*-master-*" in by_name["tag:Name"]
+        assert "*openshift*" in by_name["tag:Name"]
@@ -0,0 +1,227 @@
+"""Integration tests for resuming OpenShift teardowns across scheduled runs."""
+
+from __future__ import annotations
+import time
+import pytest
+from unittest.mock import Mock, patch
+from botocore.exceptions import ClientError
+
+from openshift_resource_cleanup.ec2.instances import execute_cleanup_action
+from openshift_resource_cleanup.handler import cleanup_region
+from openshift_resource_cleanup.models import CleanupAction, ClusterProgress
+from openshift_resource_cleanup.state import MemoryStateStore
+from openshift_resource_cleanup.utils import TimeBudget
+from tests.conftest import InstanceBuilder
+
+
+def make_action() -> CleanupAction:
+    return CleanupAction(
+        instance_id="i-0123456789abcdef0",
+        region="us-east-1",
+        name="jvp-rosa1-qmdkk-master-0",
+        action="TERMINATE_OPENSHIFT_CLUSTER",
+        reason="OpenShift cluster TTL expired (1.00 days overdue)",
+        days_overdue=1.0,
+        cluster_name="jvp-rosa1",
+        infra_id="jvp-rosa1-qmdkk",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.openshift
+class TestExecuteCleanupActionWithState:
+    """Test execute_cleanup_action against a state store."""
+
+    @patch("openshift_resource_cleanup.ec2.instances.destroy_openshift_cluster")
+    @patch("openshift_resource_cleanup.ec2.instances.detect_openshift_infra_id")
+    @patch("openshift_resource_cleanup.ec2.instances.get_client")
+    @patch("openshift_resource_cleanup.ec2.instances.DRY_RUN", False)
+    def test_finished_cluster_only_terminates_scanned_instances(
+        self, mock_get_client, mock_detect, mock_destroy
+    ):
+        """
+        GIVEN a cluster recorded as complete whose instances are still scanned
+        WHEN execute_cleanup_action is called for it
+        THEN no detection or teardown call should be made
+        AND every scanned instance should be terminated
+        """
+        store = MemoryStateStore()
+        progress = ClusterProgress.from_action(make_action())
+        progress.record_attempt(True)
+        store.put(progress)
+        action = make_action()
+        action.instance_ids = ["i-0123456789abcdef0", "i-0fedcba9876543210"]
+
+        assert execute_cleanup_action(action, "us-east-1", state_store=store)
+
+        mock_detect.assert_not_called()
+        mock_destroy.assert_not_called()
+        mock_get_client.return_value.terminate_instances.assert_called_once_with(
+            InstanceIds=["i-0123456789abcdef0", "i-0fedcba9876543210"]
+        )
+
+    @patch("openshift_resource_cleanup.ec2.instances.destroy_openshift_cluster")
+    @patch("openshift_resource_cleanup.ec2.instances.detect_openshift_infra_id")
+    @patch("openshift_resource_cleanup.ec2.instances.get_client")
+    @patch("openshift_resource_cleanup.ec2.instances.DRY_RUN", False)
+    def test_failed_termination_not_recorded(
+        self, mock_get_client, mock_detect, mock_destroy
+    ):
+        """
+        GIVEN an expired cluster whose instances cannot be terminated
+        WHEN execute_cleanup_action is called for it
+        THEN the teardown should not run
+        AND no progress should be recorded
+        """
+        store = MemoryStateStore()
+        mock_get_client.return_value.terminate_instances.side_effect = ClientError(
+            {"Error": {"Code": "UnauthorizedOperation"}}, "TerminateInstances"
+        )
+
+        assert not execute_cleanup_action(make_action(), "us-east-1", state_store=store)
+
+        mock_destroy.assert_not_called()
+        assert store.get("us-east-1", "jvp-rosa1-qmdkk") is None
+
+    @patch("openshift_resource_cleanup.ec2.instances.destroy_openshift_cluster")
+    @patch("openshift_resource_cleanup.ec2.instances.detect_openshift_infra_id")
+    @patch("openshift_resource_cleanup.ec2.instances.get_client")
+    @patch("openshift_resource_cleanup.ec2.instances.DRY_RUN", False)
+    def test_instances_terminated_before_teardown_graph(
+        self, mock_get_client, mock_detect, mock_destroy
+    ):
+        """
+        GIVEN an expired cluster
+        WHEN execute_cleanup_action is called for it
+        THEN its instances should be terminated before the teardown graph runs
+        """
+        calls = Mock()
+        calls.attach_mock(mock_get_client.return_value.terminate_instances, "terminate")
+        calls.attach_mock(mock_destroy, "destroy")
+        mock_detect.return_value = "jvp-rosa1-qmdkk"
+        mock_destroy.return_value = False
+
+        execute_cleanup_action(make_action(), "us-east-1", state_store=MemoryStateStore())
+
+        assert [name for name, _, _ in calls.mock_calls] == ["terminate", "destroy"]
+
+    @patch("openshift_resource_cleanup.ec2.instances.destroy_openshift_cluster")
+    @patch("openshift_resource_cleanup.ec2.instances.detect_openshift_infra_id")
+    @patch("openshift_resource_cleanup.ec2.instances.get_client")
+    @patch("openshift_resource_cleanup.ec2.instances.DRY_RUN", False)
+    def test_unfinished_teardown_recorded_and_resumed(
+        self, mock_get_client, mock_detect, mock_destroy
+    ):
+        """
+        GIVEN a cluster whose teardown stops with nodes remaining
+        WHEN execute_cleanup_action runs twice
+        THEN the second run should receive the first run's completed nodes
+        AND the record should be complete once teardown succeeds
+        """
+        store = MemoryStateStore()
+        mock_detect.return_value = "jvp-rosa1-qmdkk"
+        seen_completed = []
+
+        def destroy(cluster_name, infra_id, region, inventory=None, progress=None):
+            seen_completed.append(list(progress.completed_nodes))
+            if not progress.completed_nodes:
+                progress.completed_nodes = ["load_balancers", "nat_gateways"]
+                progress.remaining_nodes = ["subnets", "vpc"]
+                return False
+            return True
+
+        mock_destroy.side_effect = destroy
+
+        execute_cleanup_action(make_action(), "us-east-1", state_store=store)
+        first = store.get("us-east-1", "jvp-rosa1-qmdkk")
+        assert first.remaining_nodes == ["subnets", "vpc"]
+        assert not first.is_complete
+
+        execute_cleanup_action(make_action(), "us-east-1", state_store=store)
+        second = store.get("us-east-1", "jvp-rosa1-qmdkk")
+
+        assert seen_completed == [[], ["load_balancers", "nat_gateways"]]
+        assert second.is_complete
+        assert second.attempts == 2
+
+
+@pytest.mark.integration
+@pytest.mark.openshift
+class TestCleanupRegionResume:
+    """Test cleanup_region resuming clusters missing from the instance scan."""
+
+    @patch("openshift_resource_cleanup.handler.send_notification")
+    @patch("openshift_resource_cleanup.handler.get_state_store")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.DRY_RUN", False)
+    def test_resumes_pending_cluster_after_instances_are_gone(
+        self, mock_get_client, mock_execute, mock_get_store, mock_notify
+    ):
+        """
+        GIVEN a cluster left mid-teardown whose instances are already terminated
+        WHEN cleanup_region scans the region
+        THEN the stored action should be executed again
+        """
+        store = MemoryStateStore()
+        store.put(ClusterProgress.from_action(make_action()))
+        mock_get_store.return_value = store
+        mock_ec2 = Mock()
+        mock_get_client.return_value = mock_ec2
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            {"Reservations": []}
+        ]
+
+        actions = cleanup_region("us-east-1")
+
+        assert actions == [make_action()]
+        mock_execute.assert_called_once()
+        assert mock_execute.call_args.kwargs["state_store"] is store
+
+    @patch("openshift_resource_cleanup.handler.send_notification")
+    @patch("openshift_resource_cleanup.handler.get_state_store")
+    @patch("openshift_resource_cleanup.handler.execute_cleanup_action")
+    @patch("openshift_resource_cleanup.handler.get_client")
+    @patch("openshift_resource_cleanup.handler.DRY_RUN", False)
+    @patch("openshift_resource_cleanup.handler.NOTIFICATION_MODE", "region")
+    def test_defers_and_checkpoints_clusters_past_deadline(
+        self, mock_get_client, mock_execute, mock_get_store, mock_notify
+    ):
+        """
+        GIVEN two expired clusters and time left for only one teardown
+        WHEN cleanup_region runs
+        THEN the most overdue cluster should be torn down
+        AND the other should be reported deferred and checkpointed
+        """
+        store = MemoryStateStore()
+        mock_get_store.return_value = store
+        now = time.time()
+        instances = [
+            InstanceBuilder()
+            .with_instance_id(f"i-{infra_id}")
+            .with_name(f"{infra_id}-master-0")
+            .with_tag("red-hat-clustertype", "rosa")
+            .with_openshift_tags(infra_id)
+            .with_ttl_tags(int(now - days * 86400), 1)
+            .build()
+            for infra_id, days in (("recent-abc12", 1), ("stale-def34", 5))
+        ]
+        mock_ec2 = Mock()
+        mock_get_client.return_value = mock_ec2
+        mock_ec2.get_paginator.return_value.paginate.return_value = [
+            {"Reservations": [{"Instances": instances}]}
+        ]
+        remaining_ms = iter([300000, 30000])
+
+        with patch(
+            "openshift_resource_cleanup.handler.current_time_budget",
+            return_value=TimeBudget(lambda: next(remaining_ms, 30000)),
+        ):
+            actions = cleanup_region("us-east-1")
+
+        mock_execute.assert_called_once()
+        assert mock_execute.call_args.args[0].infra_id == "stale-def34"
+        deferred = [action.infra_id for action in actions if action.deferred]
+        assert deferred == ["recent-abc12"]
+        assert [p.infra_id for p in store.pending("us-east-1")] == ["recent-abc12"]
+        assert mock_notify.call_args.args[0] == actions
@@ -28,7 +28,7 @@ class TestDestroyOpenshiftCluster:
     @patch("openshift_resource_cleanup.openshift.orchestrator.release_elastic_ips")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_nat_gateways")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_load_balancers")
-    @patch("openshift_resource_cleanup.openshift.orchestrator.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.get_client")
     @patch("openshift_resource_cleanup.models.config.DRY_RUN", False)
     def test_orchestrator_calls_functions_in_correct_order(
         self,
@@ -64,15 +64,15 @@ class TestDestroyOpenshiftCluster:
         assert result is True
 
         # Verify cleanup functions called once in correct order
-        mock_delete_lbs.assert_called_once_with("test-infra-123", "us-east-1")
-        mock_delete_nats.assert_called_once_with("test-infra-123", "us-east-1")
-        mock_release_eips.assert_called_once_with("test-infra-123", "us-east-1")
-        mock_cleanup_enis.assert_called_once_with("vpc-abc123", "us-east-1")
-        mock_delete_endpoints.assert_called_once_with("vpc-abc123", "us-east-1")
-        mock_delete_sgs.assert_called_once_with("vpc-abc123", "us-east-1")
-        mock_delete_subnets.assert_called_once_with("vpc-abc123", "us-east-1")
-        mock_delete_rts.assert_called_once_with("vpc-abc123", "us-east-1")
-        mock_delete_igw.assert_called_once_with("vpc-abc123", "us-east-1")
+        mock_delete_lbs.assert_called_once_with("test-infra-123", "us-east-1", inventory=None)
+        mock_delete_nats.assert_called_once_with("test-infra-123", "us-east-1", inventory=None)
+        mock_release_eips.assert_called_once_with("test-infra-123", "us-east-1", inventory=None)
+        mock_cleanup_enis.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
+        mock_delete_endpoints.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
+        mock_delete_sgs.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
+        mock_delete_subnets.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
+        mock_delete_rts.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
+        mock_delete_igw.assert_called_once_with("vpc-abc123", "us-east-1", inventory=None)
         mock_delete_vpc.assert_called_once_with("vpc-abc123", "us-east-1")
 
         # Route53 and S3 cleanup when VPC successfully deleted
@@ -83,7 +83,7 @@ class TestDestroyOpenshiftCluster:
     @patch("openshift_resource_cleanup.openshift.orchestrator.cleanup_route53_records")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_vpc")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_load_balancers")
-    @patch("openshift_resource_cleanup.openshift.orchestrator.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.get_client")
     def test_orchestrator_exits_early_when_vpc_not_found(
         self, mock_boto_client, mock_delete_lbs, mock_delete_vpc, mock_cleanup_route53, mock_cleanup_s3
     ):
@@ -114,7 +114,7 @@ class TestDestroyOpenshiftCluster:
     @patch("openshift_resource_cleanup.openshift.orchestrator.cleanup_route53_records")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_vpc")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_load_balancers")
-    @patch("openshift_resource_cleanup.openshift.orchestrator.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.get_client")
     def test_vpc_has_dependencies_returns_false(
         self,
         mock_boto_client,
@@ -146,7 +146,7 @@ class TestDestroyOpenshiftCluster:
 
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_vpc")
     @patch("openshift_resource_cleanup.openshift.orchestrator.delete_load_balancers")
-    @patch("openshift_resource_cleanup.openshift.orchestrator.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.get_client")
     def test_orchestrator_handles_dependency_violations(
         self, mock_boto_client, mock_delete_lbs, mock_delete_vpc
     ):
@@ -171,3 +171,45 @@ class TestDestroyOpenshiftCluster:
 
         # Should return False (dependencies remain)
         assert result is False
+
+    @patch("openshift_resource_cleanup.openshift.orchestrator.cleanup_s3_state")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.cleanup_route53_records")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.delete_vpc")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.delete_security_groups")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.delete_load_balancers")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
+    @patch("openshift_resource_cleanup.openshift.orchestrator.get_client")
+    def test_orchestrator_uses_region_inventory(
+        self,
+        mock_boto_client,
+        mock_network_client,
+        mock_delete_lbs,
+        mock_delete_sgs,
+        mock_delete_vpc,
+        mock_cleanup_route53,
+        mock_cleanup_s3,
+    ):
+        """
+        GIVEN a RegionInventory snapshot for the region
+        WHEN destroy_openshift_cluster is called with it
+        THEN the VPC should be resolved from the snapshot and passed to every step
+        """
+        inventory = Mock()
+        inventory.cluster_vpc_ids.return_value = ["vpc-snap"]
+        inventory.by_cluster.return_value = []
+        inventory.by_vpc.return_value = []
+        mock_delete_vpc.return_value = True
+
+        result = destroy_openshift_cluster(
+            "test-cluster", "test-infra-123", "us-east-1", inventory=inventory
+        )
+
+        assert result is True
+        mock_boto_client.return_value.describe_vpcs.assert_not_called()
+        inventory.cluster_vpc_ids.assert_called_once_with("test-infra-123")
+        mock_delete_lbs.assert_called_once_with(
+            "test-infra-123", "us-east-1", inventory=inventory
+        )
+        mock_delete_sgs.assert_called_once_with(
+            "vpc-snap", "us-east-1", inventory=inventory
+        )
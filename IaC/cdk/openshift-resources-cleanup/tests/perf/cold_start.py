@@ -0,0 +1,124 @@
+"""Measure the cold-start import cost of the Lambda handler.
+
+Each measurement runs in a fresh interpreter, as Lambda does on a cold start:
+
+- wall-clock time of ``import openshift_resource_cleanup.handler``
+- the modules that dominate ``python -X importtime``
+- which heavy modules (boto3, X-Ray, teardown code, ...) were loaded eagerly
+
+Run from the project directory::
+
+    PYTHONPATH=lambda python -m tests.perf.cold_start --runs 5 --top 15
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+HANDLER_MODULE = "openshift_resource_cleanup.handler"
+LAMBDA_DIR = Path(__file__).resolve().parents[2] / "lambda"
+
+# Modules that must only load once a client is built or a cluster torn down
+DEFERRED_MODULES = (
+    "boto3",
+    "botocore.session",
+    "botocore.config",
+    "aws_xray_sdk",
+    "sqlite3",
+    "openshift_resource_cleanup.openshift.orchestrator",
+    "openshift_resource_cleanup.openshift.teardown",
+    "openshift_resource_cleanup.state.dynamodb",
+)
+
+_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import {HANDLER_MODULE}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "import_seconds": elapsed,
+    "loaded": [m for m in {DEFERRED_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _environment() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(LAMBDA_DIR), env.get("PYTHONPATH")])
+    )
+    # Same settings as the deployed function
+    env.setdefault("POWERTOOLS_TRACE_DISABLED", "true")
+    env.setdefault("STATE_BACKEND", "dynamodb")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def probe_import() -> dict[str, Any]:
+    """Import the handler in a fresh interpreter and report time and modules."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        env=_environment(),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(top: int = 15) -> list[tuple[str, int]]:
+    """Return the ``top`` slowest imports as (module, cumulative microseconds)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {HANDLER_MODULE}"],
+        env=_environment(),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|", 2)
+        rows.append((module.strip(), int(cumulative)))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:top]
+
+
+def measure(runs: int = 5) -> dict[str, Any]:
+    """Import the handler ``runs`` times (after one warm-up) and summarize."""
+    probe_import()  # populate __pycache__ so every run measures the same thing
+    probes = [probe_import() for _ in range(max(1, runs))]
+    times = [probe["import_seconds"] for probe in probes]
+    return {
+        "runs": len(times),
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "min_ms": round(min(times) * 1000, 1),
+        "max_ms": round(max(times) * 1000, 1),
+        "eagerly_loaded": sorted({m for probe in probes for m in probe["loaded"]}),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args(argv)
+
+    report = measure(args.runs)
+    report["slowest_imports_ms"] = {
+        module: round(micros / 1000, 1) for module, micros in import_profile(args.top)
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
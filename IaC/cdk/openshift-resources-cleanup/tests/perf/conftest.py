@@ -0,0 +1,9 @@
+"""Fixtures specific to replay/benchmark tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _mark_as_slow(request):
+    """Automatically mark all tests in perf/ as slow tests."""
+    request.node.add_marker(pytest.mark.slow)
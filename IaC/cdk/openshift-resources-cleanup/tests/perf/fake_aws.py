@@ -0,0 +1,367 @@
+"""Fake boto3 layer backed by an in-memory account inventory.
+
+Implements the subset of EC2, ELB, ELBv2, Route53, S3, SNS and STS used by the
+cleanup Lambda: filtered and paginated describe/list calls, deletes that
+remove resources from the inventory, and a fixed per-request latency. Every
+request (each paginator page counts as one) is tallied per
+``service:operation`` so replays can assert API-call budgets.
+
+Account inventory layout (also the JSON fixture format)::
+
+    {
+      "account_id": "123456789012",
+      "hosted_zones": [{"Id": "/hostedzone/Z1", "Name": "cd.percona.com."}],
+      "record_sets": {"Z1": [<ResourceRecordSet>, ...]},
+      "buckets": {"<bucket>": [{"Key": ..., "Size": ...}, ...]},
+      "regions": {"<region>": {"instances": [...], "vpcs": [...], ...}}
+    }
+
+Region resource lists use the response shapes of the matching describe call
+(kinds follow ``RegionInventory.RESOURCE_SPECS``).
+"""
+
+from __future__ import annotations
+import copy
+import fnmatch
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Iterator
+
+from botocore.exceptions import ClientError
+
+# (service, operation) -> (region resource kind, result key, default page size)
+DESCRIBE_OPERATIONS = {
+    ("ec2", "describe_vpcs"): ("vpcs", "Vpcs", 1000),
+    ("ec2", "describe_subnets"): ("subnets", "Subnets", 1000),
+    ("ec2", "describe_route_tables"): ("route_tables", "RouteTables", 100),
+    ("ec2", "describe_internet_gateways"): (
+        "internet_gateways",
+        "InternetGateways",
+        1000,
+    ),
+    ("ec2", "describe_nat_gateways"): ("nat_gateways", "NatGateways", 1000),
+    ("ec2", "describe_addresses"): ("addresses", "Addresses", 0),
+    ("ec2", "describe_network_interfaces"): (
+        "network_interfaces",
+        "NetworkInterfaces",
+        1000,
+    ),
+    ("ec2", "describe_vpc_endpoints"): ("vpc_endpoints", "VpcEndpoints", 1000),
+    ("ec2", "describe_security_groups"): ("security_groups", "SecurityGroups", 1000),
+    ("elb", "describe_load_balancers"): (
+        "load_balancers",
+        "LoadBalancerDescriptions",
+        400,
+    ),
+    ("elbv2", "describe_load_balancers"): ("load_balancers_v2", "LoadBalancers", 400),
+}
+
+# (service, operation) -> (region resource kind, ID field, request parameter)
+DELETE_OPERATIONS = {
+    ("ec2", "delete_vpc"): ("vpcs", "VpcId", "VpcId"),
+    ("ec2", "delete_subnet"): ("subnets", "SubnetId", "SubnetId"),
+    ("ec2", "delete_route_table"): ("route_tables", "RouteTableId", "RouteTableId"),
+    ("ec2", "delete_internet_gateway"): (
+        "internet_gateways",
+        "InternetGatewayId",
+        "InternetGatewayId",
+    ),
+    ("ec2", "release_address"): ("addresses", "AllocationId", "AllocationId"),
+    ("ec2", "delete_network_interface"): (
+        "network_interfaces",
+        "NetworkInterfaceId",
+        "NetworkInterfaceId",
+    ),
+    ("ec2", "delete_security_group"): ("security_groups", "GroupId", "GroupId"),
+    ("elb", "delete_load_balancer"): (
+        "load_balancers",
+        "LoadBalancerName",
+        "LoadBalancerName",
+    ),
+    ("elbv2", "delete_load_balancer"): (
+        "load_balancers_v2",
+        "LoadBalancerArn",
+        "LoadBalancerArn",
+    ),
+}
+
+
+def _tag_keys(item: dict[str, Any]) -> list[str]:
+    return [tag["Key"] for tag in item.get("Tags") or []]
+
+
+def _matches(item: dict[str, Any], filters: list[dict[str, Any]]) -> bool:
+    """Apply EC2-style filters (names ANDed, values ORed, ``*`` wildcards)."""
+    for flt in filters:
+        name, values = flt["Name"], flt["Values"]
+        if name == "tag-key":
+            candidates = _tag_keys(item)
+        elif name.startswith("tag:"):
+            key = name[4:]
+            candidates = [t["Value"] for t in item.get("Tags") or [] if t["Key"] == key]
+        elif name == "instance-state-name":
+            candidates = [item["State"]["Name"]]
+        elif name == "state":
+            candidates = [item.get("State", "")]
+        elif name in ("vpc-id", "attachment.vpc-id"):
+            candidates = [item.get("VpcId", "")] + [
+                a.get("VpcId", "") for a in item.get("Attachments", [])
+            ]
+        else:
+            raise NotImplementedError(f"Fake filter not supported: {name}")
+        if not any(
+            fnmatch.fnmatchcase(candidate, value)
+            for candidate in candidates
+            for value in values
+        ):
+            return False
+    return True
+
+
+def _dns_order(name: str) -> list[str]:
+    return list(reversed(name.rstrip(".").split(".")))
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+class FakeAWS:
+    """Shared state behind every fake client of one replay."""
+
+    def __init__(self, account: dict[str, Any], latency_ms: float = 0.0):
+        self.account = copy.deepcopy(account)
+        self.latency_seconds = latency_ms / 1000.0
+        self.calls: Counter[str] = Counter()
+        self.published: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, service: str, operation: str) -> None:
+        """Count one request and apply the configured latency."""
+        with self._lock:
+            self.calls[f"{service}:{operation}"] += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def calls_by_service(self) -> dict[str, int]:
+        totals: Counter[str] = Counter()
+        for key, count in self.calls.items():
+            totals[key.split(":", 1)[0]] += count
+        return dict(totals)
+
+    def region(self, region: str | None) -> dict[str, list[dict[str, Any]]]:
+        return self.account["regions"].setdefault(region or "us-east-1", {})
+
+    def client(
+        self, service_name: str, region_name: str | None = None, **kwargs: Any
+    ) -> FakeClient:
+        """Drop-in replacement for ``boto3.client``."""
+        return FakeClient(self, service_name, region_name)
+
+
+class FakePaginator:
+    """Pages over a fake operation the way botocore paginators do."""
+
+    def __init__(self, client: FakeClient, operation: str):
+        self._client = client
+        self._operation = operation
+
+    def paginate(self, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        config = kwargs.pop("PaginationConfig", {}) or {}
+        return self._client._pages(self._operation, config.get("PageSize"), kwargs)
+
+
+class FakeClient:
+    """One fake service client bound to a region."""
+
+    def __init__(self, aws: FakeAWS, service: str, region: str | None):
+        self._aws = aws
+        self._service = service
+        self._region = region
+
+    def get_paginator(self, operation: str) -> FakePaginator:
+        return FakePaginator(self, operation)
+
+    def __getattr__(self, operation: str) -> Callable[..., dict[str, Any]]:
+        if operation.startswith("_") or operation == "meta":
+            # No botocore event system to instrument
+            raise AttributeError(operation)
+        key = (self._service, operation)
+        if key in DESCRIBE_OPERATIONS:
+            return lambda **kwargs: next(self._pages(operation, None, kwargs))
+        if key in DELETE_OPERATIONS:
+            return lambda **kwargs: self._delete(operation, kwargs)
+        handler = getattr(self, f"_{self._service}_{operation}", None)
+        if handler is None:
+            raise AttributeError(f"Fake {self._service} has no operation {operation}")
+
+        def call(**kwargs: Any) -> dict[str, Any]:
+            self._aws.record(self._service, operation)
+            result: dict[str, Any] = handler(**kwargs)
+            return result
+
+        return call
+
+    # ----- describe / list -----
+
+    def _pages(
+        self, operation: str, page_size: int | None, kwargs: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        if (self._service, operation) == ("ec2", "describe_instances"):
+            items = self._filtered("instances", kwargs.get("Filters", []))
+            size = page_size or 1000
+            for start in range(0, max(len(items), 1), size):
+                self._aws.record("ec2", "describe_instances")
+                chunk = items[start : start + size]
+                yield {"Reservations": [{"Instances": chunk}] if chunk else []}
+            return
+        if (self._service, operation) == ("s3", "list_objects_v2"):
+            yield from self._s3_pages(page_size or 1000, **kwargs)
+            return
+
+        kind, result_key, default_size = DESCRIBE_OPERATIONS[(self._service, operation)]
+        items = self._filtered(kind, kwargs.get("Filters", []))
+        size = page_size or default_size or max(len(items), 1)
+        for start in range(0, max(len(items), 1), size):
+            self._aws.record(self._service, operation)
+            yield {result_key: items[start : start + size]}
+
+    def _filtered(self, kind: str, filters: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        items = self._aws.region(self._region).get(kind, [])
+        return [copy.deepcopy(item) for item in items if _matches(item, filters)]
+
+    def _s3_pages(
+        self, page_size: int, Bucket: str, Prefix: str = "", **kwargs: Any
+    ) -> Iterator[dict[str, Any]]:
+        if Bucket not in self._aws.account.get("buckets", {}):
+            self._aws.record("s3", "list_objects_v2")
+            raise _client_error("NoSuchBucket", "ListObjectsV2")
+        objects = sorted(
+            (o for o in self._aws.account["buckets"][Bucket] if o["Key"].startswith(Prefix)),
+            key=lambda o: o["Key"],
+        )
+        for start in range(0, max(len(objects), 1), page_size):
+            self._aws.record("s3", "list_objects_v2")
+            chunk = objects[start : start + page_size]
+            yield {"Contents": [dict(o) for o in chunk]} if chunk else {}
+
+    # ----- deletes -----
+
+    def _delete(self, operation: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        self._aws.record(self._service, operation)
+        kind, id_field, param = DELETE_OPERATIONS[(self._service, operation)]
+        items = self._aws.region(self._region).setdefault(kind, [])
+        target = kwargs[param]
+        remaining = [item for item in items if item.get(id_field) != target]
+        if len(remaining) == len(items):
+            raise _client_error(f"Invalid{id_field}.NotFound", operation)
+        items[:] = remaining
+        return {}
+
+    def _ec2_describe_regions(self, **kwargs: Any) -> dict[str, Any]:
+        return {"Regions": [{"RegionName": r} for r in self._aws.account["regions"]]}
+
+    def _ec2_terminate_instances(self, InstanceIds: list[str]) -> dict[str, Any]:
+        for instance in self._aws.region(self._region).get("instances", []):
+            if instance["InstanceId"] in InstanceIds:
+                instance["State"] = {"Name": "terminated"}
+        return {"TerminatingInstances": [{"InstanceId": i} for i in InstanceIds]}
+
+    def _ec2_delete_nat_gateway(self, NatGatewayId: str) -> dict[str, Any]:
+        for nat in self._aws.region(self._region).get("nat_gateways", []):
+            if nat["NatGatewayId"] == NatGatewayId:
+                nat["State"] = "deleted"
+        return {"NatGatewayId": NatGatewayId}
+
+    def _ec2_delete_vpc_endpoints(self, VpcEndpointIds: list[str]) -> dict[str, Any]:
+        endpoints = self._aws.region(self._region).setdefault("vpc_endpoints", [])
+        endpoints[:] = [e for e in endpoints if e["VpcEndpointId"] not in VpcEndpointIds]
+        return {"Unsuccessful": []}
+
+    def _ec2_revoke_security_group_ingress(self, **kwargs: Any) -> dict[str, Any]:
+        return {"Return": True}
+
+    def _ec2_revoke_security_group_egress(self, **kwargs: Any) -> dict[str, Any]:
+        return {"Return": True}
+
+    def _ec2_detach_internet_gateway(
+        self, InternetGatewayId: str, VpcId: str
+    ) -> dict[str, Any]:
+        for igw in self._aws.region(self._region).get("internet_gateways", []):
+            if igw["InternetGatewayId"] == InternetGatewayId:
+                igw["Attachments"] = []
+        return {}
+
+    # ----- Route53 -----
+
+    def _route53_list_hosted_zones_by_name(
+        self, DNSName: str = "", **kwargs: Any
+    ) -> dict[str, Any]:
+        zones = sorted(
+            self._aws.account.get("hosted_zones", []), key=lambda z: _dns_order(z["Name"])
+        )
+        start = _dns_order(DNSName)
+        return {"HostedZones": [z for z in zones if _dns_order(z["Name"]) >= start]}
+
+    def _route53_list_resource_record_sets(
+        self,
+        HostedZoneId: str,
+        StartRecordName: str = "",
+        MaxItems: str = "300",
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        records = sorted(
+            self._aws.account.get("record_sets", {}).get(HostedZoneId, []),
+            key=lambda r: (_dns_order(r["Name"]), r["Type"]),
+        )
+        start = _dns_order(StartRecordName)
+        remaining = [r for r in records if _dns_order(r["Name"]) >= start]
+        size = int(MaxItems)
+        page: dict[str, Any] = {
+            "ResourceRecordSets": copy.deepcopy(remaining[:size]),
+            "IsTruncated": len(remaining) > size,
+        }
+        if page["IsTruncated"]:
+            page["NextRecordName"] = remaining[size]["Name"]
+            page["NextRecordType"] = remaining[size]["Type"]
+        return page
+
+    def _route53_change_resource_record_sets(
+        self, HostedZoneId: str, ChangeBatch: dict[str, Any]
+    ) -> dict[str, Any]:
+        records = self._aws.account.setdefault("record_sets", {}).setdefault(
+            HostedZoneId, []
+        )
+        deleted = {
+            (c["ResourceRecordSet"]["Name"], c["ResourceRecordSet"]["Type"])
+            for c in ChangeBatch["Changes"]
+            if c["Action"] == "DELETE"
+        }
+        records[:] = [r for r in records if (r["Name"], r["Type"]) not in deleted]
+        return {"ChangeInfo": {"Status": "PENDING"}}
+
+    # ----- S3, SNS, STS -----
+
+    def _s3_delete_objects(self, Bucket: str, Delete: dict[str, Any]) -> dict[str, Any]:
+        keys = {obj["Key"] for obj in Delete["Objects"]}
+        objects = self._aws.account["buckets"][Bucket]
+        objects[:] = [o for o in objects if o["Key"] not in keys]
+        return {} if Delete.get("Quiet") else {"Deleted": [{"Key": k} for k in keys]}
+
+    def _sns_publish(self, **kwargs: Any) -> dict[str, Any]:
+        self._aws.published.append(kwargs)
+        return {"MessageId": str(len(self._aws.published))}
+
+    def _sns_publish_batch(
+        self, TopicArn: str, PublishBatchRequestEntries: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        for entry in PublishBatchRequestEntries:
+            self._aws.published.append({"TopicArn": TopicArn, **entry})
+        return {
+            "Successful": [{"Id": e["Id"]} for e in PublishBatchRequestEntries],
+            "Failed": [],
+        }
+
+    def _sts_get_caller_identity(self) -> dict[str, Any]:
+        return {"Account": self._aws.account["account_id"]}
@@ -0,0 +1,200 @@
+"""Replay lambda_handler against a fake account and report its cost.
+
+The boto3 client factory behind ``utils.get_client`` is swapped for the fake
+layer in ``fake_aws``, so the whole pipeline (scan, detection, teardown
+graph, DNS, S3, notifications) runs unmodified against an inventory.
+
+Run from the project directory::
+
+    PYTHONPATH=lambda python -m tests.perf.replay --regions 20 --clusters 50 \\
+        --instances 5000 --latency-ms 5
+
+    PYTHONPATH=lambda python -m tests.perf.replay \\
+        --fixture tests/perf/fixtures/small_account.json --live
+
+    PYTHONPATH=lambda python -m tests.perf.replay \\
+        --fixture tests/perf/fixtures/small_account.json --plan
+"""
+
+from __future__ import annotations
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, redirect_stdout
+from typing import Any
+from unittest.mock import patch
+
+from .fake_aws import FakeAWS
+from .synthetic import load_account, save_account, synthetic_account
+
+PACKAGE = "openshift_resource_cleanup"
+
+
+class ReplayContext:
+    """Minimal Lambda context with a real countdown."""
+
+    function_name = "LambdaOpenShiftCleanup"
+    function_version = "$LATEST"
+    invoked_function_arn = (
+        "arn:aws:lambda:us-east-2:123456789012:function:LambdaOpenShiftCleanup"
+    )
+    memory_limit_in_mb = 1024
+    aws_request_id = "replay"
+    log_group_name = "/aws/lambda/LambdaOpenShiftCleanup"
+    log_stream_name = "replay"
+
+    def __init__(self, timeout_seconds: float = 600):
+        self._deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def run_replay(
+    account: dict[str, Any],
+    latency_ms: float = 0.0,
+    dry_run: bool = True,
+    trace_memory: bool = True,
+    log_level: str = "WARNING",
+) -> dict[str, Any]:
+    """Invoke lambda_handler once against ``account`` and measure it.
+
+    Returns:
+        Report with wall time, API calls per service and operation, peak
+        traced memory and the handler's response body
+    """
+    from openshift_resource_cleanup import handler
+    from openshift_resource_cleanup.openshift.dns import clear_zone_cache
+    from openshift_resource_cleanup.state import reset_state_store
+    from openshift_resource_cleanup.utils import clear_clients, get_logger
+
+    aws = FakeAWS(account, latency_ms=latency_ms)
+    logger = get_logger()
+    previous_level = logger.log_level
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(f"{PACKAGE}.utils.clients.boto3.client", side_effect=aws.client)
+        )
+        # Config constants are bound at import time in every module
+        for name, module in list(sys.modules.items()):
+            if name.startswith(PACKAGE) and hasattr(module, "DRY_RUN"):
+                stack.enter_context(patch.object(module, "DRY_RUN", dry_run))
+        stack.enter_context(patch.object(handler, "TARGET_REGIONS", "all"))
+        stack.enter_context(
+            patch.object(handler, "SNS_TOPIC_ARN", "arn:aws:sns:us-east-2:123456789012:replay")
+        )
+        clear_clients()
+        clear_zone_cache()
+        reset_state_store()
+        logger.setLevel(log_level)
+        # Keep EMF metric blobs out of the report output
+        stack.enter_context(redirect_stdout(io.StringIO()))
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            response = handler.lambda_handler({}, ReplayContext())
+        finally:
+            wall_seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+            if trace_memory:
+                tracemalloc.stop()
+            logger.setLevel(previous_level)
+            clear_clients()
+            clear_zone_cache()
+            reset_state_store()
+
+    body = json.loads(response["body"])
+    regions = account["regions"]
+    return {
+        "regions": len(regions),
+        "instances": sum(len(r.get("instances", [])) for r in regions.values()),
+        "vpcs": sum(len(r.get("vpcs", [])) for r in regions.values()),
+        "latency_ms": latency_ms,
+        "dry_run": dry_run,
+        "wall_seconds": round(wall_seconds, 3),
+        "total_actions": body["total_actions"],
+        "api_calls_total": sum(aws.calls.values()),
+        "api_calls": aws.calls_by_service(),
+        "api_calls_by_operation": dict(sorted(aws.calls.items())),
+        "notifications": len(aws.published),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "remaining": {
+            "vpcs": sum(len(r.get("vpcs", [])) for r in aws.account["regions"].values()),
+        },
+    }
+
+
+def plan_account(account: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build the dry-run teardown plan of every cluster VPC in ``account``."""
+    from openshift_resource_cleanup.openshift.inventory import (
+        CLUSTER_TAG_PREFIX,
+        RegionInventory,
+    )
+    from openshift_resource_cleanup.openshift.planner import plan_cluster_teardown
+    from openshift_resource_cleanup.utils import clear_clients
+
+    aws = FakeAWS(account)
+    plans = []
+    with patch(f"{PACKAGE}.utils.clients.boto3.client", side_effect=aws.client):
+        clear_clients()
+        try:
+            for region in account["regions"]:
+                inventory = RegionInventory(region)
+                for vpc in inventory.get("vpcs"):
+                    for tag in vpc.get("Tags", []):
+                        if tag["Key"].startswith(CLUSTER_TAG_PREFIX):
+                            infra_id = tag["Key"][len(CLUSTER_TAG_PREFIX) :]
+                            plans.append(
+                                plan_cluster_teardown(
+                                    infra_id.rsplit("-", 1)[0], infra_id, region, inventory
+                                ).to_dict()
+                            )
+        finally:
+            clear_clients()
+    return plans
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixture", help="Replay a recorded account JSON instead")
+    parser.add_argument("--regions", type=int, default=3)
+    parser.add_argument("--clusters", type=int, default=5, help="Clusters per region")
+    parser.add_argument("--instances", type=int, default=200, help="Instances per region")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--live", action="store_true", help="Replay with DRY_RUN off")
+    parser.add_argument("--record", help="Write the synthetic account JSON here")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc")
+    parser.add_argument(
+        "--plan", action="store_true", help="Print the dry-run teardown plans instead"
+    )
+    args = parser.parse_args(argv)
+
+    if args.fixture:
+        account = load_account(args.fixture)
+    else:
+        account = synthetic_account(args.regions, args.clusters, args.instances)
+    if args.record:
+        save_account(account, args.record)
+
+    if args.plan:
+        print(json.dumps(plan_account(account), indent=2))
+        return 0
+
+    report = run_replay(
+        account,
+        latency_ms=args.latency_ms,
+        dry_run=not args.live,
+        trace_memory=not args.no_memory,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Synthetic account inventories for replay runs.
+
+``synthetic_account`` lays out what an OpenShift installer leaves behind per
+cluster (VPC, subnets, route tables, NAT gateways and EIPs, security groups,
+ENIs, an S3 endpoint, API load balancers, DNS records, installer state in S3)
+plus unrelated instances that the scan has to wade through: EKS nodes that
+match the discovery tag filter and plain instances that do not.
+"""
+
+from __future__ import annotations
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+ACCOUNT_ID = "123456789012"
+BASE_DOMAIN = "cd.percona.com"
+ZONE_ID = "ZREPLAY"
+
+REGION_NAMES = [
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2", "ca-central-1",
+    "eu-west-1", "eu-west-2", "eu-west-3", "eu-central-1", "eu-north-1",
+    "eu-south-1", "ap-south-1", "ap-northeast-1", "ap-northeast-2",
+    "ap-northeast-3", "ap-southeast-1", "ap-southeast-2", "sa-east-1",
+    "me-south-1", "af-south-1",
+]
+
+ZONES = ("a", "b", "c")
+
+
+def _tags(**tags: str) -> list[dict[str, str]]:
+    return [{"Key": key, "Value": value} for key, value in tags.items()]
+
+
+def _cluster_tags(infra_id: str, **extra: str) -> list[dict[str, str]]:
+    return [{"Key": f"kubernetes.io/cluster/{infra_id}", "Value": "owned"}] + _tags(
+        **extra
+    )
+
+
+def _instance(instance_id: str, tags: list[dict[str, str]]) -> dict[str, Any]:
+    return {
+        "InstanceId": instance_id,
+        "State": {"Name": "running"},
+        "LaunchTime": "2025-01-01T00:00:00+00:00",
+        "Tags": tags,
+    }
+
+
+def add_cluster(
+    account: dict[str, Any],
+    region: str,
+    index: int,
+    instances: int,
+    now: float,
+    s3_objects: int = 20,
+) -> str:
+    """Add one expired OpenShift cluster and its resources; return its infra ID."""
+    regional = account["regions"][region]
+    cluster_name = f"{region}-c{index}"
+    infra_id = f"{cluster_name}-x{index:04d}"
+    vpc_id = f"vpc-{infra_id}"
+    created = int(now - (index % 10 + 2) * 86400)
+
+    for n in range(instances):
+        role = "master" if n < 3 else "worker"
+        regional["instances"].append(
+            _instance(
+                f"i-{infra_id}-{n}",
+                _cluster_tags(
+                    infra_id,
+                    **{
+                        "Name": f"{infra_id}-{role}-{n}",
+                        "red-hat-clustertype": "rosa",
+                        "creation-time": str(created),
+                        "delete-cluster-after-hours": "8",
+                        "iit-billing-tag": "openshift",
+                        "owner": "qa",
+                    },
+                ),
+            )
+        )
+
+    regional["vpcs"].append({"VpcId": vpc_id, "Tags": _cluster_tags(infra_id)})
+    regional["internet_gateways"].append(
+        {
+            "InternetGatewayId": f"igw-{infra_id}",
+            "Attachments": [{"VpcId": vpc_id, "State": "available"}],
+            "Tags": _cluster_tags(infra_id),
+        }
+    )
+    regional["vpc_endpoints"].append(
+        {"VpcEndpointId": f"vpce-{infra_id}", "VpcId": vpc_id, "Tags": _cluster_tags(infra_id)}
+    )
+    regional["route_tables"].append(
+        {
+            "RouteTableId": f"rtb-{infra_id}-main",
+            "VpcId": vpc_id,
+            "Associations": [{"Main": True}],
+            "Tags": [],
+        }
+    )
+    for zone in ZONES:
+        suffix = f"{infra_id}-{zone}"
+        for tier in ("public", "private"):
+            regional["subnets"].append(
+                {"SubnetId": f"subnet-{tier}-{suffix}", "VpcId": vpc_id, "Tags": _cluster_tags(infra_id)}
+            )
+        regional["route_tables"].append(
+            {
+                "RouteTableId": f"rtb-{suffix}",
+                "VpcId": vpc_id,
+                "Associations": [{"Main": False}],
+                "Tags": _cluster_tags(infra_id),
+            }
+        )
+        regional["nat_gateways"].append(
+            {
+                "NatGatewayId": f"nat-{suffix}",
+                "VpcId": vpc_id,
+                "State": "available",
+                "Tags": _cluster_tags(infra_id),
+            }
+        )
+        regional["addresses"].append(
+            {"AllocationId": f"eipalloc-{suffix}", "Domain": "vpc", "Tags": _cluster_tags(infra_id)}
+        )
+        regional["network_interfaces"].append(
+            {"NetworkInterfaceId": f"eni-{suffix}", "VpcId": vpc_id, "Status": "available"}
+        )
+    for name in ("default", "master", "worker", "lb", "node"):
+        regional["security_groups"].append(
+            {
+                "GroupId": f"sg-{infra_id}-{name}",
+                "GroupName": name if name == "default" else f"{infra_id}-{name}",
+                "VpcId": vpc_id,
+                "IpPermissions": [{"IpProtocol": "-1"}],
+                "IpPermissionsEgress": [{"IpProtocol": "-1"}],
+                "Tags": _cluster_tags(infra_id),
+            }
+        )
+    regional["load_balancers"].append(
+        {"LoadBalancerName": f"{infra_id}-ext", "VPCId": vpc_id}
+    )
+    for name in ("int", "ext"):
+        regional["load_balancers_v2"].append(
+            {
+                "LoadBalancerName": f"{infra_id}-{name}",
+                "LoadBalancerArn": f"arn:aws:elasticloadbalancing:{region}:{ACCOUNT_ID}:loadbalancer/net/{infra_id}-{name}",
+                "VpcId": vpc_id,
+                "Type": "network",
+            }
+        )
+
+    records = account["record_sets"][ZONE_ID]
+    for prefix in ("api", "api-int", "*.apps"):
+        records.append(
+            {
+                "Name": f"{prefix}.{cluster_name}.{BASE_DOMAIN}.",
+                "Type": "A",
+                "AliasTarget": {"DNSName": f"{infra_id}-ext.elb.amazonaws.com."},
+            }
+        )
+    bucket = account["buckets"].setdefault(
+        f"openshift-clusters-{ACCOUNT_ID}-{region}", []
+    )
+    for n in range(s3_objects):
+        bucket.append({"Key": f"{cluster_name}/state/{n:05d}.json", "Size": 4096})
+    return infra_id
+
+
+def synthetic_account(
+    regions: int = 3,
+    clusters: int = 5,
+    instances: int = 200,
+    cluster_instances: int = 6,
+    dns_records: int = 200,
+    now: float | None = None,
+) -> dict[str, Any]:
+    """Build an account inventory.
+
+    Args:
+        regions: Number of regions (at most len(REGION_NAMES))
+        clusters: Expired OpenShift clusters per region
+        instances: Total instances per region, cluster nodes included
+        cluster_instances: Nodes per cluster
+        dns_records: Unrelated records in the shared hosted zone
+        now: Reference time for TTL tags (default: time.time())
+    """
+    now = time.time() if now is None else now
+    account: dict[str, Any] = {
+        "account_id": ACCOUNT_ID,
+        "hosted_zones": [{"Id": f"/hostedzone/{ZONE_ID}", "Name": f"{BASE_DOMAIN}."}],
+        "record_sets": {
+            ZONE_ID: [
+                {"Name": f"ci-{n}.{BASE_DOMAIN}.", "Type": "CNAME"} for n in range(dns_records)
+            ]
+        },
+        "buckets": {},
+        "regions": {},
+    }
+    kinds = (
+        "instances", "vpcs", "subnets", "route_tables", "internet_gateways",
+        "nat_gateways", "addresses", "network_interfaces", "vpc_endpoints",
+        "security_groups", "load_balancers", "load_balancers_v2",
+    )
+    for region in REGION_NAMES[:regions]:
+        account["regions"][region] = {kind: [] for kind in kinds}
+        for index in range(clusters):
+            add_cluster(account, region, index, cluster_instances, now)
+
+        filler = max(0, instances - clusters * cluster_instances)
+        for n in range(filler):
+            if n % 4 == 0:
+                tags = _cluster_tags(f"eks-{n % 7}", Name=f"eks-node-{n}")
+            else:
+                tags = _tags(Name=f"ci-agent-{n}", **{"iit-billing-tag": "ci"})
+            account["regions"][region]["instances"].append(
+                _instance(f"i-{region}-filler-{n}", tags)
+            )
+    return account
+
+
+def load_account(path: str | Path) -> dict[str, Any]:
+    """Load a recorded account inventory from JSON."""
+    with open(path) as f:
+        account: dict[str, Any] = json.load(f)
+    return account
+
+
+def save_account(account: dict[str, Any], path: str | Path) -> None:
+    """Record an account inventory as JSON."""
+    with open(path, "w") as f:
+        json.dump(account, f, separators=(",", ":"))
@@ -0,0 +1,55 @@
+"""Classifier benchmark: single-pass InstanceFacts over a large account."""
+
+from __future__ import annotations
+import time
+
+from openshift_resource_cleanup.models import InstanceFacts
+from tests.conftest import InstanceBuilder
+
+# Loose floor for CI machines; classification runs at ~400k instances/s locally
+MIN_INSTANCES_PER_SECOND = 20_000
+
+
+class TestClassifier:
+    """Guard the throughput of instance classification."""
+
+    def test_classifies_100k_instances_within_throughput_floor(self):
+        """
+        GIVEN 100k synthetic instances of mixed kinds
+        WHEN every instance is classified
+        THEN the OpenShift instances should be detected
+        AND throughput should stay above MIN_INSTANCES_PER_SECOND
+        """
+        kinds = [
+            lambda n: InstanceBuilder()
+            .with_name(f"ci-{n}")
+            .with_billing_tag("ci")
+            .with_owner("jenkins"),
+            lambda n: InstanceBuilder()
+            .with_name(f"eks-node-{n}")
+            .with_eks_tags(f"eks-{n % 50}")
+            .with_ttl_tags(1000000, 8),
+            lambda n: InstanceBuilder()
+            .with_name(f"ocp-{n % 100}-worker-{n}")
+            .with_tag("red-hat-clustertype", "rosa")
+            .with_openshift_tags(f"ocp-{n % 100}-abc12")
+            .with_ttl_tags(1000000 + n % 100, 8)
+            .with_owner("qa"),
+            lambda n: InstanceBuilder()
+            .with_name(f"capi-{n}")
+            .with_tag("sigs.k8s.io/cluster-api-provider-aws/cluster/capi-xyz", "owned")
+            .with_ttl_tags(1000000, 8),
+        ]
+        instances = [
+            kinds[n % len(kinds)](n).with_instance_id(f"i-{n:08d}").build()
+            for n in range(100_000)
+        ]
+
+        started = time.perf_counter()
+        detected = sum(
+            1 for instance in instances if InstanceFacts.from_instance(instance).infra_id
+        )
+        elapsed = time.perf_counter() - started
+
+        assert detected == 50_000
+        assert len(instances) / elapsed >= MIN_INSTANCES_PER_SECOND
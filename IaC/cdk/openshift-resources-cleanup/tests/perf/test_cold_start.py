@@ -0,0 +1,33 @@
+"""Cold-start tests: keep the handler import small."""
+
+from __future__ import annotations
+
+from .cold_start import DEFERRED_MODULES, measure
+
+# Generous ceiling for CI machines; the handler imports in ~100ms locally,
+# against ~450ms when boto3 and the X-Ray SDK were loaded at import
+IMPORT_BUDGET_MS = 300
+
+
+class TestColdStart:
+    """Guard what the handler loads before its first invocation."""
+
+    def test_heavy_modules_are_not_loaded_at_import(self):
+        """
+        GIVEN a fresh interpreter configured like the deployed function
+        WHEN the handler module is imported
+        THEN boto3, the X-Ray SDK, state backends and teardown code should not load
+        """
+        report = measure(runs=1)
+
+        assert report["eagerly_loaded"] == [], DEFERRED_MODULES
+
+    def test_handler_import_within_budget(self):
+        """
+        GIVEN a fresh interpreter with compiled bytecode
+        WHEN the handler module is imported several times
+        THEN the median import time should stay within the budget
+        """
+        report = measure(runs=3)
+
+        assert report["median_ms"] < IMPORT_BUDGET_MS, report
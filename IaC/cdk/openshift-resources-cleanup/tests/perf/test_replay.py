@@ -0,0 +1,86 @@
+"""Replay tests: whole-pipeline API-call budgets against fake accounts."""
+
+from __future__ import annotations
+from pathlib import Path
+
+from .replay import plan_account, run_replay
+from .synthetic import load_account, synthetic_account
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class TestReplay:
+    """Guard API-call counts of lambda_handler for whole accounts."""
+
+    def test_recorded_account_torn_down_within_call_budget(self):
+        """
+        GIVEN the recorded two-region account with two expired clusters each
+        WHEN lambda_handler is replayed in live mode
+        THEN every cluster VPC should be deleted
+        AND each region should be described once per resource type, with
+        one tag query and one instance-name query for instances
+        """
+        report = run_replay(load_account(FIXTURES / "small_account.json"), dry_run=False)
+        calls = report["api_calls_by_operation"]
+
+        assert report["total_actions"] == 4
+        assert report["remaining"]["vpcs"] == 0
+        assert calls["ec2:describe_instances"] == 2 * report["regions"]
+        for operation in (
+            "ec2:describe_vpcs",
+            "ec2:describe_subnets",
+            "ec2:describe_security_groups",
+            "elb:describe_load_balancers",
+            "elbv2:describe_load_balancers",
+        ):
+            assert calls[operation] == report["regions"], operation
+        assert calls["route53:list_hosted_zones_by_name"] == 1
+        assert calls["sts:get_caller_identity"] == 1
+        assert calls["s3:delete_objects"] == report["total_actions"]
+
+    def test_dry_run_scan_cost_independent_of_cluster_count(self):
+        """
+        GIVEN synthetic accounts with 2 and 10 expired clusters per region
+        WHEN lambda_handler is replayed in dry-run mode with request latency
+        THEN no delete call should be made
+        AND EC2 describe calls should not grow with the number of clusters
+        """
+        small = run_replay(synthetic_account(regions=2, clusters=2, instances=100), latency_ms=1)
+        large = run_replay(synthetic_account(regions=2, clusters=10, instances=100), latency_ms=1)
+
+        for report in (small, large):
+            assert not [op for op in report["api_calls_by_operation"] if ":delete" in op]
+            assert report["peak_memory_mb"] > 0
+
+        def ec2_describes(report: dict) -> int:
+            return sum(
+                count
+                for op, count in report["api_calls_by_operation"].items()
+                if op.startswith("ec2:describe")
+            )
+
+        assert large["total_actions"] == 20
+        assert ec2_describes(large) == ec2_describes(small)
+
+    def test_dry_run_plan_matches_live_teardown(self):
+        """
+        GIVEN the recorded two-region account
+        WHEN every cluster is planned from the region inventory
+        AND the account is then replayed in live mode
+        THEN the planned mutating EC2/ELB calls should equal the calls made
+        """
+        account = load_account(FIXTURES / "small_account.json")
+
+        plans = plan_account(account)
+        report = run_replay(account, dry_run=False)
+
+        mutating = sum(
+            count
+            for op, count in report["api_calls_by_operation"].items()
+            if op.split(":")[0] in ("ec2", "elb", "elbv2")
+            and not op.split(":")[1].startswith("describe")
+        )
+        assert len(plans) == report["total_actions"]
+        assert sum(plan["estimated_api_calls"] for plan in plans) == mutating
+        assert all(plan["steps"][-1]["node"] == "vpc" for plan in plans)
+        assert report["notifications"] == report["regions"]
@@ -12,7 +12,7 @@ from openshift_resource_cleanup.openshift.detection import detect_openshift_infr
 class TestDetectOpenshiftInfraId:
     """Test OpenShift infrastructure ID detection."""
 
-    @patch("openshift_resource_cleanup.openshift.detection.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.detection.get_client")
     def test_detects_infra_id_from_exact_match(self, mock_boto_client):
         """
         GIVEN VPC with exact cluster name tag
@@ -49,7 +49,7 @@ class TestDetectOpenshiftInfraId:
             ]
         )
 
-    @patch("openshift_resource_cleanup.openshift.detection.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.detection.get_client")
     def test_detects_infra_id_from_wildcard_match(self, mock_boto_client):
         """
         GIVEN VPC with cluster name prefix (wildcard match needed)
@@ -95,7 +95,7 @@ class TestDetectOpenshiftInfraId:
             "kubernetes.io/cluster/test-cluster-*"
         ]
 
-    @patch("openshift_resource_cleanup.openshift.detection.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.detection.get_client")
     def test_returns_none_when_no_vpc_found(self, mock_boto_client):
         """
         GIVEN no VPC exists with cluster tags
@@ -111,7 +111,7 @@ class TestDetectOpenshiftInfraId:
 
         assert infra_id is None
 
-    @patch("openshift_resource_cleanup.openshift.detection.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.detection.get_client")
     def test_returns_none_when_vpc_has_no_cluster_tags(self, mock_boto_client):
         """
         GIVEN VPC exists but has no kubernetes cluster tags
@@ -137,7 +137,7 @@ class TestDetectOpenshiftInfraId:
 
         assert infra_id is None
 
-    @patch("openshift_resource_cleanup.openshift.detection.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.detection.get_client")
     def test_handles_aws_api_exception(self, mock_boto_client):
         """
         GIVEN AWS API raises exception
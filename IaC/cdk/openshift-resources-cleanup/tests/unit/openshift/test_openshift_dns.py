@@ -4,7 +4,42 @@ from __future__ import annotations
 import pytest
 from unittest.mock import Mock, patch
 
-from openshift_resource_cleanup.openshift.dns import cleanup_route53_records
+from openshift_resource_cleanup.openshift.dns import (
+    MAX_CHANGE_RECORDS,
+    chunk_changes,
+    cleanup_route53_records,
+    clear_zone_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_zone_cache():
+    clear_zone_cache()
+    yield
+    clear_zone_cache()
+
+
+def _dns_order(record: dict) -> list[str]:
+    return list(reversed(record["Name"].rstrip(".").split(".")))
+
+
+def fake_record_listing(records: list[dict], page_size: int = 300):
+    """Emulate list_resource_record_sets: DNS-tree order, StartRecordName, paging."""
+    ordered = sorted(records, key=_dns_order)
+
+    def list_resource_record_sets(HostedZoneId, StartRecordName, MaxItems, **kwargs):
+        start = list(reversed(StartRecordName.rstrip(".").split(".")))
+        remaining = [r for r in ordered if _dns_order(r) >= start]
+        page = {"ResourceRecordSets": remaining[:page_size], "IsTruncated": False}
+        if len(remaining) > page_size:
+            page.update(
+                IsTruncated=True,
+                NextRecordName=remaining[page_size]["Name"],
+                NextRecordType=remaining[page_size]["Type"],
+            )
+        return page
+
+    return list_resource_record_sets
 
 
 @pytest.mark.unit
@@ -12,7 +47,7 @@ from openshift_resource_cleanup.openshift.dns import cleanup_route53_records
 class TestCleanupRoute53Records:
     """Test Route53 DNS record cleanup for OpenShift clusters."""
 
-    @patch("openshift_resource_cleanup.openshift.dns.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
     @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
     @patch("openshift_resource_cleanup.openshift.dns.DRY_RUN", False)
     def test_deletes_cluster_dns_records_live_mode(self, mock_boto_client):
@@ -24,12 +59,12 @@ class TestCleanupRoute53Records:
         mock_route53 = Mock()
         mock_boto_client.return_value = mock_route53
 
-        mock_route53.list_hosted_zones.return_value = {
+        mock_route53.list_hosted_zones_by_name.return_value = {
             "HostedZones": [{"Id": "/hostedzone/Z123456", "Name": "cd.percona.com."}]
         }
 
-        mock_route53.list_resource_record_sets.return_value = {
-            "ResourceRecordSets": [
+        mock_route53.list_resource_record_sets.side_effect = fake_record_listing(
+            [
                 {
                     "Name": "api.test-cluster.cd.percona.com.",
                     "Type": "A",
@@ -49,14 +84,21 @@ class TestCleanupRoute53Records:
                     "ResourceRecords": [{"Value": "9.10.11.12"}],
                 },
             ]
-        }
+        )
 
         cleanup_route53_records("test-cluster", "us-east-1")
 
-        mock_route53.list_hosted_zones.assert_called_once()
-        mock_route53.list_resource_record_sets.assert_called_once_with(
-            HostedZoneId="Z123456"
+        mock_route53.list_hosted_zones_by_name.assert_called_once_with(
+            DNSName="cd.percona.com"
         )
+        start_names = [
+            c.kwargs["StartRecordName"]
+            for c in mock_route53.list_resource_record_sets.call_args_list
+        ]
+        assert start_names == [
+            "api.test-cluster.cd.percona.com",
+            "apps.test-cluster.cd.percona.com",
+        ]
 
         # Should delete 2 records (api and apps) but not the other one
         call_args = mock_route53.change_resource_record_sets.call_args
@@ -65,7 +107,7 @@ class TestCleanupRoute53Records:
         assert len(changes) == 2
         assert all(change["Action"] == "DELETE" for change in changes)
 
-    @patch("openshift_resource_cleanup.openshift.dns.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
     @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
     @patch("openshift_resource_cleanup.openshift.dns.DRY_RUN", True)
     def test_skips_deletion_in_dry_run_mode(self, mock_boto_client):
@@ -77,12 +119,12 @@ class TestCleanupRoute53Records:
         mock_route53 = Mock()
         mock_boto_client.return_value = mock_route53
 
-        mock_route53.list_hosted_zones.return_value = {
+        mock_route53.list_hosted_zones_by_name.return_value = {
             "HostedZones": [{"Id": "/hostedzone/Z123", "Name": "cd.percona.com."}]
         }
 
-        mock_route53.list_resource_record_sets.return_value = {
-            "ResourceRecordSets": [
+        mock_route53.list_resource_record_sets.side_effect = fake_record_listing(
+            [
                 {
                     "Name": "api.test-cluster.cd.percona.com.",
                     "Type": "A",
@@ -90,13 +132,13 @@ class TestCleanupRoute53Records:
                     "ResourceRecords": [{"Value": "1.2.3.4"}],
                 }
             ]
-        }
+        )
 
         cleanup_route53_records("test-cluster", "us-east-1")
 
         mock_route53.change_resource_record_sets.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.dns.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
     @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
     def test_handles_missing_hosted_zone(self, mock_boto_client):
         """
@@ -107,7 +149,7 @@ class TestCleanupRoute53Records:
         mock_route53 = Mock()
         mock_boto_client.return_value = mock_route53
 
-        mock_route53.list_hosted_zones.return_value = {
+        mock_route53.list_hosted_zones_by_name.return_value = {
             "HostedZones": [{"Id": "/hostedzone/Z999", "Name": "other-domain.com."}]
         }
 
@@ -115,7 +157,7 @@ class TestCleanupRoute53Records:
 
         mock_route53.list_resource_record_sets.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.dns.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
     @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
     @patch("openshift_resource_cleanup.openshift.dns.DRY_RUN", False)
     def test_handles_no_matching_records(self, mock_boto_client):
@@ -127,12 +169,12 @@ class TestCleanupRoute53Records:
         mock_route53 = Mock()
         mock_boto_client.return_value = mock_route53
 
-        mock_route53.list_hosted_zones.return_value = {
+        mock_route53.list_hosted_zones_by_name.return_value = {
             "HostedZones": [{"Id": "/hostedzone/Z123", "Name": "cd.percona.com."}]
         }
 
-        mock_route53.list_resource_record_sets.return_value = {
-            "ResourceRecordSets": [
+        mock_route53.list_resource_record_sets.side_effect = fake_record_listing(
+            [
                 {
                     "Name": "other.cd.percona.com.",
                     "Type": "A",
@@ -140,8 +182,123 @@ class TestCleanupRoute53Records:
                     "ResourceRecords": [{"Value": "1.2.3.4"}],
                 }
             ]
-        }
+        )
 
         cleanup_route53_records("test-cluster", "us-east-1")
 
         mock_route53.change_resource_record_sets.assert_not_called()
+
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
+    @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
+    @patch("openshift_resource_cleanup.openshift.dns.DRY_RUN", False)
+    def test_reads_only_cluster_range_across_pages(self, mock_boto_client):
+        """
+        GIVEN a zone with many CI records and a cluster subtree spanning pages
+        WHEN cleanup_route53_records is called
+        THEN only the cluster's records should be deleted
+        AND listing should stop once past the cluster's names
+        """
+        mock_route53 = Mock()
+        mock_boto_client.return_value = mock_route53
+        mock_route53.list_hosted_zones_by_name.return_value = {
+            "HostedZones": [{"Id": "/hostedzone/Z123", "Name": "cd.percona.com."}]
+        }
+        records = [
+            {"Name": f"ci-{n}.cd.percona.com.", "Type": "A", "TTL": 60,
+             "ResourceRecords": [{"Value": "10.0.0.1"}]}
+            for n in range(50)
+        ] + [
+            {"Name": f"svc-{n}.apps.test-cluster.cd.percona.com.", "Type": "A", "TTL": 60,
+             "ResourceRecords": [{"Value": "10.0.0.2"}]}
+            for n in range(5)
+        ] + [
+            {"Name": "api.test-cluster.cd.percona.com.", "Type": "A", "TTL": 60,
+             "ResourceRecords": [{"Value": "10.0.0.3"}]},
+            {"Name": "api.test-cluster-2.cd.percona.com.", "Type": "A", "TTL": 60,
+             "ResourceRecords": [{"Value": "10.0.0.4"}]},
+        ]
+        mock_route53.list_resource_record_sets.side_effect = fake_record_listing(
+            records, page_size=2
+        )
+
+        cleanup_route53_records("test-cluster", "us-east-1")
+
+        changes = mock_route53.change_resource_record_sets.call_args.kwargs[
+            "ChangeBatch"
+        ]["Changes"]
+        deleted = sorted(c["ResourceRecordSet"]["Name"] for c in changes)
+        assert deleted == sorted(
+            ["api.test-cluster.cd.percona.com."]
+            + [f"svc-{n}.apps.test-cluster.cd.percona.com." for n in range(5)]
+        )
+        # 1 page for api, 3 pages for the 5 apps records; CI records never read
+        assert mock_route53.list_resource_record_sets.call_count == 4
+
+    @patch("openshift_resource_cleanup.openshift.dns.get_client")
+    @patch("openshift_resource_cleanup.openshift.dns.OPENSHIFT_BASE_DOMAIN", "cd.percona.com")
+    @patch("openshift_resource_cleanup.openshift.dns.DRY_RUN", True)
+    def test_caches_hosted_zone_id(self, mock_boto_client):
+        """
+        GIVEN several clusters cleaned up in the same process
+        WHEN cleanup_route53_records is called for each
+        THEN the hosted zone should be looked up once
+        """
+        mock_route53 = Mock()
+        mock_boto_client.return_value = mock_route53
+        mock_route53.list_hosted_zones_by_name.return_value = {
+            "HostedZones": [{"Id": "/hostedzone/Z123", "Name": "cd.percona.com."}]
+        }
+        mock_route53.list_resource_record_sets.side_effect = fake_record_listing([])
+
+        cleanup_route53_records("cluster-a", "us-east-1")
+        cleanup_route53_records("cluster-b", "us-east-1")
+
+        mock_route53.list_hosted_zones_by_name.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestChunkChanges:
+    """Test Route53 change batch chunking."""
+
+    def test_splits_at_record_limit(self):
+        """
+        GIVEN more changes than fit in one request
+        WHEN chunk_changes is called
+        THEN no batch should exceed the per-request record limit
+        """
+        changes = [
+            {
+                "Action": "DELETE",
+                "ResourceRecordSet": {
+                    "Name": f"r{n}.example.com.",
+                    "Type": "A",
+                    "ResourceRecords": [{"Value": "1.2.3.4"}],
+                },
+            }
+            for n in range(2500)
+        ]
+
+        batches = list(chunk_changes(changes))
+
+        assert [len(b) for b in batches] == [MAX_CHANGE_RECORDS, MAX_CHANGE_RECORDS, 500]
+
+    def test_splits_at_value_character_limit(self):
+        """
+        GIVEN TXT records with long values
+        WHEN chunk_changes is called
+        THEN batches should stay within the value character limit
+        """
+        changes = [
+            {
+                "Action": "DELETE",
+                "ResourceRecordSet": {
+                    "Name": f"t{n}.example.com.",
+                    "Type": "TXT",
+                    "ResourceRecords": [{"Value": "x" * 4000}],
+                },
+            }
+            for n in range(10)
+        ]
+
+        assert [len(b) for b in chunk_changes(changes)] == [8, 2]
@@ -0,0 +1,192 @@
+"""Unit tests for the region-wide resource snapshot."""
+
+from __future__ import annotations
+import pytest
+from unittest.mock import Mock, patch
+
+from openshift_resource_cleanup.openshift.inventory import RegionInventory
+
+
+def _paginating_client(pages_by_operation: dict[str, list[dict]]) -> Mock:
+    """Build a mock client whose paginators return canned pages per operation."""
+    client = Mock()
+
+    def get_paginator(operation):
+        paginator = Mock()
+        paginator.paginate.return_value = pages_by_operation.get(operation, [{}])
+        return paginator
+
+    client.get_paginator.side_effect = get_paginator
+    return client
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestRegionInventory:
+    """Test RegionInventory loading and indexing."""
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_indexes_by_cluster_tag_and_vpc(self, mock_get_client):
+        """
+        GIVEN VPCs and subnets for two clusters
+        WHEN the inventory is queried by cluster and VPC
+        THEN only the matching resources should be returned
+        """
+        mock_get_client.return_value = _paginating_client(
+            {
+                "describe_vpcs": [
+                    {
+                        "Vpcs": [
+                            {
+                                "VpcId": "vpc-a",
+                                "Tags": [
+                                    {"Key": "kubernetes.io/cluster/alpha-1", "Value": "owned"}
+                                ],
+                            },
+                            {
+                                "VpcId": "vpc-b",
+                                "Tags": [
+                                    {"Key": "kubernetes.io/cluster/beta-2", "Value": "shared"}
+                                ],
+                            },
+                        ]
+                    }
+                ],
+                "describe_subnets": [
+                    {"Subnets": [{"SubnetId": "subnet-a", "VpcId": "vpc-a"}]},
+                    {"Subnets": [{"SubnetId": "subnet-b", "VpcId": "vpc-b"}]},
+                ],
+            }
+        )
+
+        inventory = RegionInventory("us-east-1")
+
+        assert inventory.cluster_vpc_ids("alpha-1") == ["vpc-a"]
+        assert inventory.cluster_vpc_ids("beta-2") == []  # not "owned"
+        assert [v["VpcId"] for v in inventory.by_cluster("vpcs", "beta-2", None)] == [
+            "vpc-b"
+        ]
+        assert [s["SubnetId"] for s in inventory.by_vpc("subnets", "vpc-b")] == [
+            "subnet-b"
+        ]
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_describes_each_kind_once(self, mock_get_client):
+        """
+        GIVEN several clusters querying the same resource kind
+        WHEN the inventory is queried repeatedly
+        THEN the describe API should be paginated only once
+        """
+        client = _paginating_client({"describe_vpcs": [{"Vpcs": []}]})
+        mock_get_client.return_value = client
+
+        inventory = RegionInventory("us-east-1")
+        for infra_id in ("a-1", "b-2", "c-3"):
+            inventory.cluster_vpc_ids(infra_id)
+
+        client.get_paginator.assert_called_once_with("describe_vpcs")
+        assert inventory.api_calls == {"ec2:describe_vpcs": 1}
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_indexes_internet_gateways_by_attachment(self, mock_get_client):
+        """
+        GIVEN an internet gateway attached to a VPC
+        WHEN querying internet gateways by VPC
+        THEN the attachment VPC should be used for indexing
+        """
+        mock_get_client.return_value = _paginating_client(
+            {
+                "describe_internet_gateways": [
+                    {
+                        "InternetGateways": [
+                            {
+                                "InternetGatewayId": "igw-1",
+                                "Attachments": [{"VpcId": "vpc-a", "State": "available"}],
+                            }
+                        ]
+                    }
+                ]
+            }
+        )
+
+        inventory = RegionInventory("us-east-1")
+
+        igws = inventory.by_vpc("internet_gateways", "vpc-a")
+        assert [igw["InternetGatewayId"] for igw in igws] == ["igw-1"]
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_addresses_use_single_unpaginated_call(self, mock_get_client):
+        """
+        GIVEN Elastic IPs tagged for a cluster
+        WHEN querying addresses by cluster
+        THEN describe_addresses should be called directly once
+        """
+        client = Mock()
+        client.describe_addresses.return_value = {
+            "Addresses": [
+                {
+                    "AllocationId": "eipalloc-1",
+                    "Tags": [{"Key": "kubernetes.io/cluster/alpha-1", "Value": "owned"}],
+                }
+            ]
+        }
+        mock_get_client.return_value = client
+
+        inventory = RegionInventory("us-east-1")
+
+        assert len(inventory.by_cluster("addresses", "alpha-1")) == 1
+        assert len(inventory.by_cluster("addresses", "alpha-1")) == 1
+        client.describe_addresses.assert_called_once_with()
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_find_infra_id_prefers_exact_match(self, mock_get_client):
+        """
+        GIVEN VPCs tagged for 'demo' and 'demo-abcde'
+        WHEN find_infra_id is called
+        THEN exact match wins and prefix match is the fallback
+        """
+        mock_get_client.return_value = _paginating_client(
+            {
+                "describe_vpcs": [
+                    {
+                        "Vpcs": [
+                            {
+                                "VpcId": "vpc-1",
+                                "Tags": [
+                                    {"Key": "kubernetes.io/cluster/other-xyz12", "Value": "owned"}
+                                ],
+                            },
+                            {
+                                "VpcId": "vpc-2",
+                                "Tags": [
+                                    {"Key": "kubernetes.io/cluster/demo-abcde", "Value": "owned"}
+                                ],
+                            },
+                        ]
+                    }
+                ]
+            }
+        )
+
+        inventory = RegionInventory("us-east-1")
+
+        assert inventory.find_infra_id("demo") == "demo-abcde"
+        assert inventory.find_infra_id("other") == "other-xyz12"
+        assert inventory.find_infra_id("missing") is None
+
+    @patch("openshift_resource_cleanup.openshift.inventory.get_client")
+    def test_invalidate_forces_reload(self, mock_get_client):
+        """
+        GIVEN a loaded resource kind
+        WHEN invalidate is called for it
+        THEN the next query should describe it again
+        """
+        client = _paginating_client({"describe_subnets": [{"Subnets": []}]})
+        mock_get_client.return_value = client
+
+        inventory = RegionInventory("us-east-1")
+        inventory.get("subnets")
+        inventory.invalidate("subnets")
+        inventory.get("subnets")
+
+        assert client.get_paginator.call_count == 2
@@ -26,7 +26,7 @@ from openshift_resource_cleanup.openshift.network import (
 class TestDeleteNatGateways:
     """Test NAT gateway deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_deletes_nat_gateways_live_mode(self, mock_boto_client):
         """
@@ -58,7 +58,7 @@ class TestDeleteNatGateways:
         mock_ec2.delete_nat_gateway.assert_any_call(NatGatewayId="nat-abc123")
         mock_ec2.delete_nat_gateway.assert_any_call(NatGatewayId="nat-def456")
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", True)
     def test_skips_deletion_in_dry_run_mode(self, mock_boto_client):
         """
@@ -77,7 +77,7 @@ class TestDeleteNatGateways:
         mock_ec2.describe_nat_gateways.assert_called_once()
         mock_ec2.delete_nat_gateway.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     def test_handles_empty_nat_gateway_list(self, mock_boto_client):
         """
         GIVEN no NAT gateways exist
@@ -98,7 +98,7 @@ class TestDeleteNatGateways:
 class TestReleaseElasticIps:
     """Test Elastic IP release."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_releases_elastic_ips_live_mode(self, mock_boto_client):
         """
@@ -129,7 +129,7 @@ class TestReleaseElasticIps:
         mock_ec2.release_address.assert_any_call(AllocationId="eipalloc-abc123")
         mock_ec2.release_address.assert_any_call(AllocationId="eipalloc-def456")
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_handles_client_error_gracefully(self, mock_boto_client):
         """
@@ -157,7 +157,7 @@ class TestReleaseElasticIps:
 class TestCleanupNetworkInterfaces:
     """Test network interface cleanup."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_deletes_available_enis(self, mock_boto_client):
         """
@@ -190,7 +190,7 @@ class TestCleanupNetworkInterfaces:
 class TestDeleteVpcEndpoints:
     """Test VPC endpoint deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_deletes_vpc_endpoints(self, mock_boto_client):
         """
@@ -218,7 +218,7 @@ class TestDeleteVpcEndpoints:
 class TestDeleteSecurityGroups:
     """Test security group deletion with dependency handling."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_removes_ingress_rules_before_deletion(self, mock_boto_client):
         """
@@ -252,7 +252,7 @@ class TestDeleteSecurityGroups:
         # Then delete the security group
         mock_ec2.delete_security_group.assert_called_once_with(GroupId="sg-abc123")
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_skips_default_security_group(self, mock_boto_client):
         """
@@ -276,13 +276,77 @@ class TestDeleteSecurityGroups:
 
         mock_ec2.delete_security_group.assert_not_called()
 
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
+    @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
+    def test_revokes_all_rules_before_any_deletion(self, mock_boto_client):
+        """
+        GIVEN security groups referencing each other in ingress and egress rules
+        WHEN delete_security_groups is called
+        THEN every group's rules should be revoked in one call per direction
+        AND groups should only be deleted after all revocations
+        """
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        calls = []
+        mock_ec2.revoke_security_group_ingress.side_effect = (
+            lambda **kw: calls.append(("ingress", kw["GroupId"]))
+        )
+        mock_ec2.revoke_security_group_egress.side_effect = (
+            lambda **kw: calls.append(("egress", kw["GroupId"]))
+        )
+        mock_ec2.delete_security_group.side_effect = (
+            lambda **kw: calls.append(("delete", kw["GroupId"]))
+        )
+        mock_ec2.describe_security_groups.return_value = {
+            "SecurityGroups": [
+                {
+                    "GroupId": f"sg-{n}",
+                    "GroupName": f"cluster-sg-{n}",
+                    "IpPermissions": [
+                        {"IpProtocol": "-1", "UserIdGroupPairs": [{"GroupId": f"sg-{1 - n}"}]}
+                    ],
+                    "IpPermissionsEgress": [
+                        {"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}
+                    ],
+                }
+                for n in (0, 1)
+            ]
+        }
+
+        result = delete_security_groups("vpc-123456", "us-east-1")
+
+        assert result is True
+        assert mock_ec2.revoke_security_group_ingress.call_count == 2
+        assert mock_ec2.revoke_security_group_egress.call_count == 2
+        assert all(kind != "delete" for kind, _ in calls[:4])
+        assert sorted(group for kind, group in calls[4:]) == ["sg-0", "sg-1"]
+
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
+    @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
+    def test_reports_incomplete_when_group_still_in_use(self, mock_boto_client):
+        """
+        GIVEN a security group still attached to a network interface
+        WHEN delete_security_groups is called
+        THEN it should return False so dependent steps wait
+        """
+        mock_ec2 = Mock()
+        mock_boto_client.return_value = mock_ec2
+        mock_ec2.describe_security_groups.return_value = {
+            "SecurityGroups": [{"GroupId": "sg-abc123", "GroupName": "openshift-sg"}]
+        }
+        mock_ec2.delete_security_group.side_effect = ClientError(
+            {"Error": {"Code": "DependencyViolation"}}, "DeleteSecurityGroup"
+        )
+
+        assert delete_security_groups("vpc-123456", "us-east-1") is False
+
 
 @pytest.mark.unit
 @pytest.mark.openshift
 class TestDeleteSubnets:
     """Test subnet deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_deletes_all_subnets(self, mock_boto_client):
         """
@@ -309,7 +373,7 @@ class TestDeleteSubnets:
 class TestDeleteRouteTables:
     """Test route table deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_skips_main_route_table(self, mock_boto_client):
         """
@@ -343,7 +407,7 @@ class TestDeleteRouteTables:
 class TestDeleteInternetGateway:
     """Test internet gateway deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_detaches_and_deletes_igw(self, mock_boto_client):
         """
@@ -372,7 +436,7 @@ class TestDeleteInternetGateway:
 class TestDeleteVpc:
     """Test VPC deletion."""
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", False)
     def test_deletes_vpc_live_mode(self, mock_boto_client):
         """
@@ -387,7 +451,7 @@ class TestDeleteVpc:
 
         mock_ec2.delete_vpc.assert_called_once_with(VpcId="vpc-123456")
 
-    @patch("openshift_resource_cleanup.openshift.network.boto3.client")
+    @patch("openshift_resource_cleanup.openshift.network.get_client")
     @patch("openshift_resource_cleanup.openshift.network.DRY_RUN", True)
     def test_skips_deletion_in_dry_run(self, mock_boto_client):
         """
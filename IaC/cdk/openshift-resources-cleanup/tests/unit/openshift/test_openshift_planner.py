@@ -0,0 +1,138 @@
+"""Unit tests for dry-run teardown plans."""
+
+from __future__ import annotations
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from openshift_resource_cleanup.openshift.inventory import RegionInventory
+from openshift_resource_cleanup.openshift.planner import plan_cluster_teardown
+
+OWNED = [{"Key": "kubernetes.io/cluster/alpha-1", "Value": "owned"}]
+
+
+def _inventory_client(pages: dict[str, list[dict]], addresses: list[dict]) -> Mock:
+    client = Mock()
+
+    def get_paginator(operation):
+        paginator = Mock()
+        paginator.paginate.return_value = pages.get(operation, [{}])
+        return paginator
+
+    client.get_paginator.side_effect = get_paginator
+    client.describe_addresses.return_value = {"Addresses": addresses}
+    return client
+
+
+@pytest.fixture
+def inventory():
+    client = _inventory_client(
+        {
+            "describe_vpcs": [{"Vpcs": [{"VpcId": "vpc-a", "Tags": OWNED}]}],
+            "describe_nat_gateways": [
+                {
+                    "NatGateways": [
+                        {"NatGatewayId": "nat-1", "State": "available", "Tags": OWNED},
+                        {"NatGatewayId": "nat-2", "State": "deleted", "Tags": OWNED},
+                    ]
+                }
+            ],
+            "describe_security_groups": [
+                {
+                    "SecurityGroups": [
+                        {"GroupId": "sg-default", "GroupName": "default", "VpcId": "vpc-a"},
+                        {
+                            "GroupId": "sg-1",
+                            "GroupName": "alpha-1-node",
+                            "VpcId": "vpc-a",
+                            "IpPermissions": [{"IpProtocol": "-1"}],
+                            "IpPermissionsEgress": [{"IpProtocol": "-1"}],
+                        },
+                    ]
+                }
+            ],
+            "describe_subnets": [
+                {"Subnets": [{"SubnetId": "subnet-1", "VpcId": "vpc-a"}]}
+            ],
+            "describe_route_tables": [
+                {
+                    "RouteTables": [
+                        {"RouteTableId": "rtb-main", "VpcId": "vpc-a",
+                         "Associations": [{"Main": True}]},
+                        {"RouteTableId": "rtb-1", "VpcId": "vpc-a"},
+                    ]
+                }
+            ],
+            "describe_internet_gateways": [
+                {
+                    "InternetGateways": [
+                        {"InternetGatewayId": "igw-1", "Attachments": [{"VpcId": "vpc-a"}]}
+                    ]
+                }
+            ],
+        },
+        addresses=[{"AllocationId": "eipalloc-1", "Tags": OWNED}],
+    )
+    with patch(
+        "openshift_resource_cleanup.openshift.inventory.get_client", return_value=client
+    ):
+        yield RegionInventory("us-east-1")
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestTeardownPlanner:
+    """Test plans built from the region inventory."""
+
+    def test_plan_selects_resources_like_delete_steps(self, inventory):
+        """
+        GIVEN a cluster VPC with NAT, EIP, security groups, subnet, route tables and IGW
+        WHEN its teardown is planned
+        THEN deleted NATs, the default group and the main route table should be skipped
+        AND empty nodes left out
+        """
+        plan = plan_cluster_teardown("alpha", "alpha-1", "us-east-1", inventory)
+
+        resources = {step.node: step.resources for step in plan.steps}
+        assert plan.vpc_id == "vpc-a"
+        assert resources == {
+            "nat_gateways": ["nat-1"],
+            "elastic_ips": ["eipalloc-1"],
+            "security_groups": ["sg-1"],
+            "subnets": ["subnet-1"],
+            "route_tables": ["rtb-1"],
+            "internet_gateway": ["igw-1"],
+            "vpc": ["vpc-a"],
+        }
+
+    def test_stages_and_api_call_estimate(self, inventory):
+        """
+        GIVEN the same cluster
+        WHEN its teardown is planned
+        THEN stages should follow the dependency graph
+        AND calls should count rule revokes, IGW detach and instance termination
+        """
+        plan = plan_cluster_teardown("alpha", "alpha-1", "us-east-1", inventory)
+
+        steps = {step.node: step for step in plan.steps}
+        assert steps["nat_gateways"].stage == 0
+        assert steps["elastic_ips"].stage == 1
+        assert steps["route_tables"].stage == 3
+        assert steps["vpc"].stage == plan.stages - 1 == 4
+        assert steps["security_groups"].api_calls == 3
+        assert steps["internet_gateway"].api_calls == 2
+        # nat + eip + sg(3) + subnet + rtb + igw(2) + vpc + terminate
+        assert plan.api_calls == 11
+        assert json.loads(plan.to_json())["estimated_api_calls"] == 11
+
+    def test_cluster_without_vpc_has_only_post_steps(self, inventory):
+        """
+        GIVEN a cluster whose VPC is already gone
+        WHEN its teardown is planned
+        THEN no graph step should be planned, only DNS and S3 cleanup
+        """
+        plan = plan_cluster_teardown("beta", "beta-2", "us-east-1", inventory)
+
+        assert plan.vpc_id is None
+        assert plan.steps == []
+        assert plan.to_dict()["post_steps"] == ["route53_records", "s3_state"]
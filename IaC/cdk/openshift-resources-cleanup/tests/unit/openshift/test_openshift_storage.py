@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import Mock, patch
 from botocore.exceptions import ClientError
 
-from openshift_resource_cleanup.openshift.storage import cleanup_s3_state
+from openshift_resource_cleanup.openshift.storage import cleanup_s3_state, delete_prefix
 
 
 @pytest.mark.unit
@@ -13,7 +13,11 @@ from openshift_resource_cleanup.openshift.storage import cleanup_s3_state
 class TestCleanupS3State:
     """Test S3 state bucket cleanup for OpenShift clusters."""
 
-    @patch("openshift_resource_cleanup.openshift.storage.boto3.client")
+    @patch(
+        "openshift_resource_cleanup.openshift.storage.get_account_id",
+        Mock(return_value="123456789012"),
+    )
+    @patch("openshift_resource_cleanup.openshift.storage.get_client")
     @patch("openshift_resource_cleanup.openshift.storage.DRY_RUN", False)
     def test_deletes_s3_objects_live_mode(self, mock_boto_client):
         """
@@ -22,42 +26,45 @@ class TestCleanupS3State:
         THEN all cluster objects should be deleted
         """
         mock_s3 = Mock()
-        mock_sts = Mock()
-
-        def client_factory(service_name, **kwargs):
-            if service_name == "s3":
-                return mock_s3
-            elif service_name == "sts":
-                return mock_sts
-            return Mock()
-
-        mock_boto_client.side_effect = client_factory
-
-        mock_sts.get_caller_identity.return_value = {"Account": "123456789012"}
-
-        mock_s3.list_objects_v2.return_value = {
-            "Contents": [
-                {"Key": "test-cluster/terraform.tfstate"},
-                {"Key": "test-cluster/metadata.json"},
-            ]
-        }
+        mock_boto_client.return_value = mock_s3
+
+        mock_s3.get_paginator.return_value.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "test-cluster/terraform.tfstate", "Size": 100},
+                    {"Key": "test-cluster/metadata.json", "Size": 20},
+                ]
+            }
+        ]
+        mock_s3.delete_objects.return_value = {}
 
         cleanup_s3_state("test-cluster", "us-east-1")
 
         expected_bucket = "openshift-clusters-123456789012-us-east-1"
-        mock_s3.list_objects_v2.assert_called_once_with(
-            Bucket=expected_bucket, Prefix="test-cluster/"
+        mock_s3.get_paginator.assert_called_once_with("list_objects_v2")
+        mock_s3.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket=expected_bucket,
+            Prefix="test-cluster/",
+            PaginationConfig={"PageSize": 1000},
         )
 
-        assert mock_s3.delete_object.call_count == 2
-        mock_s3.delete_object.assert_any_call(
-            Bucket=expected_bucket, Key="test-cluster/terraform.tfstate"
-        )
-        mock_s3.delete_object.assert_any_call(
-            Bucket=expected_bucket, Key="test-cluster/metadata.json"
+        mock_s3.delete_objects.assert_called_once_with(
+            Bucket=expected_bucket,
+            Delete={
+                "Objects": [
+                    {"Key": "test-cluster/terraform.tfstate"},
+                    {"Key": "test-cluster/metadata.json"},
+                ],
+                "Quiet": True,
+            },
         )
+        mock_s3.delete_object.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.storage.boto3.client")
+    @patch(
+        "openshift_resource_cleanup.openshift.storage.get_account_id",
+        Mock(return_value="123456789012"),
+    )
+    @patch("openshift_resource_cleanup.openshift.storage.get_client")
     @patch("openshift_resource_cleanup.openshift.storage.DRY_RUN", True)
     def test_skips_deletion_in_dry_run_mode(self, mock_boto_client):
         """
@@ -66,27 +73,20 @@ class TestCleanupS3State:
         THEN no deletions should occur
         """
         mock_s3 = Mock()
-        mock_sts = Mock()
-
-        def client_factory(service_name, **kwargs):
-            if service_name == "s3":
-                return mock_s3
-            elif service_name == "sts":
-                return mock_sts
-            return Mock()
-
-        mock_boto_client.side_effect = client_factory
-
-        mock_sts.get_caller_identity.return_value = {"Account": "123456789012"}
-        mock_s3.list_objects_v2.return_value = {
-            "Contents": [{"Key": "test-cluster/terraform.tfstate"}]
-        }
+        mock_boto_client.return_value = mock_s3
+        mock_s3.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "test-cluster/terraform.tfstate"}]}
+        ]
 
         cleanup_s3_state("test-cluster", "us-east-1")
 
-        mock_s3.delete_object.assert_not_called()
+        mock_s3.delete_objects.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.storage.boto3.client")
+    @patch(
+        "openshift_resource_cleanup.openshift.storage.get_account_id",
+        Mock(return_value="123456789012"),
+    )
+    @patch("openshift_resource_cleanup.openshift.storage.get_client")
     @patch("openshift_resource_cleanup.openshift.storage.DRY_RUN", False)
     def test_handles_no_contents_in_bucket(self, mock_boto_client):
         """
@@ -95,25 +95,19 @@ class TestCleanupS3State:
         THEN function should complete without errors
         """
         mock_s3 = Mock()
-        mock_sts = Mock()
-
-        def client_factory(service_name, **kwargs):
-            if service_name == "s3":
-                return mock_s3
-            elif service_name == "sts":
-                return mock_sts
-            return Mock()
-
-        mock_boto_client.side_effect = client_factory
-
-        mock_sts.get_caller_identity.return_value = {"Account": "123456789012"}
-        mock_s3.list_objects_v2.return_value = {}  # No Contents key
+        mock_boto_client.return_value = mock_s3
+        # No Contents key
+        mock_s3.get_paginator.return_value.paginate.return_value = [{}]
 
         cleanup_s3_state("test-cluster", "us-east-1")
 
-        mock_s3.delete_object.assert_not_called()
+        mock_s3.delete_objects.assert_not_called()
 
-    @patch("openshift_resource_cleanup.openshift.storage.boto3.client")
+    @patch(
+        "openshift_resource_cleanup.openshift.storage.get_account_id",
+        Mock(return_value="123456789012"),
+    )
+    @patch("openshift_resource_cleanup.openshift.storage.get_client")
     @patch("openshift_resource_cleanup.openshift.storage.DRY_RUN", False)
     def test_handles_missing_bucket_gracefully(self, mock_boto_client):
         """
@@ -122,23 +116,66 @@ class TestCleanupS3State:
         THEN NoSuchBucket error should be handled gracefully
         """
         mock_s3 = Mock()
-        mock_sts = Mock()
-
-        def client_factory(service_name, **kwargs):
-            if service_name == "s3":
-                return mock_s3
-            elif service_name == "sts":
-                return mock_sts
-            return Mock()
-
-        mock_boto_client.side_effect = client_factory
-
-        mock_sts.get_caller_identity.return_value = {"Account": "123456789012"}
-        mock_s3.list_objects_v2.side_effect = ClientError(
+        mock_boto_client.return_value = mock_s3
+        mock_s3.get_paginator.return_value.paginate.side_effect = ClientError(
             {"Error": {"Code": "NoSuchBucket"}}, "ListObjectsV2"
         )
 
         # Should not raise exception
         cleanup_s3_state("test-cluster", "us-east-1")
 
-        mock_s3.delete_object.assert_not_called()
+        mock_s3.delete_objects.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestDeletePrefix:
+    """Test streaming bulk deletion of an S3 prefix."""
+
+    def test_deletes_every_page_in_batches(self):
+        """
+        GIVEN a prefix with 2500 objects spread over three list pages
+        WHEN delete_prefix is called
+        THEN each page should be removed with one delete_objects call
+        AND deleted objects and bytes should be reported
+        """
+        mock_s3 = Mock()
+        pages = [
+            {"Contents": [{"Key": f"c/{n}", "Size": 10} for n in range(start, end)]}
+            for start, end in ((0, 1000), (1000, 2000), (2000, 2500))
+        ]
+        mock_s3.get_paginator.return_value.paginate.return_value = pages
+        mock_s3.delete_objects.return_value = {}
+
+        stats = delete_prefix(mock_s3, "bucket", "c/")
+
+        assert mock_s3.delete_objects.call_count == 3
+        batch_sizes = sorted(
+            len(c.kwargs["Delete"]["Objects"])
+            for c in mock_s3.delete_objects.call_args_list
+        )
+        assert batch_sizes == [500, 1000, 1000]
+        assert stats["objects_deleted"] == 2500
+        assert stats["bytes_deleted"] == 25000
+        assert stats["objects_failed"] == 0
+        assert "objects_per_second" in stats and "bytes_per_second" in stats
+
+    def test_reports_per_key_failures(self):
+        """
+        GIVEN delete_objects reports an error for one key
+        WHEN delete_prefix is called
+        THEN the failed key should not be counted as deleted
+        """
+        mock_s3 = Mock()
+        mock_s3.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "c/a", "Size": 5}, {"Key": "c/b", "Size": 7}]}
+        ]
+        mock_s3.delete_objects.return_value = {
+            "Errors": [{"Key": "c/b", "Code": "AccessDenied"}]
+        }
+
+        stats = delete_prefix(mock_s3, "bucket", "c/")
+
+        assert stats["objects_deleted"] == 1
+        assert stats["bytes_deleted"] == 5
+        assert stats["objects_failed"] == 1
@@ -0,0 +1,206 @@
+"""Unit tests for the OpenShift teardown graph executor."""
+
+from __future__ import annotations
+import threading
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+
+from openshift_resource_cleanup.openshift.teardown import (
+    TeardownExecutor,
+    TeardownNode,
+)
+from openshift_resource_cleanup.utils import TimeBudget
+
+
+class FakeClock:
+    """Monotonic clock advanced only by sleep()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestTeardownExecutor:
+    """Test dependency-graph teardown execution."""
+
+    def test_independent_nodes_run_in_parallel(self):
+        """
+        GIVEN two nodes without dependencies between them
+        WHEN the graph is executed with two workers
+        THEN both should be running at the same time
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def action() -> bool:
+            barrier.wait()
+            return True
+
+        report = TeardownExecutor(
+            [TeardownNode("a", action), TeardownNode("b", action)], max_workers=2
+        ).run()
+
+        assert report.complete
+
+    def test_dependents_run_after_dependencies(self):
+        """
+        GIVEN a chain a -> b -> c
+        WHEN the graph is executed
+        THEN nodes should complete in dependency order
+        """
+        order: list[str] = []
+
+        def make(name: str):
+            return lambda: order.append(name) or True
+
+        report = TeardownExecutor(
+            [
+                TeardownNode("c", make("c"), depends_on=("b",)),
+                TeardownNode("b", make("b"), depends_on=("a",)),
+                TeardownNode("a", make("a")),
+            ]
+        ).run()
+
+        assert order == ["a", "b", "c"]
+        assert report.complete
+
+    def test_without_budget_blocked_nodes_are_not_retried(self):
+        """
+        GIVEN a blocked node and no invocation budget
+        WHEN the graph is executed
+        THEN it should be attempted once and its dependents left pending
+        """
+        dependent = Mock(return_value=True)
+        report = TeardownExecutor(
+            [
+                TeardownNode("nat", Mock(return_value=False)),
+                TeardownNode("subnets", dependent, depends_on=("nat",)),
+            ]
+        ).run()
+
+        assert not report.complete
+        assert report.nodes["nat"].status == "blocked"
+        assert report.nodes["nat"].attempts == 1
+        assert report.nodes["subnets"].status == "pending"
+        dependent.assert_not_called()
+
+    def test_blocked_node_retried_with_backoff_within_budget(self):
+        """
+        GIVEN a node blocked for two attempts and plenty of budget
+        WHEN the graph is executed
+        THEN it should be retried after 5s then 10s with its inventory refreshed
+        """
+        clock = FakeClock()
+        inventory = Mock()
+        subnets = Mock(side_effect=[False, False, True])
+
+        report = TeardownExecutor(
+            [
+                TeardownNode("subnets", subnets, refresh=("subnets",)),
+                TeardownNode("vpc", Mock(return_value=True), depends_on=("subnets",)),
+            ],
+            budget=TimeBudget(lambda: 300000),
+            inventory=inventory,
+            sleep=clock.sleep,
+            clock=clock,
+        ).run()
+
+        assert report.complete
+        assert report.nodes["subnets"].attempts == 3
+        assert clock.sleeps == [5.0, 10.0]
+        assert inventory.invalidate.call_count == 2
+        inventory.invalidate.assert_called_with("subnets")
+
+    def test_retries_stop_when_budget_runs_out(self):
+        """
+        GIVEN a node that stays blocked and a budget shorter than the backoff
+        WHEN the graph is executed
+        THEN it should give up without sleeping
+        """
+        clock = FakeClock()
+        report = TeardownExecutor(
+            [TeardownNode("igw", Mock(return_value=False))],
+            budget=TimeBudget(lambda: 64000, reserve_seconds=60),
+            sleep=clock.sleep,
+            clock=clock,
+        ).run()
+
+        assert report.nodes["igw"].status == "blocked"
+        assert report.nodes["igw"].attempts == 1
+        assert clock.sleeps == []
+
+    def test_limited_budget_caps_retries_of_one_cluster(self):
+        """
+        GIVEN a node that stays blocked and an invocation budget capped to 10s
+        WHEN the graph is executed
+        THEN it should be retried only while the cap allows the backoff
+        """
+        clock = FakeClock()
+        report = TeardownExecutor(
+            [TeardownNode("subnets", Mock(return_value=False))],
+            budget=TimeBudget(lambda: 600000).limited_to(10),
+            sleep=clock.sleep,
+            clock=clock,
+        ).run()
+
+        assert report.nodes["subnets"].attempts == 2
+        assert clock.sleeps == [5.0]
+
+    def test_dependency_violation_marks_node_blocked(self):
+        """
+        GIVEN a node raising DependencyViolation
+        WHEN the graph is executed
+        THEN the node should be reported blocked instead of raising
+        """
+        action = Mock(
+            side_effect=ClientError(
+                {"Error": {"Code": "DependencyViolation"}}, "DeleteSubnet"
+            )
+        )
+        report = TeardownExecutor([TeardownNode("subnets", action)]).run()
+
+        assert report.nodes["subnets"].status == "blocked"
+
+    def test_nodes_completed_by_previous_run_are_skipped(self):
+        """
+        GIVEN nodes recorded as complete by a previous run
+        WHEN the graph is executed with them
+        THEN only the remaining nodes should run
+        """
+        finished = Mock(return_value=True)
+        remaining = Mock(return_value=True)
+
+        report = TeardownExecutor(
+            [
+                TeardownNode("nat", finished),
+                TeardownNode("subnets", remaining, depends_on=("nat",)),
+            ],
+            completed=["nat"],
+        ).run()
+
+        assert report.complete
+        finished.assert_not_called()
+        remaining.assert_called_once()
+
+    def test_rejects_cyclic_graph(self):
+        """
+        GIVEN nodes that depend on each other
+        WHEN the executor is created
+        THEN ValueError should be raised
+        """
+        with pytest.raises(ValueError):
+            TeardownExecutor(
+                [
+                    TeardownNode("a", Mock(), depends_on=("b",)),
+                    TeardownNode("b", Mock(), depends_on=("a",)),
+                ]
+            )
@@ -0,0 +1,103 @@
+"""Unit tests for the columnar action ledger."""
+
+from __future__ import annotations
+import io
+import json
+import pytest
+
+from openshift_resource_cleanup.models import ActionLedger, CleanupAction
+
+
+def make_action(region: str, infra_id: str, days_overdue: float = 1.0, **overrides):
+    fields = dict(
+        instance_id=f"i-{infra_id}",
+        region=region,
+        name=f"{infra_id}-master-0",
+        action="TERMINATE_OPENSHIFT_CLUSTER",
+        reason="OpenShift cluster TTL expired",
+        days_overdue=days_overdue,
+        cluster_name=infra_id.rsplit("-", 1)[0],
+        infra_id=infra_id,
+    )
+    fields.update(overrides)
+    return CleanupAction(**fields)
+
+
+@pytest.mark.unit
+class TestActionLedger:
+    """Test storage, aggregates and serialization of the ledger."""
+
+    def test_rows_round_trip(self):
+        """
+        GIVEN actions with optional fields set and unset
+        WHEN they are stored in the ledger
+        THEN iterating should return equal actions in insertion order
+        """
+        actions = [
+            make_action(
+                "us-east-1",
+                "alpha-aaaaa",
+                2.5,
+                owner="dev",
+                deferred=True,
+                instance_ids=["i-alpha-aaaaa", "i-alpha-bbbbb"],
+            ),
+            make_action("eu-west-1", "beta-bbbbb", cluster_name=None, owner=None),
+        ]
+
+        ledger = ActionLedger(actions)
+
+        assert len(ledger) == 2
+        assert list(ledger) == actions
+
+    def test_aggregates_from_columns(self):
+        """
+        GIVEN actions across regions, two of them deferred
+        WHEN aggregates are computed
+        THEN counts, deferred rows and overdue summary should match the input
+        """
+        ledger = ActionLedger(
+            [
+                make_action("us-east-1", "a-1", 1.0),
+                make_action("us-east-1", "b-1", 3.0, deferred=True),
+                make_action("eu-west-1", "c-1", 2.0, action="STOP", deferred=True),
+            ]
+        )
+
+        assert ledger.count_by("region") == {"us-east-1": 2, "eu-west-1": 1}
+        assert ledger.count_by("action") == {"TERMINATE_OPENSHIFT_CLUSTER": 2, "STOP": 1}
+        assert ledger.count_by("owner") == {}
+        assert ledger.deferred_count() == 2
+        assert ledger.deferred_indexes() == [1, 2]
+        assert ledger.days_overdue_summary() == {"max": 3.0, "mean": 2.0}
+
+    def test_repeated_strings_are_interned(self):
+        """
+        GIVEN 1000 actions sharing region, action, reason and billing tag
+        WHEN they are stored
+        THEN each shared string should be stored once
+        """
+        ledger = ActionLedger(
+            make_action("us-east-1", f"c{n}-xxxxx", billing_tag="ci") for n in range(1000)
+        )
+
+        # 4 shared strings + instance id, name, cluster name and infra id per row
+        assert len(ledger._strings) == 1 + 4 + 4 * 1000
+
+    def test_ndjson_matches_to_dict(self):
+        """
+        GIVEN a ledger of three actions
+        WHEN it is written as NDJSON
+        THEN each line should equal the action's to_dict and head() should cap rows
+        """
+        actions = [make_action("us-east-1", f"c{n}-xxxxx", n / 3) for n in range(3)]
+        ledger = ActionLedger(actions)
+        stream = io.BytesIO()
+
+        written = ledger.write_ndjson(stream)
+
+        lines = stream.getvalue().splitlines()
+        assert written == len(stream.getvalue())
+        assert [json.loads(line) for line in lines] == [a.to_dict() for a in actions]
+        assert ledger.head(2) == [a.to_dict() for a in actions[:2]]
+        assert ledger.head(10) == [a.to_dict() for a in actions]
@@ -0,0 +1,189 @@
+"""Unit tests for per-operation AWS API accounting."""
+
+from __future__ import annotations
+import pytest
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+from unittest.mock import patch
+
+from openshift_resource_cleanup.utils.api_stats import ApiStats, percentile
+
+EC2_OK = (
+    b'<DescribeRegionsResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+    b"<requestId>1</requestId><regionInfo/></DescribeRegionsResponse>"
+)
+EC2_THROTTLED = (
+    b"<Response><Errors><Error><Code>RequestLimitExceeded</Code>"
+    b"<Message>Request limit exceeded.</Message></Error></Errors>"
+    b"<RequestID>1</RequestID></Response>"
+)
+
+
+class _Raw:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+def make_client(stats: ApiStats, responses: list[tuple[int, bytes]]):
+    """Real EC2 client whose HTTP layer replays ``responses`` in order.
+
+    The last response repeats once the others are used up.
+    """
+    client = boto3.client(
+        "ec2",
+        region_name="eu-west-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        config=Config(retries={"mode": "standard", "max_attempts": 3}),
+    )
+    stats.instrument(client)
+    pending = list(responses)
+
+    def send(request, **kwargs):
+        status, body = pending.pop(0) if len(pending) > 1 else pending[0]
+        return AWSResponse(request.url, status, {}, _Raw(body))
+
+    client.meta.events.register("before-send", send)
+    return client
+
+
+@pytest.fixture
+def no_backoff():
+    with patch("botocore.endpoint.time.sleep"):
+        yield
+
+
+class TestPercentile:
+    """Test nearest-rank percentiles."""
+
+    def test_nearest_rank(self):
+        """
+        GIVEN latencies 1..100
+        WHEN percentiles are taken
+        THEN they should be the nearest-rank values
+        """
+        values = [float(n) for n in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([], 50) == 0.0
+
+
+class TestBotocoreHooks:
+    """Test accounting through a real botocore request pipeline."""
+
+    def test_counts_calls_and_latency_per_region_and_operation(self, no_backoff):
+        """
+        GIVEN an instrumented client
+        WHEN two successful calls are made
+        THEN both should be counted under the client's region and operation
+        """
+        stats = ApiStats()
+        client = make_client(stats, [(200, EC2_OK), (200, EC2_OK)])
+
+        client.describe_regions()
+        client.describe_regions()
+
+        snapshot = stats.snapshot()
+        operation = snapshot["regions"]["eu-west-1"]["operations"]["ec2:DescribeRegions"]
+        assert snapshot["calls"] == 2
+        assert operation["calls"] == 2
+        assert operation["errors"] == 0
+        assert set(operation["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+    def test_counts_throttles_and_retries(self, no_backoff):
+        """
+        GIVEN a call throttled twice before succeeding
+        WHEN it is made through the instrumented client
+        THEN one call, two throttled attempts and two retries should be recorded
+        """
+        stats = ApiStats()
+        client = make_client(
+            stats, [(503, EC2_THROTTLED), (503, EC2_THROTTLED), (200, EC2_OK)]
+        )
+
+        client.describe_regions()
+
+        region = stats.snapshot()["regions"]["eu-west-1"]
+        assert region["calls"] == 1
+        assert region["throttles"] == 2
+        assert region["retries"] == 2
+        assert region["errors"] == 0
+
+    def test_exhausted_retries_count_as_error(self, no_backoff):
+        """
+        GIVEN a call throttled on every attempt
+        WHEN retries are exhausted
+        THEN the call should be recorded as an error with every throttle counted
+        """
+        stats = ApiStats()
+        client = make_client(stats, [(503, EC2_THROTTLED)])
+
+        with pytest.raises(client.exceptions.ClientError):
+            client.describe_regions()
+
+        region = stats.snapshot()["regions"]["eu-west-1"]
+        assert region["calls"] == 1
+        assert region["errors"] == 1
+        assert region["retries"] >= 2
+        assert region["throttles"] == region["retries"] + 1
+
+    def test_reset_clears_stats(self, no_backoff):
+        """
+        GIVEN recorded calls
+        WHEN the collector is reset
+        THEN the next snapshot should be empty
+        """
+        stats = ApiStats()
+        client = make_client(stats, [(200, EC2_OK)])
+        client.describe_regions()
+
+        stats.reset()
+
+        assert stats.snapshot() == {
+            "calls": 0,
+            "errors": 0,
+            "throttles": 0,
+            "retries": 0,
+            "regions": {},
+        }
+
+
+class TestAggregation:
+    """Test snapshot ordering and cross-region latency."""
+
+    def test_operations_sorted_by_total_latency(self):
+        """
+        GIVEN one operation with many fast calls and one with a few slow calls
+        WHEN a snapshot is taken
+        THEN the operation with the most total latency should come first
+        """
+        stats = ApiStats()
+        for _ in range(10):
+            stats.record_call("us-east-1", "ec2", "DescribeInstances", 5.0)
+        for _ in range(2):
+            stats.record_call("us-east-1", "elb", "DescribeLoadBalancers", 400.0)
+
+        operations = stats.snapshot()["regions"]["us-east-1"]["operations"]
+
+        assert list(operations) == ["elb:DescribeLoadBalancers", "ec2:DescribeInstances"]
+
+    def test_latency_by_operation_merges_regions(self):
+        """
+        GIVEN the same operation called in two regions
+        WHEN latency is summarized per operation
+        THEN samples from both regions should be combined
+        """
+        stats = ApiStats()
+        stats.record_call("us-east-1", "ec2", "DeleteVpc", 10.0)
+        stats.record_call("eu-west-1", "ec2", "DeleteVpc", 30.0)
+
+        latency = stats.latency_by_operation()["ec2:DeleteVpc"]
+
+        assert latency["p50"] == 10.0
+        assert latency["max"] == 30.0
@@ -0,0 +1,123 @@
+"""Unit tests for the shared boto3 client registry."""
+
+from __future__ import annotations
+import threading
+import pytest
+from unittest.mock import Mock, patch
+
+from openshift_resource_cleanup.models.config import FAN_OUT_MAX_CONCURRENCY
+from openshift_resource_cleanup.utils.clients import (
+    CLIENT_CONFIG,
+    SERVICE_CONFIG,
+    clear_clients,
+    get_account_id,
+    get_client,
+)
+
+
+class TestClientRegistry:
+    """Test per-(service, region) client caching."""
+
+    @patch("openshift_resource_cleanup.utils.clients.boto3.client")
+    def test_reuses_client_for_same_service_and_region(self, mock_boto_client):
+        """
+        GIVEN a client was already requested for ec2/us-east-1
+        WHEN get_client is called again with the same arguments
+        THEN the cached client should be returned without building a new one
+        """
+        mock_boto_client.side_effect = lambda *args, **kwargs: Mock()
+
+        first = get_client("ec2", region_name="us-east-1")
+        second = get_client("ec2", region_name="us-east-1")
+
+        assert first is second
+        mock_boto_client.assert_called_once_with(
+            "ec2", region_name="us-east-1", config=CLIENT_CONFIG
+        )
+
+    @patch("openshift_resource_cleanup.utils.clients.boto3.client")
+    def test_separate_clients_per_region_and_service(self, mock_boto_client):
+        """
+        GIVEN requests for different regions and services
+        WHEN get_client is called
+        THEN each (service, region) pair should get its own client
+        """
+        mock_boto_client.side_effect = lambda *args, **kwargs: Mock()
+
+        ec2_east = get_client("ec2", region_name="us-east-1")
+        ec2_west = get_client("ec2", region_name="us-west-2")
+        elb_east = get_client("elb", region_name="us-east-1")
+        route53 = get_client("route53")
+
+        assert len({id(ec2_east), id(ec2_west), id(elb_east), id(route53)}) == 4
+        assert mock_boto_client.call_count == 4
+
+    @patch("openshift_resource_cleanup.utils.clients.boto3.client")
+    def test_concurrent_callers_share_one_client(self, mock_boto_client):
+        """
+        GIVEN many threads requesting the same client at once
+        WHEN get_client is called concurrently
+        THEN only one client should be built
+        """
+        mock_boto_client.side_effect = lambda *args, **kwargs: Mock()
+        results = []
+
+        def worker():
+            results.append(get_client("ec2", region_name="eu-west-1"))
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in results}) == 1
+        mock_boto_client.assert_called_once()
+
+    @patch("openshift_resource_cleanup.utils.clients.boto3.client")
+    def test_clear_clients_forces_rebuild(self, mock_boto_client):
+        """
+        GIVEN a cached client
+        WHEN clear_clients is called
+        THEN the next get_client should build a fresh client
+        """
+        mock_boto_client.side_effect = lambda *args, **kwargs: Mock()
+
+        first = get_client("sns")
+        clear_clients()
+        second = get_client("sns")
+
+        assert first is not second
+
+    @patch("openshift_resource_cleanup.utils.clients.boto3.client")
+    def test_account_id_looked_up_once(self, mock_boto_client):
+        """
+        GIVEN repeated account ID lookups in one container
+        WHEN get_account_id is called
+        THEN sts.get_caller_identity should be called only once
+        """
+        mock_sts = Mock()
+        mock_sts.get_caller_identity.return_value = {"Account": "123456789012"}
+        mock_boto_client.return_value = mock_sts
+
+        assert get_account_id() == "123456789012"
+        assert get_account_id() == "123456789012"
+
+        mock_sts.get_caller_identity.assert_called_once()
+
+    def test_client_config_uses_adaptive_retries(self):
+        """
+        GIVEN the shared client configuration
+        THEN adaptive retry mode and a pool sized for concurrency should be set
+        """
+        assert CLIENT_CONFIG.retries["mode"] == "adaptive"
+        assert CLIENT_CONFIG.max_pool_connections >= 32
+
+    def test_lambda_client_pool_fits_full_fan_out(self):
+        """
+        GIVEN the Lambda client configuration
+        THEN every fan-out invoke that may run at once should get a connection
+        """
+        lambda_config = CLIENT_CONFIG.merge(SERVICE_CONFIG["lambda"])
+
+        assert lambda_config.max_pool_connections >= FAN_OUT_MAX_CONCURRENCY
@@ -0,0 +1,129 @@
+"""Unit tests for the single-pass InstanceFacts classifier."""
+
+from __future__ import annotations
+import pytest
+
+from openshift_resource_cleanup.handler import evaluate_ttl
+from openshift_resource_cleanup.models import InstanceFacts
+from openshift_resource_cleanup.models.instance_facts import (
+    DETECTED_CLUSTER_API,
+    DETECTED_NAME_PATTERN,
+    DETECTED_ROSA,
+    parse_ttl_expiry,
+)
+from tests.conftest import InstanceBuilder
+
+
+@pytest.mark.unit
+@pytest.mark.openshift
+class TestInstanceFacts:
+    """Test classification of instance tags in one pass."""
+
+    def test_collects_all_facts_from_rosa_instance(self):
+        """
+        GIVEN a ROSA instance with TTL, billing and owner tags
+        WHEN it is classified
+        THEN every fact should be filled from the single pass
+        """
+        instance = (
+            InstanceBuilder()
+            .with_instance_id("i-rosa")
+            .with_name("jvp-rosa1-qmdkk-worker-0")
+            .with_tag("red-hat-clustertype", "rosa")
+            .with_openshift_tags("jvp-rosa1-qmdkk")
+            .with_ttl_tags(1000000, 2)
+            .with_owner("jvp")
+            .build()
+        )
+
+        facts = InstanceFacts.from_instance(instance)
+
+        assert facts.instance_id == "i-rosa"
+        assert facts.name == "jvp-rosa1-qmdkk-worker-0"
+        assert facts.infra_id == "jvp-rosa1-qmdkk"
+        assert facts.detection == DETECTED_ROSA
+        assert facts.expires_at == 1000000 + 2 * 3600
+        assert facts.billing_tag == "openshift"
+        assert facts.owner == "jvp"
+
+    def test_eks_instance_is_not_detected(self):
+        """
+        GIVEN an EKS node with only a kubernetes.io/cluster tag
+        WHEN it is classified
+        THEN no infra ID or detection method should be set
+        """
+        facts = InstanceFacts.from_instance(
+            InstanceBuilder().with_name("eks-node").with_eks_tags("eks-1").build()
+        )
+
+        assert facts.infra_id is None
+        assert facts.detection is None
+
+    def test_cluster_api_tag_detected(self):
+        """
+        GIVEN an instance with a cluster-api provider tag
+        WHEN it is classified
+        THEN the infra ID should come from that tag
+        """
+        facts = InstanceFacts.from_instance(
+            InstanceBuilder()
+            .with_tag("sigs.k8s.io/cluster-api-provider-aws/cluster/ocp-abc12", "owned")
+            .build()
+        )
+
+        assert facts.infra_id == "ocp-abc12"
+        assert facts.detection == DETECTED_CLUSTER_API
+
+    def test_master_name_needs_infra_id_lookup(self):
+        """
+        GIVEN an untagged installer master instance
+        WHEN it is classified
+        THEN the cluster name should be kept for the infra ID lookup
+        """
+        facts = InstanceFacts.from_instance(
+            InstanceBuilder().with_name("test-cluster-abc12-master-0").build()
+        )
+
+        assert facts.infra_id is None
+        assert facts.detection == DETECTED_NAME_PATTERN
+        assert facts.name_cluster == "test-cluster"
+
+    def test_malformed_ttl_is_recorded_not_raised(self):
+        """
+        GIVEN TTL tags that cannot be parsed
+        WHEN the instance is classified and its TTL evaluated
+        THEN the error should be recorded and deletion skipped
+        """
+        facts = InstanceFacts.from_instance(
+            InstanceBuilder()
+            .with_tag("creation-time", "yesterday")
+            .with_tag("delete-cluster-after-hours", "8")
+            .build()
+        )
+
+        assert facts.expires_at is None
+        assert facts.ttl_error
+        assert evaluate_ttl(facts) == (False, 0.0)
+
+    def test_iso_creation_time_supported(self):
+        """
+        GIVEN an ISO 8601 creation-time tag
+        WHEN the TTL expiry is parsed
+        THEN it should match the equivalent Unix timestamp
+        """
+        assert parse_ttl_expiry("1970-01-12T13:46:40Z", "1") == 1000000 + 3600
+
+    def test_evaluate_ttl_reports_days_overdue(self):
+        """
+        GIVEN an instance whose TTL expired two days ago
+        WHEN evaluate_ttl is called
+        THEN it should be marked for deletion two days overdue
+        """
+        facts = InstanceFacts.from_instance(
+            InstanceBuilder().with_ttl_tags(1000000, 24).build()
+        )
+
+        should_delete, days_overdue = evaluate_ttl(facts, now=1000000 + 3 * 86400)
+
+        assert should_delete is True
+        assert days_overdue == pytest.approx(2.0)
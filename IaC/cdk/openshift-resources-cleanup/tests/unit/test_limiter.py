@@ -0,0 +1,264 @@
+"""Unit tests for the throttle-aware API limiter."""
+
+from __future__ import annotations
+import io
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+from openshift_resource_cleanup.fanout import LambdaDispatcher, region_event
+from openshift_resource_cleanup.utils.api_stats import ApiStats
+from openshift_resource_cleanup.utils.limiter import AimdLimiter, ApiLimiter, TokenBucket
+from tests.unit.test_api_stats import EC2_OK, EC2_THROTTLED, make_client
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock: FakeClock, **options) -> AimdLimiter:
+    options.setdefault("rate", 1000.0)
+    options.setdefault("capacity", 1000.0)
+    return AimdLimiter(clock=clock, sleep=clock.sleep, **options)
+
+
+class TestAimd:
+    """Test additive increase / multiplicative decrease of the limit."""
+
+    def test_throttle_halves_limit_once_per_cooldown(self, clock):
+        """
+        GIVEN a limiter at its maximum of 16
+        WHEN three throttles arrive within one cooldown window and one after it
+        THEN the limit should be halved twice, not four times
+        """
+        limiter = make_limiter(clock, max_concurrency=16, cooldown_seconds=1.0)
+
+        limiter.throttled()
+        limiter.throttled()
+        limiter.throttled()
+        clock.now += 1.5
+        limiter.throttled()
+
+        assert limiter.limit == 4.0
+        assert limiter.throttles == 4
+        assert limiter.decreases == 2
+
+    def test_limit_never_drops_below_minimum(self, clock):
+        """
+        GIVEN a limiter with a minimum of 2
+        WHEN it is throttled repeatedly
+        THEN the limit should stop at 2
+        """
+        limiter = make_limiter(
+            clock, max_concurrency=8, min_concurrency=2, cooldown_seconds=0
+        )
+
+        for _ in range(10):
+            limiter.throttled()
+
+        assert limiter.limit == 2.0
+        assert limiter.snapshot()["lowest_limit"] == 2.0
+
+    def test_successes_grow_limit_back_to_maximum(self, clock):
+        """
+        GIVEN a limiter cut down to 1 slot
+        WHEN calls keep succeeding
+        THEN the limit should grow back, but never above the maximum
+        """
+        limiter = make_limiter(
+            clock, max_concurrency=8, cooldown_seconds=0, decrease_factor=0.1
+        )
+        limiter.throttled()
+        assert limiter.limit == 1.0
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(success=True)
+        grown = limiter.limit
+        for _ in range(200):
+            limiter.acquire()
+            limiter.release(success=True)
+
+        assert 2.0 < grown < 8.0
+        assert limiter.limit == 8.0
+
+    def test_failed_calls_do_not_grow_limit(self, clock):
+        """
+        GIVEN a reduced limit
+        WHEN calls fail without throttling
+        THEN the limit should stay where it is
+        """
+        limiter = make_limiter(clock, max_concurrency=8)
+        limiter.throttled()
+
+        limiter.acquire()
+        limiter.release(success=False)
+
+        assert limiter.limit == 4.0
+
+
+class TestAdmission:
+    """Test concurrency and rate admission."""
+
+    def test_in_flight_calls_never_exceed_limit(self):
+        """
+        GIVEN a limiter with 3 slots shared by 12 threads
+        WHEN every thread makes calls
+        THEN no more than 3 calls should be in flight at once
+        """
+        limiter = AimdLimiter(max_concurrency=3, rate=1e6, capacity=1e6)
+        observed = []
+        lock = threading.Lock()
+
+        def call():
+            for _ in range(5):
+                limiter.acquire()
+                with lock:
+                    observed.append(limiter.in_flight)
+                time.sleep(0.001)
+                limiter.release(success=True)
+
+        threads = [threading.Thread(target=call) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(observed) <= 3
+        assert limiter.in_flight == 0
+        assert limiter.snapshot()["peak_in_flight"] == 3
+        assert limiter.waits > 0
+
+    def test_token_bucket_paces_bursts(self, clock):
+        """
+        GIVEN a bucket of 2 tokens refilling at 4 per second
+        WHEN 4 tokens are taken at once
+        THEN the first 2 should be free and the rest wait for refill
+        """
+        bucket = TokenBucket(rate=4.0, capacity=2.0, clock=clock)
+
+        delays = [bucket.take() for _ in range(4)]
+
+        assert delays == [0.0, 0.0, 0.25, 0.5]
+
+    def test_rate_limit_waits_are_counted(self, clock):
+        """
+        GIVEN a limiter whose bucket holds a single token
+        WHEN three calls are admitted back to back
+        THEN two should wait and the wait time should be recorded
+        """
+        limiter = make_limiter(clock, max_concurrency=8, rate=2.0, capacity=1.0)
+
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(success=True)
+
+        snapshot = limiter.snapshot()
+        assert snapshot["waits"] == 2
+        assert snapshot["wait_seconds"] == pytest.approx(1.0)
+
+    def test_admission_wait_is_bounded(self, clock):
+        """
+        GIVEN a limiter whose only slot is never released
+        WHEN another call is admitted
+        THEN it should proceed after max_wait_seconds and count a timeout
+        """
+        limiter = AimdLimiter(
+            max_concurrency=1, rate=1e6, capacity=1e6, max_wait_seconds=0.05
+        )
+        limiter.acquire()
+
+        limiter.acquire()
+
+        assert limiter.in_flight == 2
+        assert limiter.timeouts == 1
+
+
+class TestClientHooks:
+    """Test the limiter attached to a real botocore client."""
+
+    def test_throttled_call_shrinks_and_success_releases(self):
+        """
+        GIVEN a client with the limiter and API accounting attached
+        WHEN a call is throttled twice before succeeding
+        THEN the limit should be cut, the slot released and throttles counted
+        """
+        limiter = ApiLimiter(max_concurrency=8, cooldown_seconds=0)
+        stats = ApiStats()
+        client = make_client(
+            stats, [(503, EC2_THROTTLED), (503, EC2_THROTTLED), (200, EC2_OK)]
+        )
+        limiter.instrument(client)
+
+        with patch("botocore.endpoint.time.sleep"):
+            client.describe_regions()
+
+        snapshot = limiter.snapshot()["ec2:eu-west-1"]
+        assert snapshot["calls"] == 1
+        assert snapshot["throttles"] == 2
+        assert snapshot["decreases"] == 2
+        assert limiter.get("ec2", "eu-west-1").in_flight == 0
+
+    def test_snapshot_skips_unused_limiters(self):
+        """
+        GIVEN limiters created for clients that made no calls
+        WHEN a snapshot is taken
+        THEN they should not be reported
+        """
+        limiter = ApiLimiter()
+        limiter.get("ec2", "us-east-1")
+
+        assert limiter.snapshot() == {}
+
+    def test_fan_out_wider_than_api_concurrency_never_waits(self):
+        """
+        GIVEN a fan-out concurrency above the API concurrency limit
+        WHEN that many synchronous worker invokes run at once
+        THEN every invoke should be in flight together
+        AND none should wait on the limiter
+        """
+        api_max_concurrency, fan_out_concurrency = 4, 12
+        limiter = ApiLimiter(max_concurrency=api_max_concurrency, max_wait_seconds=5)
+        client = boto3.client(
+            "lambda",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        limiter.instrument(client)
+        # Each worker only returns once all of them are running
+        all_running = threading.Barrier(fan_out_concurrency, timeout=5)
+
+        def send(request, **kwargs):
+            all_running.wait()
+            return AWSResponse(request.url, 200, {}, io.BytesIO(b"{}"))
+
+        client.meta.events.register("before-send", send)
+        events = [region_event(f"region-{n}") for n in range(fan_out_concurrency)]
+
+        with patch("openshift_resource_cleanup.fanout.get_client", return_value=client):
+            results = LambdaDispatcher(
+                "cleanup-fn", max_workers=fan_out_concurrency
+            ).dispatch(events)
+
+        snapshot = limiter.snapshot()["lambda:us-east-1"]
+        assert results == [{}] * fan_out_concurrency
+        assert snapshot["peak_in_flight"] == fan_out_concurrency
+        assert snapshot["waits"] == 0
+        assert snapshot["timeouts"] == 0
@@ -0,0 +1,195 @@
+"""Unit tests for the SNS digest notifier."""
+
+from __future__ import annotations
+import pytest
+from unittest.mock import Mock, patch
+
+from openshift_resource_cleanup.models import CleanupAction
+from openshift_resource_cleanup.notifications import (
+    PUBLISH_BATCH_SIZE,
+    DigestNotifier,
+    notification_fingerprint,
+)
+from openshift_resource_cleanup.state import MemoryStateStore
+
+TOPIC = "arn:aws:sns:us-east-2:123456789012:cleanup"
+
+
+def make_action(region: str, infra_id: str, **overrides) -> CleanupAction:
+    fields = dict(
+        instance_id=f"i-{infra_id}",
+        region=region,
+        name=f"{infra_id}-master-0",
+        action="TERMINATE_OPENSHIFT_CLUSTER",
+        reason="OpenShift cluster TTL expired",
+        days_overdue=1.0,
+        cluster_name=infra_id.rsplit("-", 1)[0],
+        infra_id=infra_id,
+    )
+    fields.update(overrides)
+    return CleanupAction(**fields)
+
+
+class Clock:
+    def __init__(self, now: float = 1_760_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_sns():
+    with patch("openshift_resource_cleanup.notifications.get_client") as get_client:
+        sns = Mock()
+        sns.publish_batch.return_value = {"Successful": [], "Failed": []}
+        get_client.return_value = sns
+        yield sns
+
+
+def published_entries(sns: Mock) -> list[dict]:
+    return [
+        entry
+        for call in sns.publish_batch.call_args_list
+        for entry in call.kwargs["PublishBatchRequestEntries"]
+    ]
+
+
+@pytest.mark.unit
+class TestDigestNotifier:
+    """Test aggregation, deduplication and batch publishing."""
+
+    def test_one_message_for_all_regions(self, mock_sns):
+        """
+        GIVEN actions in two regions
+        WHEN the digest is sent
+        THEN a single message covering both regions should be published
+        """
+        notifier = DigestNotifier(TOPIC, MemoryStateStore(), clock=Clock())
+
+        result = notifier.notify(
+            [
+                make_action("us-east-1", "alpha-aaaaa"),
+                make_action("eu-west-1", "beta-bbbbb", deferred=True),
+            ]
+        )
+
+        entries = published_entries(mock_sns)
+        assert result == {"reported": 2, "suppressed": 0, "messages": 1}
+        assert mock_sns.publish_batch.call_count == 1
+        assert len(entries) == 1
+        message = entries[0]["Message"]
+        assert "Total Clusters: 2 in 2 regions" in message
+        assert "== eu-west-1 (1) ==" in message
+        assert "== us-east-1 (1) ==" in message
+        assert "Deferred to next run (time budget exhausted): 1" in message
+        assert entries[0]["Subject"].startswith("[DRY-RUN]")
+
+    def test_suppresses_clusters_reported_within_window(self, mock_sns):
+        """
+        GIVEN a cluster reported one hour ago with a 24h window
+        WHEN the next run finds it again alongside a new cluster
+        THEN only the new cluster should be reported
+        """
+        store, clock = MemoryStateStore(), Clock()
+        notifier = DigestNotifier(TOPIC, store, window_hours=24, clock=clock)
+        notifier.notify([make_action("us-east-1", "alpha-aaaaa")])
+        mock_sns.reset_mock()
+        clock.now += 3600
+
+        result = notifier.notify(
+            [make_action("us-east-1", "alpha-aaaaa"), make_action("us-east-1", "gamma-ccccc")]
+        )
+
+        message = published_entries(mock_sns)[0]["Message"]
+        assert result == {"reported": 1, "suppressed": 1, "messages": 1}
+        assert "gamma" in message
+        assert "alpha" not in message
+        assert "Already reported in the last 24h (omitted): 1" in message
+
+    def test_nothing_published_when_everything_was_reported(self, mock_sns):
+        """
+        GIVEN every cluster was reported within the window
+        WHEN the digest is sent
+        THEN SNS should not be called at all
+        """
+        clock = Clock()
+        notifier = DigestNotifier(TOPIC, MemoryStateStore(), clock=clock)
+        actions = [make_action("us-east-1", "alpha-aaaaa")]
+        notifier.notify(actions)
+        mock_sns.reset_mock()
+        clock.now += 60
+
+        result = notifier.notify(actions)
+
+        assert result == {"reported": 0, "suppressed": 1, "messages": 0}
+        mock_sns.publish_batch.assert_not_called()
+
+    def test_reports_again_after_window(self, mock_sns):
+        """
+        GIVEN a cluster reported 25 hours ago with a 24h window
+        WHEN it is found again
+        THEN it should be reported again
+        """
+        clock = Clock()
+        notifier = DigestNotifier(TOPIC, MemoryStateStore(), window_hours=24, clock=clock)
+        notifier.notify([make_action("us-east-1", "alpha-aaaaa")])
+        clock.now += 25 * 3600
+
+        result = notifier.notify([make_action("us-east-1", "alpha-aaaaa")])
+
+        assert result["reported"] == 1
+
+    def test_failed_publish_is_not_remembered(self, mock_sns):
+        """
+        GIVEN SNS rejects the digest
+        WHEN the digest is sent
+        THEN an error should be raised and the clusters not marked as reported
+        """
+        store = MemoryStateStore()
+        mock_sns.publish_batch.return_value = {
+            "Failed": [{"Id": "0", "Code": "InternalError", "Message": "boom"}]
+        }
+        notifier = DigestNotifier(TOPIC, store, clock=Clock())
+
+        with pytest.raises(RuntimeError, match="InternalError"):
+            notifier.notify([make_action("us-east-1", "alpha-aaaaa")])
+
+        assert store.recent_notifications(0.0) == set()
+
+    def test_large_digest_split_and_batched(self, mock_sns):
+        """
+        GIVEN more actions than fit in one SNS message
+        WHEN the digest is sent
+        THEN it should be split into numbered parts
+        AND published in batches of at most 10 entries within the size limit
+        """
+        long_reason = "x" * 2000
+        actions = [
+            make_action("us-east-1", f"c{n:04d}-aaaaa", reason=long_reason)
+            for n in range(400)
+        ]
+        notifier = DigestNotifier(TOPIC, MemoryStateStore(), clock=Clock())
+
+        result = notifier.notify(actions)
+
+        entries = published_entries(mock_sns)
+        assert result["messages"] == len(entries) > 1
+        assert entries[0]["Subject"].endswith(f"(1/{len(entries)})")
+        for call in mock_sns.publish_batch.call_args_list:
+            batch = call.kwargs["PublishBatchRequestEntries"]
+            assert len(batch) <= PUBLISH_BATCH_SIZE
+            assert sum(len(e["Message"].encode()) for e in batch) <= 256 * 1024
+        assert sum(e["Message"].count("Cluster: ") for e in entries) == 400
+
+    def test_mode_is_part_of_fingerprint(self):
+        """
+        GIVEN the same action in dry-run and live mode
+        WHEN fingerprints are computed
+        THEN they should differ, so going live reports every cluster again
+        """
+        action = make_action("us-east-1", "alpha-aaaaa")
+
+        assert notification_fingerprint(action, True) != notification_fingerprint(
+            action, False
+        )
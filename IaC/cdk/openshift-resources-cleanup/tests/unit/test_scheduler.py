@@ -0,0 +1,75 @@
+"""Unit tests for the deadline-aware work scheduler."""
+
+from __future__ import annotations
+import pytest
+
+from openshift_resource_cleanup.utils import DeadlineScheduler, TimeBudget
+
+
+class FakeClock:
+    """Clock advanced by the work items themselves."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestDeadlineScheduler:
+    """Test priority ordering and deadline handling."""
+
+    def test_runs_highest_priority_first(self):
+        """
+        GIVEN items with different priorities and no budget
+        WHEN the scheduler runs
+        THEN items should run in descending priority order
+        """
+        order: list[int] = []
+
+        result = DeadlineScheduler(None).run(
+            [1, 5, 3], priority=lambda n: n, work=lambda n: order.append(n) or True
+        )
+
+        assert order == [5, 3, 1]
+        assert result.completed == [5, 3, 1]
+        assert not result.stopped_early
+
+    def test_defers_items_once_budget_no_longer_fits(self):
+        """
+        GIVEN a 100s budget and items taking 40s each
+        WHEN the scheduler runs
+        THEN it should stop starting items once the slowest would not fit
+        """
+        clock = FakeClock()
+        budget = TimeBudget(lambda: int((100 - clock.now) * 1000))
+
+        def work(n: int) -> bool:
+            clock.now += 40
+            return True
+
+        result = DeadlineScheduler(budget, estimate_seconds=10, clock=clock).run(
+            [4, 3, 2, 1], priority=lambda n: n, work=work
+        )
+
+        assert result.completed == [4, 3]
+        assert result.deferred == [2, 1]
+        assert result.durations == [40, 40]
+
+    def test_failures_do_not_stop_the_run(self):
+        """
+        GIVEN a work item that raises
+        WHEN the scheduler runs
+        THEN it should be reported failed and later items still run
+        """
+
+        def work(n: int) -> bool:
+            if n == 2:
+                raise RuntimeError("boom")
+            return n != 1
+
+        result = DeadlineScheduler(None).run([1, 2, 3], priority=lambda n: n, work=work)
+
+        assert result.completed == [3]
+        assert result.failed == [2, 1]
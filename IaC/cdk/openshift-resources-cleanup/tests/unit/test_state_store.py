@@ -0,0 +1,229 @@
+"""Unit tests for the cross-run cleanup state store."""
+
+from __future__ import annotations
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from openshift_resource_cleanup.models import (
+    PHASE_COMPLETE,
+    CleanupAction,
+    ClusterProgress,
+)
+from openshift_resource_cleanup.state import (
+    DynamoDBStateStore,
+    MemoryStateStore,
+    SQLiteStateStore,
+)
+
+
+def make_action(infra_id: str = "jvp-rosa1-qmdkk") -> CleanupAction:
+    return CleanupAction(
+        instance_id="i-0123456789abcdef0",
+        region="us-east-1",
+        name=f"{infra_id}-master-0",
+        action="TERMINATE_OPENSHIFT_CLUSTER",
+        reason="OpenShift cluster TTL expired (1.00 days overdue)",
+        days_overdue=1.0,
+        cluster_name="jvp-rosa1",
+        infra_id=infra_id,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request):
+    if request.param == "memory":
+        yield MemoryStateStore()
+    else:
+        sqlite_store = SQLiteStateStore(":memory:")
+        yield sqlite_store
+        sqlite_store.close()
+
+
+@pytest.mark.unit
+class TestClusterProgress:
+    """Test ClusterProgress records."""
+
+    def test_round_trips_cleanup_action(self):
+        """
+        GIVEN progress started from a cleanup action
+        WHEN the action is rebuilt from the record
+        THEN it should match the original action
+        """
+        action = make_action()
+        progress = ClusterProgress.from_action(action)
+
+        assert progress.infra_id == "jvp-rosa1-qmdkk"
+        assert progress.to_action() == action
+
+    def test_record_attempt_marks_complete(self):
+        """
+        GIVEN progress with remaining nodes
+        WHEN a successful attempt is recorded
+        THEN the phase should be complete with nothing remaining
+        """
+        progress = ClusterProgress.from_action(make_action())
+        progress.remaining_nodes = ["vpc"]
+
+        progress.record_attempt(True)
+
+        assert progress.phase == PHASE_COMPLETE
+        assert progress.remaining_nodes == []
+        assert progress.attempts == 1
+        assert progress.last_attempt_at is not None
+
+
+@pytest.mark.unit
+class TestStateStores:
+    """Test behaviour shared by the memory and SQLite backends."""
+
+    def test_put_then_get(self, store):
+        """
+        GIVEN a stored progress record
+        WHEN it is read back by region and infra ID
+        THEN all fields should be preserved
+        """
+        progress = ClusterProgress.from_action(make_action())
+        progress.completed_nodes = ["load_balancers", "nat_gateways"]
+        store.put(progress)
+
+        assert store.get("us-east-1", "jvp-rosa1-qmdkk") == progress
+        assert store.get("us-east-1", "unknown") is None
+
+    def test_pending_excludes_finished_clusters(self, store):
+        """
+        GIVEN one finished and one unfinished cluster in a region
+        WHEN pending clusters are listed
+        THEN only the unfinished one should be returned
+        """
+        done = ClusterProgress.from_action(make_action("done-aaaaa"))
+        done.record_attempt(True)
+        store.put(done)
+        store.put(ClusterProgress.from_action(make_action("busy-bbbbb")))
+        other_region = ClusterProgress.from_action(make_action("west-ccccc"))
+        other_region.region = "us-west-2"
+        store.put(other_region)
+
+        assert [p.infra_id for p in store.pending("us-east-1")] == ["busy-bbbbb"]
+
+    def test_recent_notifications_respect_window(self, store):
+        """
+        GIVEN fingerprints recorded at two different times
+        WHEN recent notifications are read from a cutoff between them
+        THEN only the newer fingerprints should be returned
+        """
+        store.record_notifications(["old"], sent_at=1000.0, keep_seconds=10_000)
+        store.record_notifications(["new-a", "new-b"], sent_at=5000.0, keep_seconds=10_000)
+
+        assert store.recent_notifications(since=2000.0) == {"new-a", "new-b"}
+        assert store.recent_notifications(since=0.0) == {"old", "new-a", "new-b"}
+
+    def test_record_notifications_prunes_expired(self, store):
+        """
+        GIVEN a fingerprint older than the keep window
+        WHEN new fingerprints are recorded
+        THEN the expired one should be dropped
+        """
+        store.record_notifications(["stale"], sent_at=0.0, keep_seconds=100)
+        store.record_notifications(["fresh"], sent_at=1000.0, keep_seconds=100)
+
+        assert store.recent_notifications(since=0.0) == {"fresh"}
+
+
+@pytest.mark.unit
+class TestDynamoDBStateStore:
+    """Test the DynamoDB backend against a mocked client."""
+
+    @patch("openshift_resource_cleanup.state.dynamodb.get_client")
+    def test_put_writes_keys_and_ttl(self, mock_get_client):
+        """
+        GIVEN a progress record
+        WHEN it is stored
+        THEN region/infra_id keys, the JSON record and a TTL should be written
+        """
+        mock_ddb = Mock()
+        mock_get_client.return_value = mock_ddb
+        progress = ClusterProgress.from_action(make_action())
+        progress.last_attempt_at = 1_000_000.0
+
+        DynamoDBStateStore("state-table").put(progress)
+
+        item = mock_ddb.put_item.call_args.kwargs["Item"]
+        assert mock_ddb.put_item.call_args.kwargs["TableName"] == "state-table"
+        assert item["region"] == {"S": "us-east-1"}
+        assert item["infra_id"] == {"S": "jvp-rosa1-qmdkk"}
+        assert json.loads(item["data"]["S"]) == progress.to_dict()
+        assert int(item["expires_at"]["N"]) > 1_000_000
+
+    @patch("openshift_resource_cleanup.state.dynamodb.get_client")
+    def test_list_region_queries_partition(self, mock_get_client):
+        """
+        GIVEN records stored for a region
+        WHEN the region is listed
+        THEN a single paginated Query on the region key should be used
+        """
+        mock_ddb = Mock()
+        mock_get_client.return_value = mock_ddb
+        progress = ClusterProgress.from_action(make_action())
+        mock_ddb.get_paginator.return_value.paginate.return_value = [
+            {"Items": [{"data": {"S": json.dumps(progress.to_dict())}}]}
+        ]
+
+        records = DynamoDBStateStore("state-table").list_region("us-east-1")
+
+        assert records == [progress]
+        mock_ddb.get_paginator.assert_called_once_with("query")
+
+    @patch("openshift_resource_cleanup.state.dynamodb.get_client")
+    def test_record_notifications_batches_writes(self, mock_get_client):
+        """
+        GIVEN 30 fingerprints to remember
+        WHEN they are recorded
+        THEN they should be written in BatchWriteItem calls of at most 25
+        AND each item should expire with the window
+        """
+        mock_ddb = Mock()
+        mock_get_client.return_value = mock_ddb
+        mock_ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+        DynamoDBStateStore("state-table").record_notifications(
+            [f"fp-{n}" for n in range(30)], sent_at=1000.0, keep_seconds=3600
+        )
+
+        batches = [
+            c.kwargs["RequestItems"]["state-table"]
+            for c in mock_ddb.batch_write_item.call_args_list
+        ]
+        assert [len(batch) for batch in batches] == [25, 5]
+        item = batches[0][0]["PutRequest"]["Item"]
+        assert item["region"] == {"S": "#notifications"}
+        assert item["expires_at"] == {"N": "4600"}
+
+    @patch("openshift_resource_cleanup.state.dynamodb.get_client")
+    def test_recent_notifications_filters_by_time(self, mock_get_client):
+        """
+        GIVEN fingerprints in the notifications partition
+        WHEN recent notifications are read
+        THEN the partition should be queried with a sent_at filter
+        """
+        mock_ddb = Mock()
+        mock_get_client.return_value = mock_ddb
+        mock_ddb.get_paginator.return_value.paginate.return_value = [
+            {"Items": [{"infra_id": {"S": "fp-1"}}]}
+        ]
+
+        recent = DynamoDBStateStore("state-table").recent_notifications(500.0)
+
+        query = mock_ddb.get_paginator.return_value.paginate.call_args.kwargs
+        assert recent == {"fp-1"}
+        assert query["ExpressionAttributeValues"][":region"] == {"S": "#notifications"}
+        assert query["ExpressionAttributeValues"][":since"] == {"N": "500.0"}
+
+    def test_requires_table_name(self):
+        """
+        GIVEN no table name
+        WHEN the DynamoDB store is created
+        THEN ValueError should be raised
+        """
+        with pytest.raises(ValueError):
+            DynamoDBStateStore("")
@@ -1,24 +1,26 @@
 # Remove unused cloudformations
 import logging
 import datetime
-import boto3
-from boto3.exceptions import Boto3Error
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
-from utils import get_regions_list
-from time import sleep
+from utils import ADAPTIVE_RETRIES, backoff_delays, get_client, sweep_regions, wait_until
 
+STACK_STATUSES = {
+    "ROLLBACK_COMPLETE",
+    "CREATE_COMPLETE",
+    "UPDATE_COMPLETE",
+    "DELETE_FAILED",
+}
+# Stacks cleaned up at once within a region
+STACK_WORKERS = int(os.environ.get("STACK_WORKERS", "4"))
+# How long to track stack deletions before leaving them to CloudFormation
+STACK_DELETE_TIMEOUT = 300
 
-def is_stack_to_terminate(stack, aws_region):
-    cf_client = boto3.client("cloudformation", region_name=aws_region)
 
-    try:
-        stack_desc = cf_client.describe_stacks(StackName=stack)["Stacks"][0]
-        tags = stack_desc["Tags"]
-    except ClientError as e:
-        logging.error(f"Client error {e}")
-        return False
-
-    tags_dict = {item["Key"]: item["Value"] for item in tags}
+def is_stack_to_terminate(stack_desc):
+    tags_dict = {item["Key"]: item["Value"] for item in stack_desc.get("Tags", [])}
 
     if "team" not in tags_dict.keys() or tags_dict.get("team") != "cloud":
         return False
@@ -35,29 +37,25 @@ def is_stack_to_terminate(stack, aws_region):
     return False
 
 
-def get_cloudformation_to_terminate(aws_region):
-    cf_client = boto3.client("cloudformation", region_name=aws_region)
+def describe_stacks(cf_client):
+    """Describe every live stack of the region, tags included, page by page."""
+    paginator = cf_client.get_paginator("describe_stacks")
+    return [stack for page in paginator.paginate() for stack in page["Stacks"]]
 
-    stacks_for_deletion = []
+
+def get_cloudformation_to_terminate(aws_region):
+    cf_client = get_client("cloudformation", aws_region)
 
     cloudformation_stacks = [
-        stack["StackName"]
-        for stack in cf_client.list_stacks(
-            StackStatusFilter=[
-                "ROLLBACK_COMPLETE",
-                "CREATE_COMPLETE",
-                "UPDATE_COMPLETE",
-                "DELETE_FAILED",
-            ]
-        )["StackSummaries"]
+        stack for stack in describe_stacks(cf_client) if stack["StackStatus"] in STACK_STATUSES
     ]
 
     if not cloudformation_stacks:
-        logging.info(f"There are no cloudformation_stacks in cloud")
+        logging.info(f"There are no cloudformation_stacks in region {aws_region}")
 
-    for stack in cloudformation_stacks:
-        if is_stack_to_terminate(stack, aws_region):
-            stacks_for_deletion.append(stack)
+    stacks_for_deletion = [
+        stack["StackName"] for stack in cloudformation_stacks if is_stack_to_terminate(stack)
+    ]
 
     if not stacks_for_deletion:
         logging.info(f"There are no stacks for deletion")
@@ -65,7 +63,7 @@ def get_cloudformation_to_terminate(aws_region):
 
 
 def delete_stack(stack_name, aws_region):
-    cf_client = boto3.client("cloudformation", region_name=aws_region)
+    cf_client = get_client("cloudformation", aws_region)
     try:
         logging.info(f"Removing cloudformation stack: {stack_name}")
         cf_client.update_termination_protection(
@@ -76,17 +74,91 @@ def delete_stack(stack_name, aws_region):
     except ClientError as e:
         if "does not exist" in str(e):
             logging.info(f"Stack {stack_name} no longer exists, skipping.")
-            return
+            return False
         logging.error(f"Error deleting stack: {e}")
         raise
+    return True
+
+
+def wait_for_stacks_delete(stack_names, aws_region):
+    """Track deleting stacks with one paginated describe_stacks per poll.
+
+    Deleted stacks drop out of describe_stacks; stacks that end up in
+    DELETE_FAILED are reported and no longer waited for.
+    """
+    cf_client = get_client("cloudformation", aws_region)
+    pending = set(stack_names)
+
+    def deleted():
+        statuses = {
+            stack["StackName"]: stack["StackStatus"]
+            for stack in describe_stacks(cf_client)
+            if stack["StackName"] in pending
+        }
+        for stack_name in sorted(pending):
+            status = statuses.get(stack_name)
+            if status is None:
+                logging.info(f"Stack {stack_name} was successfully deleted.")
+            elif status == "DELETE_FAILED":
+                logging.error(f"Stack {stack_name} deletion failed.")
+            else:
+                continue
+            pending.discard(stack_name)
+        return not pending
+
+    # A stack retried from DELETE_FAILED can still report that status right
+    # after delete_stack; let the deletions start before the first poll
+    time.sleep(next(backoff_delays()))
+    if not wait_until(deleted, f"deletion of stacks in {aws_region}", timeout=STACK_DELETE_TIMEOUT):
+        logging.error(f"Stacks {sorted(pending)} are still being deleted.")
+
+
+def delete_role(iam_client, role_name):
+    paginator = iam_client.get_paginator("list_attached_role_policies")
+    for page in paginator.paginate(RoleName=role_name):
+        for policy in page["AttachedPolicies"]:
+            iam_client.detach_role_policy(RoleName=role_name, PolicyArn=policy["PolicyArn"])
+
+    paginator = iam_client.get_paginator("list_role_policies")
+    for page in paginator.paginate(RoleName=role_name):
+        for policy_name in page["PolicyNames"]:
+            iam_client.delete_role_policy(RoleName=role_name, PolicyName=policy_name)
+
+    iam_client.delete_role(RoleName=role_name)
+
+
+def delete_instance_profile(iam_client, profile_name):
+    try:
+        response = iam_client.get_instance_profile(InstanceProfileName=profile_name)
+        roles = response["InstanceProfile"]["Roles"]
+        if roles:
+            for role in roles:
+                logging.info(f"Role attached to instance profile {profile_name}: {role['RoleName']}")
+                iam_client.remove_role_from_instance_profile(
+                    InstanceProfileName=profile_name, RoleName=role["RoleName"]
+                )
+        else:
+            logging.info(f"No roles are attached to instance profile {profile_name}.")
+
+    except iam_client.exceptions.NoSuchEntityException:
+        logging.error(f"Instance profile {profile_name} does not exist.")
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
+    iam_client.delete_instance_profile(InstanceProfileName=profile_name)
 
 
 def delete_stack_resources(stack_name, aws_region):
-    cf_client = boto3.client("cloudformation", region_name=aws_region)
-    iam_client = boto3.client("iam")
+    cf_client = get_client("cloudformation", aws_region)
+    # IAM throttling is absorbed by adaptive retries rather than fixed sleeps
+    iam_client = get_client("iam", config=ADAPTIVE_RETRIES)
 
     try:
-        resources = cf_client.describe_stack_resources(StackName=stack_name)
+        paginator = cf_client.get_paginator("list_stack_resources")
+        resources = [
+            resource
+            for page in paginator.paginate(StackName=stack_name)
+            for resource in page["StackResourceSummaries"]
+        ]
     except ClientError as e:
         if "does not exist" in str(e):
             logging.info(f"Stack {stack_name} no longer exists, skipping resource cleanup.")
@@ -94,65 +166,50 @@ def delete_stack_resources(stack_name, aws_region):
         logging.error(f"Error describing stack resources: {e}")
         raise
 
-    for resource in resources["StackResources"]:
-            resource_id = resource["PhysicalResourceId"]
-            resource_type = resource["ResourceType"]
+    # Profiles release their roles and roles their policies before the
+    # policies themselves are deleted
+    deleters = {
+        "AWS::IAM::InstanceProfile": delete_instance_profile,
+        "AWS::IAM::Role": delete_role,
+        "AWS::IAM::Policy": lambda client, arn: client.delete_policy(PolicyArn=arn),
+    }
+    for resource_type, delete in deleters.items():
+        for resource in resources:
+            resource_id = resource.get("PhysicalResourceId")
+            if resource["ResourceType"] != resource_type or not resource_id:
+                continue
             try:
-                print(
+                logging.info(
                     f"Attempting to delete resource: {resource_id} of type: {resource_type}"
                 )
-                if resource_type == "AWS::IAM::Role":
-                    attached_policies = iam_client.list_attached_role_policies(
-                        RoleName=resource_id
-                    )["AttachedPolicies"]
-                    for policy in attached_policies:
-                        iam_client.detach_role_policy(
-                            RoleName=resource_id, PolicyArn=policy["PolicyArn"]
-                        )
-                    iam_client.delete_role(RoleName=resource_id)
-                elif resource_type == "AWS::IAM::Policy":
-                    iam_client.delete_policy(PolicyArn=resource_id)
-                elif resource_type == "AWS::IAM::InstanceProfile":
-                    try:
-                        response = iam_client.get_instance_profile(
-                            InstanceProfileName=resource_id
-                        )
-                        roles = response["InstanceProfile"]["Roles"]
-                        if roles:
-                            for role in roles:
-                                print(
-                                    f"Role attached to instance profile {resource_id}: {role['RoleName']}"
-                                )
-                                iam_client.remove_role_from_instance_profile(
-                                    InstanceProfileName=resource_id, RoleName=role["RoleName"]
-                                )
-                        else:
-                            logging.info(f"No roles are attached to instance profile {resource_id}.")
-
-                    except iam_client.exceptions.NoSuchEntityException:
-                        logging.error( f"Instance profile {resource_id} does not exist.")
-                    except Exception as e:
-                        logging.error(f"An error occurred: {e}")
-                    iam_client.delete_instance_profile(InstanceProfileName=resource_id)
-
-                sleep(2)  # Sleep to avoid hitting rate limits
+                delete(iam_client, resource_id)
             except ClientError as e:
                 logging.error(f"Failed to delete resource: {resource_id}. Error: {e}")
 
 
-def lambda_handler(event, context):
+def cleanup_region(aws_region):
+    cloudformation_stacks = get_cloudformation_to_terminate(aws_region)
 
-    aws_regions = get_regions_list()
+    def terminate(cloudformation_stack):
+        try:
+            delete_stack_resources(cloudformation_stack, aws_region)
+            return delete_stack(cloudformation_stack, aws_region), None
+        except Exception as e:
+            logging.error(f"Failed to delete cloudformation stack {cloudformation_stack}. Error: {e}")
+            return False, e
 
-    for aws_region in aws_regions:
-        logging.info(f"Searching for resources to remove in {aws_region}.")
-        cloudformation_stacks = get_cloudformation_to_terminate(aws_region)
+    with ThreadPoolExecutor(max_workers=STACK_WORKERS) as pool:
+        results = list(pool.map(terminate, cloudformation_stacks))
 
-        for cloudformation_stack in cloudformation_stacks:
-            try:
-                logging.info(f"Deleting cloudformation stacks.")
-                delete_stack_resources(cloudformation_stack, aws_region)
-                delete_stack(cloudformation_stack, aws_region)
-            except Exception as e:
-                logging.error(f"Failed to delete cloudformation stack {cloudformation_stack}. Error: {e}")
-                raise
+    deleting = [stack for stack, (started, _) in zip(cloudformation_stacks, results) if started]
+    if deleting:
+        wait_for_stacks_delete(deleting, aws_region)
+
+    errors = [error for _, error in results if error is not None]
+    if errors:
+        raise errors[0]
+    return len(cloudformation_stacks)
+
+
+def lambda_handler(event, context):
+    sweep_regions(cleanup_region, context)
@@ -1,10 +1,17 @@
 # Remove expired eks clusters.
 import logging
 import datetime
-import boto3
-from time import sleep
 from boto3.exceptions import Boto3Error
-from utils import get_regions_list
+from botocore.exceptions import ClientError
+from utils import get_client, sweep_regions, wait_until
+
+# Names per describe_auto_scaling_groups call
+ASG_BATCH_SIZE = 50
+# Node group and cluster deletions of one region share this budget
+DELETE_TIMEOUT = 600
+# Tags naming the EKS cluster an autoscaling group belongs to
+CLUSTER_NAME_TAGS = ("eks:cluster-name", "alpha.eksctl.io/cluster-name")
+CLUSTER_TAG_PREFIX = "kubernetes.io/cluster/"
 
 
 def is_cluster_to_terminate(cluster, eks_client):
@@ -28,10 +35,13 @@ def is_cluster_to_terminate(cluster, eks_client):
 
 def get_clusters_to_terminate(aws_region):
     clusters_for_deletion = []
-    eks_client = boto3.client("eks", region_name=aws_region)
-    clusters = eks_client.list_clusters()["clusters"]
+    eks_client = get_client("eks", aws_region)
+    paginator = eks_client.get_paginator("list_clusters")
+    clusters = [
+        cluster for page in paginator.paginate() for cluster in page["clusters"]
+    ]
     if not clusters:
-        logging.info(f"There are no clusters in cloud")
+        logging.info(f"There are no clusters in region {aws_region}")
 
     for cluster in clusters:
         if is_cluster_to_terminate(cluster, eks_client):
@@ -42,37 +52,18 @@ def get_clusters_to_terminate(aws_region):
     return clusters_for_deletion
 
 
-def wait_for_node_group_delete(autoscaling_client, autoscaling_group_name):
-    timeout = 300  # 5 min
-    attempt = 0
-    sleep_time = 10
-    attempts = timeout // sleep_time
-
-    while attempt < attempts:
-        try:
-            status_info = autoscaling_client.describe_auto_scaling_groups(
-                AutoScalingGroupNames=[autoscaling_group_name]
-            )["AutoScalingGroups"]
-        except IndexError as e:
-            logging.info(
-                f"Node group {autoscaling_group_name} was successfully deleted."
-            )
-            break
-        logging.info(
-            f"Node group {autoscaling_group_name} deletion. "
-            f"Attempt {attempt}/{attempts}. Sleeping {sleep_time} seconds."
-        )
-        sleep(sleep_time)
-        attempt += 1
-    else:
-        raise RuntimeError(
-            f"Node group {autoscaling_group_name} was not deleted in {timeout} seconds."
-        )
+def get_group_cluster(group):
+    for tag in group.get("Tags", []):
+        if tag["Key"] in CLUSTER_NAME_TAGS:
+            return tag["Value"]
+        if tag["Key"].startswith(CLUSTER_TAG_PREFIX):
+            return tag["Key"][len(CLUSTER_TAG_PREFIX):]
+    return None
 
 
-def delete_nodegroup(aws_region):
-    autoscaling_client = boto3.client("autoscaling", region_name=aws_region)
-    auto_scaling_groups = []
+def get_nodegroups_to_terminate(autoscaling_client):
+    """Return {autoscaling group name: cluster name or None} of expired groups."""
+    auto_scaling_groups = {}
 
     paginator = autoscaling_client.get_paginator("describe_auto_scaling_groups")
     for page in paginator.paginate():
@@ -106,57 +97,110 @@ def delete_nodegroup(aws_region):
                 and creation_time is not None
                 and (current_time - creation_time) / 3600 > cluster_lifetime
             ):
-                auto_scaling_groups.append(group["AutoScalingGroupName"])
-
-    if auto_scaling_groups:
-        for auto_scaling_group in auto_scaling_groups:
-            try:
-                autoscaling_client.delete_auto_scaling_group(
-                    AutoScalingGroupName=auto_scaling_group, ForceDelete=True
-                )
-                wait_for_node_group_delete(autoscaling_client, auto_scaling_group)
-            except Boto3Error as e:
-                logging.error(
-                    f"Deleting autoscaling group {auto_scaling_group} failed with error: {e}"
-                )
-
-
-def delete_cluster(aws_region, cluster_name):
-    eks_client = boto3.client("eks", region_name=aws_region)
-    eks_client.delete_cluster(name=cluster_name)
-    wait_for_cluster_delete(eks_client, cluster_name)
-
-
-def wait_for_cluster_delete(eks_client, cluster_name):
-    timeout = 300  # 5 min
-    attempt = 0
-    sleep_time = 10
-    attempts = timeout // sleep_time
-
-    while attempt < attempts:
+                auto_scaling_groups[group["AutoScalingGroupName"]] = get_group_cluster(group)
+
+    return auto_scaling_groups
+
+
+def delete_nodegroups(autoscaling_client, auto_scaling_groups):
+    """Start the deletion of every group; returns the names being deleted."""
+    deleting = set()
+    for auto_scaling_group in auto_scaling_groups:
+        logging.info(f"Deleting autoscaling group {auto_scaling_group}")
         try:
-            status = eks_client.describe_cluster(name=cluster_name)["cluster"]["status"]
-        except eks_client.exceptions.ResourceNotFoundException:
-            logging.info(f"Cluster {cluster_name} was successfully deleted.")
-            break
-        logging.info(
-            f"Cluster {cluster_name} status is {status}. "
-            f"Attempt {attempt}/{attempts}. Sleeping {sleep_time} seconds."
+            autoscaling_client.delete_auto_scaling_group(
+                AutoScalingGroupName=auto_scaling_group, ForceDelete=True
+            )
+            deleting.add(auto_scaling_group)
+        except (Boto3Error, ClientError) as e:
+            logging.error(
+                f"Deleting autoscaling group {auto_scaling_group} failed with error: {e}"
+            )
+    return deleting
+
+
+def get_existing_nodegroups(autoscaling_client, names):
+    """Return which of names still exist, describing up to ASG_BATCH_SIZE per call."""
+    names = sorted(names)
+    existing = set()
+    paginator = autoscaling_client.get_paginator("describe_auto_scaling_groups")
+    for i in range(0, len(names), ASG_BATCH_SIZE):
+        for page in paginator.paginate(AutoScalingGroupNames=names[i:i + ASG_BATCH_SIZE]):
+            existing.update(group["AutoScalingGroupName"] for group in page["AutoScalingGroups"])
+    return existing
+
+
+def delete_cluster(eks_client, cluster_name):
+    logging.info(f"Terminating {cluster_name}")
+    try:
+        eks_client.delete_cluster(name=cluster_name)
+        return True
+    except eks_client.exceptions.ResourceNotFoundException:
+        logging.info(f"Cluster {cluster_name} was already deleted.")
+    except ClientError as e:
+        logging.error(f"Deleting cluster {cluster_name} failed with error: {e}")
+    return False
+
+
+def is_cluster_deleted(eks_client, cluster_name):
+    try:
+        status = eks_client.describe_cluster(name=cluster_name)["cluster"]["status"]
+    except eks_client.exceptions.ResourceNotFoundException:
+        logging.info(f"Cluster {cluster_name} was successfully deleted.")
+        return True
+    logging.info(f"Cluster {cluster_name} status is {status}.")
+    return False
+
+
+def terminate_clusters(aws_region, clusters, auto_scaling_groups):
+    """Delete expired node groups and clusters of a region in one polling loop.
+
+    All node group deletions start at once. Each poll describes the remaining
+    groups in batches, issues the delete of every cluster whose groups are
+    gone and checks the clusters already being deleted, so clusters don't
+    wait on each other.
+    """
+    autoscaling_client = get_client("autoscaling", aws_region)
+    eks_client = get_client("eks", aws_region)
+
+    groups_left = delete_nodegroups(autoscaling_client, auto_scaling_groups)
+    waiting = set(clusters)
+    deleting = set()
+
+    def poll():
+        if groups_left:
+            groups_left.intersection_update(
+                get_existing_nodegroups(autoscaling_client, groups_left)
+            )
+            if not groups_left:
+                logging.info(f"Node groups in {aws_region} were successfully deleted.")
+        blocked = {auto_scaling_groups[group] for group in groups_left}
+        for cluster in sorted(waiting - blocked):
+            waiting.discard(cluster)
+            if delete_cluster(eks_client, cluster):
+                deleting.add(cluster)
+        deleting.difference_update(
+            [cluster for cluster in sorted(deleting) if is_cluster_deleted(eks_client, cluster)]
+        )
+        return not (groups_left or waiting or deleting)
+
+    if wait_until(poll, f"EKS deletions in {aws_region}", timeout=DELETE_TIMEOUT):
+        return
+    if deleting:
+        logging.error(f"Clusters {sorted(deleting)} were not deleted in {DELETE_TIMEOUT} seconds.")
+    if groups_left:
+        raise RuntimeError(
+            f"Node groups {sorted(groups_left)} were not deleted in {DELETE_TIMEOUT} seconds, "
+            f"clusters {sorted(waiting)} were not deleted."
         )
-        sleep(sleep_time)
-        attempt += 1
-    else:
-        logging.error(f"Cluster {cluster_name} was not deleted in {timeout} seconds.")
 
 
-def lambda_handler(event, context):
-    aws_regions = get_regions_list()
+def cleanup_region(aws_region):
+    clusters = get_clusters_to_terminate(aws_region)
+    auto_scaling_groups = get_nodegroups_to_terminate(get_client("autoscaling", aws_region))
+    terminate_clusters(aws_region, clusters, auto_scaling_groups)
+    return len(clusters)
 
-    for aws_region in aws_regions:
-        logging.info(f"Searching for resources to remove in {aws_region}.")
-        clusters = get_clusters_to_terminate(aws_region)
-        delete_nodegroup(aws_region)
 
-        for cluster in clusters:
-            logging.info(f"Terminating {cluster}")
-            delete_cluster(aws_region, cluster)
+def lambda_handler(event, context):
+    sweep_regions(cleanup_region, context)
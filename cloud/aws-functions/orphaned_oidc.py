@@ -1,37 +1,31 @@
-import boto3
 import json
+from utils import build_role_trust_index, get_client
 
-iam = boto3.client('iam')
 
-def get_oidc_providers():
+def get_oidc_providers(iam):
+    # list_open_id_connect_providers is not paginated; it returns every provider
     response = iam.list_open_id_connect_providers()
     return [provider['Arn'] for provider in response['OpenIDConnectProviderList']]
 
-def is_provider_used(provider_arn):
+def is_provider_used(provider_arn, trust_index):
     """
     Check if an OIDC provider is referenced in the trust policy of any IAM role.
     """
-    paginator = iam.get_paginator('list_roles')
-    for page in paginator.paginate():
-        for role in page['Roles']:
-            # Fetch the trust policy of the role
-            trust_policy = iam.get_role(RoleName=role['RoleName'])['Role']['AssumeRolePolicyDocument']
-            trust_policy_statements = trust_policy.get('Statement', [])
-
-            # Check if the provider ARN is in the trust policy
-            for statement in trust_policy_statements:
-                if 'Federated' in statement.get('Principal', {}):
-                    if provider_arn == statement['Principal']['Federated']:
-                        return True
-    return False
+    return provider_arn in trust_index.get('Federated', ())
 
 def delete_unused_providers():
     """
     Delete OIDC providers that are not used in any IAM role.
     """
-    providers = get_oidc_providers()
+    iam = get_client('iam')
+    providers = get_oidc_providers(iam)
+    if not providers:
+        print("There are no OIDC providers")
+        return
+    # One pass over all roles serves every provider
+    trust_index = build_role_trust_index(iam)
     for provider in providers:
-        if not is_provider_used(provider):
+        if not is_provider_used(provider, trust_index):
             print(f"Deleting unused provider: {provider}")
             iam.delete_open_id_connect_provider(OpenIDConnectProviderArn=provider)
         else:
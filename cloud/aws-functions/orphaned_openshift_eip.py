@@ -1,8 +1,7 @@
 # Remove elastic ip.
 import logging
 import datetime
-import boto3
-from utils import get_regions_list
+from utils import get_client, sweep_regions
 
 
 def is_ip_to_release(client, ip):
@@ -38,6 +37,7 @@ def is_ip_to_release(client, ip):
 def get_ip_to_release(client, aws_region):
     ips_for_release = []
     try:
+        # describe_addresses has no paginator; it returns every address at once
         ips = client.describe_addresses()["Addresses"]
     except Exception as e:
         logging.error(f"The ips can't be received because of the error {e}")
@@ -67,13 +67,13 @@ def release_ip(client, aws_region, allocation_id):
         raise
 
 
-def lambda_handler(event, context):
+def cleanup_region(aws_region):
+    ec2 = get_client("ec2", aws_region)
+    allocation_ids = get_ip_to_release(ec2, aws_region)
+    for allocation_id in allocation_ids:
+        release_ip(ec2, aws_region, allocation_id)
+    return len(allocation_ids)
 
-    aws_regions = get_regions_list()
 
-    for aws_region in aws_regions:
-        ec2 = boto3.client("ec2", region_name=aws_region)
-        logging.info(f"Searching for resources to remove in {aws_region}.")
-        allocation_ids = get_ip_to_release(ec2, aws_region)
-        for allocation_id in allocation_ids:
-            release_ip(ec2, aws_region, allocation_id)
+def lambda_handler(event, context):
+    sweep_regions(cleanup_region, context)
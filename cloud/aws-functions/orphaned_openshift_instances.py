@@ -1,8 +1,7 @@
 # Remove openshift resources.
 import logging
 import datetime
-import boto3
-from utils import get_regions_list
+from utils import get_resource, sweep_regions
 
 
 def is_instance_to_terminate(instance):
@@ -36,8 +35,15 @@ def is_instance_to_terminate(instance):
 
 def get_instances_to_terminate(aws_region):
     instances_for_deletion = []
-    ec2 = boto3.resource("ec2", region_name=aws_region)
-    instances = ec2.instances.all()
+    ec2 = get_resource("ec2", aws_region)
+    # Only running instances of the cloud team can be terminated; filter them
+    # server side instead of paging through every instance in the region
+    instances = ec2.instances.filter(
+        Filters=[
+            {"Name": "instance-state-name", "Values": ["running"]},
+            {"Name": "tag:team", "Values": ["cloud"]},
+        ]
+    )
     if not instances:
         logging.info(f"There are no instances in region {aws_region}")
 
@@ -51,17 +57,18 @@ def get_instances_to_terminate(aws_region):
 
 
 def delete_instance(aws_region, instance_id):
-    ec2 = boto3.resource("ec2", region_name=aws_region)
+    ec2 = get_resource("ec2", aws_region)
     ec2.instances.filter(InstanceIds=[instance_id]).terminate()
 
 
-def lambda_handler(event, context):
-    aws_regions = get_regions_list()
+def cleanup_region(aws_region):
+    instances = get_instances_to_terminate(aws_region)
+
+    for instance_id in instances:
+        logging.info(f"Terminating {instance_id}")
+        delete_instance(instance_id=instance_id, aws_region=aws_region)
+    return len(instances)
 
-    for aws_region in aws_regions:
-        logging.info(f"Searching for resources to remove in {aws_region}.")
-        instances = get_instances_to_terminate(aws_region)
 
-        for instance_id in instances:
-            logging.info(f"Terminating {instance_id}")
-            delete_instance(instance_id=instance_id, aws_region=aws_region)
+def lambda_handler(event, context):
+    sweep_regions(cleanup_region, context)
@@ -1,13 +1,21 @@
 # Remove unsused users
 import logging
 import datetime
-import boto3
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils import ADAPTIVE_RETRIES, get_client
+
+# IAM calls in flight at once; IAM is a global service with its own rate limits
+USER_WORKERS = int(os.environ.get("USER_WORKERS", "8"))
+
 
 def is_user_to_terminate(client,user):
     if 'openshift' not in user['UserName']:
         return False
 
-    tags = client.list_user_tags(UserName=user['UserName'])['Tags']
+    paginator = client.get_paginator('list_user_tags')
+    tags = [tag for page in paginator.paginate(UserName=user['UserName']) for tag in page['Tags']]
     tags_dict = {item['Key']: item['Value'] for item in tags}
 
     for key in tags_dict.keys():
@@ -21,12 +29,20 @@ def is_user_to_terminate(client,user):
 
 
 def get_user_for_deletion(client):
-    users_for_deletion = []
-
-    users = client.list_users()
-    for user in users['Users']:
-        if is_user_to_terminate(client, user):
-            users_for_deletion.append(user['UserName'])
+    # Prefilter on the name so per-user calls are only made for installer users
+    paginator = client.get_paginator('list_users')
+    candidates = [
+        user
+        for page in paginator.paginate()
+        for user in page['Users']
+        if 'openshift' in user['UserName']
+    ]
+
+    with ThreadPoolExecutor(max_workers=USER_WORKERS) as pool:
+        to_terminate = list(pool.map(lambda user: is_user_to_terminate(client, user), candidates))
+    users_for_deletion = [
+        user['UserName'] for user, terminate in zip(candidates, to_terminate) if terminate
+    ]
     if not users_for_deletion:
         logging.info(f"There are no users for deletion")
 
@@ -41,26 +57,77 @@ def delete_user(client, user_name):
         raise
 
 def delete_user_policies(client, user_name):
-    user_policies = client.list_user_policies(UserName=user_name)['PolicyNames']
-    if user_policies:
-        for policy in user_policies:
+    paginator = client.get_paginator('list_user_policies')
+    for page in paginator.paginate(UserName=user_name):
+        for policy in page['PolicyNames']:
             client.delete_user_policy(UserName=user_name, PolicyName=policy)
 
+    paginator = client.get_paginator('list_attached_user_policies')
+    for page in paginator.paginate(UserName=user_name):
+        for policy in page['AttachedPolicies']:
+            client.detach_user_policy(UserName=user_name, PolicyArn=policy['PolicyArn'])
+
 def delete_user_access_keys(client, user_name):
-    user_access_keys = client.list_access_keys(UserName=user_name)['AccessKeyMetadata']
-    if user_access_keys:
-        for key in user_access_keys:
+    paginator = client.get_paginator('list_access_keys')
+    for page in paginator.paginate(UserName=user_name):
+        for key in page['AccessKeyMetadata']:
             client.delete_access_key(UserName=user_name, AccessKeyId=key['AccessKeyId'])
 
+def delete_user_login_profile(client, user_name):
+    try:
+        client.delete_login_profile(UserName=user_name)
+    except client.exceptions.NoSuchEntityException:
+        pass
+
+def delete_user_mfa_devices(client, user_name):
+    paginator = client.get_paginator('list_mfa_devices')
+    for page in paginator.paginate(UserName=user_name):
+        for device in page['MFADevices']:
+            serial_number = device['SerialNumber']
+            client.deactivate_mfa_device(UserName=user_name, SerialNumber=serial_number)
+            # Virtual devices are IAM resources of their own
+            if ':mfa/' in serial_number:
+                client.delete_virtual_mfa_device(SerialNumber=serial_number)
+
+def remove_user_from_groups(client, user_name):
+    paginator = client.get_paginator('list_groups_for_user')
+    for page in paginator.paginate(UserName=user_name):
+        for group in page['Groups']:
+            client.remove_user_from_group(UserName=user_name, GroupName=group['GroupName'])
+
+def terminate_user(client, user_name):
+    logging.info(f"Deleting user {user_name}.")
+    delete_user_policies(client, user_name)
+    delete_user_access_keys(client, user_name)
+    delete_user_login_profile(client, user_name)
+    delete_user_mfa_devices(client, user_name)
+    remove_user_from_groups(client, user_name)
+    delete_user(client, user_name)
+
 
 def lambda_handler(event, context):
-    client = boto3.client('iam')
+    client = get_client('iam', config=ADAPTIVE_RETRIES)
+    started = time.monotonic()
     user_names = get_user_for_deletion(client)
-    for user_name in user_names:
-        logging.info(f"Deleting user {user_name}.")
-        delete_user_policies(client,user_name)
-        delete_user_access_keys(client, user_name)
-        delete_user(client, user_name)
-
-
-
+    scanned = time.monotonic()
+
+    def terminate(user_name):
+        try:
+            terminate_user(client, user_name)
+            return None
+        except Exception as e:
+            logging.error(f"Deleting user {user_name} failed with error: {e}")
+            return e
+
+    with ThreadPoolExecutor(max_workers=USER_WORKERS) as pool:
+        errors = [e for e in pool.map(terminate, user_names) if e is not None]
+
+    finished = time.monotonic()
+    deleted = len(user_names) - len(errors)
+    logging.info(
+        f"Found {len(user_names)} users to delete in {scanned - started:.1f}s, "
+        f"deleted {deleted} in {finished - scanned:.1f}s "
+        f"({deleted / max(finished - scanned, 0.001):.1f} users/s, {USER_WORKERS} workers)."
+    )
+    if errors:
+        raise errors[0]
@@ -1,11 +1,16 @@
 # Remove unused vpcs and connected resources.
 import logging
 import datetime
-import boto3
-from time import sleep
+import os
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
-from boto3.exceptions import Boto3Error
-from utils import get_regions_list
+from utils import get_client, get_resource, sweep_regions, wait_until
+
+# VPCs of one region torn down at once
+VPC_WORKERS = int(os.environ.get("VPC_WORKERS", "4"))
+
+# Longest wait for one teardown step of one VPC
+STEP_TIMEOUT = 300
 
 
 def is_vpc_to_terminate(vpc):
@@ -34,10 +39,11 @@ def is_vpc_to_terminate(vpc):
 
 def get_vpcs_to_terminate(aws_region):
     vpcs_for_deletion = []
-    ec2 = boto3.resource("ec2", region_name=aws_region)
-    vpcs = list(ec2.vpcs.all())
+    ec2 = get_resource("ec2", aws_region)
+    # Only VPCs of the cloud team are candidates; filter them server side
+    vpcs = list(ec2.vpcs.filter(Filters=[{"Name": "tag:team", "Values": ["cloud"]}]))
     if not vpcs:
-        logging.info(f"There are no vpcs in cloud")
+        logging.info(f"There are no vpcs in region {aws_region}")
     for vpc in vpcs:
         if is_vpc_to_terminate(vpc):
             vpcs_for_deletion.append(vpc.id)
@@ -47,271 +53,335 @@ def get_vpcs_to_terminate(aws_region):
     return vpcs_for_deletion
 
 
-def delete_vpc_ep(aws_region, vpc_id):
-    ec2_client = boto3.client("ec2", region_name=aws_region)
-    for ep in ec2_client.describe_vpc_endpoints(
-        Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-    )["VpcEndpoints"]:
-        try:
-            ec2_client.delete_vpc_endpoints(VpcEndpointIds=[ep["VpcEndpointId"]])
-        except Boto3Error as e:
-            logging.error(f"Deleting VPC endpoint with id {ep} failed with error: {e}")
+def _vpc_filter(vpc_id, name="vpc-id"):
+    return [{"Name": name, "Values": [vpc_id]}]
 
 
-def delete_load_balancers(aws_region, vpc_id):
-    elb_client = boto3.client("elb", region_name=aws_region)
-    elbv2_client = boto3.client("elbv2", region_name=aws_region)
-    lb_names = [
-        lb["LoadBalancerName"]
-        for lb in elb_client.describe_load_balancers()["LoadBalancerDescriptions"]
-        if lb["VPCId"] == vpc_id
+def _paginate(client, operation, key, **kwargs):
+    return [
+        item
+        for page in client.get_paginator(operation).paginate(**kwargs)
+        for item in page[key]
     ]
-    if lb_names:
-        for lb_name in lb_names:
-            try:
-                logging.info(f"Deleting load balancer: {lb_name} for vpc id: {vpc_id}")
-                elb_client.delete_load_balancer(LoadBalancerName=lb_name)
-            except Boto3Error as e:
-                logging.error(
-                    f"Deleting load balancer {lb_name} failed with error: {e}"
-                )
-
-    lbv2_names = []
 
-    responseV2 = elbv2_client.describe_load_balancers()["LoadBalancers"]
-    for lbv2 in responseV2:
-        if lbv2["VpcId"] == vpc_id:
-            lbv2_names.append(lbv2["LoadBalancerArn"])
-    if lbv2_names:
-        for lbv2_name in lbv2_names:
-            try:
-                logging.info(
-                    f"Deleting load balancer: {lbv2_name} for vpc id: {vpc_id}"
-                )
-                resp = elbv2_client.delete_load_balancer(LoadBalancerArn=lbv2_name)
-            except Boto3Error as e:
-                logging.error(
-                    f"Deleting load balancer {lbv2_name} failed with error: {e}"
-                )
 
+def delete_with_backoff(resource_ids, delete, description, timeout=STEP_TIMEOUT):
+    """Delete every resource, retrying the ones still blocked with backoff.
 
-def delete_nat_gateway(aws_region, vpc_id):
-    ec2_client = boto3.client("ec2", region_name=aws_region)
-    filters = [
-        {
-            "Name": "vpc-id",
-            "Values": [
-                f"{vpc_id}",
-            ],
-        },
-    ]
-    nat_gateway = ec2_client.describe_nat_gateways(Filters=filters)
-    nat_gateway_ids = [nat["NatGatewayId"] for nat in nat_gateway["NatGateways"]]
-    if nat_gateway_ids:
-        for nat_gateway_id in nat_gateway_ids:
-            logging.info(f"Deleting NAT gateway with id: {nat_gateway_id}")
-            try:
-                ec2_client.delete_nat_gateway(NatGatewayId=nat_gateway_id)
-                wait_for_nat_gateway_delete(ec2_client, nat_gateway_id)
-            except Boto3Error as e:
-                logging.error(
-                    f"Deleting NAT gateway with id {nat_gateway_id} failed with error: {e}"
-                )
+    Resources already gone count as deleted.
 
+    Returns:
+        True if nothing is left
+    """
+    remaining = list(resource_ids)
 
-def delete_igw(ec2_resource, vpc_id):
-    vpc_resource = ec2_resource.Vpc(vpc_id)
-    igws = vpc_resource.internet_gateways.all()
-    if igws:
-        for igw in igws:
+    def attempt():
+        for resource_id in list(remaining):
             try:
-                logging.info(f"Detaching and deleting igw id: {igw.id}")
-                igw.detach_from_vpc(VpcId=vpc_id)
-                igw.delete()
-            except Boto3Error as e:
-                logging.info(f"Detaching or deleting igw failed with error: {e}")
-                continue
+                delete(resource_id)
+                logging.info(f"Deleted {description} {resource_id}.")
             except ClientError as e:
-                logging.info(f"Failed detach igw, will try again. The error was: {e}.")
-                continue
-
-
-def delete_subnets(ec2_resource, vpc_id):
-    vpc_resource = ec2_resource.Vpc(vpc_id)
-    subnets_all = vpc_resource.subnets.all()
-    subnets = [ec2_resource.Subnet(subnet.id) for subnet in subnets_all]
-    if subnets:
-        for sub in subnets:
-            for attempt in range(0, 10):
-                logging.info(f"Removing subnet with id: {sub.id}. Attempt {attempt}/10")
-                try:
-                    logging.info(
-                        f"Network interfaces {sub.network_interfaces.all()} for {sub}"
-                    )
-                    for interface in sub.network_interfaces.all():
-                        for attempt in range(0, 10):
-                            try:
-                                interface.delete()
-                            except ClientError as e:
-                                logging.info(
-                                    f"Failed to delete network interface, will try again. The error was: {e}. Sleeping 10 seconds"
-                                )
-                                sleep(10)
-                                continue
-                            break
-                    sub.delete()
-                except ClientError as e:
+                if "NotFound" not in e.response["Error"]["Code"]:
                     logging.info(
-                        f"Failed to delete subnet, will try again. The error was: {e}. Sleeping 10 seconds"
+                        f"Failed to delete {description} {resource_id}, will try again. The error was: {e}."
                     )
-                    sleep(10)
                     continue
-                break
+            remaining.remove(resource_id)
+        return not remaining
 
+    return wait_until(attempt, f"deletion of {description}s {remaining}", timeout)
 
-def delete_route_tables(ec2_resource, vpc_id):
-    vpc_resource = ec2_resource.Vpc(vpc_id)
-    route_tables = vpc_resource.route_tables.all()
-    if route_tables:
+
+def delete_vpc_ep(aws_region, vpc_id):
+    ec2_client = get_client("ec2", aws_region)
+    endpoint_ids = [
+        ep["VpcEndpointId"]
+        for ep in _paginate(
+            ec2_client, "describe_vpc_endpoints", "VpcEndpoints", Filters=_vpc_filter(vpc_id)
+        )
+        if ep["State"].lower() not in ("deleting", "deleted")
+    ]
+    if endpoint_ids:
+        logging.info(f"Deleting VPC endpoints {endpoint_ids} for vpc id: {vpc_id}")
         try:
-            for route_table in route_tables:
-                if (
-                    route_table.associations_attribute
-                    and route_table.associations_attribute[0]["Main"] == True
-                ):
-                    logging.info(
-                        f"{route_table.id} is the main route table, skipping..."
-                    )
-                    continue
-                logging.info(f"Removing route_table-id: {route_table.id}")
-                table = ec2_resource.RouteTable(route_table.id)
-                table.delete()
-        except Boto3Error as e:
-            logging.error(f"Delete of route table failed with error: {e}")
+            ec2_client.delete_vpc_endpoints(VpcEndpointIds=endpoint_ids)
         except ClientError as e:
-            logging.info(
-                f"Failed detach route_table will try again. The error was: {e}."
+            logging.error(f"Deleting VPC endpoints {endpoint_ids} failed with error: {e}")
+
+
+def wait_for_vpc_endpoints_delete(ec2_client, vpc_id):
+    def gone():
+        return all(
+            ep["State"].lower() == "deleted"
+            for ep in _paginate(
+                ec2_client, "describe_vpc_endpoints", "VpcEndpoints", Filters=_vpc_filter(vpc_id)
             )
+        )
 
+    return wait_until(gone, f"deletion of VPC endpoints in {vpc_id}", STEP_TIMEOUT)
 
-def delete_security_groups(security_groups):
-    try:
-        for security_group in security_groups:
-            if security_group.group_name == "default":
-                logging.info(
-                    f"{security_group.id} is the default security group, skipping..."
-                )
-                continue
-            if security_group.ip_permissions:
-                logging.info(
-                    f"Removing ingress rules for security group with id: {security_group.id}"
-                )
-                security_group.revoke_ingress(
-                    IpPermissions=security_group.ip_permissions
-                )
-            if security_group.ip_permissions_egress:
-                logging.info(
-                    f"Removing egress rules for security group with id: {security_group.id}"
-                )
-                security_group.revoke_egress(
-                    IpPermissions=security_group.ip_permissions_egress
-                )
 
-            logging.info(f"Removing security group with id: {security_group.id}")
-            try:
-                security_group.delete()
-            except ClientError as e:
-                logging.error(f"Deleting of security group failed with error: {e}")
-                continue
-    except Boto3Error as e:
-        logging.error(f"Deleting of security group failed with error: {e}")
+def delete_load_balancers(aws_region, vpc_id):
+    elb_client = get_client("elb", aws_region)
+    elbv2_client = get_client("elbv2", aws_region)
+    lb_names = [
+        lb["LoadBalancerName"]
+        for lb in _paginate(elb_client, "describe_load_balancers", "LoadBalancerDescriptions")
+        if lb["VPCId"] == vpc_id
+    ]
+    for lb_name in lb_names:
+        try:
+            logging.info(f"Deleting load balancer: {lb_name} for vpc id: {vpc_id}")
+            elb_client.delete_load_balancer(LoadBalancerName=lb_name)
+        except ClientError as e:
+            logging.error(f"Deleting load balancer {lb_name} failed with error: {e}")
 
+    lbv2_arns = [
+        lbv2["LoadBalancerArn"]
+        for lbv2 in _paginate(elbv2_client, "describe_load_balancers", "LoadBalancers")
+        if lbv2["VpcId"] == vpc_id
+    ]
+    for lbv2_arn in lbv2_arns:
+        try:
+            logging.info(f"Deleting load balancer: {lbv2_arn} for vpc id: {vpc_id}")
+            elbv2_client.delete_load_balancer(LoadBalancerArn=lbv2_arn)
+        except ClientError as e:
+            logging.error(f"Deleting load balancer {lbv2_arn} failed with error: {e}")
 
-def wait_for_nat_gateway_delete(ec2, nat_gateway_id):
-    timeout = 300  # 5 min
-    attempt = 0
-    sleep_time = 10
-    attempts = timeout // sleep_time
 
-    while attempt < attempts:
+def delete_nat_gateway(aws_region, vpc_id):
+    """Start deletion of the VPC's NAT gateways; return their IDs."""
+    ec2_client = get_client("ec2", aws_region)
+    nat_gateways = _paginate(
+        ec2_client,
+        "describe_nat_gateways",
+        "NatGateways",
+        Filter=_vpc_filter(vpc_id)
+        + [{"Name": "state", "Values": ["pending", "available", "deleting"]}],
+    )
+    nat_gateway_ids = [nat["NatGatewayId"] for nat in nat_gateways]
+    for nat in nat_gateways:
+        if nat["State"] == "deleting":
+            continue
+        logging.info(f"Deleting NAT gateway with id: {nat['NatGatewayId']}")
         try:
-            status = ec2.describe_nat_gateways(NatGatewayIds=[nat_gateway_id])[
-                "NatGateways"
-            ][0]["State"]
-        except ec2.exceptions.ResourceNotFoundException:
-            logging.info(f"NAT gateway with id {nat_gateway_id} was not found.")
-            break
-
-        if status == "deleted":
-            logging.info(
-                f"NAT gateway with id {nat_gateway_id} was successfully deleted."
+            ec2_client.delete_nat_gateway(NatGatewayId=nat["NatGatewayId"])
+        except ClientError as e:
+            logging.error(
+                f"Deleting NAT gateway with id {nat['NatGatewayId']} failed with error: {e}"
             )
-            break
-        logging.info(
-            f"NAT gateway with id {nat_gateway_id} status is {status}. "
-            f"Attempt {attempt}/{attempts}. Sleeping {sleep_time} seconds."
+    return nat_gateway_ids
+
+
+def wait_for_nat_gateways_delete(ec2, nat_gateway_ids):
+    """Poll every NAT gateway of a VPC with one describe call per attempt.
+
+    Returns:
+        False if the gateways were not deleted within STEP_TIMEOUT
+    """
+    if not nat_gateway_ids:
+        return True
+
+    def gone():
+        try:
+            states = {
+                nat["NatGatewayId"]: nat["State"]
+                for nat in ec2.describe_nat_gateways(NatGatewayIds=nat_gateway_ids)[
+                    "NatGateways"
+                ]
+            }
+        except ClientError as e:
+            if "NotFound" in e.response["Error"]["Code"]:
+                return True
+            raise
+        pending = [nat_id for nat_id, state in states.items() if state != "deleted"]
+        if pending:
+            logging.info(f"NAT gateways {pending} are still being deleted.")
+        return not pending
+
+    if not wait_until(gone, f"deletion of NAT gateways {nat_gateway_ids}", STEP_TIMEOUT):
+        logging.error(
+            f"NAT gateways {nat_gateway_ids} were not deleted in {STEP_TIMEOUT} seconds."
+        )
+        return False
+    return True
+
+
+def delete_igw(aws_region, vpc_id):
+    ec2_client = get_client("ec2", aws_region)
+    igw_ids = [
+        igw["InternetGatewayId"]
+        for igw in _paginate(
+            ec2_client,
+            "describe_internet_gateways",
+            "InternetGateways",
+            Filters=_vpc_filter(vpc_id, "attachment.vpc-id"),
         )
-        sleep(sleep_time)
-        attempt += 1
+    ]
 
-    else:
-        raise RuntimeError(
-            f"NAT gateway with id {nat_gateway_id} was not deleted in {timeout} seconds."
+    def detach_and_delete(igw_id):
+        try:
+            ec2_client.detach_internet_gateway(InternetGatewayId=igw_id, VpcId=vpc_id)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "Gateway.NotAttached":
+                raise
+        ec2_client.delete_internet_gateway(InternetGatewayId=igw_id)
+
+    return delete_with_backoff(igw_ids, detach_and_delete, "internet gateway")
+
+
+def delete_network_interfaces(aws_region, vpc_id):
+    """Delete the VPC's detached ENIs, retrying with backoff until they are gone.
+
+    Interfaces still detaching are retried until they can be deleted.
+    Interfaces in use are logged and skipped rather than waited on: AWS
+    releases those of deleted load balancers, NAT gateways and endpoints on
+    its own, and subnet deletion already retries while that happens.
+    """
+    ec2_client = get_client("ec2", aws_region)
+    interfaces = _paginate(
+        ec2_client,
+        "describe_network_interfaces",
+        "NetworkInterfaces",
+        Filters=_vpc_filter(vpc_id),
+    )
+    in_use = [
+        interface["NetworkInterfaceId"]
+        for interface in interfaces
+        if interface["Status"] not in ("available", "detaching")
+    ]
+    if in_use:
+        logging.info(f"Skipping network interfaces {in_use} in {vpc_id}, they are in use.")
+    return delete_with_backoff(
+        [
+            interface["NetworkInterfaceId"]
+            for interface in interfaces
+            if interface["Status"] in ("available", "detaching")
+        ],
+        lambda interface_id: ec2_client.delete_network_interface(
+            NetworkInterfaceId=interface_id
+        ),
+        "network interface",
+    )
+
+
+def delete_subnets(aws_region, vpc_id):
+    ec2_client = get_client("ec2", aws_region)
+    subnet_ids = [
+        subnet["SubnetId"]
+        for subnet in _paginate(
+            ec2_client, "describe_subnets", "Subnets", Filters=_vpc_filter(vpc_id)
         )
+    ]
+    return delete_with_backoff(
+        subnet_ids, lambda subnet_id: ec2_client.delete_subnet(SubnetId=subnet_id), "subnet"
+    )
+
+
+def delete_route_tables(aws_region, vpc_id):
+    ec2_client = get_client("ec2", aws_region)
+    route_table_ids = []
+    for route_table in _paginate(
+        ec2_client, "describe_route_tables", "RouteTables", Filters=_vpc_filter(vpc_id)
+    ):
+        if any(assoc.get("Main") for assoc in route_table.get("Associations", [])):
+            logging.info(f"{route_table['RouteTableId']} is the main route table, skipping...")
+            continue
+        route_table_ids.append(route_table["RouteTableId"])
+    return delete_with_backoff(
+        route_table_ids,
+        lambda route_table_id: ec2_client.delete_route_table(RouteTableId=route_table_id),
+        "route table",
+    )
+
+
+def delete_security_groups(aws_region, vpc_id):
+    """Revoke every rule first, then delete the now unreferenced groups.
+
+    The groups are listed once; retries only work on that cached list.
+    """
+    ec2_client = get_client("ec2", aws_region)
+    security_groups = [
+        security_group
+        for security_group in _paginate(
+            ec2_client, "describe_security_groups", "SecurityGroups", Filters=_vpc_filter(vpc_id)
+        )
+        if security_group["GroupName"] != "default"
+    ]
+    for security_group in security_groups:
+        group_id = security_group["GroupId"]
+        try:
+            if security_group.get("IpPermissions"):
+                logging.info(f"Removing ingress rules for security group with id: {group_id}")
+                ec2_client.revoke_security_group_ingress(
+                    GroupId=group_id, IpPermissions=security_group["IpPermissions"]
+                )
+            if security_group.get("IpPermissionsEgress"):
+                logging.info(f"Removing egress rules for security group with id: {group_id}")
+                ec2_client.revoke_security_group_egress(
+                    GroupId=group_id, IpPermissions=security_group["IpPermissionsEgress"]
+                )
+        except ClientError as e:
+            logging.error(f"Revoking rules of security group {group_id} failed with error: {e}")
+
+    return delete_with_backoff(
+        [security_group["GroupId"] for security_group in security_groups],
+        lambda group_id: ec2_client.delete_security_group(GroupId=group_id),
+        "security group",
+    )
 
 
 def terminate_vpc(vpc_id, aws_region):
-    ec2_resource = boto3.resource("ec2", region_name=aws_region)
+    ec2_client = get_client("ec2", aws_region)
 
+    # Load balancers, NAT gateways and endpoints do not depend on each other:
+    # start all deletions, then wait for them together
     logging.info(f"Deleting load balancers for VPC {vpc_id}.")
     delete_load_balancers(aws_region, vpc_id)
 
     logging.info(f"Deleting NAT gateway for VPC {vpc_id}.")
-    delete_nat_gateway(aws_region, vpc_id)
+    nat_gateway_ids = delete_nat_gateway(aws_region, vpc_id)
 
     logging.info(f"Deleting endpoints for VPC {vpc_id}.")
     delete_vpc_ep(aws_region, vpc_id)
-    sleep(30)
+
+    if not wait_for_nat_gateways_delete(ec2_client, nat_gateway_ids):
+        # The rest of the VPC depends on the NAT gateways being gone;
+        # leave it to the next run instead of failing the other VPCs
+        logging.error(f"Skipping VPC {vpc_id} until its NAT gateways are deleted.")
+        return
+    wait_for_vpc_endpoints_delete(ec2_client, vpc_id)
+
     logging.info(f"Deleting internet gateway for VPC {vpc_id}.")
-    delete_igw(ec2_resource, vpc_id)
+    delete_igw(aws_region, vpc_id)
+
+    logging.info(f"Deleting network interfaces for VPC {vpc_id}.")
+    delete_network_interfaces(aws_region, vpc_id)
 
     logging.info(f"Deleting subnets for VPC {vpc_id}.")
-    delete_subnets(ec2_resource, vpc_id)
+    delete_subnets(aws_region, vpc_id)
 
     logging.info(f"Deleting route tables for VPC {vpc_id}.")
-    delete_route_tables(ec2_resource, vpc_id)
+    delete_route_tables(aws_region, vpc_id)
 
     logging.info(f"Deleting security groups for VPC {vpc_id}.")
-
-    vpc_resource = ec2_resource.Vpc(vpc_id)
-    security_groups = vpc_resource.security_groups.all()
-    attempt = 0
-    while security_groups and attempt < 5:
-        delete_security_groups(security_groups)
-        security_groups = vpc_resource.security_groups.all()
-        attempt += 1
+    delete_security_groups(aws_region, vpc_id)
 
     logging.info(f"Deleting VPC {vpc_id}.")
-    for attempt in range(0, 10):
-        logging.info(f"Deleting VPC {vpc_id}.. Attempt {attempt}/10")
-        try:
-            ec2_resource.Vpc(vpc_id).delete()
-        except ClientError as e:
-            logging.info(
-                f"Failed to delete vpc, will try again. The error was: {e}. Sleeping 10 seconds"
-            )
-            sleep(10)
-            continue
-        break
+    delete_with_backoff([vpc_id], lambda vpc: ec2_client.delete_vpc(VpcId=vpc), "vpc")
 
 
-def lambda_handler(event, context):
-    aws_regions = get_regions_list()
+def cleanup_region(aws_region):
+    vpcs = get_vpcs_to_terminate(aws_region)
+
+    def terminate(vpc):
+        logging.info(f"Deleting all resources and VPC {vpc}.")
+        terminate_vpc(vpc, aws_region)
 
-    for aws_region in aws_regions:
-        logging.info(f"Searching for resources to remove in {aws_region}.")
-        vpcs = get_vpcs_to_terminate(aws_region)
+    with ThreadPoolExecutor(max_workers=VPC_WORKERS) as pool:
+        list(pool.map(terminate, vpcs))
+    return len(vpcs)
 
-        for vpc in vpcs:
-            logging.info(f"Deleting all resources and VPC.")
-            terminate_vpc(vpc, aws_region)
+
+def lambda_handler(event, context):
+    sweep_regions(cleanup_region, context)
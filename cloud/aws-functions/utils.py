@@ -1,5 +1,171 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
 import boto3
+from botocore.config import Config
+
+# Regions processed at once by sweep_regions
+REGION_WORKERS = int(os.environ.get("REGION_WORKERS", "8"))
+
+_clients = {}
+_lock = threading.Lock()
+
+
+# Client-side rate limiting: botocore slows the request rate down on
+# throttling errors and speeds it back up once they stop
+ADAPTIVE_RETRIES = Config(retries={"mode": "adaptive", "max_attempts": 10})
+
+
+def get_client(service, region_name=None, config=None):
+    """Return a boto3 client shared by every caller in this process.
+
+    Clients are thread-safe once created, but creating them from the default
+    session is not, so only creation is serialized; cached clients are looked
+    up without the lock. Callers passing the same config object share one
+    client.
+    """
+    key = (service, region_name, config)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = boto3.client(service, region_name=region_name, config=config)
+                _clients[key] = client
+    return client
+
+
+def get_resource(service, region_name=None):
+    """Create a boto3 resource; resources must not be shared between threads."""
+    with _lock:
+        return boto3.resource(service, region_name=region_name)
+
+
+def backoff_delays(base=2.0, cap=30.0):
+    """Yield exponentially growing sleep times with jitter.
+
+    Each delay is drawn between half and all of min(cap, base * 2^attempt),
+    so concurrent pollers spread out instead of retrying in lockstep.
+    """
+    attempt = 0
+    while True:
+        delay = min(cap, base * 2 ** attempt)
+        yield random.uniform(delay / 2, delay)
+        attempt += 1
+
+
+def wait_until(check, description, timeout=300, base=2.0, cap=30.0):
+    """Call check() with backoff until it returns True or timeout expires.
+
+    Returns:
+        True if check() succeeded, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    for attempt, delay in enumerate(backoff_delays(base, cap), start=1):
+        if check():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logging.error(f"{description} did not finish in {timeout} seconds.")
+            return False
+        delay = min(delay, remaining)
+        logging.info(
+            f"Waiting for {description}. Attempt {attempt}. Sleeping {delay:.1f} seconds."
+        )
+        time.sleep(delay)
+
 
 def get_regions_list():
-    client = boto3.client('ec2')
+    client = get_client('ec2')
     return [region['RegionName'] for region in client.describe_regions()['Regions']]
+
+
+def _as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def build_role_trust_index(iam_client=None):
+    """Index the principals trusted by every IAM role in one list_roles pass.
+
+    list_roles already returns each role's trust policy, so no get_role call
+    is needed. Principals can be a single value or a list in a policy, and
+    "*" is kept as is.
+
+    Returns:
+        dict of principal type ("Federated", "AWS", "Service") -> set of
+        principals trusted by at least one role
+    """
+    iam_client = iam_client or get_client("iam")
+    index = defaultdict(set)
+    roles = 0
+    for page in iam_client.get_paginator("list_roles").paginate():
+        for role in page["Roles"]:
+            roles += 1
+            policy = role.get("AssumeRolePolicyDocument") or {}
+            if isinstance(policy, str):
+                policy = json.loads(unquote(policy))
+            for statement in _as_list(policy.get("Statement", [])):
+                principal = statement.get("Principal", {})
+                if not isinstance(principal, dict):
+                    index["*"].add(principal)
+                    continue
+                for principal_type, values in principal.items():
+                    index[principal_type].update(_as_list(values))
+    logging.info(f"Indexed trust policies of {roles} IAM roles.")
+    return index
+
+
+def sweep_regions(region_func, context=None, aws_regions=None, workers=REGION_WORKERS):
+    """Run region_func(aws_region) for every region concurrently.
+
+    Every region runs to completion even if another one fails; the first
+    error is raised once the sweep is over, so the invocation still fails.
+
+    Returns:
+        dict of region -> region_func result, for regions that succeeded
+    """
+    if aws_regions is None:
+        aws_regions = get_regions_list()
+
+    def run(aws_region):
+        started = time.monotonic()
+        result, error = None, None
+        try:
+            logging.info(f"Searching for resources to remove in {aws_region}.")
+            result = region_func(aws_region)
+        except Exception as e:
+            logging.error(f"Sweep of region {aws_region} failed with error: {e}")
+            error = e
+        elapsed = time.monotonic() - started
+        logging.info(f"Region {aws_region} finished in {elapsed:.1f}s.")
+        return result, error, elapsed
+
+    started = time.monotonic()
+    results, errors, timings = {}, [], {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {region: pool.submit(run, region) for region in aws_regions}
+        for region, future in futures.items():
+            result, error, timings[region] = future.result()
+            if error is None:
+                results[region] = result
+            else:
+                errors.append(error)
+    elapsed = time.monotonic() - started
+
+    slowest = max(timings, key=timings.get, default=None)
+    summary = f"Swept {len(aws_regions)} regions in {elapsed:.1f}s with {workers} workers"
+    if slowest:
+        summary += f", slowest {slowest} ({timings[slowest]:.1f}s)"
+    if context is not None:
+        summary += f", {context.get_remaining_time_in_millis() / 1000:.0f}s of Lambda time left"
+    logging.info(f"{summary}.")
+    if errors:
+        raise errors[0]
+    return results